@@ -0,0 +1,311 @@
+# ALOCAÇÃO DE REGISTRADORES
+# Decide quais variáveis do programa ficam em registrador em vez da pilha,
+# com varredura linear (linear scan) sobre os intervalos de vida:
+#   1. percorre a AST numerando os comandos/usos em ordem; cada variável
+#      ganha um intervalo [primeira posição, última posição]
+#   2. variável usada dentro de um laço vive até o fim do laço (o valor
+#      volta pro começo a cada iteração), e cada uso pesa 10^profundidade,
+#      então as variáveis de laço interno são as mais "quentes"
+#   3. varre os intervalos pela posição de início; quando acabam os
+#      registradores, derrama (manda pra pilha) o de menor peso
+#
+# Inteiros (e cadeias/lógicos, que também cabem numa palavra) usam
+# $s0-$s7; flutuantes usam $f20-$f31. Os $t0-$t9 e $f2-$f11 continuam
+# reservados pra avaliação das expressões
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Var, Binaria, Unaria, Chamada, IncDec)
+from codigo_intermediario import calcular_vivas
+from lacos import profundidade_blocos
+
+REGISTRADORES_INTEIROS = ['$s' + str(i) for i in range(8)]
+REGISTRADORES_FLUTUANTES = ['$f' + str(i) for i in range(20, 32)]
+
+# Registradores que uma função chamada tem que devolver intactos (salva e
+# restaura se usar); os outros podem ser destruídos por qualquer chamada
+REGISTRADORES_PRESERVADOS = frozenset(REGISTRADORES_INTEIROS + REGISTRADORES_FLUTUANTES)
+
+# Peso máximo de um uso (evita números enormes em laços muito aninhados)
+PROFUNDIDADE_MAXIMA = 6
+
+
+class Intervalo:
+    # chave: o que recebe o registrador (DeclVar na AST, nome no IR)
+    # classe: 'inteiro' ou 'flutuante' (qual banco de registradores)
+    # cruza_chamada: tá vivo durante alguma chamada de função (só pode
+    # ficar num registrador preservado)
+    __slots__ = ('chave', 'inicio', 'fim', 'peso', 'classe', 'cruza_chamada')
+
+    def __init__(self, chave, inicio, classe):
+        self.chave = chave
+        self.inicio = inicio
+        self.fim = inicio
+        self.peso = 0
+        self.classe = classe
+        self.cruza_chamada = False
+
+    def __repr__(self):
+        nome = self.chave.nome if isinstance(self.chave, DeclVar) else str(self.chave)
+        return "Intervalo(" + nome + ", " + str(self.inicio) + "-" + str(self.fim) + \
+               ", peso=" + str(self.peso) + ")"
+
+
+def classe_do_tipo(tipo):
+    return 'flutuante' if tipo == 'flutuante' else 'inteiro'
+
+
+class _Coletor:
+    # Percorre os comandos do programa principal montando os intervalos
+    # (corpos de função ficam de fora: não são gerados por enquanto)
+    def __init__(self):
+        self.pos = 0
+        self.profundidade = 0
+        self.intervalos = {}   # decl -> Intervalo
+        self.ordem = []
+
+    def usar(self, decl):
+        if not isinstance(decl, DeclVar):
+            return
+        iv = self.intervalos.get(decl)
+        if iv is None:
+            # Uso sem declaração vista (parâmetro, por exemplo): fica na pilha
+            return
+        iv.fim = self.pos
+        iv.peso += 10 ** min(self.profundidade, PROFUNDIDADE_MAXIMA)
+
+    def declarar(self, decl):
+        iv = Intervalo(decl, self.pos, classe_do_tipo(decl.tipo))
+        self.intervalos[decl] = iv
+        self.ordem.append(iv)
+
+    def laco(self, partes):
+        # partes: funções que percorrem cada pedaço do laço (condição, corpo...)
+        # Toda variável usada no laço fica viva no laço inteiro: o valor
+        # volta pro começo a cada iteração (vale até pra quem foi declarada
+        # dentro dele, que reusa o mesmo lugar na próxima volta)
+        inicio = self.pos
+        self.profundidade += 1
+        for parte in partes:
+            parte()
+        self.profundidade -= 1
+        self.pos += 1
+        fim = self.pos
+        for iv in self.ordem:
+            if inicio <= iv.fim < fim:
+                iv.inicio = min(iv.inicio, inicio)
+                iv.fim = fim
+
+    def comandos(self, lista):
+        for cmd in lista:
+            self.comando(cmd)
+
+    def comando(self, cmd):
+        self.pos += 1
+        if isinstance(cmd, DeclVar):
+            if cmd.valor is not None:
+                self.expr(cmd.valor)
+            self.declarar(cmd)
+            if cmd.valor is not None:
+                self.usar(cmd)
+
+        elif isinstance(cmd, DeclFuncao):
+            pass
+
+        elif isinstance(cmd, Atribuicao):
+            self.expr(cmd.expr)
+            self.usar(cmd.decl)
+
+        elif isinstance(cmd, Escrita) or isinstance(cmd, ExprCmd):
+            self.expr(cmd.expr)
+
+        elif isinstance(cmd, Leitura):
+            self.usar(cmd.decl)
+
+        elif isinstance(cmd, Se):
+            self.expr(cmd.cond)
+            self.comandos(cmd.entao)
+            if cmd.senao is not None:
+                self.comandos(cmd.senao)
+
+        elif isinstance(cmd, Enquanto):
+            self.laco([lambda: self.expr(cmd.cond),
+                       lambda: self.comandos(cmd.corpo)])
+
+        elif isinstance(cmd, Para):
+            self.comando(cmd.inicio)
+            partes = [lambda: self.comandos(cmd.corpo), lambda: self.comando(cmd.passo)]
+            if cmd.cond is not None:
+                partes.insert(0, lambda: self.expr(cmd.cond))
+            self.laco(partes)
+
+    def expr(self, expr):
+        if isinstance(expr, Var) or isinstance(expr, IncDec):
+            self.usar(expr.decl)
+        elif isinstance(expr, Binaria):
+            self.expr(expr.esq)
+            self.expr(expr.dir)
+        elif isinstance(expr, Unaria):
+            self.expr(expr.expr)
+        elif isinstance(expr, Chamada):
+            for arg in expr.args:
+                self.expr(arg)
+
+
+def calcular_intervalos(comandos):
+    # Intervalos de vida das variáveis declaradas nos comandos, em ordem de início
+    coletor = _Coletor()
+    coletor.comandos(comandos)
+    return coletor.ordem
+
+
+def varredura_linear(intervalos, registradores):
+    # Linear scan clássico (Poletto & Sarkar), derramando pelo menor peso
+    # Intervalo que cruza chamada só pega registrador de REGISTRADORES_PRESERVADOS
+    # Retorna ({chave: registrador}, [intervalos derramados])
+    alocacao = {}
+    derramados = []
+    ativos = []            # intervalos com registrador, ordenados pelo fim
+    livres = list(registradores)
+
+    for iv in sorted(intervalos, key=lambda x: x.inicio):
+        # Libera os registradores de quem já morreu
+        while ativos and ativos[0].fim < iv.inicio:
+            livres.append(alocacao[ativos.pop(0).chave])
+
+        serve = [r for r in livres if not iv.cruza_chamada or r in REGISTRADORES_PRESERVADOS]
+        if serve:
+            livres.remove(serve[0])
+            alocacao[iv.chave] = serve[0]
+            _inserir_ativo(ativos, iv)
+            continue
+
+        # Sem registrador livre: sai o mais leve (pode ser o próprio iv)
+        candidatos = [a for a in ativos
+                      if not iv.cruza_chamada or alocacao[a.chave] in REGISTRADORES_PRESERVADOS]
+        vitima = min(candidatos, key=lambda x: x.peso) if candidatos else None
+        if vitima is not None and vitima.peso < iv.peso:
+            alocacao[iv.chave] = alocacao.pop(vitima.chave)
+            ativos.remove(vitima)
+            derramados.append(vitima)
+            _inserir_ativo(ativos, iv)
+        else:
+            derramados.append(iv)
+
+    return alocacao, derramados
+
+
+def _inserir_ativo(ativos, iv):
+    i = 0
+    while i < len(ativos) and ativos[i].fim <= iv.fim:
+        i += 1
+    ativos.insert(i, iv)
+
+
+def alocar_registradores(arvore, registradores_inteiros=None, registradores_flutuantes=None,
+                         excluir=()):
+    # Registradores das variáveis do programa principal (ou do corpo, se
+    # arvore for uma DeclFuncao): {DeclVar: registrador}
+    # Quem não aparece no dicionário fica na pilha; excluir são declarações
+    # que ficam na memória de qualquer jeito (globais usadas por funções)
+    if registradores_inteiros is None:
+        registradores_inteiros = REGISTRADORES_INTEIROS
+    if registradores_flutuantes is None:
+        registradores_flutuantes = REGISTRADORES_FLUTUANTES
+
+    comandos = arvore.corpo if isinstance(arvore, DeclFuncao) else arvore.comandos
+    intervalos = [iv for iv in calcular_intervalos(comandos) if iv.chave not in excluir]
+    return _alocar_por_classe(intervalos, registradores_inteiros, registradores_flutuantes)
+
+
+def _alocar_por_classe(intervalos, registradores_inteiros, registradores_flutuantes):
+    alocacao = {}
+    for classe, regs in (('inteiro', registradores_inteiros),
+                         ('flutuante', registradores_flutuantes)):
+        da_classe = [iv for iv in intervalos if iv.classe == classe]
+        regs_classe, _ = varredura_linear(da_classe, regs)
+        alocacao.update(regs_classe)
+    return alocacao
+
+
+# ---------------- Alocação no código intermediário ----------------
+# No IR os intervalos saem da análise de vivacidade: numerando as instruções
+# na ordem em que os blocos vão ser emitidos, o intervalo de um nome cobre
+# todo ponto onde ele é definido, usado ou está vivo (entrada/saída de bloco)
+# Aqui temporários e variáveis disputam os mesmos registradores, então entram
+# também os $t (só $t8/$t9 ficam de rascunho pro gerador)
+# Qualquer ordem dos blocos dá intervalos corretos; com a ordem do perfil
+# (otimizacao_perfil.py) a numeração continua na ordem de antes
+# (funcao.ordem_alocacao), pra o código frio jogado pro fim não esticar os
+# intervalos do resto
+
+REGISTRADORES_INTEIROS_IR = ['$t' + str(i) for i in range(8)] + REGISTRADORES_INTEIROS
+REGISTRADORES_FLUTUANTES_IR = ['$f' + str(i) for i in range(4, 12)] + REGISTRADORES_FLUTUANTES
+
+
+def ordem_blocos(funcao):
+    return funcao.ordem_alocacao if funcao.ordem_alocacao is not None else funcao.blocos
+
+
+def profundidade_lacos(funcao):
+    # Profundidade de laço de cada bloco, na ordem da numeração: em quantos
+    # laços naturais (lacos.py) o bloco está
+    profundidade = profundidade_blocos(funcao)
+    return [profundidade[b] for b in ordem_blocos(funcao)]
+
+
+def calcular_intervalos_ir(funcao, vivas_na_saida=(), usos_chamada=(), excluir=()):
+    entrada, saida = calcular_vivas(funcao, vivas_na_saida, usos_chamada)
+    profundidade = profundidade_lacos(funcao)
+    intervalos = {}
+
+    def tocar(nome, pos, peso):
+        iv = intervalos.get(nome)
+        if iv is None:
+            iv = intervalos[nome] = Intervalo(nome, pos, classe_do_tipo(funcao.tipos.get(nome)))
+        iv.inicio = min(iv.inicio, pos)
+        iv.fim = max(iv.fim, pos)
+        iv.peso += peso
+
+    pos = 0
+    for nome in funcao.params:
+        tocar(nome, pos, 0)
+    for i, b in enumerate(ordem_blocos(funcao)):
+        peso = 10 ** min(profundidade[i], PROFUNDIDADE_MAXIMA)
+        pos += 1
+        for nome in entrada[b]:
+            tocar(nome, pos, 0)
+        for instr in b.instrs:
+            pos += 1
+            for nome in instr.usos():
+                tocar(nome, pos, peso)
+            if instr.dest is not None:
+                tocar(instr.dest, pos, peso)
+        for nome in saida[b]:
+            tocar(nome, pos, 0)
+
+    # Quem tá vivo depois de uma chamada (sem ser o resultado dela) cruza a chamada
+    for b in funcao.blocos:
+        vivas = set(saida[b])
+        for instr in reversed(b.instrs):
+            if instr.dest is not None:
+                vivas.discard(instr.dest)
+            if instr.op == 'chamar':
+                for nome in vivas:
+                    if nome in intervalos:
+                        intervalos[nome].cruza_chamada = True
+                vivas.update(usos_chamada)
+            vivas.update(instr.usos())
+    return [iv for iv in intervalos.values() if iv.chave not in excluir]
+
+
+def alocar_registradores_ir(funcao, registradores_inteiros=None, registradores_flutuantes=None,
+                            vivas_na_saida=(), usos_chamada=(), excluir=()):
+    # Registradores dos nomes (variáveis e temporários) de uma FuncaoIR:
+    # {nome: registrador}; quem ficar de fora vai pra pilha (excluir: nomes
+    # que ficam na memória, as globais)
+    if registradores_inteiros is None:
+        registradores_inteiros = REGISTRADORES_INTEIROS_IR
+    if registradores_flutuantes is None:
+        registradores_flutuantes = REGISTRADORES_FLUTUANTES_IR
+    intervalos = calcular_intervalos_ir(funcao, vivas_na_saida, usos_chamada, excluir)
+    return _alocar_por_classe(intervalos, registradores_inteiros, registradores_flutuantes)
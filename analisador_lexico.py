@@ -1,284 +1,709 @@
-class Token:
-    def __init__(self, tipo, lexema, linha, coluna):
-        self.tipo = tipo
-        self.lexema = lexema
-        self.linha = linha
-        self.coluna = coluna
-
-    def __repr__(self):
-        return self.tipo + " | " + self.lexema + " | L:" + str(self.linha) + " C:" + str(self.coluna)
-
-
-class AFDPalavrasReservadas:
-    # AFD pra reconhecer palavras reservadas da linguagem
-    # Usa uma tabela hash com as palavras e seus tipos correspondentes
-    def __init__(self):
-        # Mapeamento das palavras reservadas pro tipo delas
-        self.estados_finais = {
-            'var': 'var',
-            'fun': 'fun',
-            'inteiro': 'inteiro',
-            'flutuante': 'flutuante',
-            'cadeia': 'cadeia',
-            'logico': 'lógico',
-            'if': 'if',
-            'else': 'else',
-            'for': 'for',
-            'while': 'while',
-            'write': 'write',
-            'read': 'read',
-            'verdadeiro': 'verdadeiro',
-            'falso': 'falso',
-            'inicio': 'inicio',
-            'fim': 'fim'
-        }
-    
-    def reconhecer(self, palavra):
-        # Verifica se a palavra tá na tabela de reservadas
-        # Se não tiver, é um identificador comum (id)
-        if palavra in self.estados_finais:
-            return self.estados_finais[palavra]
-        return 'id'
-
-
-class AFDOperadores:
-    # AFD pra reconhecer operadores da linguagem
-    # Trata operadores de 1 e 2 caracteres
-    def __init__(self):
-        # Operadores compostos (2 caracteres) - tem prioridade no reconhecimento
-        self.op_2char = {
-            '>=': 'ge',
-            '<=': 'le',
-            '==': 'eqeq',
-            '!=': 'ne',
-            '++': 'inc',
-            '--': 'dec',
-            '&&': 'e_logico'
-        }
-        
-        # Operadores simples (1 caractere)
-        self.op_1char = {
-            '+': 'mais',
-            '-': 'menos',
-            '*': 'mult',
-            '/': 'div',
-            '(': 'ap',
-            ')': 'fp',
-            '{': 'ab',
-            '}': 'fb',
-            ',': 'v',
-            ';': 'pv',
-            '=': 'igual',
-            '>': 'maior',
-            '<': 'menor',
-            '&': 'concat',
-            ':': 'dois_pontos'
-        }
-    
-    def reconhecer(self, c1, c2=None):
-        # Estratégia greedy: tenta casar 2 chars primeiro, depois 1
-        # Retorna uma tupla (tipo_token, tamanho_consumido)
-        
-        # Primeiro tenta operador de 2 caracteres
-        if c2 is not None:
-            dois = c1 + c2
-            if dois in self.op_2char:
-                return (self.op_2char[dois], 2)
-        
-        # Se não der, tenta operador de 1 caractere
-        if c1 in self.op_1char:
-            return (self.op_1char[c1], 1)
-        
-        # Operador desconhecido
-        return ('desconhecido', 1)
-
-
-class Lexico:
-    def __init__(self):
-        self.codigo = ""
-        self.pos = 0
-        self.linha = 1
-        self.coluna = 1
-        
-        # Instancia os AFDs que vão fazer o reconhecimento
-        self.afd_palavras = AFDPalavrasReservadas()
-        self.afd_ops = AFDOperadores()
-
-    def definir_entrada(self, codigo):
-        self.codigo = codigo
-        self.pos = 0
-        self.linha = 1
-        self.coluna = 1
-
-    def char_atual(self):
-        # Pega o caractere na posição atual, ou None se chegou no fim
-        if self.pos < len(self.codigo):
-            return self.codigo[self.pos]
-        return None
-    
-    def proximo_char(self):
-        # Olha o próximo caractere sem avançar a posição
-        if self.pos + 1 < len(self.codigo):
-            return self.codigo[self.pos + 1]
-        return None
-    
-    def avancar(self):
-        # Move pro próximo caractere e atualiza linha/coluna
-        c = self.char_atual()
-        if c is not None:
-            self.pos += 1
-            if c == '\n':
-                self.linha += 1
-                self.coluna = 1
-            else:
-                self.coluna += 1
-
-    def proximo_token(self):
-        # Ignora espaços em branco
-        while self.char_atual() is not None and self.char_atual() in ' \t\r\n':
-            self.avancar()
-        
-        c = self.char_atual()
-        if c is None:
-            return Token('$', '$', self.linha, self.coluna)
-        
-        lin = self.linha
-        col = self.coluna
-
-        # Comentário de linha (//)
-        if c == '/' and self.proximo_char() == '/':
-            while self.char_atual() is not None and self.char_atual() != '\n':
-                self.avancar()
-            return self.proximo_token()
-
-        # String literal entre aspas
-        if c == '"':
-            return self.ler_string(lin, col)
-
-        # Literal numérico
-        if self.eh_digito(c):
-            return self.ler_numero(lin, col)
-
-        # Identificador ou palavra reservada
-        if self.eh_letra(c) or c == '_':
-            return self.ler_identificador(lin, col)
-
-        # Operador
-        if c in '+-*/(){},;=!><&:':
-            return self.ler_operador(lin, col)
-
-        # Caractere inválido
-        raise Exception("Char invalido: '" + c + "' em L" + str(self.linha) + " C" + str(self.coluna))
-
-    def eh_digito(self, c):
-        if c is None:
-            return False
-        return '0' <= c <= '9'
-    
-    def eh_letra(self, c):
-        if c is None:
-            return False
-        return ('a' <= c <= 'z') or ('A' <= c <= 'Z')
-    
-    def eh_alfanum(self, c):
-        return self.eh_letra(c) or self.eh_digito(c) or c == '_'
-
-    def ler_string(self, lin, col):
-        # Lê uma string literal do código
-        # Trata caracteres de escape também
-        lex = ""
-        lex += self.char_atual()  # aspas de abertura
-        self.avancar()
-
-        while self.char_atual() is not None:
-            c = self.char_atual()
-
-            # Caractere de escape (barra invertida)
-            if c == '\\':
-                lex += c
-                self.avancar()
-                if self.char_atual() is not None:
-                    lex += self.char_atual()
-                    self.avancar()
-                continue
-
-            # Fecha a string
-            if c == '"':
-                lex += c
-                self.avancar()
-                return Token('CADEIA', lex, lin, col)
-
-            lex += c
-            self.avancar()
-
-        raise Exception("String nao fechada em L" + str(lin) + " C" + str(col))
-
-    def ler_numero(self, lin, col):
-        # Lê um número (inteiro ou ponto flutuante)
-        lex = ""
-        
-        # Parte inteira
-        while self.char_atual() is not None and self.eh_digito(self.char_atual()):
-            lex += self.char_atual()
-            self.avancar()
-        
-        # Parte decimal (se existir)
-        if self.char_atual() == '.':
-            lex += self.char_atual()
-            self.avancar()
-            while self.char_atual() is not None and self.eh_digito(self.char_atual()):
-                lex += self.char_atual()
-                self.avancar()
-        
-        return Token('num', lex, lin, col)
-
-    def ler_identificador(self, lin, col):
-        # Lê um identificador ou palavra reservada
-        lex = ""
-        
-        # Primeiro caractere (letra ou underscore)
-        lex += self.char_atual()
-        self.avancar()
-        
-        # Resto do identificador (letras, dígitos ou underscore)
-        while self.char_atual() is not None and self.eh_alfanum(self.char_atual()):
-            lex += self.char_atual()
-            self.avancar()
-        
-        # Consulta o AFD pra saber se e palavra reservada ou ID comum
-        tipo = self.afd_palavras.reconhecer(lex)
-        return Token(tipo, lex, lin, col)
-
-    def ler_operador(self, lin, col):
-        # Lê um operador usando estratégia greedy (tomando sempre a melhor decisão local disponível no momento)
-        c1 = self.char_atual()
-        c2 = self.proximo_char()
-        
-        # AFD retorna o tipo e quantos caracteres consumir
-        tipo, tam = self.afd_ops.reconhecer(c1, c2)
-        
-        lex = c1
-        self.avancar()
-        
-        if tam == 2 and c2 is not None:
-            lex += c2
-            self.avancar()
-        
-        return Token(tipo, lex, lin, col)
-
-    def analisar(self, codigo):
-        self.definir_entrada(codigo)
-        tokens = []
-        erros = []
-
-        while True:
-            try:
-                tk = self.proximo_token()
-                if tk.tipo == '$':
-                    break
-                tokens.append(tk)
-            except Exception as e:
-                erros.append(str(e))
-                self.avancar()
-
-        return tokens, erros
+import gc
+import io
+import re
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, chain, compress, count, repeat
+from operator import add, sub
+
+
+class Token:
+    # __slots__ tira o __dict__ de cada token (bem menos memória por token)
+    __slots__ = ('tipo', 'lexema', 'linha', 'coluna')
+
+    def __init__(self, tipo, lexema, linha, coluna):
+        self.tipo = tipo
+        self.lexema = lexema
+        self.linha = linha
+        self.coluna = coluna
+
+    def __repr__(self):
+        return self.tipo + " | " + self.lexema + " | L:" + str(self.linha) + " C:" + str(self.coluna)
+
+
+class AFDPalavrasReservadas:
+    # AFD pra reconhecer palavras reservadas da linguagem
+    # Usa uma tabela hash com as palavras e seus tipos correspondentes
+    def __init__(self):
+        # Mapeamento das palavras reservadas pro tipo delas
+        self.estados_finais = {
+            'var': 'var',
+            'fun': 'fun',
+            'inteiro': 'inteiro',
+            'flutuante': 'flutuante',
+            'cadeia': 'cadeia',
+            'logico': 'lógico',
+            'if': 'if',
+            'else': 'else',
+            'for': 'for',
+            'while': 'while',
+            'write': 'write',
+            'read': 'read',
+            'verdadeiro': 'verdadeiro',
+            'falso': 'falso',
+            'inicio': 'inicio',
+            'fim': 'fim'
+        }
+    
+    def reconhecer(self, palavra):
+        # Verifica se a palavra tá na tabela de reservadas
+        # Se não tiver, é um identificador comum (id)
+        if palavra in self.estados_finais:
+            return self.estados_finais[palavra]
+        return 'id'
+
+
+class AFDOperadores:
+    # AFD pra reconhecer operadores da linguagem
+    # Trata operadores de 1 e 2 caracteres
+    def __init__(self):
+        # Operadores compostos (2 caracteres) - tem prioridade no reconhecimento
+        self.op_2char = {
+            '>=': 'ge',
+            '<=': 'le',
+            '==': 'eqeq',
+            '!=': 'ne',
+            '++': 'inc',
+            '--': 'dec',
+            '&&': 'e_logico'
+        }
+        
+        # Operadores simples (1 caractere)
+        self.op_1char = {
+            '+': 'mais',
+            '-': 'menos',
+            '*': 'mult',
+            '/': 'div',
+            '(': 'ap',
+            ')': 'fp',
+            '{': 'ab',
+            '}': 'fb',
+            ',': 'v',
+            ';': 'pv',
+            '=': 'igual',
+            '>': 'maior',
+            '<': 'menor',
+            '&': 'concat',
+            ':': 'dois_pontos'
+        }
+    
+    def reconhecer(self, c1, c2=None):
+        # Estratégia greedy: tenta casar 2 chars primeiro, depois 1
+        # Retorna uma tupla (tipo_token, tamanho_consumido)
+        
+        # Primeiro tenta operador de 2 caracteres
+        if c2 is not None:
+            dois = c1 + c2
+            if dois in self.op_2char:
+                return (self.op_2char[dois], 2)
+        
+        # Se não der, tenta operador de 1 caractere
+        if c1 in self.op_1char:
+            return (self.op_1char[c1], 1)
+        
+        # Operador desconhecido
+        return ('desconhecido', 1)
+
+
+# Padrão mestre do motor rápido: uma alternativa por classe de token
+# A ordem importa: comentário antes do operador '/', string fechada antes da
+# string aberta, operador de 2 chars antes do de 1 char (mesmo greedy do AFD)
+# O último grupo (ERRO) casa qualquer char, então o scanner nunca trava
+PADRAO_MESTRE = re.compile(r"""
+    (?P<ESPACO>[ \t\r\n]+)
+  | (?P<COMENTARIO>//[^\n]*)
+  | (?P<ID>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<NUM>[0-9]+(?:\.[0-9]*)?)
+  | (?P<CADEIA>"[^"\\]*(?:\\[\s\S][^"\\]*)*")
+  | (?P<CADEIA_ABERTA>"[\s\S]*)
+  | (?P<OP2>>=|<=|==|!=|\+\+|--|&&)
+  | (?P<OP1>[-+*/(){},;=!><&:])
+  | (?P<ERRO>[\s\S])
+""", re.VERBOSE)
+
+# Padrão do caminho rápido (split): os mesmos tokens do PADRAO_MESTRE, num
+# grupo só, sem espaço e sem os casos de erro. Onde não casa sobra no meio
+# dos tokens; se isso for só espaço o resultado é igual ao do PADRAO_MESTRE
+PADRAO_TOKENS = re.compile(r"""(
+    //[^\n]*
+  | [A-Za-z_][A-Za-z0-9_]*
+  | [0-9]+(?:\.[0-9]*)?
+  | "[^"\\]*(?:\\[\s\S][^"\\]*)*"
+  | >=|<=|==|!=|\+\+|--|&&
+  | [-+*/(){},;=!><&:]
+)""", re.VERBOSE)
+SO_ESPACO = re.compile(r"[ \t\r\n]*\Z")
+
+
+class TiposLexema(dict):
+    # Tipo de cada lexema do caminho rápido: reservadas e operadores vêm
+    # prontos, o resto é classificado pelo primeiro char na primeira vez
+    # que aparece e fica guardado (ids e números se repetem muito)
+    def __missing__(self, lex):
+        c = lex[0]
+        if c == '"':
+            tipo = 'CADEIA'
+        elif '0' <= c <= '9':
+            tipo = 'num'
+        else:
+            tipo = 'id'
+        self[lex] = tipo
+        return tipo
+
+
+def _montar_tipos_token():
+    # Lista de todos os tipos de token que o léxico pode gerar
+    # A posição na lista é o código inteiro do tipo (cabe em 'H')
+    tipos = ['$', 'id', 'num', 'CADEIA', 'desconhecido']
+    ops = AFDOperadores()
+    for tipo in list(AFDPalavrasReservadas().estados_finais.values()) + \
+            list(ops.op_2char.values()) + list(ops.op_1char.values()):
+        if tipo not in tipos:
+            tipos.append(tipo)
+    return tipos
+
+
+# Tipos de token internados como inteiros pequenos
+# TIPOS_TOKEN[codigo] -> tipo  /  CODIGO_TIPO[tipo] -> codigo
+TIPOS_TOKEN = _montar_tipos_token()
+CODIGO_TIPO = {tipo: i for i, tipo in enumerate(TIPOS_TOKEN)}
+
+
+class TokenVisao:
+    # Visão de um token guardado num TokenBuffer
+    # Tem os mesmos campos do Token (tipo, lexema, linha, coluna), mas só lê
+    # do buffer quando pedido; o lexema é fatiado do código fonte na hora
+    __slots__ = ('buffer', 'indice')
+
+    def __init__(self, buffer, indice):
+        self.buffer = buffer
+        self.indice = indice
+
+    @property
+    def codigo_tipo(self):
+        return self.buffer.tipos[self.indice]
+
+    @property
+    def tipo(self):
+        return TIPOS_TOKEN[self.buffer.tipos[self.indice]]
+
+    @property
+    def lexema(self):
+        b = self.buffer
+        return b.codigo[b.inicios[self.indice]:b.fins[self.indice]]
+
+    @property
+    def linha(self):
+        return self.buffer.posicao(self.indice)[0]
+
+    @property
+    def coluna(self):
+        return self.buffer.posicao(self.indice)[1]
+
+    def __repr__(self):
+        return self.tipo + " | " + self.lexema + " | L:" + str(self.linha) + " C:" + str(self.coluna)
+
+
+class TokenBuffer:
+    # Guarda os tokens em arrays paralelos (struct-of-arrays) em vez de objetos:
+    #   tipos   -> código do tipo (array 'H', ver CODIGO_TIPO)
+    #   inicios, fins   -> fatia do lexema dentro de codigo (array 'I')
+    # Linha e coluna não ficam guardadas: saem do início do token por busca
+    # binária no índice das quebras de linha do código (montado na primeira
+    # consulta, já que a maior parte dos tokens nunca tem a posição lida)
+    # Fica em ~10 bytes por token e não copia os lexemas
+    # Indexar ou iterar devolve TokenVisao, então as fases que usam
+    # .tipo/.lexema/.linha/.coluna funcionam sem mudar nada
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.tipos = array('H')
+        self.inicios = array('I')
+        self.fins = array('I')
+        self.quebras = None
+
+    def adicionar(self, codigo_tipo, inicio, fim):
+        self.tipos.append(codigo_tipo)
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+
+    def indice_quebras(self):
+        # Posição de cada '\n' do código = soma dos tamanhos das linhas antes dele
+        if self.quebras is None:
+            linhas = self.codigo.split('\n')
+            del linhas[-1]
+            self.quebras = array('I', map(add, accumulate(map(len, linhas)), count()))
+        return self.quebras
+
+    def posicao(self, i):
+        # (linha, coluna) do token i
+        quebras = self.indice_quebras()
+        inicio = self.inicios[i]
+        k = bisect_left(quebras, inicio)
+        if k == 0:
+            return 1, inicio + 1
+        return k + 1, inicio - quebras[k - 1]
+
+    def lista_lexemas(self):
+        # Lexemas de todos os tokens de uma vez (pra quem percorre o buffer todo)
+        return list(map(self.codigo.__getitem__, map(slice, self.inicios, self.fins)))
+
+    def lista_linhas(self):
+        # Linhas de todos os tokens de uma vez: soma as quebras de linha entre
+        # o início de um token e o do seguinte (os inícios vêm em ordem)
+        inicios = self.inicios
+        entre = map(self.codigo.count, repeat('\n'), chain((0,), inicios), inicios)
+        return list(accumulate(entre, initial=1))[1:]
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i):
+        # Caminho comum primeiro: índice inteiro dentro do buffer
+        if i.__class__ is int and 0 <= i < len(self.tipos):
+            return TokenVisao(self, i)
+        if isinstance(i, slice):
+            return [TokenVisao(self, j) for j in range(*i.indices(len(self.tipos)))]
+        if i < 0:
+            i += len(self.tipos)
+        if not 0 <= i < len(self.tipos):
+            raise IndexError("indice de token fora do buffer")
+        return TokenVisao(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.tipos)):
+            yield TokenVisao(self, i)
+
+    def estender(self, base, lexemas, tipos, inicios):
+        # Acrescenta um lote do Lexico.lotes (inicios relativos a base)
+        self.tipos.extend(map(CODIGO_TIPO.__getitem__, tipos))
+        inicios = list(map(add, inicios, repeat(base))) if base else inicios
+        self.inicios.extend(inicios)
+        self.fins.extend(map(add, inicios, map(len, lexemas)))
+
+    def token(self, i):
+        # Materializa um Token de verdade (com cópia do lexema)
+        v = self[i]
+        return Token(v.tipo, v.lexema, v.linha, v.coluna)
+
+
+# Tamanho padrão dos blocos lidos de arquivo pelo gerador Lexico.tokens
+TAMANHO_BLOCO = 64 * 1024
+
+
+class Lexico:
+    # motor='rapido' (padrão) varre em lote com o PADRAO_TOKENS e cai no
+    # PADRAO_MESTRE nos blocos com erro léxico
+    # motor='classico' usa a leitura char a char com os AFDs
+    # Os dois geram exatamente os mesmos tokens e mensagens de erro
+    def __init__(self, motor='rapido'):
+        self.codigo = ""
+        self.pos = 0
+        self.linha = 1
+        self.coluna = 1
+        self.motor = motor
+        
+        # Instancia os AFDs que vão fazer o reconhecimento
+        self.afd_palavras = AFDPalavrasReservadas()
+        self.afd_ops = AFDOperadores()
+
+        # Tabela única de tipos dos operadores pro motor rápido
+        # ('!' sozinho não tá em nenhuma tabela, vira 'desconhecido' igual no AFD)
+        self.tipos_ops = dict(self.afd_ops.op_1char)
+        self.tipos_ops.update(self.afd_ops.op_2char)
+        self.tipos_ops['!'] = 'desconhecido'
+        # Reservadas + operadores, base do TiposLexema do caminho rápido
+        self.tipos_fixos = dict(self.tipos_ops)
+        self.tipos_fixos.update(self.afd_palavras.estados_finais)
+
+    def definir_entrada(self, codigo):
+        self.codigo = codigo
+        self.pos = 0
+        self.linha = 1
+        self.coluna = 1
+
+    def char_atual(self):
+        # Pega o caractere na posição atual, ou None se chegou no fim
+        if self.pos < len(self.codigo):
+            return self.codigo[self.pos]
+        return None
+    
+    def proximo_char(self):
+        # Olha o próximo caractere sem avançar a posição
+        if self.pos + 1 < len(self.codigo):
+            return self.codigo[self.pos + 1]
+        return None
+    
+    def avancar(self):
+        # Move pro próximo caractere e atualiza linha/coluna
+        c = self.char_atual()
+        if c is not None:
+            self.pos += 1
+            if c == '\n':
+                self.linha += 1
+                self.coluna = 1
+            else:
+                self.coluna += 1
+
+    def proximo_token(self):
+        # Ignora espaços em branco
+        while self.char_atual() is not None and self.char_atual() in ' \t\r\n':
+            self.avancar()
+        
+        c = self.char_atual()
+        if c is None:
+            return Token('$', '$', self.linha, self.coluna)
+        
+        lin = self.linha
+        col = self.coluna
+
+        # Comentário de linha (//)
+        if c == '/' and self.proximo_char() == '/':
+            while self.char_atual() is not None and self.char_atual() != '\n':
+                self.avancar()
+            return self.proximo_token()
+
+        # String literal entre aspas
+        if c == '"':
+            return self.ler_string(lin, col)
+
+        # Literal numérico
+        if self.eh_digito(c):
+            return self.ler_numero(lin, col)
+
+        # Identificador ou palavra reservada
+        if self.eh_letra(c) or c == '_':
+            return self.ler_identificador(lin, col)
+
+        # Operador
+        if c in '+-*/(){},;=!><&:':
+            return self.ler_operador(lin, col)
+
+        # Caractere inválido
+        raise Exception("Char invalido: '" + c + "' em L" + str(self.linha) + " C" + str(self.coluna))
+
+    def eh_digito(self, c):
+        if c is None:
+            return False
+        return '0' <= c <= '9'
+    
+    def eh_letra(self, c):
+        if c is None:
+            return False
+        return ('a' <= c <= 'z') or ('A' <= c <= 'Z')
+    
+    def eh_alfanum(self, c):
+        return self.eh_letra(c) or self.eh_digito(c) or c == '_'
+
+    def ler_string(self, lin, col):
+        # Lê uma string literal do código
+        # Trata caracteres de escape também
+        lex = ""
+        lex += self.char_atual()  # aspas de abertura
+        self.avancar()
+
+        while self.char_atual() is not None:
+            c = self.char_atual()
+
+            # Caractere de escape (barra invertida)
+            if c == '\\':
+                lex += c
+                self.avancar()
+                if self.char_atual() is not None:
+                    lex += self.char_atual()
+                    self.avancar()
+                continue
+
+            # Fecha a string
+            if c == '"':
+                lex += c
+                self.avancar()
+                return Token('CADEIA', lex, lin, col)
+
+            lex += c
+            self.avancar()
+
+        raise Exception("String nao fechada em L" + str(lin) + " C" + str(col))
+
+    def ler_numero(self, lin, col):
+        # Lê um número (inteiro ou ponto flutuante)
+        lex = ""
+        
+        # Parte inteira
+        while self.char_atual() is not None and self.eh_digito(self.char_atual()):
+            lex += self.char_atual()
+            self.avancar()
+        
+        # Parte decimal (se existir)
+        if self.char_atual() == '.':
+            lex += self.char_atual()
+            self.avancar()
+            while self.char_atual() is not None and self.eh_digito(self.char_atual()):
+                lex += self.char_atual()
+                self.avancar()
+        
+        return Token('num', lex, lin, col)
+
+    def ler_identificador(self, lin, col):
+        # Lê um identificador ou palavra reservada
+        lex = ""
+        
+        # Primeiro caractere (letra ou underscore)
+        lex += self.char_atual()
+        self.avancar()
+        
+        # Resto do identificador (letras, dígitos ou underscore)
+        while self.char_atual() is not None and self.eh_alfanum(self.char_atual()):
+            lex += self.char_atual()
+            self.avancar()
+        
+        # Consulta o AFD pra saber se e palavra reservada ou ID comum
+        tipo = self.afd_palavras.reconhecer(lex)
+        return Token(tipo, lex, lin, col)
+
+    def ler_operador(self, lin, col):
+        # Lê um operador usando estratégia greedy (tomando sempre a melhor decisão local disponível no momento)
+        c1 = self.char_atual()
+        c2 = self.proximo_char()
+        
+        # AFD retorna o tipo e quantos caracteres consumir
+        tipo, tam = self.afd_ops.reconhecer(c1, c2)
+        
+        lex = c1
+        self.avancar()
+        
+        if tam == 2 and c2 is not None:
+            lex += c2
+            self.avancar()
+        
+        return Token(tipo, lex, lin, col)
+
+    def analisar(self, codigo):
+        if self.motor == 'rapido':
+            return self.analisar_rapido(codigo)
+        return self.analisar_classico(codigo)
+
+    def analisar_classico(self, codigo):
+        self.definir_entrada(codigo)
+        tokens = []
+        erros = []
+
+        while True:
+            try:
+                tk = self.proximo_token()
+                if tk.tipo == '$':
+                    break
+                tokens.append(tk)
+            except Exception as e:
+                erros.append(str(e))
+                self.avancar()
+
+        return tokens, erros
+
+    def analisar_compacto(self, codigo):
+        # Igual ao analisar_rapido, mas guarda tudo num TokenBuffer
+        # Sai dos mesmos lotes do tokens(), só que sem criar um Token por
+        # lexema e sem calcular linha/coluna (o TokenBuffer tira do início)
+        buf = TokenBuffer(codigo)
+        for base, lexemas, tipos, inicios, _, _ in self.lotes(codigo, posicoes=False):
+            buf.estender(base, lexemas, tipos, inicios)
+        return buf, self.erros
+
+    def analisar_rapido(self, codigo):
+        # Motor rápido materializado: os Token de cada lote saem de uma vez
+        # (map sobre as listas paralelas). Com o coletor de lixo ligado,
+        # criar centenas de milhares de objetos dispara várias coletas que
+        # percorrem a lista inteira de novo, e isso custava mais que criar
+        # os tokens; Token só guarda str e int (não tem ciclo), então o
+        # coletor fica parado enquanto a lista é montada
+        # Ainda é bem mais lento que o analisar_compacto (um objeto por
+        # token contra arrays); o caminho rápido de verdade é o compacto
+        tokens = []
+        coletando = gc.isenabled()
+        gc.disable()
+        try:
+            for _, lexemas, tipos, _, linhas, colunas in self.lotes(codigo):
+                tokens.extend(map(Token, tipos, lexemas, linhas, colunas))
+        finally:
+            if coletando:
+                gc.enable()
+        return tokens, self.erros
+
+    def tokens(self, fonte, tamanho_bloco=TAMANHO_BLOCO):
+        # Gerador de tokens (motor rápido): devolve um token por vez, sem lista
+        # fonte pode ser uma string ou um arquivo (qualquer coisa com read())
+        # Os erros vão parar em self.erros
+        for _, lexemas, tipos, _, linhas, colunas in self.lotes(fonte, tamanho_bloco):
+            yield from map(Token, tipos, lexemas, linhas, colunas)
+
+    def lotes(self, fonte, tamanho_bloco=TAMANHO_BLOCO, posicoes=True):
+        # Varre a entrada em blocos de tamanho_bloco e devolve, por bloco, as
+        # listas paralelas (base, lexemas, tipos, inicios, linhas, colunas);
+        # inicios são relativos a base, a posição do bloco na entrada
+        # Arquivos são lidos aos poucos e o buffer só guarda o pedaço ainda
+        # não consumido, então a memória depende do tamanho do bloco e do
+        # maior token, e não do tamanho da entrada
+        # posicoes=False não monta as listas de linhas e colunas (vêm None)
+        self.erros = []
+
+        if isinstance(fonte, str):
+            self.definir_entrada(fonte)
+            fonte = io.StringIO(fonte)
+        else:
+            self.definir_entrada("")
+        ler = fonte.read
+        buf = ler(tamanho_bloco)
+        fim_entrada = not buf
+
+        base = 0          # posição absoluta de buf[0] na entrada
+        pos = 0           # próximo char ainda não consumido do buffer
+        linha = 1
+        inicio_linha = 0  # início da linha atual, relativo ao buffer (pode ser < 0)
+
+        while True:
+            n = len(buf)
+            lote = self.varrer_lote(buf, pos, fim_entrada, linha, inicio_linha, posicoes)
+            if lote is None:
+                lote = self.varrer_exato(buf, pos, fim_entrada, linha, inicio_linha)
+            lexemas, tipos, inicios, linhas, colunas, pos, linha, inicio_linha = lote
+            if lexemas:
+                yield base, lexemas, tipos, inicios, linhas, colunas
+
+            if fim_entrada:
+                break
+
+            # Lê mais um bloco e descarta o que já foi consumido
+            # Se um token sozinho for maior que o bloco, a leitura cresce junto
+            # (evita reescanear o mesmo token muitas vezes)
+            bloco = ler(max(tamanho_bloco, n - pos))
+            if not bloco:
+                fim_entrada = True
+            base += pos
+            inicio_linha -= pos
+            buf = buf[pos:] + bloco
+            pos = 0
+
+        # Deixa o estado igual ao do motor clássico no fim da entrada
+        self.pos = base + len(buf)
+        self.linha = linha
+        self.coluna = len(buf) - inicio_linha + 1
+
+    def varrer_lote(self, buf, pos, fim_entrada, linha, inicio_linha, posicoes=True):
+        # Caminho rápido: um PADRAO_TOKENS.split separa buf[pos:] em
+        # [espaço, token, espaço, token, ..., espaço] dentro do re, e tipos,
+        # posições, linhas e colunas saem de map/accumulate sobre as listas,
+        # sem laço Python por token
+        # Devolve None se sobrou algo além de espaço entre os tokens (char
+        # inválido, string sem fechar): aí o bloco vai pro varrer_exato
+        texto = buf[pos:] if pos else buf
+        partes = PADRAO_TOKENS.split(texto)
+        if not SO_ESPACO.match("".join(partes[0::2])):
+            return None
+
+        lexemas = partes[1::2]
+        # Início de cada token = tamanho de tudo que vem antes dele
+        inicios = list(accumulate(map(len, partes), initial=pos))[1:-1:2]
+
+        # Fora do fim da entrada, um token encostado no fim do buffer pode
+        # continuar no próximo bloco ('ab' + 'c', '>' + '=', '/' + '/'...),
+        # então fica pra próxima varredura
+        fim = len(buf)
+        if not fim_entrada and lexemas and inicios[-1] + len(lexemas[-1]) == fim:
+            fim = inicios.pop()
+            lexemas.pop()
+
+        linhas = colunas = None
+        if posicoes:
+            # Posição de cada '\n' do trecho, com o '\n' de antes da linha
+            # atual na frente (o início da linha pode ter ficado num bloco
+            # anterior). Pra cada token, k = quantas quebras vêm antes dele
+            # (busca binária): linha = linha do bloco + k - 1 e coluna =
+            # distância até a última quebra antes dele
+            quebras = [inicio_linha - 1]
+            quebras.extend(map(add, accumulate(map(len, texto.split('\n')[:-1])), count(pos)))
+            ks = list(map(bisect_left, repeat(quebras), inicios))
+            linhas = list(map(add, ks, repeat(linha - 1)))
+            colunas = list(map(sub, inicios, map(quebras.__getitem__, map(sub, ks, repeat(1)))))
+
+        q = buf.count('\n', pos, fim)
+        if q:
+            linha += q
+            inicio_linha = buf.rfind('\n', pos, fim) + 1
+
+        # Comentário casa no split (pra não achar token dentro dele), mas não vira token
+        if '//' in texto:
+            manter = [not lex.startswith('//') for lex in lexemas]
+            lexemas = list(compress(lexemas, manter))
+            inicios = list(compress(inicios, manter))
+            if posicoes:
+                linhas = list(compress(linhas, manter))
+                colunas = list(compress(colunas, manter))
+
+        tipos = list(map(TiposLexema(self.tipos_fixos).__getitem__, lexemas))
+        return lexemas, tipos, inicios, linhas, colunas, fim, linha, inicio_linha
+
+    def varrer_exato(self, buf, pos, fim_entrada, linha, inicio_linha):
+        # Caminho exato: casa o PADRAO_MESTRE token a token, com as mesmas
+        # mensagens de erro do motor clássico. Só roda em bloco com erro léxico
+        # Linha/coluna vêm do deslocamento: guarda o início da linha atual e só
+        # recalcula quando o trecho casado tem '\n' (espaço ou string multilinha)
+        erros = self.erros
+        reservadas = self.afd_palavras.estados_finais
+        tipos_ops = self.tipos_ops
+        lexemas = []
+        tipos = []
+        inicios = []
+        linhas = []
+        colunas = []
+        n = len(buf)
+
+        for m in PADRAO_MESTRE.finditer(buf, pos):
+            ini = m.start()
+            fim = m.end()
+
+            # Token encostado no fim do buffer pode continuar no próximo
+            # bloco ('ab' + 'c', '>' + '=', '/' + '/', string sem fechar...)
+            # Então só aceita depois de ler mais ou de chegar no fim mesmo
+            if fim == n and not fim_entrada:
+                return lexemas, tipos, inicios, linhas, colunas, ini, linha, inicio_linha
+
+            grupo = m.lastgroup
+            if grupo == 'ESPACO':
+                q = buf.count('\n', ini, fim)
+                if q:
+                    linha += q
+                    inicio_linha = buf.rfind('\n', ini, fim) + 1
+                continue
+            elif grupo == 'ID':
+                lex = m.group()
+                tipo = reservadas.get(lex, 'id')
+            elif grupo == 'OP1' or grupo == 'OP2':
+                lex = m.group()
+                tipo = tipos_ops[lex]
+            elif grupo == 'NUM':
+                lex = m.group()
+                tipo = 'num'
+            elif grupo == 'CADEIA':
+                lex = m.group()
+                tipo = 'CADEIA'
+            elif grupo == 'COMENTARIO':
+                continue
+            elif grupo == 'CADEIA_ABERTA':
+                erros.append("String nao fechada em L" + str(linha) + " C" + str(ini - inicio_linha + 1))
+                continue
+            else:
+                erros.append("Char invalido: '" + m.group() + "' em L" + str(linha) + " C" + str(ini - inicio_linha + 1))
+                continue
+
+            lexemas.append(lex)
+            tipos.append(tipo)
+            inicios.append(ini)
+            linhas.append(linha)
+            colunas.append(ini - inicio_linha + 1)
+
+            if grupo == 'CADEIA':
+                q = lex.count('\n')
+                if q:
+                    linha += q
+                    inicio_linha = ini + lex.rfind('\n') + 1
+
+        return lexemas, tipos, inicios, linhas, colunas, n, linha, inicio_linha
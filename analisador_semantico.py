@@ -1,173 +1,293 @@
-class PilhaEscopos:
-    # Pilha manual pra gerenciar os escopos aninhados do programa
-    # Funciona como um Autômato de Pilha da teoria de LFA
-    def __init__(self):
-        self.itens = []
-        self.tamanho = 0
-        self.empilhar({})  # escopo global
-    
-    def empilhar(self, escopo):
-        # Adiciona um novo escopo no topo da pilha
-        self.itens.append(escopo)
-        self.tamanho += 1
-    
-    def desempilhar(self):
-        # Remove o escopo do topo (mantém pelo menos o global)
-        if self.tamanho > 1:
-            self.tamanho -= 1
-            return self.itens.pop()
-        return None
-    
-    def topo(self):
-        # Retorna o escopo que tá no topo (escopo atual)
-        if self.tamanho > 0:
-            return self.itens[self.tamanho - 1]
-        return None
-    
-    def buscar(self, nome):
-        # Procura uma variável em todos os escopos, de cima pra baixo
-        i = self.tamanho - 1
-        while i >= 0:
-            escopo = self.itens[i]
-            if nome in escopo:
-                return escopo[nome]
-            i -= 1
-        return None
-    
-    def esta_no_escopo_atual(self, nome):
-        # Checa se a variável existe especificadaamente no escopo atual
-        escopo_atual = self.topo()
-        if escopo_atual is None:
-            return False
-        return nome in escopo_atual
-    
-    def escopo_global(self):
-        # Retorna o escopo global (sempre o primeiro da pilha)
-        if self.tamanho > 0:
-            return self.itens[0]
-        return None
-    
-    def contar_variaveis_global(self):
-        # Conta quantas variáveis tem no escopo global
-        escopo = self.escopo_global()
-        if escopo is None:
-            return 0
-        contador = 0
-        for chave in escopo:
-            contador += 1
-        return contador
-
-
-class TabelaSimbolos:
-    def __init__(self):
-        self.escopos = PilhaEscopos()
-        self.tipos_validos = ['inteiro', 'flutuante', 'cadeia', 'lógico', 'função']
-
-    def entrar_escopo(self):
-        self.escopos.empilhar({})
-
-    def sair_escopo(self):
-        self.escopos.desempilhar()
-
-    def declarar(self, nome, tipo='inteiro', linha=0):
-        # Declara uma variável no escopo atual
-        # Lança exceção se já existir no mesmo escopo
-        if self.escopos.esta_no_escopo_atual(nome):
-            raise Exception("Variavel '" + nome + "' ja declarada na linha " + str(linha))
-        
-        escopo_atual = self.escopos.topo()
-        escopo_atual[nome] = {'tipo': tipo, 'linha': linha}
-
-    def buscar(self, nome):
-        # Busca a variável subindo pela pilha de escopos
-        return self.escopos.buscar(nome)
-
-
-def analisar_semantica(tokens):
-    # Análise semântica em duas passadas:
-    # Primeira passada: registra todas as declarações
-    # Segunda passada: verifica se as variáveis usadas foram declaradas
-    tabela = TabelaSimbolos()
-    erros = []
-    
-    # PASSADA 1: Registrar declaracoes
-    i = 0
-    while i < len(tokens):
-        tk = tokens[i]
-    
-        # Declaracao de variavel: var id ; OU inteiro id ; OU flutuante id ; etc
-        if tk.tipo in ['var', 'inteiro', 'flutuante', 'cadeia', 'lógico']:  
-            if i + 2 < len(tokens):
-                if tokens[i + 1].tipo == 'id' and tokens[i + 2].tipo == 'pv':
-                    tipo = 'inteiro' if tk.tipo == 'var' else tk.tipo  
-                    nome = tokens[i + 1].lexema
-                    try:
-                        tabela.declarar(nome, tipo, tokens[i + 1].linha)  
-                    except Exception as e:
-                        erros.append(str(e))
-                    i += 3
-                    continue
-            
-        # Declaracao de funcao: fun id ( params )
-        if tk.tipo == 'fun':
-            if i + 1 < len(tokens):
-                if tokens[i + 1].tipo == 'id':
-                    nome = tokens[i + 1].lexema
-                    try:
-                        tabela.declarar(nome, 'função', tokens[i + 1].linha)
-                    except Exception as e:
-                        erros.append(str(e))
-                    
-                    # Registra parametros
-                    j = i + 2
-                    if j < len(tokens) and tokens[j].tipo == 'ap':
-                        j += 1
-                        while j < len(tokens) and tokens[j].tipo != 'fp':
-                            if tokens[j].tipo == 'id':
-                                try:
-                                    tabela.declarar(tokens[j].lexema, 'inteiro', tokens[j].linha)
-                                except Exception as e:
-                                    erros.append(str(e))
-                            j += 1
-        
-        i += 1
-    
-    # PASSADA 2: Verificar uso de variaveis
-    i = 0
-    while i < len(tokens):
-        tk = tokens[i]
-        
-        # Pula declaracoes
-        if tk.tipo in ['var', 'inteiro', 'flutuante', 'cadeia', 'lógico']:
-            while i < len(tokens) and tokens[i].tipo != 'pv':
-                i += 1
-                i += 1
-            continue
-        
-        if tk.tipo == 'fun':
-            while i < len(tokens) and tokens[i].tipo != 'ab':
-                i += 1
-            continue
-        
-        # Verifica uso de ID
-        if tk.tipo == 'id':
-            # Checa se nao e declaracao
-            eh_declaracao = False
-            
-            if i > 0:
-                if tokens[i - 1].tipo in ['var', 'fun', 'v']:
-                    eh_declaracao = True
-            
-            if i > 1:
-                if tokens[i - 2].tipo == 'ap' and tokens[i - 3].tipo == 'fun':
-                    eh_declaracao = True
-            
-            # Se nao e declaracao, verifica se foi declarada
-            if not eh_declaracao:
-                if tabela.buscar(tk.lexema) is None:
-                    erros.append("Variavel '" + tk.lexema + "' nao declarada na linha " + str(tk.linha))
-        
-        i += 1
-    
-        return erros, tabela
-
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Var, Binaria, Unaria, Chamada, IncDec)
+
+# Tipos de token que abrem uma declaração de variável
+# (conjunto, pra consulta O(1) em vez de varrer uma lista a cada token)
+TIPOS_DECLARACAO = frozenset(['var', 'inteiro', 'flutuante', 'cadeia', 'lógico'])
+
+
+class PilhaEscopos:
+    # Pilha manual pra gerenciar os escopos aninhados do programa
+    # Funciona como um Autômato de Pilha da teoria de LFA
+    #
+    # Além da pilha de escopos (um dicionário por escopo), guarda a tabela
+    # encadeada self.visiveis: nome -> pilha das declarações desse nome,
+    # da mais externa pra mais interna (as sombreadas ficam embaixo)
+    # Assim buscar é O(1), não importa quantos escopos estejam abertos
+    def __init__(self):
+        self.itens = []
+        self.tamanho = 0
+        self.visiveis = {}
+        self.empilhar({})  # escopo global
+
+    def empilhar(self, escopo):
+        # Adiciona um novo escopo no topo da pilha
+        self.itens.append(escopo)
+        self.tamanho += 1
+        for nome, info in escopo.items():
+            self.visiveis.setdefault(nome, []).append(info)
+
+    def desempilhar(self):
+        # Remove o escopo do topo (mantém pelo menos o global)
+        # e tira as declarações dele da tabela de visíveis
+        if self.tamanho > 1:
+            self.tamanho -= 1
+            escopo = self.itens.pop()
+            for nome in escopo:
+                pilha = self.visiveis[nome]
+                pilha.pop()
+                if not pilha:
+                    del self.visiveis[nome]
+            return escopo
+        return None
+
+    def topo(self):
+        # Retorna o escopo que tá no topo (escopo atual)
+        if self.tamanho > 0:
+            return self.itens[self.tamanho - 1]
+        return None
+
+    def declarar(self, nome, info):
+        # Registra o nome no escopo do topo e na tabela de visíveis
+        self.itens[self.tamanho - 1][nome] = info
+        self.visiveis.setdefault(nome, []).append(info)
+
+    def buscar(self, nome):
+        # Declaração visível mais interna do nome (ou None)
+        pilha = self.visiveis.get(nome)
+        if pilha:
+            return pilha[-1]
+        return None
+
+    def esta_no_escopo_atual(self, nome):
+        # Checa se a variável existe especificadaamente no escopo atual
+        escopo_atual = self.topo()
+        if escopo_atual is None:
+            return False
+        return nome in escopo_atual
+
+    def escopo_global(self):
+        # Retorna o escopo global (sempre o primeiro da pilha)
+        if self.tamanho > 0:
+            return self.itens[0]
+        return None
+
+    def contar_variaveis_global(self):
+        # Conta quantas variáveis tem no escopo global
+        escopo = self.escopo_global()
+        if escopo is None:
+            return 0
+        contador = 0
+        for chave in escopo:
+            contador += 1
+        return contador
+
+
+class TabelaSimbolos:
+    def __init__(self):
+        self.escopos = PilhaEscopos()
+        self.tipos_validos = ['inteiro', 'flutuante', 'cadeia', 'lógico', 'função']
+
+    def entrar_escopo(self):
+        self.escopos.empilhar({})
+
+    def sair_escopo(self):
+        self.escopos.desempilhar()
+
+    def declarar(self, nome, tipo='inteiro', linha=0, decl=None):
+        # Declara uma variável no escopo atual
+        # Lança exceção se já existir no mesmo escopo
+        # decl: nó da AST da declaração (quando a análise é feita na AST)
+        if self.escopos.esta_no_escopo_atual(nome):
+            raise Exception("Variavel '" + nome + "' ja declarada na linha " + str(linha))
+
+        self.escopos.declarar(nome, {'tipo': tipo, 'linha': linha, 'decl': decl})
+
+    def buscar(self, nome):
+        # Busca a declaração visível mais interna (O(1))
+        return self.escopos.buscar(nome)
+
+
+def analisar_semantica(tokens):
+    # Análise semântica numa passada só sobre os tokens:
+    # - declarações entram no escopo atual quando aparecem
+    # - cada '{' abre um escopo e cada '}' fecha; a função abre o escopo
+    #   dela nos parâmetros e o corpo usa esse mesmo escopo
+    # - o for abre um escopo pro que é declarado no cabeçalho
+    # - todo id usado precisa ter uma declaração visível naquele ponto
+    tabela = TabelaSimbolos()
+    erros = []
+
+    n = len(tokens)
+    corpo_funcao = False  # o próximo '{' é o corpo de uma função (escopo já aberto)
+    escopos_for = []      # quantos '{' abertos quando cada for começou
+    prof_chaves = 0
+
+    i = 0
+    while i < n:
+        tk = tokens[i]
+        tipo = tk.tipo
+
+        # Declaracao de variavel: var id ; OU inteiro id ; OU inteiro id = ...
+        if tipo in TIPOS_DECLARACAO and i + 1 < n and tokens[i + 1].tipo == 'id':
+            tipo_var = 'inteiro' if tipo == 'var' else tipo
+            nome_tk = tokens[i + 1]
+            try:
+                tabela.declarar(nome_tk.lexema, tipo_var, nome_tk.linha)
+            except Exception as e:
+                erros.append(str(e))
+            i += 2
+            continue
+
+        # Declaracao de funcao: fun id ( params ) {
+        if tipo == 'fun' and i + 1 < n and tokens[i + 1].tipo == 'id':
+            nome_tk = tokens[i + 1]
+            try:
+                tabela.declarar(nome_tk.lexema, 'função', nome_tk.linha)
+            except Exception as e:
+                erros.append(str(e))
+
+            # Escopo da função: parâmetros + corpo
+            tabela.entrar_escopo()
+            j = i + 2
+            if j < n and tokens[j].tipo == 'ap':
+                j += 1
+                while j < n and tokens[j].tipo != 'fp':
+                    if tokens[j].tipo == 'id':
+                        try:
+                            tabela.declarar(tokens[j].lexema, 'inteiro', tokens[j].linha)
+                        except Exception as e:
+                            erros.append(str(e))
+                    j += 1
+                j += 1
+            corpo_funcao = True
+            i = j
+            continue
+
+        if tipo == 'for':
+            # O cabeçalho do for tem escopo próprio, fechado junto com o corpo
+            tabela.entrar_escopo()
+            escopos_for.append(prof_chaves)
+
+        elif tipo == 'ab':
+            prof_chaves += 1
+            if corpo_funcao:
+                corpo_funcao = False
+            else:
+                tabela.entrar_escopo()
+
+        elif tipo == 'fb':
+            prof_chaves -= 1
+            tabela.sair_escopo()
+            # Fechou o corpo de um for: fecha também o escopo do cabeçalho
+            if escopos_for and escopos_for[-1] == prof_chaves:
+                escopos_for.pop()
+                tabela.sair_escopo()
+
+        elif tipo == 'id':
+            if tabela.buscar(tk.lexema) is None:
+                erros.append("Variavel '" + tk.lexema + "' nao declarada na linha " + str(tk.linha))
+
+        i += 1
+
+    return erros, tabela
+
+
+def analisar_semantica_arvore(arvore):
+    # Mesma análise do analisar_semantica, mas percorrendo a AST montada pelo
+    # SLR numa passada só. Além de checar, liga cada uso (Var, Atribuicao,
+    # Leitura, IncDec, Chamada) à declaração que ele enxerga, no campo decl,
+    # pra geração de código não confundir variáveis sombreadas
+    tabela = TabelaSimbolos()
+    erros = []
+
+    _analisar_comandos(arvore.comandos, tabela, erros)
+
+    return erros, tabela
+
+
+def _declarar(tabela, erros, nome, tipo, linha, decl):
+    try:
+        tabela.declarar(nome, tipo, linha, decl)
+    except Exception as e:
+        erros.append(str(e))
+
+
+def _resolver(no, tabela, erros):
+    # Liga o uso à declaração visível (ou registra o erro)
+    info = tabela.buscar(no.nome)
+    if info is None:
+        erros.append("Variavel '" + no.nome + "' nao declarada na linha " + str(no.linha))
+    else:
+        no.decl = info['decl']
+
+
+def _analisar_bloco(comandos, tabela, erros):
+    # Bloco entre { }: escopo próprio
+    tabela.entrar_escopo()
+    _analisar_comandos(comandos, tabela, erros)
+    tabela.sair_escopo()
+
+
+def _analisar_comandos(comandos, tabela, erros):
+    for cmd in comandos:
+        if isinstance(cmd, DeclVar):
+            # O valor inicial é avaliado antes do nome existir
+            if cmd.valor is not None:
+                _analisar_expr(cmd.valor, tabela, erros)
+            tipo = 'inteiro' if cmd.tipo == 'var' else cmd.tipo
+            _declarar(tabela, erros, cmd.nome, tipo, cmd.linha, cmd)
+
+        elif isinstance(cmd, DeclFuncao):
+            # O nome entra antes do corpo (permite recursão); parâmetros e
+            # corpo dividem o mesmo escopo
+            _declarar(tabela, erros, cmd.nome, 'função', cmd.linha, cmd)
+            tabela.entrar_escopo()
+            for p in cmd.params:
+                _declarar(tabela, erros, p.nome, 'inteiro', p.linha, p)
+            _analisar_comandos(cmd.corpo, tabela, erros)
+            tabela.sair_escopo()
+
+        elif isinstance(cmd, Atribuicao):
+            _analisar_expr(cmd.expr, tabela, erros)
+            _resolver(cmd, tabela, erros)
+
+        elif isinstance(cmd, Escrita) or isinstance(cmd, ExprCmd):
+            _analisar_expr(cmd.expr, tabela, erros)
+
+        elif isinstance(cmd, Leitura):
+            _resolver(cmd, tabela, erros)
+
+        elif isinstance(cmd, Se):
+            _analisar_expr(cmd.cond, tabela, erros)
+            _analisar_bloco(cmd.entao, tabela, erros)
+            if cmd.senao is not None:
+                _analisar_bloco(cmd.senao, tabela, erros)
+
+        elif isinstance(cmd, Enquanto):
+            _analisar_expr(cmd.cond, tabela, erros)
+            _analisar_bloco(cmd.corpo, tabela, erros)
+
+        elif isinstance(cmd, Para):
+            # Escopo do cabeçalho (inteiro i = 0) envolve condição, passo e corpo
+            tabela.entrar_escopo()
+            _analisar_comandos([cmd.inicio], tabela, erros)
+            if cmd.cond is not None:
+                _analisar_expr(cmd.cond, tabela, erros)
+            _analisar_comandos([cmd.passo], tabela, erros)
+            _analisar_bloco(cmd.corpo, tabela, erros)
+            tabela.sair_escopo()
+
+
+def _analisar_expr(expr, tabela, erros):
+    if isinstance(expr, Var) or isinstance(expr, IncDec):
+        _resolver(expr, tabela, erros)
+    elif isinstance(expr, Binaria):
+        _analisar_expr(expr.esq, tabela, erros)
+        _analisar_expr(expr.dir, tabela, erros)
+    elif isinstance(expr, Unaria):
+        _analisar_expr(expr.expr, tabela, erros)
+    elif isinstance(expr, Chamada):
+        _resolver(expr, tabela, erros)
+        for arg in expr.args:
+            _analisar_expr(arg, tabela, erros)
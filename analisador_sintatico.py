@@ -1,147 +1,403 @@
-from analisador_lexico import Token
-
-class ParserDescendente:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.pos = 0
-        self.erros = []
-
-    def atual(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return Token('$', '$', 0, 0)
-
-    def avancar(self):
-        self.pos += 1
-
-    def esperar(self, tipo):
-        if self.atual().tipo == tipo:
-            self.avancar()
-        else:
-            self.erros.append(f"Erro sintático: Esperado '{tipo}', encontrado '{self.atual().tipo}' na linha {self.atual().linha}, coluna {self.atual().coluna}")
-
-    def analisar(self):
-        self.program()
-        if self.erros:
-            return self.erros
-        return []
-
-    def program(self):
-        while self.atual().tipo != '$':
-            self.stmt()
-
-    def stmt(self):
-        token = self.atual()
-        if token.tipo == 'var':
-            self.var_decl()
-        elif token.tipo == 'fun':
-            self.fun_decl()
-        elif token.tipo == 'id':
-            self.assign()
-        elif token.tipo == 'escreva':
-            self.escreva_stmt()
-        elif token.tipo == 'leia':
-            self.leia_stmt()
-        elif token.tipo == 'se':
-            self.if_stmt()
-        else:
-            # Token inesperado: adiciona erro e AVANÇA para evitar loop infinito
-            self.erros.append(f"Erro sintático: Statement inesperado '{token.lexema}' na linha {token.linha}, coluna {token.coluna}")
-            self.avancar() 
-            
-    def var_decl(self):
-        self.esperar('var')
-        self.esperar('id')
-        self.esperar('pv')
-
-    def fun_decl(self):
-        self.esperar('fun')
-        self.esperar('id')
-        self.esperar('ap')
-        if self.atual().tipo == 'id':
-            self.params()
-        self.esperar('fp')
-        self.esperar('ab')
-        while self.atual().tipo != 'fb':
-            self.stmt()
-        self.esperar('fb')
-
-    def params(self):
-        self.esperar('id')
-        while self.atual().tipo == 'v':
-            self.avancar()
-            self.esperar('id')
-
-    def assign(self):
-        self.esperar('id')
-        self.esperar('igual')
-        self.expr()
-        self.esperar('pv')
-
-    def escreva_stmt(self):
-        self.esperar('escreva')
-        self.esperar('ap')
-        self.expr()
-        self.esperar('fp')
-        self.esperar('pv')
-
-    def leia_stmt(self):
-        self.esperar('leia')
-        self.esperar('ap')
-        self.esperar('id')
-        self.esperar('fp')
-        self.esperar('pv')
-
-    def if_stmt(self):
-        self.esperar('se')
-        self.esperar('ap')
-        self.expr()
-        self.esperar('fp')
-        self.esperar('ab')
-        while self.atual().tipo != 'fb':
-            self.stmt()
-        self.esperar('fb')
-        if self.atual().tipo == 'senão':
-            self.avancar()
-            self.esperar('ab')
-            while self.atual().tipo != 'fb':
-                self.stmt()
-            self.esperar('fb')
-
-    def expr(self):
-        self.term()
-        while self.atual().tipo in ['mais', 'menos']:
-            self.avancar()
-            self.term()
-        # Expressões lógicas
-        if self.atual().tipo in ['maior', 'menor', 'ge', 'le', 'eqeq', 'ne']:
-            self.avancar()
-            self.term()
-
-    def term(self):
-        self.factor()
-        while self.atual().tipo in ['mult', 'div']:
-            self.avancar()
-            self.factor()
-
-    def factor(self):
-        token = self.atual()
-        if token.tipo == 'num' or token.tipo == 'id' or token.tipo == 'CADEIA':
-            self.avancar()
-        elif token.tipo == 'ap':
-            self.avancar()
-            self.expr()
-            self.esperar('fp')
-        else:
-            self.erros.append(f"Erro sintático: Factor inesperado '{token.lexema}' na linha {token.linha}")
-
-def analisar(tokens):
-    parser = ParserDescendente(tokens)
-    erros = parser.analisar()
-    if erros:
-        print("ERROS SINTÁTICOS NO DESCENDENTE RECURSIVO:")
-        for erro in erros:
-            print(f"  {erro}")
-        return erros
-    print("Análise sintática descendente recursiva bem-sucedida.")
-    return []
+# ANALISADOR SINTÁTICO DESCENDENTE (LL(1))
+# Parser preditivo recursivo pra mesma gramática do SLR (PRODUCOES), com
+# os mesmos tipos de token do léxico, e que monta a mesma AST das
+# ACOES_SEMANTICAS; então dá pra trocar um pelo outro
+# A gramática do SLR tem recursão à esquerda (listas, ADD, MUL) e prefixos
+# comuns; aqui a recursão vira laço e os prefixos são decididos olhando o
+# token seguinte (ex.: id seguido de '=' é atribuição, senão é expressão)
+# Expressões usam uma pilha de operadores em vez de uma função por nível de
+# precedência, então parênteses e unários aninhados não gastam a pilha do
+# Python; blocos aninhados ainda são recursivos e têm um limite
+# Não tem recuperação de erro: para no primeiro erro. Quem precisa das
+# mensagens completas usa o SLR; o AnalisadorSintatico faz essa escolha
+
+from analisador_lexico import TIPOS_TOKEN, TokenBuffer
+from analisador_sintatico_slr import SLR, GRAFIAS, MAX_ERROS
+from arvore_sintatica import (Programa, DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se,
+                              Enquanto, Para, ExprCmd, Num, Cadeia, Logico, Var, Binaria,
+                              Unaria, Chamada, IncDec)
+
+# Tipos de token que começam um TIPO
+TIPOS = frozenset(['var', 'inteiro', 'flutuante', 'cadeia', 'lógico'])
+# Operadores de cada nível de precedência
+RELACIONAIS = frozenset(['maior', 'menor', 'ge', 'le', 'eqeq', 'ne'])
+ADITIVOS = frozenset(['mais', 'menos', 'concat'])
+MULTIPLICATIVOS = frozenset(['mult', 'div'])
+# Tokens que começam uma expressão (FIRST de EXPR)
+INICIO_EXPR = frozenset(['id', 'num', 'CADEIA', 'verdadeiro', 'falso', 'ap', 'neg', 'menos'])
+
+# Precedência na pilha de operadores (maior amarra mais); os unários na
+# frente do operando ficam acima de todos os binários
+RELACIONAL = 1
+UNARIO = 4
+PRECEDENCIA = dict.fromkeys(RELACIONAIS, RELACIONAL)
+PRECEDENCIA.update(dict.fromkeys(ADITIVOS, 2))
+PRECEDENCIA.update(dict.fromkeys(MULTIPLICATIVOS, 3))
+
+# Blocos um dentro do outro que o parser aceita (cada nível são algumas
+# chamadas recursivas)
+MAX_ANINHAMENTO = 150
+
+
+class ErroSintatico(Exception):
+    # Erro no programa analisado; qualquer outra exceção é bug do parser
+    pass
+
+
+class ParserDescendente:
+    def __init__(self, tokens):
+        # tokens: lista de Token ou TokenBuffer (precisa de acesso por índice)
+        self.tokens = tokens
+        # Tipo, lexema e linha de cada token ficam em listas paralelas (o
+        # tipo com um '$' no fim), então olhar um token é só um índice. Do
+        # TokenBuffer as listas saem inteiras de uma vez, sem uma TokenVisao
+        # por token
+        if isinstance(tokens, TokenBuffer):
+            self.tipos = list(map(TIPOS_TOKEN.__getitem__, tokens.tipos))
+            self.lexemas = tokens.lista_lexemas()
+            self.linhas = tokens.lista_linhas()
+        else:
+            self.tipos = [tk.tipo for tk in tokens]
+            self.lexemas = [tk.lexema for tk in tokens]
+            self.linhas = [tk.linha for tk in tokens]
+        self.tipos.append('$')
+        self.pos = 0
+        self.profundidade = 0
+        self.erros = []
+        # Contador do LL(1) (ele não tem shift/reduce): tokens consumidos na
+        # última análise, até o erro se teve um
+        self.tokens_consumidos = 0
+
+    def analisar(self):
+        # Só a verificação; devolve a lista de erros (vazia se passou)
+        return self.analisar_arvore()[1]
+
+    def analisar_arvore(self):
+        # Devolve (arvore, erros); a árvore é None se tiver erro
+        self.pos = 0
+        self.profundidade = 0
+        self.erros = []
+        try:
+            arvore = Programa(self.lista_comandos('$'))
+            self.esperar('$')
+        except ErroSintatico as e:
+            self.tokens_consumidos = self.pos
+            self.erros.append(str(e))
+            return None, self.erros
+        # O '$' do fim não conta, não é token do programa
+        self.tokens_consumidos = self.pos - 1
+        return arvore, []
+
+    # ---------------- Tokens ----------------
+
+    def atual(self):
+        return self.tipos[self.pos]
+
+    def esperar(self, tipo):
+        # Consome um token do tipo pedido e devolve o índice dele
+        i = self.pos
+        if self.tipos[i] != tipo:
+            self.erro([tipo])
+        self.pos = i + 1
+        return i
+
+    def erro(self, esperados):
+        # Mesmo formato de mensagem do SLR
+        grafias = ", ".join(GRAFIAS.get(t, t) for t in esperados)
+        if self.tipos[self.pos] == '$':
+            raise ErroSintatico("Erro sintático: fim do arquivo inesperado; esperado: " + grafias)
+        tk = self.tokens[self.pos]
+        raise ErroSintatico(f"Erro sintático na linha {tk.linha}, coluna {tk.coluna}: token '{tk.lexema}' inesperado; esperado: {grafias}")
+
+    # ---------------- Comandos ----------------
+
+    def lista_comandos(self, fim):
+        # STMT_LIST: um ou mais comandos, até o token 'fim' (que não é consumido)
+        comandos = [self.comando()]
+        while self.tipos[self.pos] != fim:
+            comandos.append(self.comando())
+        return comandos
+
+    def bloco(self):
+        # ab STMT_LIST fb
+        i = self.esperar('ab')
+        self.profundidade += 1
+        if self.profundidade > MAX_ANINHAMENTO:
+            tk = self.tokens[i]
+            raise ErroSintatico(f"Erro sintático na linha {tk.linha}, coluna {tk.coluna}: "
+                                f"blocos aninhados demais (máximo {MAX_ANINHAMENTO})")
+        comandos = self.lista_comandos('fb')
+        self.profundidade -= 1
+        self.pos += 1
+        return comandos
+
+    def comando(self):
+        i = self.pos
+        tipo = self.tipos[i]
+        lexemas = self.lexemas
+        linhas = self.linhas
+        if tipo in TIPOS:
+            # VAR_DECL: TIPO id pv
+            self.pos += 1
+            nome = self.esperar('id')
+            self.esperar('pv')
+            return DeclVar(tipo, lexemas[nome], None, linhas[nome])
+        if tipo == 'id':
+            if self.tipos[i + 1] == 'igual':
+                # ASSIGN: id igual EXPR pv
+                self.pos += 2
+                expr = self.expressao()
+                self.esperar('pv')
+                return Atribuicao(lexemas[i], expr, linhas[i])
+            # O resto que começa com id (id++; f(x); x + 1;) é EXPR_STMT
+            expr = self.expressao()
+            self.esperar('pv')
+            return ExprCmd(expr, expr.linha)
+        if tipo == 'write':
+            self.pos += 1
+            self.esperar('ap')
+            expr = self.expressao()
+            self.esperar('fp')
+            self.esperar('pv')
+            return Escrita(expr, linhas[i])
+        if tipo == 'read':
+            self.pos += 1
+            self.esperar('ap')
+            nome = self.esperar('id')
+            self.esperar('fp')
+            self.esperar('pv')
+            return Leitura(lexemas[nome], linhas[i])
+        if tipo == 'if':
+            self.pos += 1
+            self.esperar('ap')
+            cond = self.expressao()
+            self.esperar('fp')
+            entao = self.bloco()
+            senao = None
+            if self.tipos[self.pos] == 'else':
+                self.pos += 1
+                senao = self.bloco()
+            return Se(cond, entao, senao, linhas[i])
+        if tipo == 'while':
+            self.pos += 1
+            self.esperar('ap')
+            cond = self.expressao()
+            self.esperar('fp')
+            return Enquanto(cond, self.bloco(), linhas[i])
+        if tipo == 'for':
+            self.pos += 1
+            self.esperar('ap')
+            ini = self.atribuicao_para()
+            self.esperar('pv')
+            cond = None
+            if self.tipos[self.pos] != 'pv':
+                cond = self.expressao()
+            self.esperar('pv')
+            passo = self.atribuicao_para()
+            self.esperar('fp')
+            return Para(ini, cond, passo, self.bloco(), linhas[i])
+        if tipo == 'fun':
+            self.pos += 1
+            nome = self.esperar('id')
+            self.esperar('ap')
+            params = []
+            if self.tipos[self.pos] == 'id':
+                p = self.esperar('id')
+                params.append(DeclVar('inteiro', lexemas[p], None, linhas[p]))
+                while self.tipos[self.pos] == 'v':
+                    self.pos += 1
+                    p = self.esperar('id')
+                    params.append(DeclVar('inteiro', lexemas[p], None, linhas[p]))
+            self.esperar('fp')
+            return DeclFuncao(lexemas[nome], params, self.bloco(), linhas[nome])
+        if tipo in INICIO_EXPR:
+            expr = self.expressao()
+            self.esperar('pv')
+            return ExprCmd(expr, expr.linha)
+        self.erro(sorted(TIPOS) + ['id', 'write', 'read', 'if', 'while', 'for', 'fun'])
+
+    def atribuicao_para(self):
+        # ASSIGN_NS: [TIPO] id igual EXPR (início e passo do for)
+        tipo = self.tipos[self.pos]
+        if tipo in TIPOS:
+            self.pos += 1
+            nome = self.esperar('id')
+            self.esperar('igual')
+            return DeclVar(tipo, self.lexemas[nome], self.expressao(), self.linhas[nome])
+        nome = self.esperar('id')
+        self.esperar('igual')
+        return Atribuicao(self.lexemas[nome], self.expressao(), self.linhas[nome])
+
+    # ---------------- Expressões ----------------
+
+    def expressao(self):
+        # EXPR/REL: ADD [op_relacional ADD] (não encadeia: a < b < c é erro)
+        # ADD e MUL associam à esquerda, UNARY é (neg | menos) UNARY | PRIMARY
+        # Cada '(' e cada argumento de chamada abre um quadro novo (operandos,
+        # operadores, se já teve relacional) guardado em 'abertos'; quando a
+        # expressão de dentro acaba, o quadro fecha e o resultado vira um
+        # operando do quadro de baixo. contexto diz o que fecha o quadro:
+        # 'ap' (parênteses) ou (índice do id, argumentos) numa chamada
+        tipos = self.tipos
+        linhas = self.linhas
+        abertos = []
+        contexto = None
+        operandos = []
+        operadores = []
+        relacional = False
+        while True:
+            # Um operando: os unários na frente e depois o PRIMARY
+            i = self.pos
+            tipo = tipos[i]
+            while tipo == 'neg' or tipo == 'menos':
+                operadores.append((UNARIO, tipo, linhas[i]))
+                i += 1
+                tipo = tipos[i]
+            self.pos = i
+            if tipo == 'ap' or (tipo == 'id' and tipos[i + 1] == 'ap' and tipos[i + 2] != 'fp'):
+                abertos.append((contexto, operandos, operadores, relacional))
+                if tipo == 'ap':
+                    contexto = 'ap'
+                    self.pos = i + 1
+                else:
+                    contexto = (i, [])
+                    self.pos = i + 2
+                operandos = []
+                operadores = []
+                relacional = False
+                continue
+            operandos.append(self.primaria())
+
+            # Operador binário depois do operando: reduz o que amarra pelo
+            # menos tanto quanto ele e volta pra ler o lado direito. Sem
+            # operador (ou um segundo relacional) o quadro acabou
+            while True:
+                op = tipos[self.pos]
+                prec = PRECEDENCIA.get(op, 0)
+                if prec == RELACIONAL and relacional:
+                    prec = 0
+                while operadores and operadores[-1][0] >= prec:
+                    reduzir(operandos, operadores)
+                if prec:
+                    relacional = relacional or prec == RELACIONAL
+                    operadores.append((prec, op, linhas[self.pos]))
+                    self.pos += 1
+                    break
+                expr = operandos.pop()
+                if not abertos:
+                    return expr
+                if contexto == 'ap':
+                    self.esperar('fp')
+                else:
+                    contexto[1].append(expr)
+                    if tipos[self.pos] == 'v':
+                        # Próximo argumento, no mesmo quadro
+                        self.pos += 1
+                        relacional = False
+                        break
+                    self.esperar('fp')
+                    expr = Chamada(self.lexemas[contexto[0]], contexto[1], linhas[contexto[0]])
+                contexto, operandos, operadores, relacional = abertos.pop()
+                operandos.append(expr)
+
+    def primaria(self):
+        i = self.pos
+        tipos = self.tipos
+        tipo = tipos[i]
+        if tipo == 'id':
+            self.pos = i + 1
+            proximo = tipos[i + 1]
+            if proximo == 'ap':
+                # FUN_CALL sem argumentos (com argumentos a expressao abre
+                # um quadro pra eles)
+                self.pos = i + 3
+                return Chamada(self.lexemas[i], [], self.linhas[i])
+            if proximo == 'inc' or proximo == 'dec':
+                self.pos += 1
+                return IncDec(self.lexemas[i], proximo, self.linhas[i])
+            return Var(self.lexemas[i], self.linhas[i])
+        if tipo == 'num':
+            self.pos = i + 1
+            return Num(self.lexemas[i], self.linhas[i])
+        if tipo == 'CADEIA':
+            self.pos = i + 1
+            return Cadeia(self.lexemas[i], self.linhas[i])
+        if tipo == 'verdadeiro' or tipo == 'falso':
+            self.pos = i + 1
+            return Logico(tipo == 'verdadeiro', self.linhas[i])
+        self.erro(['id', 'num', 'CADEIA', 'verdadeiro', 'falso', 'ap', 'neg', 'menos'])
+
+
+def reduzir(operandos, operadores):
+    # Tira o operador do topo e monta o nó com o(s) operando(s) do topo
+    prec, op, linha = operadores.pop()
+    direita = operandos.pop()
+    if prec == UNARIO:
+        operandos.append(Unaria(op, direita, linha))
+    else:
+        operandos[-1] = Binaria(op, operandos[-1], direita, linha)
+
+
+# Analisadores que o AnalisadorSintatico sabe usar:
+#   'auto'        LL(1) como caminho rápido; só se ele achar erro o SLR refaz
+#                 a análise, que valida o resultado e dá as mensagens (com
+#                 recuperação de erro). Programa certo passa por um parser só
+#   'descendente' só o LL(1) (para no primeiro erro)
+#   'slr'         só o SLR
+PARSERS = ('auto', 'descendente', 'slr')
+PARSER_PADRAO = 'auto'
+
+
+class AnalisadorSintatico:
+    # Mesma interface do SLR (analisar/analisar_arvore e os contadores),
+    # escolhendo o parser pelo parâmetro 'parser'
+    def __init__(self, parser=PARSER_PADRAO, max_erros=MAX_ERROS):
+        if parser not in PARSERS:
+            raise Exception("Parser desconhecido: " + str(parser))
+        self.parser = parser
+        self.max_erros = max_erros
+        # Qual parser deu a resposta na última análise
+        self.usado = None
+        self.deslocamentos = 0
+        self.reducoes = 0
+        self.erros_suprimidos = 0
+        self.tokens_consumidos = 0
+        self.interrompida = False
+
+    def analisar(self, tokens):
+        return self.analisar_arvore(tokens)[1]
+
+    def analisar_arvore(self, tokens):
+        self.deslocamentos = 0
+        self.reducoes = 0
+        self.erros_suprimidos = 0
+        self.tokens_consumidos = 0
+        self.interrompida = False
+
+        if self.parser != 'slr':
+            # O LL(1) precisa de acesso por índice (olha um token à frente)
+            if not isinstance(tokens, (list, tuple, TokenBuffer)):
+                tokens = list(tokens)
+            self.usado = 'descendente'
+            descendente = ParserDescendente(tokens)
+            arvore, erros = descendente.analisar_arvore()
+            if not erros or self.parser == 'descendente':
+                self.tokens_consumidos = descendente.tokens_consumidos
+                return arvore, erros
+
+        self.usado = 'slr'
+        slr = SLR(max_erros=self.max_erros)
+        arvore, erros = slr.analisar_arvore(tokens)
+        self.deslocamentos = slr.deslocamentos
+        self.reducoes = slr.reducoes
+        self.erros_suprimidos = slr.erros_suprimidos
+        self.interrompida = slr.interrompida
+        return arvore, erros
+
+    def contadores(self):
+        # Contadores do parser que deu a resposta, com os nomes dele: o
+        # LL(1) não faz shift/reduce, então não tem por que reportar zeros
+        if self.usado == 'descendente':
+            return {'tokens_consumidos': self.tokens_consumidos}
+        return {'deslocamentos': self.deslocamentos, 'reducoes': self.reducoes,
+                'erros_suprimidos': self.erros_suprimidos}
@@ -0,0 +1,227 @@
+# VERIFICAÇÃO DE TIPOS
+# Roda depois da análise semântica (precisa das declarações já ligadas nos
+# campos decl) e anota cada expressão da AST com o tipo dela:
+#   inteiro, flutuante, cadeia ou lógico
+# O tipo fica guardado no próprio nó (campo tipo), então cada subexpressão
+# é tipada uma vez só, e a geração de código usa esse campo pra escolher
+# entre instruções de inteiro e de ponto flutuante (FPU)
+#
+# Regras:
+#   - aritmética (+ - * /) só entre números; se um lado é flutuante o
+#     resultado é flutuante, senão inteiro
+#   - '&' (concatenação) só entre cadeias literais: o resultado é montado
+#     em tempo de compilação, não tem concatenação em tempo de execução
+#   - comparações < > <= >= entre números; == e != entre números ou entre
+#     dois lógicos; o resultado é lógico
+#   - atribuição aceita o mesmo tipo ou inteiro -> flutuante (conversão
+#     automática); flutuante -> inteiro é erro
+#   - condição de if/while/for precisa ser lógica ou inteira
+#   - parâmetros de função são inteiros; a chamada vale um inteiro
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Num, Cadeia, Logico, Var, Binaria, Unaria,
+                              Chamada, IncDec)
+
+NUMERICOS = frozenset(['inteiro', 'flutuante'])
+
+OPERADORES_ARITMETICOS = frozenset(['mais', 'menos', 'mult', 'div'])
+OPERADORES_ORDEM = frozenset(['maior', 'menor', 'ge', 'le'])
+OPERADORES_IGUALDADE = frozenset(['eqeq', 'ne'])
+
+# Como cada operador aparece nas mensagens de erro
+SIMBOLO_OPERADOR = {
+    'mais': '+', 'menos': '-', 'mult': '*', 'div': '/', 'concat': '&',
+    'maior': '>', 'menor': '<', 'ge': '>=', 'le': '<=', 'eqeq': '==', 'ne': '!=',
+    'neg': '!', 'inc': '++', 'dec': '--',
+}
+
+
+def tipo_declarado(decl):
+    # Tipo de uma declaração da AST ('var' é inteiro; função é 'função')
+    if isinstance(decl, DeclFuncao):
+        return 'função'
+    if decl.tipo == 'var':
+        return 'inteiro'
+    return decl.tipo
+
+
+def atribuicao_compativel(destino, origem):
+    return destino == origem or (destino == 'flutuante' and origem == 'inteiro')
+
+
+def cadeia_literal(expr):
+    # Cadeia escrita no fonte, ou concatenação só de cadeias escritas no fonte
+    if isinstance(expr, Cadeia):
+        return True
+    return (isinstance(expr, Binaria) and expr.op == 'concat' and
+            cadeia_literal(expr.esq) and cadeia_literal(expr.dir))
+
+
+def verificar_tipos(arvore):
+    # Anota os tipos da AST inteira e devolve a lista de erros
+    erros = []
+    _verificar_comandos(arvore.comandos, erros)
+    return erros
+
+
+def _erro(erros, msg, linha):
+    erros.append(msg + " na linha " + str(linha))
+
+
+def _verificar_comandos(comandos, erros):
+    for cmd in comandos:
+        _verificar_cmd(cmd, erros)
+
+
+def _verificar_atribuicao(nome, destino, expr, linha, erros):
+    origem = tipo_expr(expr, erros)
+    if destino is None or origem is None:
+        return
+    if not atribuicao_compativel(destino, origem):
+        _erro(erros, "Tipo incompativel: '" + nome + "' e' " + destino +
+              " mas recebe " + origem, linha)
+
+
+def _verificar_condicao(cond, erros):
+    tipo = tipo_expr(cond, erros)
+    if tipo is not None and tipo not in ('lógico', 'inteiro'):
+        _erro(erros, "Condicao deve ser lógico ou inteiro, nao " + tipo, cond.linha)
+
+
+def _verificar_cmd(cmd, erros):
+    if isinstance(cmd, DeclVar):
+        if cmd.valor is not None:
+            _verificar_atribuicao(cmd.nome, tipo_declarado(cmd), cmd.valor, cmd.linha, erros)
+
+    elif isinstance(cmd, DeclFuncao):
+        _verificar_comandos(cmd.corpo, erros)
+
+    elif isinstance(cmd, Atribuicao):
+        destino = _tipo_variavel(cmd, erros)
+        _verificar_atribuicao(cmd.nome, destino, cmd.expr, cmd.linha, erros)
+
+    elif isinstance(cmd, Escrita) or isinstance(cmd, ExprCmd):
+        tipo_expr(cmd.expr, erros)
+
+    elif isinstance(cmd, Leitura):
+        tipo = _tipo_variavel(cmd, erros)
+        if tipo == 'cadeia':
+            _erro(erros, "Leitura de cadeia nao suportada ('" + cmd.nome + "')", cmd.linha)
+
+    elif isinstance(cmd, Se):
+        _verificar_condicao(cmd.cond, erros)
+        _verificar_comandos(cmd.entao, erros)
+        if cmd.senao is not None:
+            _verificar_comandos(cmd.senao, erros)
+
+    elif isinstance(cmd, Enquanto):
+        _verificar_condicao(cmd.cond, erros)
+        _verificar_comandos(cmd.corpo, erros)
+
+    elif isinstance(cmd, Para):
+        _verificar_cmd(cmd.inicio, erros)
+        if cmd.cond is not None:
+            _verificar_condicao(cmd.cond, erros)
+        _verificar_cmd(cmd.passo, erros)
+        _verificar_comandos(cmd.corpo, erros)
+
+
+def _tipo_variavel(no, erros):
+    # Tipo da variável usada pelo nó (None se a semântica não resolveu)
+    if no.decl is None:
+        return None
+    tipo = tipo_declarado(no.decl)
+    if tipo == 'função':
+        _erro(erros, "'" + no.nome + "' e' uma funcao, nao uma variavel", no.linha)
+        return None
+    return tipo
+
+
+def tipo_expr(expr, erros):
+    # Tipo da expressão, calculado uma vez e guardado em expr.tipo
+    # None quando não dá pra saber (erro já reportado antes)
+    if expr.tipo is None:
+        expr.tipo = _inferir(expr, erros)
+    return expr.tipo
+
+
+def _inferir(expr, erros):
+    if isinstance(expr, Num):
+        return 'flutuante' if '.' in expr.lexema else 'inteiro'
+
+    if isinstance(expr, Cadeia):
+        return 'cadeia'
+
+    if isinstance(expr, Logico):
+        return 'lógico'
+
+    if isinstance(expr, Var):
+        return _tipo_variavel(expr, erros)
+
+    if isinstance(expr, IncDec):
+        tipo = _tipo_variavel(expr, erros)
+        if tipo is not None and tipo != 'inteiro':
+            _erro(erros, "Operador '" + SIMBOLO_OPERADOR[expr.op] + "' exige inteiro, '" +
+                  expr.nome + "' e' " + tipo, expr.linha)
+            return None
+        return tipo
+
+    if isinstance(expr, Unaria):
+        tipo = tipo_expr(expr.expr, erros)
+        if tipo is None:
+            return None
+        if expr.op == 'menos':
+            if tipo in NUMERICOS:
+                return tipo
+        elif tipo in ('lógico', 'inteiro'):
+            return 'lógico'
+        _erro(erros, "Operador '" + SIMBOLO_OPERADOR[expr.op] + "' nao se aplica a " + tipo, expr.linha)
+        return None
+
+    if isinstance(expr, Binaria):
+        esq = tipo_expr(expr.esq, erros)
+        dir = tipo_expr(expr.dir, erros)
+        if esq is None or dir is None:
+            return None
+        op = expr.op
+
+        if op in OPERADORES_ARITMETICOS:
+            if esq in NUMERICOS and dir in NUMERICOS:
+                return 'flutuante' if 'flutuante' in (esq, dir) else 'inteiro'
+        elif op == 'concat':
+            if esq == 'cadeia' and dir == 'cadeia':
+                if cadeia_literal(expr.esq) and cadeia_literal(expr.dir):
+                    return 'cadeia'
+                _erro(erros, "Concatenacao '&' so e' permitida entre cadeias literais", expr.linha)
+                return None
+        elif op in OPERADORES_ORDEM:
+            if esq in NUMERICOS and dir in NUMERICOS:
+                return 'lógico'
+        elif op in OPERADORES_IGUALDADE:
+            if (esq in NUMERICOS and dir in NUMERICOS) or esq == dir == 'lógico':
+                return 'lógico'
+
+        _erro(erros, "Tipos incompativeis em '" + SIMBOLO_OPERADOR.get(op, op) + "': " +
+              esq + " e " + dir, expr.linha)
+        return None
+
+    if isinstance(expr, Chamada):
+        for arg in expr.args:
+            tipo_expr(arg, erros)
+        decl = expr.decl
+        if decl is None:
+            return 'inteiro'
+        if not isinstance(decl, DeclFuncao):
+            _erro(erros, "'" + expr.nome + "' nao e' uma funcao", expr.linha)
+            return None
+        if len(expr.args) != len(decl.params):
+            _erro(erros, "Funcao '" + expr.nome + "' espera " + str(len(decl.params)) +
+                  " argumento(s), recebeu " + str(len(expr.args)), expr.linha)
+        else:
+            for arg in expr.args:
+                if arg.tipo is not None and arg.tipo not in ('inteiro', 'lógico'):
+                    _erro(erros, "Argumento de '" + expr.nome + "' deve ser inteiro, nao " +
+                          arg.tipo, arg.linha)
+        return 'inteiro'
+
+    return None
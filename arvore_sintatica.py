@@ -0,0 +1,229 @@
+# ÁRVORE SINTÁTICA ABSTRATA (AST)
+# Nós que o SLR monta nas reduções e que as fases seguintes (semântica e
+# geração de código) percorrem, em vez de reescanear a lista de tokens
+# Todos usam __slots__ pra ficarem pequenos em programas grandes
+
+
+class No:
+    __slots__ = ('linha',)
+
+    def campos(self):
+        # Nomes de todos os campos do nó (incluindo os das classes pai)
+        nomes = []
+        for cls in reversed(type(self).__mro__):
+            for nome in getattr(cls, '__slots__', ()):
+                if nome not in nomes:
+                    nomes.append(nome)
+        return nomes
+
+    def __repr__(self):
+        partes = []
+        for nome in self.campos():
+            if nome not in ('linha', 'decl', 'origem'):
+                partes.append(nome + "=" + repr(getattr(self, nome, None)))
+        return type(self).__name__ + "(" + ", ".join(partes) + ")"
+
+
+# ---------------- Comandos ----------------
+
+class Programa(No):
+    __slots__ = ('comandos',)
+
+    def __init__(self, comandos, linha=0):
+        self.comandos = comandos
+        self.linha = linha
+
+
+class DeclVar(No):
+    # tipo: tipo do token da declaração ('var', 'inteiro', 'flutuante', ...)
+    # valor: expressão inicial (só no for: inteiro i = 0) ou None
+    __slots__ = ('tipo', 'nome', 'valor')
+
+    def __init__(self, tipo, nome, valor=None, linha=0):
+        self.tipo = tipo
+        self.nome = nome
+        self.valor = valor
+        self.linha = linha
+
+
+class DeclFuncao(No):
+    # params: lista de DeclVar (os parâmetros são inteiros)
+    __slots__ = ('nome', 'params', 'corpo')
+
+    def __init__(self, nome, params, corpo, linha=0):
+        self.nome = nome
+        self.params = params
+        self.corpo = corpo
+        self.linha = linha
+
+
+class Atribuicao(No):
+    # decl: declaração (DeclVar) resolvida pela análise semântica
+    __slots__ = ('nome', 'expr', 'decl')
+
+    def __init__(self, nome, expr, linha=0):
+        self.nome = nome
+        self.expr = expr
+        self.linha = linha
+        self.decl = None
+
+
+class Escrita(No):
+    __slots__ = ('expr',)
+
+    def __init__(self, expr, linha=0):
+        self.expr = expr
+        self.linha = linha
+
+
+class Leitura(No):
+    __slots__ = ('nome', 'decl')
+
+    def __init__(self, nome, linha=0):
+        self.nome = nome
+        self.linha = linha
+        self.decl = None
+
+
+class Se(No):
+    # senao: lista de comandos do else, ou None se não tiver else
+    # origem: número do nó no programa (otimizacao_perfil.numerar_origens),
+    # pra achar as contagens dele no perfil; None fora da compilação com perfil
+    __slots__ = ('cond', 'entao', 'senao', 'origem')
+
+    def __init__(self, cond, entao, senao=None, linha=0):
+        self.cond = cond
+        self.entao = entao
+        self.senao = senao
+        self.linha = linha
+        self.origem = None
+
+
+class Enquanto(No):
+    __slots__ = ('cond', 'corpo', 'origem')
+
+    def __init__(self, cond, corpo, linha=0):
+        self.cond = cond
+        self.corpo = corpo
+        self.linha = linha
+        self.origem = None
+
+
+class Para(No):
+    # inicio: Atribuicao ou DeclVar com valor; passo: Atribuicao
+    # cond: expressão ou None (for sem condição)
+    __slots__ = ('inicio', 'cond', 'passo', 'corpo', 'origem')
+
+    def __init__(self, inicio, cond, passo, corpo, linha=0):
+        self.inicio = inicio
+        self.cond = cond
+        self.passo = passo
+        self.corpo = corpo
+        self.linha = linha
+        self.origem = None
+
+
+class ExprCmd(No):
+    # Expressão usada como comando (chamada de função, x++, ...)
+    __slots__ = ('expr',)
+
+    def __init__(self, expr, linha=0):
+        self.expr = expr
+        self.linha = linha
+
+
+# ---------------- Expressões ----------------
+
+class Expr(No):
+    # tipo: tipo resolvido pela verificação de tipos ('inteiro', 'flutuante',
+    # 'cadeia', 'lógico'); fica guardado no nó, então cada subexpressão
+    # só é tipada uma vez
+    __slots__ = ('tipo',)
+
+
+class Num(Expr):
+    # lexema guardado como veio do código ("10", "3.14")
+    __slots__ = ('lexema',)
+
+    def __init__(self, lexema, linha=0):
+        self.lexema = lexema
+        self.linha = linha
+        self.tipo = None
+
+
+class Cadeia(Expr):
+    # lexema com as aspas, igual ao token CADEIA
+    __slots__ = ('lexema',)
+
+    def __init__(self, lexema, linha=0):
+        self.lexema = lexema
+        self.linha = linha
+        self.tipo = None
+
+
+class Logico(Expr):
+    __slots__ = ('valor',)
+
+    def __init__(self, valor, linha=0):
+        self.valor = valor
+        self.linha = linha
+        self.tipo = None
+
+
+class Var(Expr):
+    # decl: declaração (DeclVar) resolvida pela análise semântica
+    __slots__ = ('nome', 'decl')
+
+    def __init__(self, nome, linha=0):
+        self.nome = nome
+        self.linha = linha
+        self.tipo = None
+        self.decl = None
+
+
+class Binaria(Expr):
+    # op: tipo do token do operador ('mais', 'menor', 'concat', ...)
+    __slots__ = ('op', 'esq', 'dir')
+
+    def __init__(self, op, esq, dir, linha=0):
+        self.op = op
+        self.esq = esq
+        self.dir = dir
+        self.linha = linha
+        self.tipo = None
+
+
+class Unaria(Expr):
+    # op: 'menos' ou 'neg'
+    __slots__ = ('op', 'expr')
+
+    def __init__(self, op, expr, linha=0):
+        self.op = op
+        self.expr = expr
+        self.linha = linha
+        self.tipo = None
+
+
+class Chamada(Expr):
+    # decl: a DeclFuncao chamada, resolvida pela análise semântica
+    __slots__ = ('nome', 'args', 'decl', 'origem')
+
+    def __init__(self, nome, args, linha=0):
+        self.nome = nome
+        self.args = args
+        self.linha = linha
+        self.tipo = None
+        self.decl = None
+        self.origem = None
+
+
+class IncDec(Expr):
+    # x++ / x-- (op: 'inc' ou 'dec'); vale o valor antigo de x
+    __slots__ = ('nome', 'op', 'decl')
+
+    def __init__(self, nome, op, linha=0):
+        self.nome = nome
+        self.op = op
+        self.linha = linha
+        self.tipo = None
+        self.decl = None
@@ -0,0 +1,469 @@
+# BENCHMARK DAS FASES
+# Gera programas sintéticos da linguagem (com semente, então o mesmo
+# tamanho e a mesma semente dão sempre o mesmo fonte) e mede cada fase do
+# compilador separada, em tokens/s e linhas/s:
+#   python benchmark.py                         -> 1KB, 10KB, 100KB e 1MB
+#                                                  (-O2 até 100KB, -O0 no 1MB)
+#   python benchmark.py -t 1KB 10KB -r 5 -O2
+#   python benchmark.py -t 100MB -r 1 --fases lexico slr
+#   python benchmark.py --comparar              -> compara com a execução anterior
+#   python benchmark.py --comparar 1639c73      -> compara com a de um commit
+#   python benchmark.py --gerar prog.txt -t 1MB -> só grava o programa gerado
+# Cada execução vira uma linha (JSON) no histórico, com o commit do git,
+# então dá pra ver entre dois commits qual fase ficou mais lenta. Com
+# --comparar o código de saída é 1 se alguma fase piorou mais que --limite
+# Fases medidas:
+#   lexico       Lexico.analisar
+#   slr          SLR.analisar_arvore (análise + montagem da AST)
+#   descendente  ParserDescendente.analisar
+#   semantica    analisar_semantica_arvore + verificar_tipos
+#   geracao      geração MIPS no nível -O pedido (com inline, IR e otimizador
+#                nos níveis 1 e 2, igual ao main.py)
+# Tamanho grande pesa na memória (a lista de tokens de 100MB passa de
+# vários GB), então os tamanhos padrão param em 1MB
+# Sem -O a geração é medida em -O2, o nível padrão do main.py (é o que quem
+# usa o compilador recebe), até MAIOR_O2_PADRAO, e em -O0 acima disso. O
+# que fazia -O1/-O2 crescer bem mais que linear era o otimizador do IR:
+# propagar_constantes copiava o estado inteiro a cada junção de blocos e
+# mover_invariantes/reduzir_forca recalculavam laços, dominadores e
+# vivacidade da função toda a cada laço. Hoje o que mais cresce acima de
+# ~100KB é o peephole (Contexto.atualizar refaz as posições dos rótulos
+# depois de cada troca), por isso o 1MB padrão fica em -O0
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from analisador_lexico import Lexico
+from analisador_sintatico_slr import SLR
+from analisador_sintatico import ParserDescendente
+from analisador_semantico import analisar_semantica_arvore
+from analisador_tipos import verificar_tipos
+from compilador import gerar
+
+FASES = ['lexico', 'slr', 'descendente', 'semantica', 'geracao']
+
+TAMANHOS_PADRAO = ['1KB', '10KB', '100KB', '1MB']
+
+# Sem -O: -O2 (o padrão do main.py) até esse tamanho, -O0 acima
+NIVEL_PADRAO = 2
+MAIOR_O2_PADRAO = '100KB'
+
+HISTORICO_PADRAO = "benchmark_historico.jsonl"
+
+UNIDADES = {'B': 1, 'KB': 1024, 'MB': 1024 * 1024, 'GB': 1024 * 1024 * 1024}
+
+PALAVRAS = ['valor', 'total', 'laco', 'teste', 'resultado', 'programa', 'saida',
+            'compilador', 'funcao', 'variavel', 'linha', 'contador', 'mensagem']
+
+
+def ler_tamanho(texto):
+    # '100KB' -> 102400 (sem unidade é em bytes)
+    texto = texto.strip().upper()
+    for unidade in sorted(UNIDADES, key=len, reverse=True):
+        if texto.endswith(unidade):
+            return int(float(texto[:-len(unidade)]) * UNIDADES[unidade])
+    return int(texto)
+
+
+def formatar_tamanho(n):
+    for unidade in ('GB', 'MB', 'KB'):
+        if n >= UNIDADES[unidade] and n % UNIDADES[unidade] == 0:
+            return str(n // UNIDADES[unidade]) + unidade
+    return str(n) + 'B'
+
+
+class GeradorProgramas:
+    # Monta um programa válido (passa na semântica e nos tipos) com pelo
+    # menos `tamanho` bytes: globais de todos os tipos, funções com
+    # parâmetros, if/else, while e for aninhados até `profundidade`,
+    # expressões longas e strings
+    # Tudo sai do random.Random(semente), então é reproduzível
+
+    def __init__(self, semente=42, profundidade=3):
+        self.rand = random.Random(semente)
+        self.profundidade = profundidade
+        self.inteiros = ['g' + str(i) for i in range(8)]
+        self.flutuantes = ['h' + str(i) for i in range(4)]
+        self.cadeias = ['s' + str(i) for i in range(2)]
+        self.logicos = ['c0', 'c1']
+        self.funcoes = []  # (nome, número de parâmetros)
+        self.contador = 0
+
+    def gerar(self, tamanho):
+        partes = []
+        total = 0
+        for linha in self.cabecalho():
+            partes.append(linha)
+            total += len(linha) + 1
+        while total < tamanho:
+            if self.rand.random() < 0.08:
+                linhas = self.funcao()
+            else:
+                linhas = self.comando(self.inteiros, 0)
+            for linha in linhas:
+                partes.append(linha)
+                total += len(linha) + 1
+        return '\n'.join(partes) + '\n'
+
+    def novo_nome(self, prefixo):
+        self.contador += 1
+        return prefixo + str(self.contador)
+
+    def cabecalho(self):
+        linhas = []
+        for nome in self.inteiros:
+            linhas.append('inteiro ' + nome + ';')
+            linhas.append(nome + ' = ' + str(self.rand.randint(0, 99)) + ';')
+        for nome in self.flutuantes:
+            linhas.append('flutuante ' + nome + ';')
+            linhas.append(nome + ' = ' + str(self.rand.randint(0, 9)) + '.' + str(self.rand.randint(0, 99)) + ';')
+        for nome in self.cadeias:
+            linhas.append('cadeia ' + nome + ';')
+            linhas.append(nome + ' = ' + self.cadeia() + ';')
+        for nome in self.logicos:
+            linhas.append('logico ' + nome + ';')
+            linhas.append(nome + ' = verdadeiro;')
+        return linhas
+
+    def cadeia(self):
+        n = self.rand.randint(1, 12)
+        return '"' + ' '.join(self.rand.choice(PALAVRAS) for _ in range(n)) + '"'
+
+    def termo(self, nomes, chamadas):
+        r = self.rand.random()
+        if r < 0.45:
+            return self.rand.choice(nomes)
+        if r < 0.8:
+            return str(self.rand.randint(0, 999))
+        if chamadas and self.funcoes and r < 0.88:
+            return self.chamada(nomes)
+        return '(' + self.expr_inteira(nomes, 3, chamadas=False) + ')'
+
+    def expr_inteira(self, nomes, maximo=6, chamadas=True):
+        # Às vezes bem longa (cadeia de até 40 termos), pra pesar no
+        # analisador e no alocador de registradores
+        n = self.rand.randint(1, maximo)
+        if maximo > 3 and self.rand.random() < 0.1:
+            n = self.rand.randint(10, 40)
+        expr = self.termo(nomes, chamadas)
+        for _ in range(n - 1):
+            op = self.rand.choice(['+', '-', '*', '+', '-'])
+            expr += ' ' + op + ' ' + self.termo(nomes, chamadas)
+        if self.rand.random() < 0.1:
+            expr = '(' + expr + ') / ' + str(self.rand.randint(1, 9))
+        return expr
+
+    def expr_flutuante(self, nomes):
+        partes = [self.rand.choice(self.flutuantes)]
+        for _ in range(self.rand.randint(0, 4)):
+            termo = self.rand.choice([self.rand.choice(self.flutuantes), self.rand.choice(nomes),
+                                      str(self.rand.randint(0, 9)) + '.5'])
+            partes.append(self.rand.choice(['+', '-', '*']) + ' ' + termo)
+        return ' '.join(partes)
+
+    def condicao(self, nomes):
+        r = self.rand.random()
+        if r < 0.15:
+            return self.rand.choice(self.logicos)
+        op = self.rand.choice(['<', '>', '<=', '>=', '==', '!='])
+        if r < 0.3:
+            return self.expr_flutuante(nomes) + ' ' + op + ' ' + self.expr_flutuante(nomes)
+        return self.expr_inteira(nomes, 3) + ' ' + op + ' ' + self.expr_inteira(nomes, 3)
+
+    def chamada(self, nomes):
+        nome, n = self.rand.choice(self.funcoes)
+        return nome + '(' + ', '.join(self.expr_inteira(nomes, 2, chamadas=False) for _ in range(n)) + ')'
+
+    def bloco(self, nomes, nivel):
+        linhas = []
+        for _ in range(self.rand.randint(1, 4)):
+            linhas.extend(self.comando(nomes, nivel))
+        return ['    ' + linha for linha in linhas]
+
+    def comando(self, nomes, nivel):
+        # Lista de linhas de um comando (os compostos ocupam várias)
+        r = self.rand.random()
+        aninha = nivel < self.profundidade
+        if aninha and r < 0.1:
+            linhas = ['if (' + self.condicao(nomes) + ') {'] + self.bloco(nomes, nivel + 1)
+            if self.rand.random() < 0.5:
+                linhas += ['} else {'] + self.bloco(nomes, nivel + 1)
+            return linhas + ['}']
+        if aninha and r < 0.16:
+            contador = self.rand.choice(nomes)
+            return (['while (' + contador + ' > 0) {'] + self.bloco(nomes, nivel + 1) +
+                    ['    ' + contador + ' = ' + contador + ' - 1;', '}'])
+        if aninha and r < 0.22:
+            i = self.novo_nome('i')
+            return (['for (inteiro ' + i + ' = 0; ' + i + ' < ' + str(self.rand.randint(1, 100)) +
+                     '; ' + i + ' = ' + i + ' + 1) {'] + self.bloco(nomes + [i], nivel + 1) + ['}'])
+        if r < 0.3:
+            local = self.novo_nome('v')
+            # Declaração no bloco atual: só os comandos seguintes enxergam,
+            # então o nome não entra na lista (fica só nessa atribuição)
+            return ['inteiro ' + local + ';', local + ' = ' + self.expr_inteira(nomes) + ';']
+        if r < 0.36:
+            if self.rand.random() < 0.5:
+                return ['write(' + self.cadeia() + ');']
+            return ['write(' + self.rand.choice(nomes + self.flutuantes + self.cadeias) + ');']
+        if r < 0.4:
+            # Concatenação só de constantes (a geração não concatena em
+            # tempo de execução)
+            destino = self.rand.choice(self.cadeias)
+            return [destino + ' = ' + self.cadeia() + ' & ' + self.cadeia() + ';']
+        if r < 0.44:
+            return [self.rand.choice(self.logicos) + ' = ' + self.condicao(nomes) + ';']
+        if r < 0.52:
+            return [self.rand.choice(self.flutuantes) + ' = ' + self.expr_flutuante(nomes) + ';']
+        if r < 0.56:
+            return ['read(' + self.rand.choice(self.inteiros) + ');']
+        if r < 0.62 and self.funcoes:
+            return [self.chamada(nomes) + ';']
+        return [self.rand.choice(nomes) + ' = ' + self.expr_inteira(nomes) + ';']
+
+    def funcao(self):
+        nome = self.novo_nome('f')
+        n = self.rand.randint(0, 5)
+        params = [nome + '_p' + str(i) for i in range(n)]
+        local = nome + '_l'
+        nomes = params + [local] + self.inteiros
+        linhas = ['fun ' + nome + '(' + ', '.join(params) + ') {',
+                  '    inteiro ' + local + ';',
+                  '    ' + local + ' = ' + self.expr_inteira(nomes) + ';']
+        for _ in range(self.rand.randint(1, 5)):
+            linhas.extend('    ' + linha for linha in self.comando(nomes, 1))
+        linhas.append('}')
+        # Só entra depois de declarada: nada de recursão
+        self.funcoes.append((nome, n))
+        return linhas
+
+
+def gerar_programa(tamanho, semente=42):
+    return GeradorProgramas(semente).gerar(tamanho)
+
+
+def medir(codigo, nivel=2, repeticoes=3, fases=FASES):
+    # Tempo de cada fase pedida (o menor das repetições, que é o menos
+    # afetado por ruído) e os totais de tokens e linhas do programa
+    # Fase que não foi pedida mas que uma pedida precisa (a AST pra
+    # semântica, a semântica pra geração) roda sem ser medida
+    precisa_arvore = 'slr' in fases or 'semantica' in fases or 'geracao' in fases
+    precisa_semantica = 'semantica' in fases or 'geracao' in fases
+    tempos = {fase: None for fase in fases}
+    tokens = []
+    for _ in range(repeticoes):
+        medidos = {}
+        gc.collect()
+        inicio = time.perf_counter()
+        tokens, erros = Lexico().analisar(codigo)
+        medidos['lexico'] = time.perf_counter() - inicio
+        if erros:
+            raise Exception("Programa gerado com erro lexico: " + erros[0])
+
+        if precisa_arvore:
+            gc.collect()
+            inicio = time.perf_counter()
+            arvore, erros = SLR().analisar_arvore(tokens)
+            medidos['slr'] = time.perf_counter() - inicio
+            if erros:
+                raise Exception("Programa gerado com erro sintatico: " + erros[0])
+
+        if 'descendente' in fases:
+            gc.collect()
+            inicio = time.perf_counter()
+            ParserDescendente(tokens).analisar()
+            medidos['descendente'] = time.perf_counter() - inicio
+
+        if precisa_semantica:
+            gc.collect()
+            inicio = time.perf_counter()
+            erros, _ = analisar_semantica_arvore(arvore)
+            if not erros:
+                erros = verificar_tipos(arvore)
+            medidos['semantica'] = time.perf_counter() - inicio
+            if erros:
+                raise Exception("Programa gerado com erro semantico: " + erros[0])
+
+        if 'geracao' in fases:
+            gc.collect()
+            inicio = time.perf_counter()
+            gerar(arvore, nivel)
+            medidos['geracao'] = time.perf_counter() - inicio
+
+        for fase in fases:
+            if tempos[fase] is None or medidos[fase] < tempos[fase]:
+                tempos[fase] = medidos[fase]
+        arvore = None
+
+    linhas = codigo.count('\n')
+    resultado = {}
+    for fase in fases:
+        segundos = max(tempos[fase], 1e-9)
+        resultado[fase] = {'segundos': tempos[fase],
+                           'tokens_s': len(tokens) / segundos,
+                           'linhas_s': linhas / segundos}
+    return {'bytes': len(codigo), 'linhas': linhas, 'tokens': len(tokens), 'fases': resultado}
+
+
+def nivel_do_tamanho(nivel, tamanho):
+    # Nível pedido no -O, ou o padrão (-O2 até MAIOR_O2_PADRAO, -O0 acima)
+    if nivel is not None:
+        return nivel
+    return NIVEL_PADRAO if tamanho <= ler_tamanho(MAIOR_O2_PADRAO) else 0
+
+
+def commit_atual():
+    # (hash, tem alteração não commitada) ou (None, False) fora de um repositório
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=pasta, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=pasta,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def ler_historico(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def salvar_execucao(caminho, execucao):
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(execucao, ensure_ascii=False) + '\n')
+
+
+def achar_referencia(historico, referencia):
+    # 'anterior' -> última execução salva; senão a última de um commit que
+    # começa com `referencia`
+    if referencia == 'anterior':
+        return historico[-1] if historico else None
+    for execucao in reversed(historico):
+        if execucao['commit'] and execucao['commit'].startswith(referencia):
+            return execucao
+    return None
+
+
+def comparar(base, atual, limite):
+    # Imprime a variação de tokens/s de cada fase e devolve quantas
+    # pioraram mais que `limite` (%); só compara o que as duas execuções
+    # mediram com o mesmo tamanho, semente e nível (execução antiga sem
+    # nível por tamanho usa o da execução)
+    if base['semente'] != atual['semente']:
+        print("Aviso: semente diferente da referencia, a comparacao pode nao valer")
+    print("Comparando com " + str(base['commit'])[:10] + " (" + base['data'] + ")")
+    anteriores = {r['tamanho']: r for r in base['resultados']}
+    regressoes = 0
+    for resultado in atual['resultados']:
+        anterior = anteriores.get(resultado['tamanho'])
+        if anterior is None:
+            continue
+        if anterior.get('nivel', base['nivel']) != resultado['nivel']:
+            print("  " + formatar_tamanho(resultado['tamanho']).ljust(7) + "nivel diferente da referencia, pulado")
+            continue
+        for fase in FASES:
+            if fase not in anterior['fases'] or fase not in resultado['fases']:
+                continue
+            antes = anterior['fases'][fase]['tokens_s']
+            depois = resultado['fases'][fase]['tokens_s']
+            variacao = (depois - antes) / antes * 100
+            marca = ''
+            if variacao < -limite:
+                marca = '  <- REGRESSAO'
+                regressoes += 1
+            print("  " + formatar_tamanho(resultado['tamanho']).ljust(7) + fase.ljust(12) +
+                  format(antes, ",.0f").rjust(14) + " -> " + format(depois, ",.0f").rjust(14) +
+                  " tokens/s  " + format(variacao, "+.1f") + "%" + marca)
+    return regressoes
+
+
+def montar_argumentos():
+    p = argparse.ArgumentParser(description="Benchmark das fases do compilador com programas sinteticos")
+    p.add_argument("-t", dest="tamanhos", nargs="+", default=TAMANHOS_PADRAO,
+                   help="tamanhos dos programas (ex.: 1KB 10MB; padrao: " + " ".join(TAMANHOS_PADRAO) + ")")
+    p.add_argument("-s", dest="semente", type=int, default=42, help="semente do gerador (padrao: 42)")
+    p.add_argument("-r", dest="repeticoes", type=int, default=3,
+                   help="repeticoes de cada medida, vale a mais rapida (padrao: 3)")
+    p.add_argument("-O", dest="nivel", type=int, choices=[0, 1, 2], default=None,
+                   help="nivel de otimizacao da geracao (padrao: " + str(NIVEL_PADRAO) + " ate " +
+                        MAIOR_O2_PADRAO + ", 0 acima)")
+    p.add_argument("--fases", nargs="+", choices=FASES, default=FASES,
+                   help="fases medidas (padrao: todas)")
+    p.add_argument("--historico", default=HISTORICO_PADRAO,
+                   help="arquivo JSONL com as execucoes (padrao: " + HISTORICO_PADRAO + ")")
+    p.add_argument("--nao-salvar", action="store_true", help="nao grava a execucao no historico")
+    p.add_argument("--comparar", nargs="?", const="anterior", default=None, metavar="COMMIT",
+                   help="compara com a execucao anterior (ou com a de um commit)")
+    p.add_argument("--limite", type=float, default=10.0,
+                   help="queda de tokens/s (%%) que conta como regressao (padrao: 10)")
+    p.add_argument("--gerar", default=None, metavar="ARQUIVO",
+                   help="so grava o programa gerado (primeiro tamanho) no arquivo")
+    return p
+
+
+def main(argv=None):
+    args = montar_argumentos().parse_args(argv)
+    tamanhos = [ler_tamanho(t) for t in args.tamanhos]
+
+    if args.gerar:
+        with open(args.gerar, 'w', encoding='utf-8') as f:
+            f.write(gerar_programa(tamanhos[0], args.semente))
+        return 0
+
+    # Programa grande tem AST funda o bastante pra passar do limite padrão
+    # de recursão nas fases que percorrem a árvore
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+
+    commit, sujo = commit_atual()
+    execucao = {'commit': commit, 'sujo': sujo, 'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(), 'maquina': platform.machine(),
+                'semente': args.semente, 'nivel': args.nivel, 'repeticoes': args.repeticoes,
+                'resultados': []}
+
+    print("Commit " + str(commit)[:10] + (" (com alteracoes)" if sujo else "") +
+          ", " + ("-O" + str(args.nivel) if args.nivel is not None else "nivel padrao") +
+          ", semente " + str(args.semente))
+    for tamanho in tamanhos:
+        nivel = nivel_do_tamanho(args.nivel, tamanho)
+        codigo = gerar_programa(tamanho, args.semente)
+        resultado = medir(codigo, nivel, args.repeticoes, args.fases)
+        resultado['tamanho'] = tamanho
+        resultado['nivel'] = nivel
+        execucao['resultados'].append(resultado)
+        print("-" * 70)
+        print(formatar_tamanho(tamanho) + " (-O" + str(nivel) + "): " + str(resultado['linhas']) +
+              " linhas, " + str(resultado['tokens']) + " tokens")
+        for fase in args.fases:
+            medida = resultado['fases'][fase]
+            print("  " + fase.ljust(12) + format(medida['segundos'], ".4f").rjust(10) + " s" +
+                  format(medida['tokens_s'], ",.0f").rjust(14) + " tokens/s" +
+                  format(medida['linhas_s'], ",.0f").rjust(12) + " linhas/s")
+    print("-" * 70)
+
+    regressoes = 0
+    if args.comparar:
+        base = achar_referencia(ler_historico(args.historico), args.comparar)
+        if base is None:
+            print("Nenhuma execucao de referencia (" + args.comparar + ") em " + args.historico)
+        else:
+            regressoes = comparar(base, execucao, args.limite)
+
+    if not args.nao_salvar:
+        salvar_execucao(args.historico, execucao)
+        print("Execucao salva em " + args.historico)
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
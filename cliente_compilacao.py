@@ -0,0 +1,75 @@
+# CLIENTE DO SERVIDOR DE COMPILAÇÃO
+# Manda um fonte pro servidor_compilacao.py e grava o .asm que volta:
+#   python cliente_compilacao.py prog.txt               -> prog.asm
+#   python cliente_compilacao.py prog.txt -o saida.asm -O1
+#   python cliente_compilacao.py - < prog.txt           -> assembly na saída padrão
+#   python cliente_compilacao.py --parar                -> desliga o servidor
+# Só importa a biblioteca padrão, então sobe rápido; os erros de compilação
+# saem na saída de erro. Código de saída: 0 ok, 1 erro de compilação,
+# 2 servidor fora do ar
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+SOCKET_PADRAO = "/tmp/compilador_mips.sock"
+
+
+def pedir(caminho_socket, pedido):
+    # Manda um pedido (dict) e devolve a resposta (dict)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(caminho_socket)
+        s.sendall((json.dumps(pedido) + "\n").encode("utf-8"))
+        with s.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Cliente do servidor de compilacao")
+    p.add_argument("entrada", nargs="?", help="arquivo fonte ('-' le da entrada padrao)")
+    p.add_argument("-o", dest="saida", default=None, help="arquivo .asm (padrao: do lado do fonte)")
+    p.add_argument("-O", dest="nivel", type=int, choices=[0, 1, 2], default=2)
+    p.add_argument("--desativar", action="append", default=[], metavar="PASSO")
+    p.add_argument("--cache", default=None, help="pasta do cache incremental (no servidor)")
+    p.add_argument("--socket", default=SOCKET_PADRAO)
+    p.add_argument("--parar", action="store_true", help="desliga o servidor")
+    args = p.parse_args(argv)
+
+    try:
+        if args.parar:
+            pedir(args.socket, {"comando": "parar"})
+            return 0
+        if args.entrada is None:
+            p.error("falta o arquivo de entrada")
+
+        pedido = {"nivel": args.nivel, "desativados": args.desativar}
+        if args.cache:
+            pedido["cache"] = os.path.abspath(args.cache)
+        if args.entrada == "-":
+            pedido["codigo"] = sys.stdin.read()
+        else:
+            # O servidor lê o arquivo (caminho absoluto: ele roda em outra pasta)
+            pedido["caminho"] = os.path.abspath(args.entrada)
+        resposta = pedir(args.socket, pedido)
+    except (OSError, ValueError) as e:
+        print("Servidor de compilacao indisponivel (" + args.socket + "): " + str(e), file=sys.stderr)
+        return 2
+
+    if not resposta["ok"]:
+        for e in resposta["erros"]:
+            print(e, file=sys.stderr)
+        return 1
+
+    if args.saida is None and args.entrada == "-":
+        sys.stdout.write(resposta["asm"])
+        return 0
+    saida = args.saida or os.path.splitext(args.entrada)[0] + ".asm"
+    with open(saida, "w", encoding="utf-8") as f:
+        f.write(resposta["asm"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
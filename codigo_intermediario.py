@@ -0,0 +1,605 @@
+# CÓDIGO INTERMEDIÁRIO (código de três endereços)
+# Fica entre a AST e o MIPS, pra ter onde otimizar:
+#   - cada instrução faz uma operação só: dest = a op b
+#   - as instruções ficam em blocos básicos (entra pelo começo, sai pelo fim)
+#   - todo bloco termina num desvio (salto, desvio condicional, fim/retorno)
+#     e os destinos dos desvios formam o grafo de fluxo de controle (CFG)
+#
+# Operandos: nome (str) de variável ou temporário, ou uma constante (Const)
+# Temporários se chamam %1, %2, ... (não colidem com nomes do programa)
+# e variáveis sombreadas ganham sufixo (x, x.2, ...)
+#
+# Instruções (op / dest / args):
+#   mov          d = a
+#   mais menos mult div              d = a op b (inteiro ou flutuante)
+#   maior menor ge le eqeq ne        d = a op b (resultado lógico 0/1)
+#   neg          d = -a             nao   d = !a
+#   (concatenação '&' não vira instrução: só existe entre literais e já sai
+#   aqui como uma Const cadeia)
+#   cvt          d = flutuante(a)   (inteiro -> flutuante)
+#   ler          d = valor lido     escrever   imprime a
+#   chamar       d = funcao(args...) (nome da função em alvos[0])
+# Terminadores:
+#   salto        vai pra alvos[0]
+#   desvio       se a <cond> b vai pra alvos[0], senão pra alvos[1]
+#   fim          fim do programa (main)   retorno   fim de uma função
+
+import struct
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Num, Cadeia, Logico, Var, Binaria, Unaria,
+                              Chamada, IncDec)
+from rotulos import Rotulos
+
+OPERADORES_BINARIOS = frozenset(['mais', 'menos', 'mult', 'div', 'maior', 'menor', 'ge', 'le',
+                                 'eqeq', 'ne'])
+OPERADORES_RELACIONAIS = frozenset(['maior', 'menor', 'ge', 'le', 'eqeq', 'ne'])
+OPERADORES_UNARIOS = frozenset(['mov', 'neg', 'nao', 'cvt'])
+TERMINADORES = frozenset(['salto', 'desvio', 'fim', 'retorno'])
+
+# Instruções que não podem sumir mesmo com o resultado sem uso
+COM_EFEITO = frozenset(['ler', 'escrever', 'chamar'])
+
+# Condição contrária (pra inverter um desvio) e condição com os operandos trocados
+NEGACAO = {'maior': 'le', 'menor': 'ge', 'ge': 'menor', 'le': 'maior', 'eqeq': 'ne', 'ne': 'eqeq'}
+ESPELHO = {'maior': 'menor', 'menor': 'maior', 'ge': 'le', 'le': 'ge', 'eqeq': 'eqeq', 'ne': 'ne'}
+
+SIMBOLO = {
+    'mais': '+', 'menos': '-', 'mult': '*', 'div': '/',
+    'maior': '>', 'menor': '<', 'ge': '>=', 'le': '<=', 'eqeq': '==', 'ne': '!=',
+}
+
+
+def flutuante_32(v):
+    # Arredonda pra precisão simples (é o que a FPU vai usar)
+    return struct.unpack('f', struct.pack('f', v))[0]
+
+
+class Const:
+    # Constante: valor Python (int, float, ou o lexema com aspas da cadeia) + tipo
+    # Flutuante já fica arredondado pra precisão simples (0.1 do fonte não é
+    # o 0.1 do Python), senão a dobra de constantes compara outro número
+    __slots__ = ('valor', 'tipo')
+
+    def __init__(self, valor, tipo):
+        self.valor = valor
+        self.tipo = tipo
+
+    def __eq__(self, outro):
+        return isinstance(outro, Const) and self.tipo == outro.tipo and self.valor == outro.valor
+
+    def __hash__(self):
+        return hash((self.valor, self.tipo))
+
+    def __repr__(self):
+        if self.tipo == 'flutuante':
+            return repr(float(self.valor))
+        return str(self.valor)
+
+
+class Instr:
+    # cond: condição do desvio ('menor', 'eqeq', ...)
+    # alvos: rótulos dos blocos de destino (ou o nome da função no chamar)
+    # origem: de que nó do fonte a instrução veio, pro perfil
+    # (otimizacao_perfil.py): no desvio (origem do if/while/for, True se
+    # alvos[0] é o lado da condição verdadeira no fonte), no chamar a
+    # origem da Chamada; None no resto
+    __slots__ = ('op', 'dest', 'args', 'alvos', 'cond', 'origem')
+
+    def __init__(self, op, dest=None, args=(), alvos=(), cond=None, origem=None):
+        self.op = op
+        self.dest = dest
+        self.args = list(args)
+        self.alvos = list(alvos)
+        self.cond = cond
+        self.origem = origem
+
+    def usos(self):
+        # Nomes lidos pela instrução
+        return [a for a in self.args if isinstance(a, str)]
+
+    def eh_terminador(self):
+        return self.op in TERMINADORES
+
+    def __repr__(self):
+        args = ", ".join(repr(a) if isinstance(a, Const) else a for a in self.args)
+        if self.op == 'salto':
+            return "salto " + self.alvos[0]
+        if self.op == 'desvio':
+            return ("se " + repr_op(self.args[0]) + " " + SIMBOLO[self.cond] + " " +
+                    repr_op(self.args[1]) + " -> " + self.alvos[0] + " senao " + self.alvos[1])
+        if self.op in ('fim', 'retorno', 'escrever'):
+            return (self.op + " " + args).rstrip()
+        if self.op == 'mov':
+            return self.dest + " = " + args
+        if self.op in SIMBOLO:
+            return (self.dest + " = " + repr_op(self.args[0]) + " " + SIMBOLO[self.op] + " " +
+                    repr_op(self.args[1]))
+        if self.op == 'chamar':
+            return self.dest + " = chamar " + self.alvos[0] + "(" + args + ")"
+        return (self.dest + " = " + self.op + " " + args).rstrip()
+
+
+def repr_op(operando):
+    return repr(operando) if isinstance(operando, Const) else operando
+
+
+class Bloco:
+    # Bloco básico: rótulo, instruções (a última é o terminador) e arestas do CFG
+    __slots__ = ('nome', 'instrs', 'sucessores', 'predecessores')
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.instrs = []
+        self.sucessores = []
+        self.predecessores = []
+
+    def terminador(self):
+        return self.instrs[-1]
+
+    def __repr__(self):
+        return "Bloco(" + self.nome + ", " + str(len(self.instrs)) + " instrs)"
+
+
+class FuncaoIR:
+    # blocos: na ordem em que vão ser emitidos (o primeiro é a entrada)
+    # tipos: tipo de cada nome (variáveis e temporários)
+    # ordem_alocacao: ordem dos blocos pra numerar os intervalos da alocação
+    # de registradores quando a emissão foi reordenada pelo perfil (None =
+    # a de blocos)
+    def __init__(self, nome, params=None):
+        self.nome = nome
+        self.params = params or []
+        self.blocos = []
+        self.tipos = {}
+        self.ordem_alocacao = None
+
+    def bloco(self, nome):
+        for b in self.blocos:
+            if b.nome == nome:
+                return b
+        return None
+
+    def mapa_blocos(self):
+        return {b.nome: b for b in self.blocos}
+
+    def tipo_de(self, operando):
+        if isinstance(operando, Const):
+            return operando.tipo
+        return self.tipos.get(operando, 'inteiro')
+
+    def num_instrucoes(self):
+        return sum(len(b.instrs) for b in self.blocos)
+
+    def formatar(self):
+        linhas = [self.nome + "(" + ", ".join(self.params) + "):"]
+        for b in self.blocos:
+            linhas.append(b.nome + ":")
+            for instr in b.instrs:
+                linhas.append("    " + repr(instr))
+        return "\n".join(linhas)
+
+
+class ProgramaIR:
+    # funcoes[0] é o programa principal (main)
+    # globais: {nome no IR: nome no fonte} das variáveis que ficam na memória
+    # mesmo sem aparecer em duas funções (compilação por unidades, onde a
+    # outra função tá em outra unidade)
+    def __init__(self, funcoes):
+        self.funcoes = funcoes
+        self.globais = {}
+
+    def principal(self):
+        return self.funcoes[0]
+
+    def num_instrucoes(self):
+        return sum(f.num_instrucoes() for f in self.funcoes)
+
+    def formatar(self):
+        return "\n\n".join(f.formatar() for f in self.funcoes)
+
+
+# ---------------- CFG e vivacidade ----------------
+
+def calcular_cfg(funcao):
+    # Liga sucessores/predecessores a partir dos terminadores
+    mapa = funcao.mapa_blocos()
+    for b in funcao.blocos:
+        b.sucessores = []
+        b.predecessores = []
+    for b in funcao.blocos:
+        term = b.terminador()
+        if term.op in ('salto', 'desvio'):
+            for alvo in term.alvos:
+                destino = mapa[alvo]
+                if destino not in b.sucessores:
+                    b.sucessores.append(destino)
+                    destino.predecessores.append(b)
+
+
+def calcular_vivas(funcao, vivas_na_saida=(), usos_chamada=()):
+    # Análise de vivacidade (de trás pra frente, até estabilizar)
+    # vivas_na_saida: nomes que continuam vivos depois do fim/retorno
+    # usos_chamada: nomes que toda chamada de função pode ler (globais)
+    # Retorna ({bloco: vivas na entrada}, {bloco: vivas na saída})
+    calcular_cfg(funcao)
+    usa = {}
+    define = {}
+    for b in funcao.blocos:
+        u = set()
+        d = set()
+        for instr in b.instrs:
+            usos = instr.usos()
+            if instr.op == 'chamar':
+                usos = usos + list(usos_chamada)
+            for nome in usos:
+                if nome not in d:
+                    u.add(nome)
+            if instr.dest is not None:
+                d.add(instr.dest)
+        usa[b] = u
+        define[b] = d
+
+    saida_final = set(vivas_na_saida)
+    entrada = {b: set() for b in funcao.blocos}
+    saida = {b: set() for b in funcao.blocos}
+    mudou = True
+    while mudou:
+        mudou = False
+        for b in reversed(funcao.blocos):
+            if b.sucessores:
+                novo_saida = set()
+                for s in b.sucessores:
+                    novo_saida |= entrada[s]
+            else:
+                novo_saida = set(saida_final)
+            novo_entrada = usa[b] | (novo_saida - define[b])
+            if novo_saida != saida[b] or novo_entrada != entrada[b]:
+                saida[b] = novo_saida
+                entrada[b] = novo_entrada
+                mudou = True
+    return entrada, saida
+
+
+def nomes_compartilhados(programa):
+    # Variáveis que aparecem em mais de uma função (as do programa principal
+    # que as funções leem/escrevem): são as globais, que uma chamada pode
+    # mudar e que ficam na memória, não em registrador
+    vistos = set()
+    compartilhados = set(programa.globais)
+    for funcao in programa.funcoes:
+        for nome in funcao.tipos:
+            if nome.startswith('%'):
+                continue
+            if nome in vistos:
+                compartilhados.add(nome)
+            vistos.add(nome)
+    return compartilhados
+
+
+def blocos_alcancaveis(funcao):
+    calcular_cfg(funcao)
+    vistos = set()
+    pendentes = [funcao.blocos[0]]
+    while pendentes:
+        b = pendentes.pop()
+        if b in vistos:
+            continue
+        vistos.add(b)
+        pendentes.extend(b.sucessores)
+    return vistos
+
+
+def pos_ordem_reversa(funcao):
+    # Blocos alcançáveis em pós-ordem reversa (todo bloco vem depois dos
+    # seus predecessores, tirando as arestas de volta); usa o CFG já calculado
+    ordem = []
+    vistos = {funcao.blocos[0]}
+    pilha = [(funcao.blocos[0], iter(funcao.blocos[0].sucessores))]
+    while pilha:
+        bloco, sucessores = pilha[-1]
+        for s in sucessores:
+            if s not in vistos:
+                vistos.add(s)
+                pilha.append((s, iter(s.sucessores)))
+                break
+        else:
+            pilha.pop()
+            ordem.append(bloco)
+    ordem.reverse()
+    return ordem
+
+
+# ---------------- Construção a partir da AST ----------------
+
+class ConstrutorIR:
+    def __init__(self):
+        self.cont_temps = 0
+        self.rotulos = Rotulos()
+        self.nomes = {}       # declaração -> nome no IR
+        self.usados = set()
+        self.funcoes = []
+        self.funcao = None
+        self.atual = None     # bloco onde as instruções estão entrando
+
+    def construir(self, arvore, globais=()):
+        principal = FuncaoIR('main')
+        self.funcoes.append(principal)
+        self.entrar_funcao(principal)
+        self.gerar_comandos(arvore.comandos)
+        self.terminar(Instr('fim'))
+        programa = ProgramaIR(self.funcoes)
+        for decl in globais:
+            # Global que ninguém usa nessa unidade não tem nome no IR
+            if decl in self.nomes:
+                programa.globais[self.nomes[decl]] = decl.nome
+        return programa
+
+    # ---- auxiliares ----
+
+    def entrar_funcao(self, funcao):
+        self.funcao = funcao
+        self.iniciar(self.novo_bloco("ENTRADA_" + funcao.nome))
+
+    def novos_blocos(self, *prefixos):
+        # Blocos de uma mesma construção (rótulos com o mesmo número)
+        return [Bloco(nome) for nome in self.rotulos.novos(*prefixos)]
+
+    def novo_bloco(self, prefixo):
+        return self.novos_blocos(prefixo)[0]
+
+    def iniciar(self, bloco):
+        # Começa a emitir no bloco (entra no fim da ordem de emissão)
+        self.funcao.blocos.append(bloco)
+        self.atual = bloco
+
+    def emitir(self, instr):
+        self.atual.instrs.append(instr)
+
+    def terminar(self, instr):
+        self.atual.instrs.append(instr)
+        self.atual = None
+
+    def saltar(self, bloco):
+        self.terminar(Instr('salto', alvos=[bloco.nome]))
+
+    def novo_temp(self, tipo):
+        self.cont_temps += 1
+        nome = "%" + str(self.cont_temps)
+        self.funcao.tipos[nome] = tipo
+        return nome
+
+    def nome_var(self, no):
+        # Nome da variável no IR (cada declaração tem o seu)
+        decl = no.decl if not isinstance(no, DeclVar) else no
+        chave = decl if decl is not None else no.nome
+        if chave not in self.nomes:
+            nome = no.nome
+            n = 1
+            while nome in self.usados:
+                n += 1
+                nome = no.nome + "." + str(n)
+            self.usados.add(nome)
+            self.nomes[chave] = nome
+        nome = self.nomes[chave]
+        self.funcao.tipos[nome] = tipo_var(decl)
+        return nome
+
+    # ---- comandos ----
+
+    def gerar_comandos(self, comandos):
+        for cmd in comandos:
+            if self.atual is None:
+                # Código depois de um terminador: bloco novo (inalcançável)
+                self.iniciar(self.novo_bloco("MORTO"))
+            self.gerar_cmd(cmd)
+
+    def gerar_cmd(self, cmd):
+        if isinstance(cmd, DeclVar):
+            nome = self.nome_var(cmd)
+            if cmd.valor is not None:
+                self.atribuir(nome, cmd.valor)
+
+        elif isinstance(cmd, DeclFuncao):
+            self.gerar_funcao(cmd)
+
+        elif isinstance(cmd, Atribuicao):
+            self.atribuir(self.nome_var(cmd), cmd.expr)
+
+        elif isinstance(cmd, Escrita):
+            self.emitir(Instr('escrever', args=[self.gerar_expr(cmd.expr)]))
+
+        elif isinstance(cmd, Leitura):
+            self.emitir(Instr('ler', self.nome_var(cmd)))
+
+        elif isinstance(cmd, ExprCmd):
+            self.gerar_expr(cmd.expr)
+
+        elif isinstance(cmd, Se):
+            entao, senao, fim = self.novos_blocos("ENTAO", "SENAO", "FIM_IF")
+            if cmd.senao is None:
+                senao = fim
+            self.gerar_desvio(cmd.cond, entao, senao, cmd.origem)
+            self.iniciar(entao)
+            self.gerar_comandos(cmd.entao)
+            if self.atual is not None:
+                self.saltar(fim)
+            if cmd.senao is not None:
+                self.iniciar(senao)
+                self.gerar_comandos(cmd.senao)
+                if self.atual is not None:
+                    self.saltar(fim)
+            self.iniciar(fim)
+
+        elif isinstance(cmd, Enquanto):
+            teste, corpo, fim = self.novos_blocos("INICIO_WHILE", "CORPO_WHILE", "FIM_WHILE")
+            self.saltar(teste)
+            self.iniciar(teste)
+            self.gerar_desvio(cmd.cond, corpo, fim, cmd.origem)
+            self.iniciar(corpo)
+            self.gerar_comandos(cmd.corpo)
+            if self.atual is not None:
+                self.saltar(teste)
+            self.iniciar(fim)
+
+        elif isinstance(cmd, Para):
+            teste, corpo, passo, fim = self.novos_blocos("INICIO_FOR", "CORPO_FOR", "PASSO_FOR",
+                                                        "FIM_FOR")
+            self.gerar_cmd(cmd.inicio)
+            self.saltar(teste)
+            self.iniciar(teste)
+            if cmd.cond is not None:
+                self.gerar_desvio(cmd.cond, corpo, fim, cmd.origem)
+            else:
+                self.saltar(corpo)
+            self.iniciar(corpo)
+            self.gerar_comandos(cmd.corpo)
+            if self.atual is not None:
+                self.saltar(passo)
+            self.iniciar(passo)
+            self.gerar_cmd(cmd.passo)
+            self.saltar(teste)
+            self.iniciar(fim)
+
+    def gerar_funcao(self, decl):
+        # Cada função vira uma FuncaoIR separada; o programa principal
+        # continua no bloco onde estava
+        anterior_funcao, anterior_bloco = self.funcao, self.atual
+        funcao = FuncaoIR(decl.nome)
+        self.funcoes.append(funcao)
+        self.entrar_funcao(funcao)
+        funcao.params = [self.nome_var(p) for p in decl.params]
+        self.gerar_comandos(decl.corpo)
+        if self.atual is not None:
+            self.terminar(Instr('retorno'))
+        self.funcao, self.atual = anterior_funcao, anterior_bloco
+
+    def atribuir(self, nome, expr):
+        valor = self.converter(self.gerar_expr(expr), expr.tipo, self.funcao.tipos[nome])
+        self.emitir(Instr('mov', nome, [valor]))
+
+    def gerar_desvio(self, cond, verdadeiro, falso, origem=None, direto=True):
+        # Termina o bloco atual desviando conforme a condição
+        # Comparação vira um desvio só (a b<cond> do MIPS), sem 0/1 no meio
+        # origem/direto: ver Instr.origem (o ! troca os alvos de lado)
+        marca = (origem, direto) if origem is not None else None
+        if isinstance(cond, Binaria) and cond.op in OPERADORES_RELACIONAIS:
+            a, b = self.operandos(cond)
+            self.terminar(Instr('desvio', args=[a, b], alvos=[verdadeiro.nome, falso.nome],
+                                cond=cond.op, origem=marca))
+        elif isinstance(cond, Unaria) and cond.op == 'neg':
+            self.gerar_desvio(cond.expr, falso, verdadeiro, origem, not direto)
+        elif isinstance(cond, Logico):
+            self.saltar(verdadeiro if cond.valor else falso)
+        else:
+            a = self.gerar_expr(cond)
+            self.terminar(Instr('desvio', args=[a, Const(0, 'inteiro')],
+                                alvos=[verdadeiro.nome, falso.nome], cond='ne', origem=marca))
+
+    # ---- expressões ----
+
+    def converter(self, operando, de, para):
+        # inteiro -> flutuante quando precisa (constante já sai convertida)
+        if para != 'flutuante' or de == 'flutuante':
+            return operando
+        if isinstance(operando, Const):
+            return Const(flutuante_32(float(operando.valor)), 'flutuante')
+        t = self.novo_temp('flutuante')
+        self.emitir(Instr('cvt', t, [operando]))
+        return t
+
+    def operandos(self, expr):
+        # Os dois lados de uma Binaria, convertidos pra flutuante se um deles for
+        a = self.fixar(self.gerar_expr(expr.esq), [expr.dir])
+        b = self.gerar_expr(expr.dir)
+        if 'flutuante' in (expr.esq.tipo, expr.dir.tipo):
+            a = self.converter(a, expr.esq.tipo, 'flutuante')
+            b = self.converter(b, expr.dir.tipo, 'flutuante')
+        return a, b
+
+    def fixar(self, operando, depois):
+        # Variável lida antes de uma expressão que pode mudar ela (x++,
+        # chamada que mexe numa global) vale o valor de antes: copia num
+        # temporário (igual ao gerador da AST)
+        if isinstance(operando, Const) or operando.startswith('%'):
+            return operando
+        if not any(tem_efeito(e) for e in depois):
+            return operando
+        t = self.novo_temp(self.funcao.tipos[operando])
+        self.emitir(Instr('mov', t, [operando]))
+        return t
+
+    def gerar_expr(self, expr):
+        # Devolve o operando (nome ou Const) com o valor da expressão
+        if isinstance(expr, Num):
+            if expr.tipo == 'flutuante' or '.' in expr.lexema:
+                return Const(flutuante_32(float(expr.lexema)), 'flutuante')
+            return Const(int(expr.lexema), 'inteiro')
+
+        if isinstance(expr, Cadeia):
+            return Const(expr.lexema, 'cadeia')
+
+        if isinstance(expr, Logico):
+            return Const(1 if expr.valor else 0, 'lógico')
+
+        if isinstance(expr, Var):
+            return self.nome_var(expr)
+
+        if isinstance(expr, IncDec):
+            # Vale o valor antigo: t = x; x = x +/- 1
+            nome = self.nome_var(expr)
+            t = self.novo_temp('inteiro')
+            self.emitir(Instr('mov', t, [nome]))
+            op = 'mais' if expr.op == 'inc' else 'menos'
+            self.emitir(Instr(op, nome, [nome, Const(1, 'inteiro')]))
+            return t
+
+        if isinstance(expr, Unaria):
+            a = self.gerar_expr(expr.expr)
+            t = self.novo_temp(expr.tipo or 'inteiro')
+            self.emitir(Instr('neg' if expr.op == 'menos' else 'nao', t, [a]))
+            return t
+
+        if isinstance(expr, Binaria) and expr.op == 'concat':
+            # Os dois lados são literais (o verificador de tipos garante)
+            a = self.gerar_expr(expr.esq)
+            b = self.gerar_expr(expr.dir)
+            return Const(a.valor[:-1] + b.valor[1:], 'cadeia')
+
+        if isinstance(expr, Binaria):
+            a, b = self.operandos(expr)
+            t = self.novo_temp(expr.tipo or 'inteiro')
+            self.emitir(Instr(expr.op, t, [a, b]))
+            return t
+
+        if isinstance(expr, Chamada):
+            args = [self.fixar(self.gerar_expr(arg), expr.args[i + 1:])
+                    for i, arg in enumerate(expr.args)]
+            t = self.novo_temp('inteiro')
+            self.emitir(Instr('chamar', t, args, alvos=[expr.nome], origem=expr.origem))
+            return t
+
+        raise Exception("Expressao nao suportada no codigo intermediario: " + repr(expr))
+
+
+def tipo_var(decl):
+    if isinstance(decl, DeclVar) and decl.tipo != 'var':
+        return decl.tipo
+    return 'inteiro'
+
+
+def tem_efeito(expr):
+    # A expressão muda alguma variável quando é avaliada? (x++, chamada)
+    if isinstance(expr, IncDec) or isinstance(expr, Chamada):
+        return True
+    if isinstance(expr, Binaria):
+        return tem_efeito(expr.esq) or tem_efeito(expr.dir)
+    if isinstance(expr, Unaria):
+        return tem_efeito(expr.expr)
+    return False
+
+
+def construir_ir(arvore, globais=()):
+    # AST (já verificada e tipada) -> ProgramaIR
+    # globais: DeclVar que têm que ficar na memória (ver ProgramaIR.globais)
+    return ConstrutorIR().construir(arvore, globais)
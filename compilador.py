@@ -0,0 +1,392 @@
+# COMPILADOR (PIPELINE COMPLETO E COMPILAÇÃO INCREMENTAL)
+# compilar(): código fonte -> assembly, passando por todas as fases
+# (léxico, sintático, semântica, tipos, geração no nível pedido), sem imprimir nada
+# CompiladorIncremental: divide o programa em unidades (cada fun do nível de
+# cima e o programa principal), compila cada uma sozinha e guarda o
+# resultado num cache em disco; na próxima vez só recompila a unidade cujo
+# hash mudou e junta (liga) tudo no .asm final
+# Como uma unidade compila sozinha:
+#   - função: as declarações do nível de cima que vêm antes dela (globais
+#     "tipo nome;" e assinaturas "fun g(a, b) { 0; }") + a própria função
+#   - principal: o programa inteiro com o corpo das funções trocado por { 0; }
+# As globais que alguma função usa ficam no .data com rótulo fixo
+# (var_<nome>), então todas as unidades acham a mesma variável; os rótulos
+# internos de cada função ganham o prefixo "U_<nome>_" na ligação
+# A chave do cache é o hash dos tokens da unidade (tipo e lexema, sem a
+# linha: mexer numa função não invalida as de baixo), do nível e da versão
+# do compilador (hash dos fontes dos módulos)
+# Otimização guiada por perfil: coletar_perfil() faz o build instrumentado e
+# roda; compilar(..., perfil=...) usa as contagens (otimizacao_perfil.py)
+
+import hashlib
+import json
+import os
+import re
+
+from analisador_lexico import Lexico, Token
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import analisar_semantica_arvore
+from analisador_tipos import verificar_tipos
+from arvore_sintatica import DeclVar
+from codigo_intermediario import construir_ir
+from otimizador import GerenciadorPassos
+from expansao_inline import ExpansorInline
+from gerador_codigo_mips import GeradorMIPS
+from interpretador_mips import InterpretadorMIPS
+from otimizacao_perfil import numerar_origens, montar_perfil, desenrolar_lacos, ordenar_blocos
+
+# Módulos que entram na versão do compilador (mudou um, o cache todo vale
+# como velho)
+MODULOS_COMPILADOR = [
+    'analisador_lexico.py', 'analisador_sintatico.py', 'analisador_sintatico_slr.py',
+    'gerador_tabela_slr.py', 'analisador_semantico.py', 'analisador_tipos.py', 'arvore_sintatica.py',
+    'codigo_intermediario.py', 'otimizador.py', 'lacos.py', 'alocador_registradores.py',
+    'expansao_inline.py', 'gerador_codigo_mips.py', 'peephole.py', 'rotulos.py',
+    'otimizacao_perfil.py', 'compilador.py',
+]
+
+# Tipos de token que começam uma declaração de variável
+TIPOS_DECLARACAO = frozenset(['var', 'inteiro', 'flutuante', 'cadeia', 'lógico'])
+
+_versao = None
+
+
+def versao_compilador():
+    global _versao
+    if _versao is None:
+        h = hashlib.sha256()
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        for nome in MODULOS_COMPILADOR:
+            caminho = os.path.join(pasta, nome)
+            if os.path.exists(caminho):
+                with open(caminho, 'rb') as f:
+                    h.update(f.read())
+        _versao = h.hexdigest()[:16]
+    return _versao
+
+
+# ---------------- Pipeline ----------------
+
+def analisar(tokens):
+    # Tokens -> AST resolvida e tipada; devolve (arvore, erros)
+    arvore, erros = AnalisadorSintatico().analisar_arvore(tokens)
+    if erros:
+        return None, erros
+    erros, _ = analisar_semantica_arvore(arvore)
+    if not erros:
+        erros = verificar_tipos(arvore)
+    if erros:
+        return None, erros
+    return arvore, []
+
+
+def gerar(arvore, nivel=2, desativados=(), globais=(), expandir=True, gerador=None, perfil=None):
+    # AST -> assembly no nível pedido (mesmo caminho do main.py)
+    # globais: DeclVar que ficam no .data com rótulo fixo
+    # expandir: expansão inline no nível >= 1
+    # perfil: Perfil do build instrumentado (otimizacao_perfil.py) pra
+    # guiar a expansão inline, o desenrolamento e a ordem dos blocos
+    chamadas = None
+    if perfil is not None:
+        if numerar_origens(arvore) != perfil.assinatura:
+            raise Exception("O perfil foi gerado pra outro programa (assinatura diferente)")
+        chamadas = perfil.chamadas
+    if nivel >= 1 and expandir:
+        ExpansorInline(chamadas=chamadas).expandir(arvore)
+    if gerador is None:
+        gerador = GeradorMIPS(nivel)
+    if nivel >= 2:
+        if perfil is not None:
+            desenrolar_lacos(arvore, perfil)
+        ir = construir_ir(arvore, globais)
+        GerenciadorPassos(desativados=desativados).executar(ir)
+        if perfil is not None:
+            ordenar_blocos(ir, perfil)
+        return gerador.gerar_codigo_ir(ir)
+    return gerador.gerar_codigo_arvore(arvore, globais)
+
+
+def compilar(codigo, nivel=2, desativados=(), perfil=None):
+    # Código fonte -> (assembly, erros); assembly None se tiver erro
+    tokens, erros = Lexico().analisar_compacto(codigo)
+    if erros:
+        return None, erros
+    arvore, erros = analisar(tokens)
+    if erros:
+        return None, erros
+    return gerar(arvore, nivel, desativados, perfil=perfil), []
+
+
+# ---------------- Perfil (PGO) ----------------
+
+def compilar_instrumentado(codigo, desativados=()):
+    # Build instrumentado do PGO: nível 2 sem expansão inline (toda chamada
+    # continua chamada, pra ser contada), todo bloco com rótulo e sem
+    # peephole. Devolve (assembly, IR, assinatura, erros)
+    tokens, erros = Lexico().analisar_compacto(codigo)
+    if erros:
+        return None, None, None, erros
+    arvore, erros = analisar(tokens)
+    if erros:
+        return None, None, None, erros
+    assinatura = numerar_origens(arvore)
+    ir = construir_ir(arvore)
+    GerenciadorPassos(desativados=desativados).executar(ir)
+    asm = GeradorMIPS(2, rotular_blocos=True).gerar_codigo_ir(ir)
+    return asm, ir, assinatura, []
+
+
+def coletar_perfil(codigo, entradas=None, limite=None, desativados=()):
+    # Compila instrumentado, roda no interpretador MIPS e devolve
+    # (Perfil, erros); entradas/limite como no InterpretadorMIPS.executar
+    asm, ir, assinatura, erros = compilar_instrumentado(codigo, desativados)
+    if erros:
+        return None, erros
+    execucao = InterpretadorMIPS(asm, contar_desvios=True).executar(entradas, limite)
+    return montar_perfil(ir, execucao, assinatura), []
+
+
+# ---------------- Unidades ----------------
+
+class Unidade:
+    # nome: 'main' ou o nome da função
+    # tokens: programa (lista de tokens) que compila a unidade sozinha
+    # globais: nomes das globais que ficam no .data com rótulo fixo
+    def __init__(self, nome, tokens, globais):
+        self.nome = nome
+        self.tokens = tokens
+        self.globais = globais
+
+    def chave(self, nivel):
+        h = hashlib.sha256()
+        h.update((versao_compilador() + "\0" + str(nivel) + "\0").encode())
+        h.update(("\0".join(sorted(self.globais)) + "\0\0").encode())
+        for tk in self.tokens:
+            h.update((tk.tipo + "\0" + str(len(tk.lexema)) + ":" + tk.lexema).encode())
+        return h.hexdigest()
+
+
+def _sintetico(tipo, lexema, perto):
+    # Token que não tá no fonte (cabeçalho da unidade), na linha de "perto"
+    return Token(tipo, lexema, perto.linha, perto.coluna)
+
+
+def _fim_funcao(tokens, i):
+    # Índice logo depois do '}' que fecha a função que começa em i
+    n = len(tokens)
+    while i < n and tokens[i].tipo != 'ab':
+        i += 1
+    nivel = 0
+    while i < n:
+        if tokens[i].tipo == 'ab':
+            nivel += 1
+        elif tokens[i].tipo == 'fb':
+            nivel -= 1
+            if nivel == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def dividir_unidades(tokens):
+    # Tokens do programa -> [Unidade principal, Unidade de cada função]
+    tokens = list(tokens)
+    principal = []
+    cabecalho = []     # declarações do nível de cima vistas até aqui
+    globais = []
+    funcoes = []
+    chaves = 0
+    parenteses = 0
+    i = 0
+    while i < len(tokens):
+        tk = tokens[i]
+        if chaves == 0 and parenteses == 0 and tk.tipo == 'fun':
+            fim = _fim_funcao(tokens, i)
+            abre = i
+            while abre < fim and tokens[abre].tipo != 'ab':
+                abre += 1
+            nome = tokens[i + 1].lexema if i + 1 < fim else 'fun'
+            funcoes.append((nome, cabecalho + tokens[i:fim], list(globais)))
+            # Corpo vazio não passa na gramática: a assinatura leva "{ 0; }"
+            assinatura = tokens[i:abre] + [_sintetico('ab', '{', tk), _sintetico('num', '0', tk),
+                                           _sintetico('pv', ';', tk), _sintetico('fb', '}', tk)]
+            principal.extend(assinatura)
+            cabecalho = cabecalho + assinatura
+            i = fim
+            continue
+        if (chaves == 0 and parenteses == 0 and tk.tipo in TIPOS_DECLARACAO
+                and i + 1 < len(tokens) and tokens[i + 1].tipo == 'id'):
+            globais.append(tokens[i + 1].lexema)
+            cabecalho = cabecalho + [tk, tokens[i + 1], _sintetico('pv', ';', tk)]
+        if tk.tipo == 'ab':
+            chaves += 1
+        elif tk.tipo == 'fb':
+            chaves -= 1
+        elif tk.tipo == 'ap':
+            parenteses += 1
+        elif tk.tipo == 'fp':
+            parenteses -= 1
+        principal.append(tk)
+        i += 1
+
+    # Global que aparece em alguma função vai pro .data também no principal
+    usadas = set()
+    for _, toks, _ in funcoes:
+        usadas.update(tk.lexema for tk in toks if tk.tipo == 'id')
+    unidades = [Unidade('main', principal, [g for g in globais if g in usadas])]
+    for nome, toks, visiveis in funcoes:
+        unidades.append(Unidade(nome, toks, visiveis))
+    return unidades
+
+
+# ---------------- Ligação ----------------
+
+def separar_asm(asm):
+    # Assembly completo -> (linhas do .data, linhas do .text)
+    dados = []
+    texto = []
+    secao = None
+    for linha in asm.split('\n'):
+        s = linha.strip()
+        if s == '.data' or s == '.text':
+            secao = s
+        elif s.startswith('.globl') or not s:
+            continue
+        elif secao == '.data':
+            dados.append(linha)
+        else:
+            texto.append(linha)
+    return dados, texto
+
+
+def rotinas_da_unidade(texto, propria, rotinas, entradas):
+    # Linhas das rotinas que são da unidade: a própria (propria) e as que
+    # não são entrada de outra unidade (funções aninhadas); as de fora
+    # (assinaturas do cabeçalho, main) ficam de fora
+    # rotinas: rótulos de entrada de todas as rotinas do assembly
+    saida = []
+    dentro = False
+    for linha in texto:
+        s = linha.strip()
+        if s.endswith(':') and s[:-1] in rotinas:
+            dentro = s[:-1] == propria or s[:-1] not in entradas
+        if dentro:
+            saida.append(linha)
+    return saida
+
+
+def relocar(dados, texto, prefixo, exportados):
+    # Põe o prefixo nos rótulos definidos na unidade (menos os exportados)
+    definidos = set()
+    for linha in texto:
+        s = linha.strip()
+        if s.endswith(':'):
+            definidos.add(s[:-1])
+    for linha in dados:
+        definidos.add(linha.split(':')[0].strip())
+    mapa = {r: prefixo + r for r in definidos if r not in exportados}
+    if not mapa:
+        return dados, texto
+
+    def trocar(m):
+        return mapa.get(m.group(0), m.group(0))
+
+    dados = [prefixo + d.strip() if d.split(':')[0].strip() in mapa else d for d in dados]
+    texto = [re.sub(r'[A-Za-z_][A-Za-z0-9_.]*', trocar, linha) for linha in texto]
+    return dados, texto
+
+
+def ligar(partes):
+    # [(dados, texto)] na ordem (main primeiro) -> assembly final
+    # Entrada de .data repetida (a mesma global em duas unidades) sai uma vez
+    codigo = [".data"]
+    vistos = set()
+    for dados, _ in partes:
+        for d in dados:
+            rotulo = d.split(':')[0].strip()
+            if rotulo not in vistos:
+                vistos.add(rotulo)
+                codigo.append(d)
+    codigo.append("")
+    codigo.append(".text")
+    codigo.append(".globl main")
+    for _, texto in partes:
+        codigo.extend(texto)
+    return "\n".join(codigo)
+
+
+# ---------------- Compilação incremental ----------------
+
+class CompiladorIncremental:
+    # pasta: onde fica o cache (um .json por unidade, nome = chave)
+    # Depois de compilar: reusadas / compiladas = unidades que vieram do
+    # cache / que precisaram compilar
+    # Não tem expansão inline entre unidades (o principal só vê as
+    # assinaturas das funções)
+    def __init__(self, pasta, nivel=2, desativados=()):
+        self.pasta = pasta
+        self.nivel = nivel
+        self.desativados = desativados
+        self.reusadas = 0
+        self.compiladas = 0
+
+    def compilar(self, codigo):
+        # Código fonte -> (assembly, erros); assembly None se tiver erro
+        self.reusadas = 0
+        self.compiladas = 0
+        tokens, erros = Lexico().analisar(codigo)
+        if erros:
+            return None, erros
+        unidades = dividir_unidades(tokens)
+        entradas = set(["main"] + ["fun_" + u.nome for u in unidades[1:]])
+
+        partes = []
+        todos_erros = []
+        for unidade in unidades:
+            parte, erros = self.compilar_unidade(unidade, entradas)
+            if erros:
+                todos_erros.extend(erros)
+            else:
+                partes.append(parte)
+        if todos_erros:
+            return None, todos_erros
+        return ligar(partes), []
+
+    def compilar_unidade(self, unidade, entradas):
+        # (dados, texto) da unidade, do cache ou compilando agora
+        chave = unidade.chave(self.nivel)
+        caminho = os.path.join(self.pasta, chave + ".json")
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, encoding="utf-8") as f:
+                    salvo = json.load(f)
+                self.reusadas += 1
+                return (salvo["dados"], salvo["texto"]), []
+            except (OSError, ValueError, KeyError):
+                pass  # Entrada estragada: compila de novo
+
+        arvore, erros = analisar(unidade.tokens)
+        if erros:
+            return None, erros
+        globais = [c for c in arvore.comandos
+                   if isinstance(c, DeclVar) and c.nome in unidade.globais]
+        gerador = GeradorMIPS(self.nivel)
+        asm = gerar(arvore, self.nivel, self.desativados, globais, False, gerador)
+        dados, texto = separar_asm(asm)
+        rotinas = set(["main"] + list(gerador.rotulos_funcao.values()))
+        if unidade.nome == 'main':
+            texto = rotinas_da_unidade(texto, "main", rotinas, entradas)
+        else:
+            texto = rotinas_da_unidade(texto, "fun_" + unidade.nome, rotinas, entradas)
+            exportados = entradas | set("var_" + g for g in unidade.globais)
+            dados, texto = relocar(dados, texto, "U_" + unidade.nome + "_", exportados)
+        self.compiladas += 1
+
+        # Grava num temporário e renomeia: outro processo usando o mesmo
+        # cache nunca lê um .json pela metade
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = caminho + "." + str(os.getpid()) + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"dados": dados, "texto": texto}, f)
+        os.replace(temporario, caminho)
+        return (dados, texto), []
@@ -0,0 +1,176 @@
+# COMPILAÇÃO EM LOTE (LINHA DE COMANDO)
+# Compila vários programas de uma vez, em paralelo (um processo por núcleo):
+#   python compilar_lote.py prog1.txt prog2.txt pasta/ -O2 -j 8 -o saida/
+# Cada entrada gera um .asm (mesmo nome, extensão trocada), do lado do
+# fonte ou dentro de -o (pasta passada como entrada mantém as subpastas)
+# Se duas entradas diferentes forem dar no mesmo .asm (a/p.txt e b/p.txt
+# com -o saida/ viram saida/p.asm) nada é compilado: sai com erro listando
+# quem colide
+# Os diagnósticos de cada arquivo voltam pro processo principal e são
+# impressos juntos, na ordem das entradas, então a saída não se mistura
+# Código de saída: 0 se tudo compilou, 1 se algum arquivo falhou
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from compilador import compilar, CompiladorIncremental
+from otimizador import PASSOS
+
+
+class Tarefa:
+    # Um arquivo pra compilar (vai pro processo filho, então só tem dado simples)
+    def __init__(self, entrada, saida, nivel, desativados, cache):
+        self.entrada = entrada
+        self.saida = saida
+        self.nivel = nivel
+        self.desativados = desativados
+        self.cache = cache
+
+
+class Resultado:
+    # erros: mensagens do compilador (ou da leitura/escrita do arquivo)
+    def __init__(self, entrada, saida, erros, tempo):
+        self.entrada = entrada
+        self.saida = saida
+        self.erros = erros
+        self.tempo = tempo
+
+
+def compilar_arquivo(tarefa):
+    # Roda no processo filho: lê, compila, grava o .asm
+    inicio = time.perf_counter()
+    try:
+        with open(tarefa.entrada, encoding="utf-8") as f:
+            codigo = f.read()
+        if tarefa.cache:
+            asm, erros = CompiladorIncremental(tarefa.cache, tarefa.nivel,
+                                               tarefa.desativados).compilar(codigo)
+        else:
+            asm, erros = compilar(codigo, tarefa.nivel, tarefa.desativados)
+        if not erros:
+            pasta = os.path.dirname(tarefa.saida)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with open(tarefa.saida, "w", encoding="utf-8") as f:
+                f.write(asm)
+    except Exception as e:
+        # Erro de E/S ou do próprio compilador: conta como falha do arquivo
+        # e o lote continua
+        erros = [type(e).__name__ + ": " + str(e)]
+    return Resultado(tarefa.entrada, tarefa.saida, erros, time.perf_counter() - inicio)
+
+
+def listar_entradas(caminhos, extensao):
+    # [(arquivo, caminho relativo pra saída)]; pasta entra com todos os
+    # arquivos da extensão, recursivo e em ordem
+    entradas = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            achados = []
+            for raiz, _, arquivos in os.walk(caminho):
+                for nome in arquivos:
+                    if nome.endswith(extensao):
+                        arquivo = os.path.join(raiz, nome)
+                        achados.append((arquivo, os.path.relpath(arquivo, caminho)))
+            entradas.extend(sorted(achados))
+        else:
+            entradas.append((caminho, os.path.basename(caminho)))
+    return entradas
+
+
+def caminho_saida(arquivo, relativo, pasta_saida):
+    base = os.path.splitext(relativo if pasta_saida else arquivo)[0] + ".asm"
+    return os.path.join(pasta_saida, base) if pasta_saida else base
+
+
+def saidas_repetidas(tarefas):
+    # {saída: [entradas]} das saídas que mais de uma entrada diferente
+    # gravaria (a mesma entrada passada duas vezes não conta)
+    por_saida = {}
+    for t in tarefas:
+        saida, entradas = por_saida.setdefault(os.path.normcase(os.path.abspath(t.saida)),
+                                               (t.saida, {}))
+        entradas.setdefault(os.path.normcase(os.path.abspath(t.entrada)), t.entrada)
+    return {saida: list(entradas.values()) for saida, entradas in por_saida.values()
+            if len(entradas) > 1}
+
+
+def nucleos():
+    # Núcleos que o processo pode usar (num container pode ser menos que a máquina)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def montar_argumentos():
+    p = argparse.ArgumentParser(description="Compila programas da linguagem pra assembly MIPS")
+    p.add_argument("entradas", nargs="+", help="arquivos fonte ou pastas")
+    p.add_argument("-O", dest="nivel", type=int, choices=[0, 1, 2], default=2,
+                   help="nivel de otimizacao (padrao: 2)")
+    p.add_argument("-o", dest="saida", default=None,
+                   help="pasta dos .asm (padrao: do lado de cada fonte)")
+    p.add_argument("-j", dest="processos", type=int, default=nucleos(),
+                   help="processos em paralelo (padrao: numero de nucleos)")
+    p.add_argument("--extensao", default=".txt",
+                   help="extensao dos fontes procurados nas pastas (padrao: .txt)")
+    p.add_argument("--desativar", action="append", default=[], choices=sorted(PASSOS),
+                   metavar="PASSO", help="passo do otimizador pra pular (pode repetir)")
+    p.add_argument("--cache", default=None,
+                   help="pasta do cache da compilacao incremental (sem ela, compila tudo)")
+    p.add_argument("-q", dest="silencioso", action="store_true",
+                   help="so mostra os arquivos com erro e o resumo")
+    return p
+
+
+def main(argv=None):
+    args = montar_argumentos().parse_args(argv)
+    entradas = listar_entradas(args.entradas, args.extensao)
+    if not entradas:
+        print("Nenhum arquivo pra compilar", file=sys.stderr)
+        return 1
+
+    tarefas = [Tarefa(arquivo, caminho_saida(arquivo, relativo, args.saida), args.nivel,
+                      tuple(args.desativar), args.cache)
+               for arquivo, relativo in entradas]
+    repetidas = saidas_repetidas(tarefas)
+    if repetidas:
+        for saida, arquivos in repetidas.items():
+            print("Saida repetida " + saida + ": " + ", ".join(arquivos), file=sys.stderr)
+        print("Mais de uma entrada gravaria o mesmo .asm; compile em lotes separados "
+              "ou passe as pastas como entrada (mantém as subpastas)", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    processos = max(1, min(args.processos, len(tarefas)))
+    if processos == 1:
+        resultados = [compilar_arquivo(t) for t in tarefas]
+    else:
+        # Lotes de vários arquivos por envio: com milhares de programas
+        # pequenos a troca de mensagens entre processos pesa mais que compilar
+        lote = max(1, len(tarefas) // (processos * 8))
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resultados = list(pool.map(compilar_arquivo, tarefas, chunksize=lote))
+    total = time.perf_counter() - inicio
+
+    falhas = 0
+    for r in resultados:
+        if r.erros:
+            falhas += 1
+            print("ERRO " + r.entrada)
+            for e in r.erros:
+                print("  - " + e)
+        elif not args.silencioso:
+            print("ok   " + r.entrada + " -> " + r.saida + " (" + format(r.tempo * 1000, ".1f") + " ms)")
+
+    print("-" * 70)
+    print(str(len(resultados)) + " arquivo(s), " + str(len(resultados) - falhas) + " ok, " +
+          str(falhas) + " com erro, " + format(total, ".2f") + " s com " + str(processos) +
+          " processo(s)")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
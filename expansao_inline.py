@@ -0,0 +1,359 @@
+# EXPANSÃO INLINE DE FUNÇÕES
+# Troca a chamada de uma função pequena pelo corpo dela, direto na AST (as
+# duas gerações, pela AST e pelo código intermediário, aproveitam):
+#   soma(x, 10);   ->   inteiro a = x; inteiro b = 10;
+#                       inteiro resultado; resultado = a + b;
+# Cada cópia ganha declarações novas (parâmetros e locais), então duas
+# cópias não se misturam; variável de fora da função continua a mesma
+# Só expande chamada que é um comando sozinho (f(...); ou x = f(...);):
+# a função sempre vale 0, então x = f(...) vira o corpo e depois x = 0.
+# Chamada no meio de uma expressão continua sendo chamada
+# Quando expandir:
+#   - corpo até limite_tamanho nós: sempre (é menor que a própria chamada)
+#   - dentro de laço: até 2 * limite_tamanho (a chamada roda muitas vezes)
+#   - função chamada num lugar só: até limite_unica (a rotina some, então
+#     o código não cresce)
+#   - função recursiva (direta ou indireta) nunca, e o programa não cresce
+#     mais que limite_crescimento nós no total
+# Com perfil (chamadas: {origem da Chamada: vezes que rodou}, ver
+# otimizacao_perfil.py), além das regras acima:
+#   - chamada quente (pelo menos FRACAO_QUENTE da mais executada): até
+#     limite_unica, como se fosse a única
+#   - chamada que nunca rodou: só se o corpo for menor que a chamada
+# Função que teve todas as chamadas expandidas é tirada da AST
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Num, Cadeia, Logico, Var, Binaria, Unaria,
+                              Chamada, IncDec)
+
+LIMITE_TAMANHO = 24
+LIMITE_UNICA = 200
+LIMITE_CRESCIMENTO = 400
+FRACAO_QUENTE = 0.1
+
+
+class ExpansorInline:
+    def __init__(self, limite_tamanho=LIMITE_TAMANHO, limite_unica=LIMITE_UNICA,
+                 limite_crescimento=LIMITE_CRESCIMENTO, chamadas=None):
+        self.limite_tamanho = limite_tamanho
+        self.limite_unica = limite_unica
+        self.limite_crescimento = limite_crescimento
+        self.chamadas = chamadas
+        self.expandidas = 0
+        self.removidas = 0
+        self.crescimento = 0
+
+    def expandir(self, arvore):
+        # Expande as chamadas do programa (mexe na própria AST) e devolve
+        # quantas foram expandidas
+        funcoes = coletar_funcoes(arvore.comandos)
+        self.recursivas = funcoes_recursivas(funcoes)
+        self.arvore = arvore
+        self.feitas = set()
+        self.quente = None
+        if self.chamadas:
+            self.quente = max(1, FRACAO_QUENTE * max(self.chamadas.values()))
+
+        # Das chamadas pras chamadoras: quando o corpo de g é copiado pra
+        # dentro de f, as chamadas de g já foram expandidas
+        for decl in ordem_chamadas(funcoes):
+            decl.corpo = self.expandir_comandos(decl.corpo, False)
+        arvore.comandos = self.expandir_comandos(arvore.comandos, False)
+
+        # Tira as funções que não são mais chamadas (repete porque tirar uma
+        # pode deixar outra sem chamada)
+        while True:
+            chamadas = contar_chamadas(arvore.comandos)
+            sobra = [d for d in coletar_funcoes(arvore.comandos)
+                     if d in self.feitas and chamadas.get(d, 0) == 0]
+            if not sobra:
+                break
+            for decl in sobra:
+                remover_funcao(arvore.comandos, decl)
+                self.feitas.discard(decl)
+                self.removidas += 1
+        return self.expandidas
+
+    def expandir_comandos(self, comandos, em_laco):
+        novos = []
+        for cmd in comandos:
+            if isinstance(cmd, Se):
+                cmd.entao = self.expandir_comandos(cmd.entao, em_laco)
+                if cmd.senao is not None:
+                    cmd.senao = self.expandir_comandos(cmd.senao, em_laco)
+            elif isinstance(cmd, Enquanto) or isinstance(cmd, Para):
+                cmd.corpo = self.expandir_comandos(cmd.corpo, True)
+
+            chamada = None
+            if isinstance(cmd, ExprCmd) or isinstance(cmd, Atribuicao):
+                if isinstance(cmd.expr, Chamada):
+                    chamada = cmd.expr
+            if chamada is None or not self.vale_expandir(chamada, em_laco):
+                novos.append(cmd)
+                continue
+
+            novos.extend(self.copiar_chamada(chamada))
+            if isinstance(cmd, Atribuicao):
+                zero = Num("0", cmd.linha)
+                zero.tipo = 'inteiro'
+                cmd.expr = zero
+                novos.append(cmd)
+        return novos
+
+    def vale_expandir(self, chamada, em_laco):
+        decl = chamada.decl
+        if not isinstance(decl, DeclFuncao) or decl in self.recursivas:
+            return False
+        if any(isinstance(c, DeclFuncao) for c in percorrer_comandos(decl.corpo)):
+            # Função com função dentro fica como está
+            return False
+        t = tamanho(decl.corpo)
+        if self.crescimento + t > self.limite_crescimento:
+            return False
+        if t <= self.limite_tamanho:
+            return True
+        if self.chamadas is not None and chamada.origem in self.chamadas:
+            vezes = self.chamadas[chamada.origem]
+            if vezes == 0:
+                return False
+            if vezes >= self.quente and t <= self.limite_unica:
+                return True
+        if em_laco and t <= 2 * self.limite_tamanho:
+            return True
+        return t <= self.limite_unica and contar_chamadas(self.arvore.comandos).get(decl, 0) == 1
+
+    def copiar_chamada(self, chamada):
+        # Comandos que fazem o papel da chamada: um parâmetro novo por
+        # argumento (na ordem, então os efeitos dos argumentos continuam na
+        # mesma ordem) e a cópia do corpo
+        decl = chamada.decl
+        copia = CopiaCorpo()
+        comandos = []
+        for param, arg in zip(decl.params, chamada.args):
+            novo = DeclVar(param.tipo, param.nome, arg, chamada.linha)
+            copia.mapa[param] = novo
+            comandos.append(novo)
+        comandos.extend(copia.comandos(decl.corpo))
+        self.expandidas += 1
+        self.crescimento += tamanho(decl.corpo)
+        self.feitas.add(decl)
+        return comandos
+
+
+class CopiaCorpo:
+    # Copia comandos/expressões trocando as declarações pelas da cópia
+    # (mapa: DeclVar original -> DeclVar nova)
+    def __init__(self):
+        self.mapa = {}
+
+    def decl(self, decl):
+        return self.mapa.get(decl, decl)
+
+    def comandos(self, comandos):
+        return [self.comando(c) for c in comandos]
+
+    def comando(self, cmd):
+        if isinstance(cmd, DeclVar):
+            valor = self.expr(cmd.valor) if cmd.valor is not None else None
+            novo = DeclVar(cmd.tipo, cmd.nome, valor, cmd.linha)
+            self.mapa[cmd] = novo
+            return novo
+        if isinstance(cmd, Atribuicao):
+            novo = Atribuicao(cmd.nome, self.expr(cmd.expr), cmd.linha)
+            novo.decl = self.decl(cmd.decl)
+            return novo
+        if isinstance(cmd, Leitura):
+            novo = Leitura(cmd.nome, cmd.linha)
+            novo.decl = self.decl(cmd.decl)
+            return novo
+        if isinstance(cmd, Escrita):
+            return Escrita(self.expr(cmd.expr), cmd.linha)
+        if isinstance(cmd, ExprCmd):
+            return ExprCmd(self.expr(cmd.expr), cmd.linha)
+        if isinstance(cmd, Se):
+            senao = self.comandos(cmd.senao) if cmd.senao is not None else None
+            novo = Se(self.expr(cmd.cond), self.comandos(cmd.entao), senao, cmd.linha)
+        elif isinstance(cmd, Enquanto):
+            novo = Enquanto(self.expr(cmd.cond), self.comandos(cmd.corpo), cmd.linha)
+        elif isinstance(cmd, Para):
+            inicio = self.comando(cmd.inicio)
+            cond = self.expr(cmd.cond) if cmd.cond is not None else None
+            novo = Para(inicio, cond, self.comando(cmd.passo), self.comandos(cmd.corpo), cmd.linha)
+        else:
+            raise Exception("Comando nao suportado na expansao inline: " + repr(cmd))
+        # A cópia conta junto com o original no perfil
+        novo.origem = cmd.origem
+        return novo
+
+    def expr(self, expr):
+        if isinstance(expr, Num):
+            novo = Num(expr.lexema, expr.linha)
+        elif isinstance(expr, Cadeia):
+            novo = Cadeia(expr.lexema, expr.linha)
+        elif isinstance(expr, Logico):
+            novo = Logico(expr.valor, expr.linha)
+        elif isinstance(expr, Var):
+            novo = Var(expr.nome, expr.linha)
+            novo.decl = self.decl(expr.decl)
+        elif isinstance(expr, IncDec):
+            novo = IncDec(expr.nome, expr.op, expr.linha)
+            novo.decl = self.decl(expr.decl)
+        elif isinstance(expr, Binaria):
+            novo = Binaria(expr.op, self.expr(expr.esq), self.expr(expr.dir), expr.linha)
+        elif isinstance(expr, Unaria):
+            novo = Unaria(expr.op, self.expr(expr.expr), expr.linha)
+        elif isinstance(expr, Chamada):
+            novo = Chamada(expr.nome, [self.expr(a) for a in expr.args], expr.linha)
+            novo.decl = expr.decl
+            novo.origem = expr.origem
+        else:
+            raise Exception("Expressao nao suportada na expansao inline: " + repr(expr))
+        novo.tipo = expr.tipo
+        return novo
+
+
+# ---------------- Percursos na AST ----------------
+
+def percorrer_comandos(comandos):
+    # Todos os comandos, entrando em blocos (não entra em funções)
+    for cmd in comandos:
+        yield cmd
+        if isinstance(cmd, Se):
+            yield from percorrer_comandos(cmd.entao)
+            if cmd.senao is not None:
+                yield from percorrer_comandos(cmd.senao)
+        elif isinstance(cmd, Enquanto):
+            yield from percorrer_comandos(cmd.corpo)
+        elif isinstance(cmd, Para):
+            yield cmd.inicio
+            yield cmd.passo
+            yield from percorrer_comandos(cmd.corpo)
+
+
+def expressoes_do_comando(cmd):
+    if isinstance(cmd, DeclVar):
+        return [cmd.valor] if cmd.valor is not None else []
+    if isinstance(cmd, Atribuicao) or isinstance(cmd, Escrita) or isinstance(cmd, ExprCmd):
+        return [cmd.expr]
+    if isinstance(cmd, Se) or isinstance(cmd, Enquanto):
+        return [cmd.cond]
+    if isinstance(cmd, Para):
+        return [cmd.cond] if cmd.cond is not None else []
+    return []
+
+
+def percorrer_expr(expr):
+    yield expr
+    if isinstance(expr, Binaria):
+        yield from percorrer_expr(expr.esq)
+        yield from percorrer_expr(expr.dir)
+    elif isinstance(expr, Unaria):
+        yield from percorrer_expr(expr.expr)
+    elif isinstance(expr, Chamada):
+        for arg in expr.args:
+            yield from percorrer_expr(arg)
+
+
+def tamanho(comandos):
+    # Nós de comando e de expressão (a medida do orçamento)
+    n = 0
+    for cmd in percorrer_comandos(comandos):
+        n += 1
+        for expr in expressoes_do_comando(cmd):
+            n += sum(1 for _ in percorrer_expr(expr))
+    return n
+
+
+def coletar_funcoes(comandos):
+    # Todas as DeclFuncao, inclusive as de dentro de outras funções
+    funcoes = []
+    for cmd in percorrer_comandos(comandos):
+        if isinstance(cmd, DeclFuncao):
+            funcoes.append(cmd)
+            funcoes.extend(coletar_funcoes(cmd.corpo))
+    return funcoes
+
+
+def chamadas_em(comandos):
+    # Chamadas feitas nos comandos (sem entrar no corpo de outras funções)
+    for cmd in percorrer_comandos(comandos):
+        for expr in expressoes_do_comando(cmd):
+            for e in percorrer_expr(expr):
+                if isinstance(e, Chamada):
+                    yield e
+
+
+def contar_chamadas(comandos):
+    # {DeclFuncao: quantas chamadas no programa todo}
+    contagem = {}
+    blocos = [comandos] + [d.corpo for d in coletar_funcoes(comandos)]
+    for bloco in blocos:
+        for chamada in chamadas_em(bloco):
+            contagem[chamada.decl] = contagem.get(chamada.decl, 0) + 1
+    return contagem
+
+
+def grafo_chamadas(funcoes):
+    # {DeclFuncao: conjunto das funções que ela chama}
+    return {d: set(c.decl for c in chamadas_em(d.corpo) if isinstance(c.decl, DeclFuncao))
+            for d in funcoes}
+
+
+def funcoes_recursivas(funcoes):
+    # Funções que conseguem chegar nelas mesmas pelo grafo de chamadas
+    grafo = grafo_chamadas(funcoes)
+    recursivas = set()
+    for decl in funcoes:
+        vistos = set()
+        pendentes = list(grafo[decl])
+        while pendentes:
+            d = pendentes.pop()
+            if d is decl:
+                recursivas.add(decl)
+                break
+            if d in vistos or d not in grafo:
+                continue
+            vistos.add(d)
+            pendentes.extend(grafo[d])
+    return recursivas
+
+
+def ordem_chamadas(funcoes):
+    # Funções em pós-ordem do grafo de chamadas (quem é chamado vem antes)
+    grafo = grafo_chamadas(funcoes)
+    ordem = []
+    vistos = set()
+
+    def visitar(decl):
+        vistos.add(decl)
+        for d in grafo[decl]:
+            if d in grafo and d not in vistos:
+                visitar(d)
+        ordem.append(decl)
+
+    for decl in funcoes:
+        if decl not in vistos:
+            visitar(decl)
+    return ordem
+
+
+def remover_funcao(comandos, decl):
+    # Tira a declaração da função da lista (ou de um bloco dentro dela)
+    if decl in comandos:
+        comandos.remove(decl)
+        return True
+    for cmd in comandos:
+        if isinstance(cmd, Se):
+            if remover_funcao(cmd.entao, decl):
+                return True
+            if cmd.senao is not None and remover_funcao(cmd.senao, decl):
+                return True
+        elif isinstance(cmd, Enquanto) or isinstance(cmd, Para) or isinstance(cmd, DeclFuncao):
+            if remover_funcao(cmd.corpo, decl):
+                return True
+    return False
+
+
+def expandir_inline(arvore):
+    # Atalho: expande com os limites padrão
+    return ExpansorInline().expandir(arvore)
@@ -1,346 +1,1201 @@
-# gerador_codigo_mips.py
-# Gera código assembly MIPS a partir dos tokens do programa
-
-class GeradorMIPS:
-    def __init__(self):
-        self.codigo = []
-        self.vars = {}  # Mapeia nome da variável pro offset na pilha (positivo)
-        self.offset = 0
-
-    def gerar_codigo(self, tokens):
-        # Primeira passada: conta quantas variáveis tem pra alocar espaço
-        # Suporta inteiro, flutuante, cadeia e lógico
-        for i in range(len(tokens)):
-            if tokens[i].tipo in ['inteiro', 'flutuante', 'cadeia', 'lógico'] and i + 1 < len(tokens):
-                if tokens[i + 1].tipo == 'id':
-                    self.offset += 4
-                    self.vars[tokens[i + 1].lexema] = self.offset  
-
-        # Monta o cabeçalho do programa MIPS
-        self.codigo.append(".data")
-        self.codigo.append("")
-        self.codigo.append(".text")
-        self.codigo.append(".globl main")
-        self.codigo.append("main:")
-
-        # Aloca espaço na pilha pras variáveis
-        if self.offset > 0:
-            self.codigo.append("    addi $sp, $sp, -" + str(self.offset))
-
-        # Processa os tokens e gera o código
-        self.processar(tokens)
-
-        # Finaliza o programa
-        if self.offset > 0:
-            self.codigo.append("    addi $sp, $sp, " + str(self.offset))
-        self.codigo.append("    li $v0, 10")
-        self.codigo.append("    syscall")
-
-        return "\n".join(self.codigo)
-
-    def processar(self, tokens):
-        i = 0
-        while i < len(tokens):
-            # Pula declarações de variáveis (já foram processadas)
-            if tokens[i].tipo in ['inteiro', 'flutuante', 'cadeia', 'lógico']:
-                i += 3
-                continue
-
-            # Pula declaração de função inteira
-            if tokens[i].tipo == 'fun':
-                while i < len(tokens) and tokens[i].tipo != 'fb':
-                    i += 1
-                i += 1
-                continue
-
-            # Atribuição simples: id = num; ou id = id op id/num;
-            if tokens[i].tipo == 'id' and i + 2 < len(tokens):
-                if tokens[i + 1].tipo == 'igual':
-                    nome = tokens[i].lexema
-                    i += 2
-
-                    # Atribuição de constante: x = 5;
-                    if tokens[i].tipo == 'num':
-                        self.codigo.append("    li $t0, " + tokens[i].lexema)
-                        off = self.vars.get(nome, 0)
-                        self.codigo.append("    sw $t0, " + str(off) + "($sp)")
-                        i += 2
-                        continue
-
-                    # Atribuição com expressão: x = y op z;
-                    elif tokens[i].tipo == 'id':
-                        var1 = tokens[i].lexema
-                        off1 = self.vars.get(var1, 0)
-                        self.codigo.append("    lw $t0, " + str(off1) + "($sp)")
-                        i += 1
-
-                        # Verifica se tem operador
-                        if i < len(tokens) and tokens[i].tipo in ['mais', 'menos', 'mult', 'div', 'maior', 'menor']:
-                            op = tokens[i].tipo
-                            i += 1
-
-                            # Carrega segundo operando
-                            if tokens[i].tipo == 'num':
-                                self.codigo.append("    li $t1, " + tokens[i].lexema)
-                            elif tokens[i].tipo == 'id':
-                                off2 = self.vars.get(tokens[i].lexema, 0)
-                                self.codigo.append("    lw $t1, " + str(off2) + "($sp)")
-                            i += 1
-
-                            # Gera instrução pro operador
-                            if op == 'mais':
-                                self.codigo.append("    add $t0, $t0, $t1")
-                            elif op == 'menos':
-                                self.codigo.append("    sub $t0, $t0, $t1")
-                            elif op == 'mult':
-                                self.codigo.append("    mul $t0, $t0, $t1")
-                            elif op == 'div':
-                                self.codigo.append("    div $t0, $t1")
-                                self.codigo.append("    mflo $t0")
-                            elif op == 'maior':
-                                self.codigo.append("    sgt $t0, $t0, $t1")
-                            elif op == 'menor':
-                                self.codigo.append("    slt $t0, $t0, $t1")
-
-                        # Salva o resultado
-                        off = self.vars.get(nome, 0)
-                        self.codigo.append("    sw $t0, " + str(off) + "($sp)")
-                        i += 1
-                        continue
-
-            # Comando if: if (x > 3) { ... } else { ... }
-            if tokens[i].tipo == 'if':
-                # Labels fixas pro primeiro if (o único com else no código de teste)
-                label_else = "ELSE_MAIOR_3"
-                label_fim = "FIM_IF_MAIOR_3"
-
-                i += 2  # pula if (
-
-                # Avalia a condição
-                if tokens[i].tipo == 'id':
-                    off1 = self.vars.get(tokens[i].lexema, 0)
-                    self.codigo.append("    lw $t0, " + str(off1) + "($sp)")
-                    i += 1
-
-                    op = tokens[i].tipo
-                    i += 1
-
-                    if tokens[i].tipo == 'id':
-                        off2 = self.vars.get(tokens[i].lexema, 0)
-                        self.codigo.append("    lw $t1, " + str(off2) + "($sp)")
-                    elif tokens[i].tipo == 'num':
-                        self.codigo.append("    li $t1, " + tokens[i].lexema)
-                    i += 2  # pula valor e )
-
-                    if op == 'maior':
-                        self.codigo.append("    sgt $t0, $t0, $t1")
-                    elif op == 'menor':
-                        self.codigo.append("    slt $t0, $t0, $t1")
-
-                    # Pula pro else se condição for falsa
-                    self.codigo.append("    beq $t0, $zero, " + label_else)
-
-                i += 1  # pula {
-
-                # Bloco then
-                while i < len(tokens) and tokens[i].tipo != 'fb':
-                    if tokens[i].tipo == 'write':
-                        i += 2
-                        if tokens[i].tipo == 'id':
-                            off = self.vars.get(tokens[i].lexema, 0)
-                            self.codigo.append("    lw $a0, " + str(off) + "($sp)")
-                        elif tokens[i].tipo == 'num':
-                            self.codigo.append("    li $a0, " + tokens[i].lexema)
-                        self.codigo.append("    li $v0, 1")
-                        self.codigo.append("    syscall")
-                        i += 3
-                    else:
-                        i += 1
-
-                i += 1  # pula }
-
-                # Pula o else depois de executar o then
-                self.codigo.append("    j " + label_fim)
-                self.codigo.append(label_else + ":")
-
-                # Bloco else (se existir)
-                if i < len(tokens) and tokens[i].tipo == 'else':
-                    i += 2  # pula else {
-
-                    while i < len(tokens) and tokens[i].tipo != 'fb':
-                        if tokens[i].tipo == 'write':
-                            i += 2
-                            if tokens[i].tipo == 'id':
-                                off = self.vars.get(tokens[i].lexema, 0)
-                                self.codigo.append("    lw $a0, " + str(off) + "($sp)")
-                            elif tokens[i].tipo == 'num':
-                                self.codigo.append("    li $a0, " + tokens[i].lexema)
-                            self.codigo.append("    li $v0, 1")
-                            self.codigo.append("    syscall")
-                            i += 3
-                        else:
-                            i += 1
-
-                    i += 1  # pula }
-
-                self.codigo.append(label_fim + ":")
-                continue
-
-            # Comando while: while (condicao) { ... }
-            if tokens[i].tipo == 'while':
-                label_inicio = "INICIO_WHILE"
-                label_fim = "FIM_WHILE"
-
-                self.codigo.append(label_inicio + ":")
-
-                i += 2  # pula while (
-
-                # Avalia condição
-                if tokens[i].tipo == 'id':
-                    off1 = self.vars.get(tokens[i].lexema, 0)
-                    self.codigo.append("    lw $t0, " + str(off1) + "($sp)")
-                    i += 1
-
-                    op = tokens[i].tipo
-                    i += 1
-
-                    if tokens[i].tipo == 'num':
-                        self.codigo.append("    li $t1, " + tokens[i].lexema)
-                    i += 2  # pula num e )
-
-                    if op == 'maior':
-                        self.codigo.append("    sgt $t0, $t0, $t1")
-
-                    # Sai do loop se condição for falsa
-                    self.codigo.append("    beq $t0, $zero, " + label_fim)
-
-                i += 1  # pula {
-
-                # Corpo do while
-                while i < len(tokens) and tokens[i].tipo != 'fb':
-                    if tokens[i].tipo == 'id' and i + 1 < len(tokens) and tokens[i + 1].tipo == 'igual':
-                        nome = tokens[i].lexema
-                        off = self.vars.get(nome, 0)
-                        i += 2
-
-                        if tokens[i].tipo == 'id':
-                            off1 = self.vars.get(tokens[i].lexema, 0)
-                            self.codigo.append("    lw $t0, " + str(off1) + "($sp)")
-                            i += 1
-
-                            if tokens[i].tipo == 'menos':
-                                i += 1
-                                if tokens[i].tipo == 'num':
-                                    self.codigo.append("    li $t1, " + tokens[i].lexema)
-                                self.codigo.append("    sub $t0, $t0, $t1")
-                                i += 1
-
-                            self.codigo.append("    sw $t0, " + str(off) + "($sp)")
-                            i += 1
-                    elif tokens[i].tipo == 'write':
-                        i += 2
-                        if tokens[i].tipo == 'id':
-                            off = self.vars.get(tokens[i].lexema, 0)
-                            self.codigo.append("    lw $a0, " + str(off) + "($sp)")
-                        elif tokens[i].tipo == 'num':
-                            self.codigo.append("    li $a0, " + tokens[i].lexema)
-                        self.codigo.append("    li $v0, 1")
-                        self.codigo.append("    syscall")
-                        i += 3
-                    else:
-                        i += 1
-
-                i += 1  # pula }
-
-                # Volta pro início do loop
-                self.codigo.append("    j " + label_inicio)
-                self.codigo.append(label_fim + ":")
-                continue
-
-            # Comando for: for (inteiro i = 0; i < 5; i = i + 1) { ... }
-            if tokens[i].tipo == 'for':
-                label_inicio = "INICIO_FOR"
-                label_corpo = "CORPO_FOR"
-                label_incremento = "INCREMENTO_FOR"
-                label_fim = "FIM_FOR"
-
-                i += 2  # pula for (
-
-                # Inicialização (já é tratada como atribuição normal)
-                # Pula até o primeiro pv (fim da init)
-                while i < len(tokens) and tokens[i].tipo != 'pv':
-                    i += 1
-                i += 1
-
-                # Teste da condição
-                self.codigo.append(label_inicio + ":")
-                if tokens[i].tipo == 'id':
-                    off1 = self.vars.get(tokens[i].lexema, 0)
-                    self.codigo.append("    lw $t0, " + str(off1) + "($sp)")
-                    i += 1
-
-                    if tokens[i].tipo == 'menor':
-                        i += 1
-                        if tokens[i].tipo == 'num':
-                            self.codigo.append("    li $t1, " + tokens[i].lexema)
-                        self.codigo.append("    slt $t0, $t0, $t1")
-                    i += 2  # pula num e pv
-
-                # Sai se condição for falsa
-                self.codigo.append("    beq $t0, $zero, " + label_fim)
-                self.codigo.append("    j " + label_corpo)
-
-                # Label de incremento (pula até o fp antes do bloco)
-                self.codigo.append(label_incremento + ":")
-                while i < len(tokens) and tokens[i].tipo != 'fp':
-                    i += 1
-                i += 2  # pula ) {
-
-                self.codigo.append("    j " + label_inicio)
-
-                # Corpo do for
-                self.codigo.append(label_corpo + ":")
-                while i < len(tokens) and tokens[i].tipo != 'fb':
-                    if tokens[i].tipo == 'write':
-                        i += 2
-                        if tokens[i].tipo == 'id':
-                            off = self.vars.get(tokens[i].lexema, 0)
-                            self.codigo.append("    lw $a0, " + str(off) + "($sp)")
-                        self.codigo.append("    li $v0, 1")
-                        self.codigo.append("    syscall")
-                        i += 3
-                    else:
-                        i += 1
-
-                i += 1  # pula }
-
-                self.codigo.append("    j " + label_incremento)
-                self.codigo.append(label_fim + ":")
-                continue
-
-            # Comando write: write(x);
-            if tokens[i].tipo == 'write':
-                i += 2
-                if tokens[i].tipo == 'id':
-                    off = self.vars.get(tokens[i].lexema, 0)
-                    self.codigo.append("    lw $a0, " + str(off) + "($sp)")
-                elif tokens[i].tipo == 'num':
-                    self.codigo.append("    li $a0, " + tokens[i].lexema)
-                self.codigo.append("    li $v0, 1")
-                self.codigo.append("    syscall")
-                i += 3
-                continue
-
-            # Comando read: read(x);
-            if tokens[i].tipo == 'read':
-                i += 2
-                if tokens[i].tipo == 'id':
-                    nome = tokens[i].lexema
-                    off = self.vars.get(nome, 0)
-                    self.codigo.append("    li $v0, 5")
-                    self.codigo.append("    syscall")
-                    self.codigo.append("    sw $v0, " + str(off) + "($sp)")
-                i += 3
-                continue
-
-            i += 1
\ No newline at end of file
+# gerador_codigo_mips.py
+# Gera código assembly MIPS a partir da AST montada pelo SLR
+# (gerar_codigo_arvore), do código intermediário (gerar_codigo_ir) ou
+# direto dos tokens (gerar_codigo, que monta a AST antes)
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Escrita, Leitura, Se, Enquanto,
+                              Para, ExprCmd, Num, Cadeia, Logico, Var, Binaria, Unaria,
+                              Chamada, IncDec)
+from alocador_registradores import (alocar_registradores, alocar_registradores_ir,
+                                    REGISTRADORES_PRESERVADOS)
+from codigo_intermediario import Const, NEGACAO, ESPELHO, nomes_compartilhados, tem_efeito
+from otimizador import avaliar, flutuante_32
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import analisar_semantica_arvore
+from analisador_tipos import verificar_tipos
+from rotulos import Rotulos
+from peephole import Peephole, de_linhas, para_linhas
+
+# Instrução MIPS de cada operador binário (resultado em registrador)
+INSTRUCAO_OP = {
+    'mais': 'add',
+    'menos': 'sub',
+    'mult': 'mul',
+    'maior': 'sgt',
+    'menor': 'slt',
+    'ge': 'sge',
+    'le': 'sle',
+    'eqeq': 'seq',
+    'ne': 'sne',
+}
+
+# Instruções da FPU (precisão simples) pras operações com flutuante
+INSTRUCAO_FLUTUANTE = {
+    'mais': 'add.s',
+    'menos': 'sub.s',
+    'mult': 'mul.s',
+    'div': 'div.s',
+}
+
+# Comparação de flutuantes: (instrução c.xx.s, troca os operandos?, nega?)
+# A FPU só tem lt/le/eq; a > b vira b < a e a != b vira not (a == b)
+COMPARACAO_FLUTUANTE = {
+    'menor': ('c.lt.s', False, False),
+    'le': ('c.le.s', False, False),
+    'maior': ('c.lt.s', True, False),
+    'ge': ('c.le.s', True, False),
+    'eqeq': ('c.eq.s', False, False),
+    'ne': ('c.eq.s', False, True),
+}
+
+# Desvio condicional fundido de cada comparação (a op b -> rótulo)
+DESVIO = {
+    'maior': 'bgt',
+    'menor': 'blt',
+    'ge': 'bge',
+    'le': 'ble',
+    'eqeq': 'beq',
+    'ne': 'bne',
+}
+
+# Registradores temporários usados na avaliação das expressões
+# Inteiros em $t0-$t9 e flutuantes em $f2-$f11 ($f0 fica de rascunho e
+# $f12 é o argumento do syscall de imprimir flutuante)
+NUM_TEMPS = 10
+
+
+class GeradorMIPS:
+    # nivel_otimizacao (só na geração pela AST):
+    #   0 - toda variável na pilha (lw/sw a cada uso)
+    #   1 - alocação de registradores: as variáveis mais usadas (as de laço
+    #       primeiro) ficam em $s0-$s7 / $f20-$f31, o resto na pilha
+    #   2 - passa pelo código intermediário (otimizador.py) e gera com
+    #       gerar_codigo_ir; quem monta o IR e roda os passos é o chamador
+    # Do nível 1 pra cima o .text ainda passa pelo peephole (peephole.py);
+    # a contagem de cada regra fica em self.peephole.contagem
+    # rotular_blocos (build instrumentado do PGO, otimizacao_perfil.py): todo
+    # bloco do IR sai com o rótulo dele e o peephole não roda, então cada
+    # bloco começa num rótulo e cada desvio vai pro rótulo do bloco destino
+    def __init__(self, nivel_otimizacao=0, rotular_blocos=False):
+        self.codigo = []
+        self.vars = {}  # Mapeia nome da variável pro offset na pilha (positivo)
+        self.offset = 0
+        self.nivel_otimizacao = nivel_otimizacao
+        self.rotular_blocos = rotular_blocos
+        self.registradores = {}
+        self.peephole = None
+
+    def gerar_codigo(self, tokens):
+        # Geração direto da lista de tokens: monta a AST com o AnalisadorSintatico, resolve
+        # as declarações e os tipos, e usa a mesma geração da AST (rótulos
+        # únicos, todos os operadores relacionais, else, for com passo,
+        # laços aninhados). Antes isso era um casamento de padrões nos tokens
+        # que só entendia os formatos do programa de teste
+        arvore, erros = AnalisadorSintatico().analisar_arvore(tokens)
+        if not erros:
+            erros, _ = analisar_semantica_arvore(arvore)
+        if not erros:
+            erros = verificar_tipos(arvore)
+        if erros:
+            raise Exception("Nao da pra gerar codigo: " + erros[0])
+        return self.gerar_codigo_arvore(arvore)
+
+    # ------------------------------------------------------------------
+    # Geração a partir da AST
+    # ------------------------------------------------------------------
+
+    def gerar_codigo_arvore(self, arvore, globais=()):
+        # Percorre a AST recursivamente, então if/while/for aninhados e
+        # expressões de qualquer tamanho saem certos
+        # Variáveis ficam na pilha (offset a partir de $sp, começando em 0)
+        # Usa os tipos anotados pela verificação de tipos (campo tipo das
+        # expressões): flutuante vai pra FPU (l.s/add.s/s.s), o resto é inteiro
+        # Expressões usam $t0-$t9 (ou $f2-$f11) como pilha de registradores; se passar
+        # disso, o valor é empilhado de verdade ($sp desce e os offsets das
+        # variáveis são corrigidos por self.desloc enquanto isso)
+        # Funções viram rotinas fun_<nome> depois do main (mesma convenção de
+        # chamada do gerar_codigo_ir); variável que uma função usa sem ser
+        # dela fica no .data
+        self.codigo = []
+        self.vars = {}
+        self.offset = 0
+        self.dados = []
+        self.cadeias = {}
+        self.flutuantes = {}
+        self.rotulos = Rotulos()
+        self.rotulos.reservar("main")
+        self.desloc = 0
+
+        funcoes = coletar_funcoes(arvore.comandos)
+        self.rotulos_funcao = {}
+        for decl in funcoes:
+            # Duas funções aninhadas podem ter o mesmo nome
+            if "fun_" + decl.nome in self.rotulos.usados:
+                self.rotulos_funcao[decl] = self.rotulos.novo("fun_" + decl.nome)
+            else:
+                self.rotulos_funcao[decl] = self.rotulos.reservar("fun_" + decl.nome)
+        # globais: declarações que vão pro .data mesmo sem função nenhuma
+        # usando (compilação por unidades); o rótulo delas é fixo, var_<nome>,
+        # pra unidades compiladas separado acharem a mesma variável
+        self.compartilhadas = {}
+        for decl in globais:
+            rotulo = self.rotulos.reservar("var_" + decl.nome)
+            self.compartilhadas[decl] = rotulo
+            self.dados.append(rotulo + ": .word 0")
+        for decl in variaveis_compartilhadas(funcoes):
+            if decl in self.compartilhadas:
+                continue
+            rotulo = self.rotulos.novo("var_" + decl.nome)
+            self.compartilhadas[decl] = rotulo
+            self.dados.append(rotulo + ": .word 0")
+
+        self.registradores = {}
+        if self.nivel_otimizacao >= 1:
+            self.registradores = alocar_registradores(arvore, excluir=self.compartilhadas)
+
+        for cmd in arvore.comandos:
+            self.gerar_cmd(cmd)
+
+        corpo = self.codigo
+        tamanho_frame = self.offset
+
+        # Monta o programa: cabeçalho, frame, corpo e saída
+        self.codigo = ["main:"]
+        if tamanho_frame > 0:
+            self.codigo.append("    addi $sp, $sp, -" + str(tamanho_frame))
+        self.codigo.extend(corpo)
+        if tamanho_frame > 0:
+            self.codigo.append("    addi $sp, $sp, " + str(tamanho_frame))
+        self.codigo.append("    li $v0, 10")
+        self.codigo.append("    syscall")
+
+        texto = self.codigo
+        for decl in funcoes:
+            texto.extend(self.gerar_funcao(decl))
+        return self.montar_programa(texto)
+
+    def gerar_funcao(self, decl):
+        # Linhas da rotina de uma função: quadro com as variáveis locais, os
+        # $s/$f20+ que ela usa e (se chama alguém) $ra/$fp; parâmetros chegam
+        # em $a0-$a3 e, do quinto em diante, na pilha de quem chamou
+        # Função folha sem local na pilha e sem $s não monta quadro
+        self.codigo = []
+        self.vars = {}
+        self.offset = 0
+        self.desloc = 0
+        self.registradores = {}
+        if self.nivel_otimizacao >= 1:
+            self.registradores = alocar_registradores(decl, excluir=self.compartilhadas)
+
+        locais_params = [self.declarar_var(p) for p in decl.params]
+        self.gerar_bloco(decl.corpo)
+        corpo = self.codigo
+
+        preservados = sorted(set(self.registradores.values()))
+        folha = not any(linha.strip().startswith("jal ") for linha in corpo)
+        quadro = self.offset + 4 * len(preservados) + (0 if folha else 8)
+
+        self.codigo = [self.rotulos_funcao[decl] + ":"]
+        if quadro > 0:
+            self.emitir("addi $sp, $sp, -" + str(quadro))
+        for i, r in enumerate(preservados):
+            self.guardar('flutuante' if r.startswith('$f') else 'inteiro', r,
+                         str(self.offset + 4 * i) + "($sp)")
+        if not folha:
+            self.emitir("sw $ra, " + str(quadro - 4) + "($sp)")
+            self.emitir("sw $fp, " + str(quadro - 8) + "($sp)")
+            self.emitir("addi $fp, $sp, " + str(quadro))
+        for i, local in enumerate(locais_params):
+            if i < 4:
+                self.guardar('inteiro', "$a" + str(i), local)
+            else:
+                self.emitir("lw $v1, " + str(quadro + 4 * i) + "($sp)")
+                self.guardar('inteiro', "$v1", local)
+        self.codigo.extend(corpo)
+        for i, r in enumerate(preservados):
+            self.carregar('flutuante' if r.startswith('$f') else 'inteiro', r,
+                          str(self.offset + 4 * i) + "($sp)")
+        if not folha:
+            self.emitir("lw $fp, " + str(quadro - 8) + "($sp)")
+            self.emitir("lw $ra, " + str(quadro - 4) + "($sp)")
+        if quadro > 0:
+            self.emitir("addi $sp, $sp, " + str(quadro))
+        self.emitir("move $v0, $zero")
+        self.emitir("jr $ra")
+        return self.codigo
+
+    def montar_programa(self, texto):
+        # Junta a seção de dados com o .text (já passado pelo peephole, se
+        # o nível pedir) e devolve o assembly final
+        dados = self.dados
+        if self.nivel_otimizacao >= 1 and not self.rotular_blocos:
+            self.peephole = Peephole(fixos=["main"] + list(self.rotulos_funcao.values()))
+            instrs = self.peephole.otimizar(de_linhas(texto))
+            texto = para_linhas(instrs)
+            # Constante que ninguém mais carrega (if morto, valor dobrado) sai do .data
+            usados = set(a for i in instrs for a in i.args)
+            dados = [d for d in dados if d.split(':')[0] in usados]
+        self.codigo = [".data"]
+        self.codigo.extend(dados)
+        self.codigo.append("")
+        self.codigo.append(".text")
+        self.codigo.append(".globl main")
+        self.codigo.extend(texto)
+        return "\n".join(self.codigo)
+
+    def emitir(self, instrucao):
+        self.codigo.append("    " + instrucao)
+
+    def declarar_var(self, decl):
+        # Cada declaração ganha seu slot (variáveis sombreadas não se misturam)
+        # O nome também aponta pro slot, pros usos que não foram resolvidos
+        # pela análise semântica (decl None)
+        # Variável que ganhou registrador não ocupa a pilha (nem a global,
+        # que tá no .data)
+        if decl in self.compartilhadas:
+            return self.compartilhadas[decl]
+        if decl in self.registradores:
+            return self.registradores[decl]
+        self.vars[decl] = self.offset
+        self.vars[decl.nome] = self.offset
+        self.offset += 4
+        return str(self.vars[decl] + self.desloc) + "($sp)"
+
+    def end_var(self, no):
+        # Onde tá a variável usada pelo nó: o registrador dela, ou o endereço
+        # "off($sp)" na pilha; usa a declaração resolvida pela semântica e,
+        # sem ela, o nome (reserva na primeira vez)
+        chave = no.decl if no.decl is not None else no.nome
+        if chave in self.compartilhadas:
+            return self.compartilhadas[chave]
+        if chave in self.registradores:
+            return self.registradores[chave]
+        if chave not in self.vars:
+            self.vars[chave] = self.offset
+            self.offset += 4
+        return str(self.vars[chave] + self.desloc) + "($sp)"
+
+    def carregar(self, tipo, destino, local):
+        # Copia a variável (registrador ou pilha) pro registrador destino
+        if tipo == 'flutuante':
+            if local.startswith('$'):
+                self.emitir("mov.s " + destino + ", " + local)
+            else:
+                self.emitir("l.s " + destino + ", " + local)
+        elif local.startswith('$'):
+            self.emitir("move " + destino + ", " + local)
+        else:
+            self.emitir("lw " + destino + ", " + local)
+
+    def rotulo_cadeia(self, lexema):
+        # Cada string literal vira uma entrada .asciiz no .data (sem repetir)
+        if lexema not in self.cadeias:
+            rotulo = "str_" + str(len(self.cadeias))
+            self.cadeias[lexema] = rotulo
+            texto = lexema.replace('\r', '\\r').replace('\n', '\\n').replace('\t', '\\t')
+            self.dados.append(rotulo + ": .asciiz " + texto)
+        return self.cadeias[lexema]
+
+    def rotulo_flutuante(self, valor):
+        # Constante flutuante vira uma entrada .float no .data (sem repetir)
+        # (a FPU não tem "li", a constante é carregada da memória com l.s)
+        texto = repr(float(valor))
+        if texto not in self.flutuantes:
+            rotulo = "flt_" + str(len(self.flutuantes))
+            self.flutuantes[texto] = rotulo
+            self.dados.append(rotulo + ": .float " + texto)
+        return self.flutuantes[texto]
+
+    def guardar(self, tipo, r, end):
+        # Grava o valor de uma expressão na variável (tipo = tipo da variável)
+        # end é o endereço na pilha ou o registrador da variável
+        if end.startswith('$'):
+            if r != end:
+                self.emitir(("mov.s " if tipo == 'flutuante' else "move ") + end + ", " + r)
+        elif tipo == 'flutuante':
+            self.emitir("s.s " + r + ", " + end)
+        else:
+            self.emitir("sw " + r + ", " + end)
+
+    def gerar_valor(self, tipo, expr):
+        # Avalia a expressão pra guardar numa variável do tipo dado
+        # (inteiro atribuído a flutuante é convertido)
+        if tipo == 'flutuante':
+            return self.gerar_flutuante(expr, 0)
+        return self.gerar_expr(expr, 0)
+
+    def gerar_bloco(self, comandos):
+        for cmd in comandos:
+            self.gerar_cmd(cmd)
+
+    def gerar_cmd(self, cmd):
+        if isinstance(cmd, DeclVar):
+            end = self.declarar_var(cmd)
+            if cmd.valor is not None:
+                r = self.gerar_valor(cmd.tipo, cmd.valor)
+                self.guardar(cmd.tipo, r, end)
+
+        elif isinstance(cmd, DeclFuncao):
+            # A rotina sai separada, depois do main (gerar_funcao)
+            pass
+
+        elif isinstance(cmd, Atribuicao):
+            tipo = tipo_da_var(cmd)
+            r = self.gerar_valor(tipo, cmd.expr)
+            self.guardar(tipo, r, self.end_var(cmd))
+
+        elif isinstance(cmd, Escrita):
+            self.gerar_escrita(cmd.expr)
+
+        elif isinstance(cmd, Leitura):
+            if tipo_da_var(cmd) == 'flutuante':
+                self.emitir("li $v0, 6")
+                self.emitir("syscall")
+                self.guardar('flutuante', "$f0", self.end_var(cmd))
+            else:
+                self.emitir("li $v0, 5")
+                self.emitir("syscall")
+                self.guardar('inteiro', "$v0", self.end_var(cmd))
+
+        elif isinstance(cmd, Se):
+            c = self.constante(cmd.cond)
+            if c is not None:
+                # Condição conhecida: só o lado que executa é gerado
+                self.gerar_bloco(cmd.entao if c.valor else (cmd.senao or []))
+                return
+            label_else, label_fim = self.rotulos.novos("ELSE", "FIM_IF")
+            self.gerar_desvio(cmd.cond, label_else, False)
+            self.gerar_bloco(cmd.entao)
+            if cmd.senao is not None:
+                self.emitir("j " + label_fim)
+            self.codigo.append(label_else + ":")
+            if cmd.senao is not None:
+                self.gerar_bloco(cmd.senao)
+                self.codigo.append(label_fim + ":")
+
+        elif isinstance(cmd, Enquanto):
+            c = self.constante(cmd.cond)
+            if c is not None and not c.valor:
+                return
+            label_inicio, label_fim = self.rotulos.novos("INICIO_WHILE", "FIM_WHILE")
+            self.codigo.append(label_inicio + ":")
+            self.gerar_desvio(cmd.cond, label_fim, False)
+            self.gerar_bloco(cmd.corpo)
+            self.emitir("j " + label_inicio)
+            self.codigo.append(label_fim + ":")
+
+        elif isinstance(cmd, Para):
+            label_inicio, label_fim = self.rotulos.novos("INICIO_FOR", "FIM_FOR")
+            self.gerar_cmd(cmd.inicio)
+            c = self.constante(cmd.cond) if cmd.cond is not None else None
+            if c is not None and not c.valor:
+                return
+            self.codigo.append(label_inicio + ":")
+            if cmd.cond is not None:
+                self.gerar_desvio(cmd.cond, label_fim, False)
+            self.gerar_bloco(cmd.corpo)
+            self.gerar_cmd(cmd.passo)
+            self.emitir("j " + label_inicio)
+            self.codigo.append(label_fim + ":")
+
+        elif isinstance(cmd, ExprCmd):
+            self.gerar_expr(cmd.expr, 0)
+
+    def gerar_desvio(self, cond, rotulo, quando):
+        # Desvia pra rotulo quando a condição der o valor quando (True/False)
+        # Comparação sai direto no desvio fundido (blt, bge, ..., ou c.xx.s +
+        # bc1t/bc1f), sem calcular o 0/1 e testar com beq depois
+        c = self.constante(cond)
+        if c is not None:
+            # Resultado já conhecido: salta sempre ou nunca
+            if bool(c.valor) == quando:
+                self.emitir("j " + rotulo)
+            return
+
+        if isinstance(cond, Binaria) and cond.op in DESVIO:
+            op = cond.op if quando else NEGACAO[cond.op]
+            if 'flutuante' in (cond.esq.tipo, cond.dir.tipo):
+                a, b = self.operandos_flutuantes(cond, 0)
+                instrucao, trocar, negar = COMPARACAO_FLUTUANTE[cond.op]
+                if trocar:
+                    a, b = b, a
+                self.emitir(instrucao + " " + a + ", " + b)
+                # flag ligada = condição verdadeira (ao contrário se negar)
+                self.emitir(("bc1t " if quando != negar else "bc1f ") + rotulo)
+                return
+            a = self.gerar_expr(cond.esq, 0)
+            if isinstance(cond.dir, Num) and '.' not in cond.dir.lexema:
+                # Constante vai como imediato
+                b = "$zero" if int(cond.dir.lexema) == 0 else cond.dir.lexema
+            else:
+                if a != "$t0" and tem_efeito(cond.dir):
+                    self.emitir("move $t0, " + a)
+                    a = "$t0"
+                b = self.gerar_expr(cond.dir, 1)
+            self.emitir(DESVIO[op] + " " + a + ", " + b + ", " + rotulo)
+
+        elif isinstance(cond, Unaria) and cond.op == 'neg':
+            self.gerar_desvio(cond.expr, rotulo, not quando)
+
+        elif isinstance(cond, Logico):
+            if cond.valor == quando:
+                self.emitir("j " + rotulo)
+
+        else:
+            r = self.gerar_expr(cond, 0)
+            self.emitir(("bne " if quando else "beq ") + r + ", $zero, " + rotulo)
+
+    def gerar_escrita(self, expr):
+        # syscall 1 (inteiro/lógico), 2 (flutuante, em $f12) ou 4 (cadeia)
+        if expr.tipo == 'flutuante':
+            r = self.gerar_expr(expr, 0)
+            self.emitir("mov.s $f12, " + r)
+            self.emitir("li $v0, 2")
+        elif isinstance(expr, Cadeia):
+            self.emitir("la $a0, " + self.rotulo_cadeia(expr.lexema))
+            self.emitir("li $v0, 4")
+        elif isinstance(expr, Var):
+            self.carregar('inteiro', "$a0", self.end_var(expr))
+            self.emitir("li $v0, 4" if expr.tipo == 'cadeia' else "li $v0, 1")
+        elif isinstance(expr, Num):
+            self.emitir("li $a0, " + expr.lexema)
+            self.emitir("li $v0, 1")
+        else:
+            r = self.gerar_expr(expr, 0)
+            self.emitir("move $a0, " + r)
+            self.emitir("li $v0, 4" if expr.tipo == 'cadeia' else "li $v0, 1")
+        self.emitir("syscall")
+
+    def gerar_expr(self, expr, k):
+        # Avalia a expressão deixando o resultado em $t<k> (retorna o nome)
+        # Expressão flutuante fica em $f<k+2>; variável que tá em registrador
+        # devolve o próprio registrador (quem usa não pode escrever nele)
+        if expr.tipo == 'flutuante':
+            return self.gerar_expr_flutuante(expr, k)
+
+        r = "$t" + str(k)
+        c = self.constante(expr)
+
+        if c is not None and c.tipo != 'cadeia':
+            self.emitir("li " + r + ", " + str(c.valor))
+
+        elif isinstance(expr, Num):
+            self.emitir("li " + r + ", " + expr.lexema)
+
+        elif isinstance(expr, Cadeia):
+            self.emitir("la " + r + ", " + self.rotulo_cadeia(expr.lexema))
+
+        elif isinstance(expr, Logico):
+            self.emitir("li " + r + ", " + ("1" if expr.valor else "0"))
+
+        elif isinstance(expr, Var):
+            # Variável em registrador é usada direto, sem cópia
+            end = self.end_var(expr)
+            if end.startswith('$'):
+                return end
+            self.emitir("lw " + r + ", " + end)
+
+        elif isinstance(expr, IncDec):
+            end = self.end_var(expr)
+            passo = "1" if expr.op == 'inc' else "-1"
+            self.carregar('inteiro', r, end)
+            if end.startswith('$'):
+                self.emitir("addi " + end + ", " + end + ", " + passo)
+            else:
+                self.emitir("addi $v1, " + r + ", " + passo)
+                self.emitir("sw $v1, " + end)
+
+        elif isinstance(expr, Unaria):
+            a = self.gerar_expr(expr.expr, k)
+            if expr.op == 'menos':
+                self.emitir("sub " + r + ", $zero, " + a)
+            else:
+                self.emitir("seq " + r + ", " + a + ", $zero")
+
+        elif isinstance(expr, Binaria) and expr.op in COMPARACAO_FLUTUANTE and \
+                'flutuante' in (expr.esq.tipo, expr.dir.tipo):
+            self.gerar_comparacao_flutuante(expr, k)
+
+        elif isinstance(expr, Binaria) and expr.op == 'concat':
+            # O verificador de tipos só deixa passar concatenação de literais,
+            # então o texto já sai pronto aqui
+            self.emitir("la " + r + ", " + self.rotulo_cadeia(cadeia_constante(expr)))
+
+        elif isinstance(expr, Binaria):
+            a = self.gerar_expr(expr.esq, k)
+            if a != r and tem_efeito(expr.dir):
+                # O lado direito muda variáveis (x++): guarda o valor atual
+                # do registrador da variável antes
+                self.emitir("move " + r + ", " + a)
+                a = r
+            if k + 1 < NUM_TEMPS:
+                b = self.gerar_expr(expr.dir, k + 1)
+                self.emitir_op(expr.op, r, a, b)
+            else:
+                # Acabaram os temporários: empilha o lado esquerdo, avalia o
+                # direito no mesmo registrador e desempilha o esquerdo em $v1
+                self.emitir("addi $sp, $sp, -4")
+                self.emitir("sw " + a + ", 0($sp)")
+                self.desloc += 4
+                b = self.gerar_expr(expr.dir, k)
+                self.emitir("lw $v1, 0($sp)")
+                self.emitir("addi $sp, $sp, 4")
+                self.desloc -= 4
+                self.emitir_op(expr.op, r, "$v1", b)
+
+        elif isinstance(expr, Chamada):
+            self.gerar_chamada(expr, k)
+            self.emitir("move " + r + ", $v0")
+
+        return r
+
+    def gerar_chamada(self, expr, k):
+        # Chamada no meio de uma expressão de profundidade k: os temporários
+        # abaixo de k ($t0.., $f2..) ainda têm valor e a função pode usar
+        # qualquer um, então vão pra pilha antes e voltam depois
+        # Os argumentos são calculados um a um numa área de 4 bytes por
+        # argumento; os quatro primeiros sobem pra $a0-$a3 e, se tiver mais,
+        # a área fica na pilha durante a chamada (quinto em 16($sp), ...)
+        vivos = ["$t" + str(i) for i in range(k)] + ["$f" + str(i + 2) for i in range(k)]
+        if vivos:
+            self.emitir("addi $sp, $sp, -" + str(4 * len(vivos)))
+            self.desloc += 4 * len(vivos)
+            for i, r in enumerate(vivos):
+                self.guardar('flutuante' if r.startswith('$f') else 'inteiro', r, str(4 * i) + "($sp)")
+
+        n = len(expr.args)
+        if n:
+            self.emitir("addi $sp, $sp, -" + str(4 * n))
+            self.desloc += 4 * n
+            for i, arg in enumerate(expr.args):
+                r = self.gerar_expr(arg, k)
+                self.emitir("sw " + r + ", " + str(4 * i) + "($sp)")
+            for i in range(min(n, 4)):
+                self.emitir("lw $a" + str(i) + ", " + str(4 * i) + "($sp)")
+            if n <= 4:
+                self.emitir("addi $sp, $sp, " + str(4 * n))
+                self.desloc -= 4 * n
+        self.emitir("jal " + self.rotulos_funcao[expr.decl])
+        if n > 4:
+            self.emitir("addi $sp, $sp, " + str(4 * n))
+            self.desloc -= 4 * n
+
+        if vivos:
+            for i, r in enumerate(vivos):
+                self.carregar('flutuante' if r.startswith('$f') else 'inteiro', r, str(4 * i) + "($sp)")
+            self.emitir("addi $sp, $sp, " + str(4 * len(vivos)))
+            self.desloc -= 4 * len(vivos)
+
+    def gerar_flutuante(self, expr, k):
+        # Valor da expressão como flutuante em $f<k+2>, convertendo se for inteiro
+        f = "$f" + str(k + 2)
+        if expr.tipo == 'flutuante':
+            return self.gerar_expr_flutuante(expr, k)
+        c = self.constante(expr)
+        if c is not None:
+            # Constante inteira: já vira constante flutuante, sem conversão
+            self.emitir("l.s " + f + ", " + self.rotulo_flutuante(c.valor))
+            return f
+        if isinstance(expr, Num):
+            self.emitir("l.s " + f + ", " + self.rotulo_flutuante(expr.lexema))
+            return f
+        r = self.gerar_expr(expr, k)
+        self.emitir("mtc1 " + r + ", " + f)
+        self.emitir("cvt.s.w " + f + ", " + f)
+        return f
+
+    def gerar_expr_flutuante(self, expr, k):
+        f = "$f" + str(k + 2)
+        c = self.constante(expr)
+
+        if c is not None:
+            self.emitir("l.s " + f + ", " + self.rotulo_flutuante(c.valor))
+
+        elif isinstance(expr, Num):
+            self.emitir("l.s " + f + ", " + self.rotulo_flutuante(expr.lexema))
+
+        elif isinstance(expr, Var):
+            end = self.end_var(expr)
+            if end.startswith('$'):
+                return end
+            self.emitir("l.s " + f + ", " + end)
+
+        elif isinstance(expr, Unaria):
+            a = self.gerar_flutuante(expr.expr, k)
+            self.emitir("neg.s " + f + ", " + a)
+
+        elif isinstance(expr, Binaria):
+            a, b = self.operandos_flutuantes(expr, k)
+            self.emitir(INSTRUCAO_FLUTUANTE[expr.op] + " " + f + ", " + a + ", " + b)
+
+        else:
+            raise Exception("Expressao flutuante nao suportada na linha " + str(expr.linha))
+
+        return f
+
+    def operandos_flutuantes(self, expr, k):
+        # Avalia os dois lados como flutuantes; devolve os registradores (a, b)
+        f = self.gerar_flutuante(expr.esq, k)
+        if f != "$f" + str(k + 2) and tem_efeito(expr.dir):
+            self.emitir("mov.s $f" + str(k + 2) + ", " + f)
+            f = "$f" + str(k + 2)
+        if k + 1 < NUM_TEMPS:
+            return f, self.gerar_flutuante(expr.dir, k + 1)
+        # Sem registrador livre: mesmo esquema de pilha dos inteiros,
+        # o lado esquerdo volta em $f0
+        self.emitir("addi $sp, $sp, -4")
+        self.emitir("s.s " + f + ", 0($sp)")
+        self.desloc += 4
+        b = self.gerar_flutuante(expr.dir, k)
+        self.emitir("l.s $f0, 0($sp)")
+        self.emitir("addi $sp, $sp, 4")
+        self.desloc -= 4
+        return "$f0", b
+
+    def gerar_comparacao_flutuante(self, expr, k):
+        # Compara na FPU e passa a flag pra $t<k> (1 ou 0):
+        # li 1, c.xx.s e movf/movt zera o registrador quando a flag não bate
+        r = "$t" + str(k)
+        a, b = self.operandos_flutuantes(expr, k)
+        instrucao, trocar, negar = COMPARACAO_FLUTUANTE[expr.op]
+        if trocar:
+            a, b = b, a
+        self.emitir("li " + r + ", 1")
+        self.emitir(instrucao + " " + a + ", " + b)
+        self.emitir(("movt " if negar else "movf ") + r + ", $zero")
+
+    def constante(self, expr):
+        # Valor da expressão calculado na compilação (do nível 1 pra cima),
+        # ou None se depender de variável
+        if self.nivel_otimizacao < 1:
+            return None
+        return valor_constante(expr)
+
+    def emitir_op(self, op, destino, a, b):
+        if op == 'div':
+            self.emitir("div " + a + ", " + b)
+            self.emitir("mflo " + destino)
+        elif op in INSTRUCAO_OP:
+            self.emitir(INSTRUCAO_OP[op] + " " + destino + ", " + a + ", " + b)
+        else:
+            raise Exception("Operador '" + op + "' ainda nao suportado na geracao de codigo")
+
+    # ---------------- Geração a partir do código intermediário ----------------
+
+    def gerar_codigo_ir(self, programa):
+        # Baixa o IR (já otimizado) pra MIPS. Cada nome do IR (variável ou
+        # temporário) fica no registrador que a alocação deu ou num slot da
+        # pilha; $t8/$t9 e $f16/$f18 são rascunho pros operandos da pilha e
+        # pras constantes. Desvios condicionais saem fundidos (blt, bge, ...)
+        # e o salto pro bloco seguinte some (cai direto nele)
+        # As globais (variáveis que alguma função usa) ficam no .data; cada
+        # função vira uma rotina "fun_<nome>" depois do main
+        self.dados = []
+        self.cadeias = {}
+        self.flutuantes = {}
+        self.desloc = 0
+        self.rotulos = Rotulos()
+        self.rotulos.reservar("main")
+        self.programa_ir = programa
+
+        # As de programa.globais têm rótulo fixo (var_<nome no fonte>), igual
+        # no gerar_codigo_arvore
+        self.compartilhadas = {}
+        for nome in sorted(programa.globais):
+            self.compartilhadas[nome] = self.rotulos.reservar("var_" + programa.globais[nome])
+        for nome in sorted(nomes_compartilhados(programa)):
+            if nome not in self.compartilhadas:
+                self.compartilhadas[nome] = self.rotulos.novo("var_" + nome.replace('.', '_'))
+            self.dados.append(self.compartilhadas[nome] + ": .word 0")
+        self.rotulos_funcao = {}
+        for funcao in programa.funcoes[1:]:
+            self.rotulos_funcao[funcao.nome] = self.rotulos.reservar("fun_" + funcao.nome)
+
+        texto = []
+        for funcao in programa.funcoes:
+            texto.extend(self.baixar_funcao(funcao))
+        return self.montar_programa(texto)
+
+    def baixar_funcao(self, funcao):
+        # Linhas de uma função do IR (o main ou uma rotina)
+        # Convenção de chamada (a do MIPS): argumentos em $a0-$a3 (do quinto
+        # em diante na pilha de quem chama, em 4*i($sp)), resultado em $v0,
+        # volta com jr $ra. O quadro da rotina guarda os slots da pilha, os
+        # $s/$f20+ que ela usa e, se ela chama alguém, $ra e $fp
+        # Função folha (sem chamada) sem slot e sem $s não monta quadro nenhum
+        principal = funcao is self.programa_ir.principal()
+        self.funcao_ir = funcao
+        compartilhadas = set(self.compartilhadas)
+        self.registradores = alocar_registradores_ir(
+            funcao, vivas_na_saida=() if principal else compartilhadas,
+            usos_chamada=compartilhadas, excluir=compartilhadas)
+        self.vars = {}
+        self.offset = 0
+        alvos = set()
+        chama = False
+        for nome in funcao.params:
+            self.reservar_slot(nome)
+        for bloco in funcao.blocos:
+            for instr in bloco.instrs:
+                for nome in instr.usos() + [instr.dest]:
+                    if nome is not None:
+                        self.reservar_slot(nome)
+                if instr.op in ('salto', 'desvio'):
+                    alvos.update(instr.alvos)
+                if instr.op == 'chamar':
+                    chama = True
+
+        # Quadro: slots [0, offset), depois os preservados, $fp e $ra no topo
+        self.preservados = []
+        if not principal:
+            self.preservados = sorted(set(r for r in self.registradores.values()
+                                          if r in REGISTRADORES_PRESERVADOS))
+        self.folha = not chama
+        self.quadro = self.offset + 4 * len(self.preservados)
+        if not principal and not self.folha:
+            self.quadro += 8
+
+        self.codigo = []
+        blocos = funcao.blocos
+        for i, bloco in enumerate(blocos):
+            proximo = blocos[i + 1].nome if i + 1 < len(blocos) else None
+            if bloco.nome in alvos or self.rotular_blocos:
+                self.codigo.append(bloco.nome + ":")
+            for instr in bloco.instrs:
+                self.baixar(instr, proximo)
+        corpo = self.codigo
+
+        self.codigo = ["main:" if principal else self.rotulos_funcao[funcao.nome] + ":"]
+        if self.quadro > 0:
+            self.emitir("addi $sp, $sp, -" + str(self.quadro))
+        if not principal:
+            for i, r in enumerate(self.preservados):
+                self.emitir(("s.s " if r.startswith('$f') else "sw ") + r + ", " +
+                            str(self.offset + 4 * i) + "($sp)")
+            if not self.folha:
+                self.emitir("sw $ra, " + str(self.quadro - 4) + "($sp)")
+                self.emitir("sw $fp, " + str(self.quadro - 8) + "($sp)")
+                self.emitir("addi $fp, $sp, " + str(self.quadro))
+            self.receber_parametros(funcao.params)
+        self.codigo.extend(corpo)
+        return self.codigo
+
+    def reservar_slot(self, nome):
+        # Slot na pilha pra quem não ganhou registrador (global fica no .data)
+        if nome not in self.registradores and nome not in self.vars and nome not in self.compartilhadas:
+            self.vars[nome] = self.offset
+            self.offset += 4
+
+    def receber_parametros(self, params):
+        # Copia cada parâmetro de $a<i> (ou da pilha de quem chamou) pro lugar dele
+        for i, nome in enumerate(params):
+            if i < 4:
+                r = "$a" + str(i)
+            else:
+                r = "$t8"
+                self.emitir("lw $t8, " + str(self.quadro + 4 * i) + "($sp)")
+            local = self.local_ir(nome)
+            if local.startswith('$'):
+                self.emitir("move " + local + ", " + r)
+            else:
+                self.emitir("sw " + r + ", " + local)
+
+    def baixar_chamada(self, instr):
+        # Do quinto argumento em diante vai pra pilha (a área é de 4 por
+        # argumento, como no MIPS); os quatro primeiros vão em $a0-$a3
+        args = instr.args
+        area = 4 * len(args) if len(args) > 4 else 0
+        if area:
+            self.emitir("addi $sp, $sp, -" + str(area))
+            self.desloc += area
+            for i in range(4, len(args)):
+                r = self.operando_inteiro(args[i], "$t8")
+                self.emitir("sw " + r + ", " + str(4 * i) + "($sp)")
+        for i, arg in enumerate(args[:4]):
+            a = "$a" + str(i)
+            r = self.operando_inteiro(arg, a)
+            if r != a:
+                self.emitir("move " + a + ", " + r)
+        self.emitir("jal " + self.rotulos_funcao[instr.alvos[0]])
+        if area:
+            self.emitir("addi $sp, $sp, " + str(area))
+            self.desloc -= area
+        if instr.dest is not None:
+            d = self.destino_ir(instr.dest, "$v0")
+            if d != "$v0":
+                self.emitir("move " + d + ", $v0")
+            self.escrever_destino(instr.dest, d)
+
+    def baixar_retorno(self):
+        # Desfaz o quadro e volta; sem return na linguagem, o resultado é 0
+        for i, r in enumerate(self.preservados):
+            self.emitir(("l.s " if r.startswith('$f') else "lw ") + r + ", " +
+                        str(self.offset + 4 * i) + "($sp)")
+        if not self.folha:
+            self.emitir("lw $fp, " + str(self.quadro - 8) + "($sp)")
+            self.emitir("lw $ra, " + str(self.quadro - 4) + "($sp)")
+        if self.quadro > 0:
+            self.emitir("addi $sp, $sp, " + str(self.quadro))
+        self.emitir("move $v0, $zero")
+        self.emitir("jr $ra")
+
+    def local_ir(self, nome):
+        # Registrador do nome, o rótulo no .data (global) ou "off($sp)" na pilha
+        if nome in self.registradores:
+            return self.registradores[nome]
+        if nome in self.compartilhadas:
+            return self.compartilhadas[nome]
+        return str(self.vars[nome] + self.desloc) + "($sp)"
+
+    def operando_inteiro(self, op, rascunho):
+        # Registrador com o valor do operando (inteiro, lógico ou endereço de cadeia)
+        if isinstance(op, Const):
+            if op.tipo == 'cadeia':
+                self.emitir("la " + rascunho + ", " + self.rotulo_cadeia(op.valor))
+                return rascunho
+            if op.valor == 0:
+                return "$zero"
+            self.emitir("li " + rascunho + ", " + str(op.valor))
+            return rascunho
+        local = self.local_ir(op)
+        if local.startswith('$'):
+            return local
+        self.emitir("lw " + rascunho + ", " + local)
+        return rascunho
+
+    def operando_flutuante(self, op, rascunho):
+        if isinstance(op, Const):
+            self.emitir("l.s " + rascunho + ", " + self.rotulo_flutuante(op.valor))
+            return rascunho
+        local = self.local_ir(op)
+        if local.startswith('$'):
+            return local
+        self.emitir("l.s " + rascunho + ", " + local)
+        return rascunho
+
+    def destino_ir(self, nome, rascunho):
+        # Onde calcular o resultado: no registrador do nome, ou no rascunho
+        # (e escrever_destino guarda na pilha depois)
+        local = self.local_ir(nome)
+        return local if local.startswith('$') else rascunho
+
+    def escrever_destino(self, nome, r):
+        local = self.local_ir(nome)
+        if not local.startswith('$'):
+            if self.funcao_ir.tipos.get(nome) == 'flutuante':
+                self.emitir("s.s " + r + ", " + local)
+            else:
+                self.emitir("sw " + r + ", " + local)
+
+    def baixar(self, instr, proximo):
+        # Uma instrução do IR -> instruções MIPS
+        # proximo: rótulo do bloco emitido logo depois (pra cair direto)
+        op = instr.op
+        funcao = self.funcao_ir
+
+        if op == 'mov':
+            self.baixar_mov(instr.dest, instr.args[0])
+
+        elif op in DESVIO or op in INSTRUCAO_OP or op == 'div':
+            a, b = instr.args
+            if 'flutuante' in (funcao.tipo_de(a), funcao.tipo_de(b)):
+                self.baixar_binaria_flutuante(instr)
+            else:
+                self.baixar_binaria_inteira(instr)
+
+        elif op == 'neg' or op == 'nao':
+            a = instr.args[0]
+            if funcao.tipo_de(a) == 'flutuante':
+                ra = self.operando_flutuante(a, "$f16")
+                d = self.destino_ir(instr.dest, "$f16")
+                self.emitir("neg.s " + d + ", " + ra)
+            else:
+                ra = self.operando_inteiro(a, "$t8")
+                d = self.destino_ir(instr.dest, "$t8")
+                if op == 'neg':
+                    self.emitir("sub " + d + ", $zero, " + ra)
+                else:
+                    self.emitir("seq " + d + ", " + ra + ", $zero")
+            self.escrever_destino(instr.dest, d)
+
+        elif op == 'cvt':
+            ra = self.operando_inteiro(instr.args[0], "$t8")
+            d = self.destino_ir(instr.dest, "$f16")
+            self.emitir("mtc1 " + ra + ", " + d)
+            self.emitir("cvt.s.w " + d + ", " + d)
+            self.escrever_destino(instr.dest, d)
+
+        elif op == 'ler':
+            if funcao.tipos.get(instr.dest) == 'flutuante':
+                self.emitir("li $v0, 6")
+                self.emitir("syscall")
+                d = self.destino_ir(instr.dest, "$f0")
+                if d != "$f0":
+                    self.emitir("mov.s " + d + ", $f0")
+            else:
+                self.emitir("li $v0, 5")
+                self.emitir("syscall")
+                d = self.destino_ir(instr.dest, "$v0")
+                if d != "$v0":
+                    self.emitir("move " + d + ", $v0")
+            self.escrever_destino(instr.dest, d)
+
+        elif op == 'escrever':
+            self.baixar_escrita(instr.args[0])
+
+        elif op == 'chamar':
+            self.baixar_chamada(instr)
+
+        elif op == 'salto':
+            if instr.alvos[0] != proximo:
+                self.emitir("j " + instr.alvos[0])
+
+        elif op == 'desvio':
+            self.baixar_desvio(instr, proximo)
+
+        elif op == 'fim':
+            if self.offset > 0:
+                self.emitir("addi $sp, $sp, " + str(self.offset))
+            self.emitir("li $v0, 10")
+            self.emitir("syscall")
+
+        elif op == 'retorno':
+            self.baixar_retorno()
+
+        else:
+            raise Exception("Instrucao do codigo intermediario desconhecida: " + op)
+
+    def baixar_mov(self, dest, origem):
+        if self.funcao_ir.tipos.get(dest) == 'flutuante':
+            d = self.destino_ir(dest, "$f16")
+            r = self.operando_flutuante(origem, d)
+            if r != d:
+                self.emitir("mov.s " + d + ", " + r)
+        else:
+            d = self.destino_ir(dest, "$t8")
+            if isinstance(origem, Const) and origem.tipo != 'cadeia':
+                self.emitir("li " + d + ", " + str(origem.valor))
+            else:
+                r = self.operando_inteiro(origem, d)
+                if r != d:
+                    self.emitir("move " + d + ", " + r)
+        self.escrever_destino(dest, d)
+
+    def baixar_binaria_inteira(self, instr):
+        op = instr.op
+        a, b = instr.args
+        ra = self.operando_inteiro(a, "$t8")
+        d = self.destino_ir(instr.dest, "$t8")
+        imediato = None
+        if isinstance(b, Const) and b.tipo != 'cadeia':
+            imediato = b.valor if op != 'menos' else -b.valor
+        if op in ('mais', 'menos') and imediato is not None and cabe_imediato(imediato):
+            self.emitir("addi " + d + ", " + ra + ", " + str(imediato))
+        elif op == 'menor' and imediato is not None and cabe_imediato(imediato):
+            self.emitir("slti " + d + ", " + ra + ", " + str(imediato))
+        else:
+            rb = self.operando_inteiro(b, "$t9")
+            self.emitir_op(op, d, ra, rb)
+        self.escrever_destino(instr.dest, d)
+
+    def baixar_binaria_flutuante(self, instr):
+        op = instr.op
+        a, b = instr.args
+        ra = self.operando_flutuante(a, "$f16")
+        rb = self.operando_flutuante(b, "$f18")
+        if op in INSTRUCAO_FLUTUANTE:
+            d = self.destino_ir(instr.dest, "$f16")
+            self.emitir(INSTRUCAO_FLUTUANTE[op] + " " + d + ", " + ra + ", " + rb)
+        else:
+            # Comparação: flag da FPU -> 0/1 num registrador inteiro
+            d = self.destino_ir(instr.dest, "$t8")
+            instrucao, trocar, negar = COMPARACAO_FLUTUANTE[op]
+            if trocar:
+                ra, rb = rb, ra
+            self.emitir("li " + d + ", 1")
+            self.emitir(instrucao + " " + ra + ", " + rb)
+            self.emitir(("movt " if negar else "movf ") + d + ", $zero")
+        self.escrever_destino(instr.dest, d)
+
+    def baixar_escrita(self, a):
+        # syscall 1 (inteiro/lógico), 2 (flutuante, em $f12) ou 4 (cadeia)
+        tipo = self.funcao_ir.tipo_de(a)
+        if tipo == 'flutuante':
+            r = self.operando_flutuante(a, "$f12")
+            if r != "$f12":
+                self.emitir("mov.s $f12, " + r)
+            self.emitir("li $v0, 2")
+        else:
+            if isinstance(a, Const) and a.tipo != 'cadeia':
+                self.emitir("li $a0, " + str(a.valor))
+            else:
+                r = self.operando_inteiro(a, "$a0")
+                if r != "$a0":
+                    self.emitir("move $a0, " + r)
+            self.emitir("li $v0, 4" if tipo == 'cadeia' else "li $v0, 1")
+        self.emitir("syscall")
+
+    def baixar_desvio(self, instr, proximo):
+        # Se o bloco do "senão" vem logo depois, um desvio só resolve;
+        # se o do "então" vem depois, desvia com a condição invertida
+        a, b = instr.args
+        verdadeiro, falso = instr.alvos
+        cond = instr.cond
+
+        if 'flutuante' in (self.funcao_ir.tipo_de(a), self.funcao_ir.tipo_de(b)):
+            ra = self.operando_flutuante(a, "$f16")
+            rb = self.operando_flutuante(b, "$f18")
+            instrucao, trocar, negar = COMPARACAO_FLUTUANTE[cond]
+            if trocar:
+                ra, rb = rb, ra
+            self.emitir(instrucao + " " + ra + ", " + rb)
+            # Com negar, a flag ligada quer dizer que a condição é falsa
+            se_verdade, se_falso = ("bc1f", "bc1t") if negar else ("bc1t", "bc1f")
+            desvio_v = se_verdade + " " + verdadeiro
+            desvio_f = se_falso + " " + falso
+        else:
+            # Constante vai pro lado direito (o MIPS aceita imediato ali)
+            if isinstance(a, Const) and not isinstance(b, Const):
+                a, b = b, a
+                cond = ESPELHO[cond]
+            ra = self.operando_inteiro(a, "$t8")
+            if isinstance(b, Const) and b.tipo != 'cadeia':
+                rb = "$zero" if b.valor == 0 else str(b.valor)
+            else:
+                rb = self.operando_inteiro(b, "$t9")
+            desvio_v = DESVIO[cond] + " " + ra + ", " + rb + ", " + verdadeiro
+            desvio_f = DESVIO[NEGACAO[cond]] + " " + ra + ", " + rb + ", " + falso
+
+        if falso == proximo:
+            self.emitir(desvio_v)
+        elif verdadeiro == proximo:
+            self.emitir(desvio_f)
+        else:
+            self.emitir(desvio_v)
+            self.emitir("j " + falso)
+
+
+def tipo_da_var(no):
+    # Tipo da variável usada pelo nó (inteiro se a semântica não resolveu)
+    decl = no.decl
+    if isinstance(decl, DeclVar) and decl.tipo != 'var':
+        return decl.tipo
+    return 'inteiro'
+
+
+def cadeia_constante(expr):
+    # Texto (com aspas) de uma expressão cadeia feita só de literais e '&',
+    # ou None se depender de variável
+    if isinstance(expr, Cadeia):
+        return expr.lexema
+    if isinstance(expr, Binaria) and expr.op == 'concat':
+        esq = cadeia_constante(expr.esq)
+        dir = cadeia_constante(expr.dir)
+        if esq is not None and dir is not None:
+            return esq[:-1] + dir[1:]
+    return None
+
+
+def valor_constante(expr):
+    # Const com o valor de uma expressão feita só de literais (mesma
+    # aritmética do otimizador do IR), ou None
+    if isinstance(expr, Num):
+        if expr.tipo == 'flutuante' or '.' in expr.lexema:
+            return Const(flutuante_32(float(expr.lexema)), 'flutuante')
+        return Const(int(expr.lexema), 'inteiro')
+    if isinstance(expr, Logico):
+        return Const(1 if expr.valor else 0, 'lógico')
+    if isinstance(expr, Unaria):
+        a = valor_constante(expr.expr)
+        if a is None:
+            return None
+        return avaliar('neg' if expr.op == 'menos' else 'nao', a.tipo, a)
+    if isinstance(expr, Binaria) and expr.op != 'concat':
+        a = valor_constante(expr.esq)
+        b = valor_constante(expr.dir)
+        if a is None or b is None:
+            return None
+        if 'flutuante' in (a.tipo, b.tipo):
+            a = Const(flutuante_32(float(a.valor)), 'flutuante')
+            b = Const(flutuante_32(float(b.valor)), 'flutuante')
+        return avaliar(expr.op, a.tipo, a, b)
+    return None
+
+
+def coletar_funcoes(comandos):
+    # Todas as DeclFuncao do programa (inclusive dentro de blocos e de
+    # outras funções), na ordem em que aparecem
+    funcoes = []
+    for cmd in comandos:
+        if isinstance(cmd, DeclFuncao):
+            funcoes.append(cmd)
+            funcoes.extend(coletar_funcoes(cmd.corpo))
+        elif isinstance(cmd, Se):
+            funcoes.extend(coletar_funcoes(cmd.entao))
+            if cmd.senao is not None:
+                funcoes.extend(coletar_funcoes(cmd.senao))
+        elif isinstance(cmd, Enquanto) or isinstance(cmd, Para):
+            funcoes.extend(coletar_funcoes(cmd.corpo))
+    return funcoes
+
+
+def variaveis_compartilhadas(funcoes):
+    # Declarações usadas dentro de uma função sem ser dela (parâmetro ou
+    # local): as globais, que ficam no .data em vez de registrador/pilha
+    compartilhadas = []
+    for decl in funcoes:
+        declaradas = set(decl.params)
+        usadas = []
+        _usos_comandos(decl.corpo, declaradas, usadas)
+        for d in usadas:
+            if d not in declaradas and d not in compartilhadas:
+                compartilhadas.append(d)
+    return compartilhadas
+
+
+def _usos_comandos(comandos, declaradas, usadas):
+    # Junta as declarações feitas e as variáveis usadas nos comandos
+    # (não entra no corpo de funções aninhadas: são outra rotina)
+    for cmd in comandos:
+        if isinstance(cmd, DeclVar):
+            declaradas.add(cmd)
+            if cmd.valor is not None:
+                _usos_expr(cmd.valor, usadas)
+        elif isinstance(cmd, Atribuicao) or isinstance(cmd, Leitura):
+            usadas.append(cmd.decl)
+            if isinstance(cmd, Atribuicao):
+                _usos_expr(cmd.expr, usadas)
+        elif isinstance(cmd, Escrita) or isinstance(cmd, ExprCmd):
+            _usos_expr(cmd.expr, usadas)
+        elif isinstance(cmd, Se):
+            _usos_expr(cmd.cond, usadas)
+            _usos_comandos(cmd.entao, declaradas, usadas)
+            if cmd.senao is not None:
+                _usos_comandos(cmd.senao, declaradas, usadas)
+        elif isinstance(cmd, Enquanto):
+            _usos_expr(cmd.cond, usadas)
+            _usos_comandos(cmd.corpo, declaradas, usadas)
+        elif isinstance(cmd, Para):
+            _usos_comandos([cmd.inicio], declaradas, usadas)
+            if cmd.cond is not None:
+                _usos_expr(cmd.cond, usadas)
+            _usos_comandos(cmd.corpo, declaradas, usadas)
+            _usos_comandos([cmd.passo], declaradas, usadas)
+
+
+def _usos_expr(expr, usadas):
+    if isinstance(expr, Var) or isinstance(expr, IncDec):
+        usadas.append(expr.decl)
+    elif isinstance(expr, Binaria):
+        _usos_expr(expr.esq, usadas)
+        _usos_expr(expr.dir, usadas)
+    elif isinstance(expr, Unaria):
+        _usos_expr(expr.expr, usadas)
+    elif isinstance(expr, Chamada):
+        for arg in expr.args:
+            _usos_expr(arg, usadas)
+
+
+def cabe_imediato(valor):
+    # Cabe no campo de 16 bits com sinal das instruções tipo I (addi, slti)?
+    return -32768 <= valor <= 32767
@@ -0,0 +1,262 @@
+# GERADOR DA TABELA SLR
+# Monta a tabela ACTION/GOTO direto das produções da gramática, em vez de
+# manter a tabela na mão:
+#   1. itens LR(0) e coleção canônica de estados (fechamento + goto)
+#   2. conjuntos FIRST e FOLLOW
+#   3. tabela SLR: shift nas transições com terminal, reduce nos itens
+#      completos pra cada terminal do FOLLOW do lado esquerdo
+# Conflitos são resolvidos do jeito clássico (shift ganha de reduce, e no
+# reduce/reduce ganha a produção de número menor) e ficam registrados
+# numa lista de mensagens
+#
+# A tabela gerada pode ser guardada num arquivo de cache versionado, cuja
+# chave é um hash da gramática: se a gramática não mudou, carrega do disco
+
+import hashlib
+import json
+import os
+
+# Muda quando o formato do cache ou o algoritmo mudar (invalida os antigos)
+VERSAO_CACHE = 1
+
+# Pasta padrão do cache (a mesma que o Python já usa pros .pyc)
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+
+
+def simbolos_gramatica(producoes):
+    # Separa os símbolos em não-terminais (aparecem do lado esquerdo)
+    # e terminais (o resto do lado direito)
+    nao_terminais = []
+    for num in sorted(producoes):
+        lhs = producoes[num][0]
+        if lhs not in nao_terminais:
+            nao_terminais.append(lhs)
+
+    terminais = []
+    for num in sorted(producoes):
+        for simbolo in producoes[num][1]:
+            if simbolo not in nao_terminais and simbolo not in terminais:
+                terminais.append(simbolo)
+    terminais.append('$')
+    return nao_terminais, terminais
+
+
+def calcular_first(producoes, nao_terminais):
+    # FIRST de cada não-terminal + quais derivam vazio (anuláveis)
+    first = {nt: set() for nt in nao_terminais}
+    anulavel = set()
+
+    mudou = True
+    while mudou:
+        mudou = False
+        for num in sorted(producoes):
+            lhs, rhs = producoes[num]
+            antes = len(first[lhs])
+            todos_anulaveis = True
+            for simbolo in rhs:
+                if simbolo in first:
+                    first[lhs] |= first[simbolo]
+                    if simbolo not in anulavel:
+                        todos_anulaveis = False
+                        break
+                else:
+                    first[lhs].add(simbolo)
+                    todos_anulaveis = False
+                    break
+            if todos_anulaveis and lhs not in anulavel:
+                anulavel.add(lhs)
+                mudou = True
+            if len(first[lhs]) != antes:
+                mudou = True
+
+    return first, anulavel
+
+
+def first_sequencia(simbolos, first, anulavel):
+    # FIRST de uma sequência de símbolos; o bool diz se a sequência é anulável
+    resultado = set()
+    for simbolo in simbolos:
+        if simbolo in first:
+            resultado |= first[simbolo]
+            if simbolo not in anulavel:
+                return resultado, False
+        else:
+            resultado.add(simbolo)
+            return resultado, False
+    return resultado, True
+
+
+def calcular_follow(producoes, nao_terminais, first, anulavel):
+    follow = {nt: set() for nt in nao_terminais}
+    inicial = producoes[min(producoes)][0]
+    follow[inicial].add('$')
+
+    mudou = True
+    while mudou:
+        mudou = False
+        for num in sorted(producoes):
+            lhs, rhs = producoes[num]
+            for i, simbolo in enumerate(rhs):
+                if simbolo not in follow:
+                    continue
+                antes = len(follow[simbolo])
+                resto, resto_anulavel = first_sequencia(rhs[i + 1:], first, anulavel)
+                follow[simbolo] |= resto
+                if resto_anulavel:
+                    follow[simbolo] |= follow[lhs]
+                if len(follow[simbolo]) != antes:
+                    mudou = True
+
+    return follow
+
+
+def fechamento(itens, producoes, por_lhs):
+    # Fecho LR(0): pra cada item A -> α . B β, inclui B -> . γ
+    conjunto = set(itens)
+    pendentes = list(itens)
+    while pendentes:
+        num, ponto = pendentes.pop()
+        rhs = producoes[num][1]
+        if ponto < len(rhs) and rhs[ponto] in por_lhs:
+            for outra in por_lhs[rhs[ponto]]:
+                item = (outra, 0)
+                if item not in conjunto:
+                    conjunto.add(item)
+                    pendentes.append(item)
+    return frozenset(conjunto)
+
+
+def colecao_lr0(producoes, nao_terminais):
+    # Coleção canônica de conjuntos de itens LR(0)
+    # Os estados são numerados em ordem de descoberta (BFS), percorrendo os
+    # símbolos em ordem alfabética, então a numeração é sempre a mesma
+    por_lhs = {nt: [] for nt in nao_terminais}
+    for num in sorted(producoes):
+        por_lhs[producoes[num][0]].append(num)
+
+    inicial = fechamento([(min(producoes), 0)], producoes, por_lhs)
+    estados = [inicial]
+    indice = {inicial: 0}
+    transicoes = {}
+
+    i = 0
+    while i < len(estados):
+        por_simbolo = {}
+        for num, ponto in estados[i]:
+            rhs = producoes[num][1]
+            if ponto < len(rhs):
+                por_simbolo.setdefault(rhs[ponto], []).append((num, ponto + 1))
+
+        for simbolo in sorted(por_simbolo):
+            destino = fechamento(por_simbolo[simbolo], producoes, por_lhs)
+            if destino not in indice:
+                indice[destino] = len(estados)
+                estados.append(destino)
+            transicoes[(i, simbolo)] = indice[destino]
+        i += 1
+
+    return estados, transicoes
+
+
+def gerar_tabela_slr(producoes):
+    # Gera a tabela no mesmo formato da AFD escrita à mão:
+    #   {estado: {"ACTION": {terminal: "S n" | "R n" | "ACC"}, "GOTO": {nt: n}}}
+    # Retorna (tabela, conflitos)
+    nao_terminais, terminais = simbolos_gramatica(producoes)
+    first, anulavel = calcular_first(producoes, nao_terminais)
+    follow = calcular_follow(producoes, nao_terminais, first, anulavel)
+    estados, transicoes = colecao_lr0(producoes, nao_terminais)
+
+    prod_inicial = min(producoes)
+    tabela = {i: {"ACTION": {}, "GOTO": {}} for i in range(len(estados))}
+    conflitos = []
+
+    # Shifts e GOTOs saem direto das transições
+    for (origem, simbolo), destino in sorted(transicoes.items()):
+        if simbolo in follow:
+            tabela[origem]["GOTO"][simbolo] = destino
+        else:
+            tabela[origem]["ACTION"][simbolo] = "S " + str(destino)
+
+    # Reduces nos itens completos
+    for i, itens in enumerate(estados):
+        acoes = tabela[i]["ACTION"]
+        for num, ponto in sorted(itens):
+            lhs, rhs = producoes[num]
+            if ponto != len(rhs):
+                continue
+
+            if num == prod_inicial:
+                acoes['$'] = "ACC"
+                continue
+
+            for terminal in sorted(follow[lhs]):
+                nova = "R " + str(num)
+                atual = acoes.get(terminal)
+                if atual is None:
+                    acoes[terminal] = nova
+                elif atual.startswith("S "):
+                    conflitos.append(f"Estado {i}: shift/reduce em '{terminal}' ({atual} x {nova}) -> {atual}")
+                elif atual.startswith("R "):
+                    outra = int(atual.split()[1])
+                    vencedora = "R " + str(min(outra, num))
+                    conflitos.append(f"Estado {i}: reduce/reduce em '{terminal}' ({atual} x {nova}) -> {vencedora}")
+                    acoes[terminal] = vencedora
+
+    return tabela, conflitos
+
+
+def chave_gramatica(producoes, *extras):
+    # Hash da gramática (e de qualquer outra coisa que mude a tabela final,
+    # como a ordem dos códigos dos terminais) + versão do cache
+    h = hashlib.sha256()
+    h.update(str(VERSAO_CACHE).encode())
+    for num in sorted(producoes):
+        lhs, rhs = producoes[num]
+        h.update(repr((num, lhs, list(rhs))).encode('utf-8'))
+    for extra in extras:
+        h.update(repr(extra).encode('utf-8'))
+    return h.hexdigest()
+
+
+def caminho_cache(chave, pasta=None):
+    return os.path.join(pasta or PASTA_CACHE, 'tabela_slr.' + chave[:16] + '.json')
+
+
+def carregar_cache(chave, pasta=None):
+    # Devolve os dados guardados pra essa chave, ou None se não tiver
+    # (ou se o arquivo for de outra versão/gramática ou estiver corrompido)
+    try:
+        with open(caminho_cache(chave, pasta), encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if dados.get('versao') != VERSAO_CACHE or dados.get('chave') != chave:
+        return None
+    return dados
+
+
+def salvar_cache(chave, dados, pasta=None):
+    # Grava num arquivo temporário e renomeia, pra outro processo nunca ler
+    # um cache pela metade. Falha ao gravar (pasta só leitura) não é erro
+    caminho = caminho_cache(chave, pasta)
+    dados = dict(dados, versao=VERSAO_CACHE, chave=chave)
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temp = caminho + '.' + str(os.getpid()) + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, separators=(',', ':'))
+        os.replace(temp, caminho)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    # Gera a tabela e mostra o relatório de conflitos
+    from analisador_sintatico_slr import PRODUCOES
+
+    tabela, conflitos = gerar_tabela_slr(PRODUCOES)
+    print("Estados: " + str(len(tabela)))
+    print("Conflitos: " + str(len(conflitos)))
+    for c in conflitos:
+        print("  - " + c)
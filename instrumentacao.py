@@ -0,0 +1,146 @@
+# INSTRUMENTAÇÃO DAS FASES
+# Mede cada fase da compilação (léxico, SLR, descendente, semântica,
+# geração...): tempo de parede, tempo de CPU, pico de memória (tracemalloc)
+# e contadores da fase (tokens, shifts/reduces do SLR ou tokens consumidos
+# do LL(1), símbolos, instruções...) e gera um relatório em JSON ou CSV:
+#   inst = Instrumentacao()
+#   with inst.fase("lexica"):
+#       tokens, erros = Lexico().analisar(codigo)
+#   inst.contar("lexica", tokens=len(tokens))
+#   inst.salvar("relatorio.json")
+# Desligada (SEM_INSTRUMENTACAO) não mede nada: fase() devolve sempre o
+# mesmo contexto vazio e contar() não faz nada; quem calcula um contador
+# caro testa inst.ativa antes
+# O tracemalloc deixa o programa bem mais lento, então dá pra medir só o
+# tempo (memoria=False)
+
+import csv
+import json
+import os
+import time
+import tracemalloc
+
+# Campos fixos de cada fase no relatório (os contadores vêm depois)
+CAMPOS = ['fase', 'parede_s', 'cpu_s', 'pico_memoria_kb']
+
+
+class _Medicao:
+    # Contexto de uma fase (with inst.fase(nome): ...)
+    def __init__(self, inst, nome):
+        self.inst = inst
+        self.nome = nome
+
+    def __enter__(self):
+        if self.inst.memoria:
+            tracemalloc.reset_peak()
+            self.memoria_inicio = tracemalloc.get_traced_memory()[0]
+        self.cpu = time.process_time()
+        self.parede = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        parede = time.perf_counter() - self.parede
+        cpu = time.process_time() - self.cpu
+        pico = None
+        if self.inst.memoria:
+            # Pico acima do que já tava alocado quando a fase começou
+            pico = (tracemalloc.get_traced_memory()[1] - self.memoria_inicio) / 1024
+        registro = self.inst.registro(self.nome)
+        registro['parede_s'] += parede
+        registro['cpu_s'] += cpu
+        if pico is not None:
+            registro['pico_memoria_kb'] = max(registro['pico_memoria_kb'] or 0, pico)
+        return False
+
+
+class _Vazio:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        return False
+
+
+_VAZIO = _Vazio()
+
+
+class Instrumentacao:
+    # fases: registros na ordem em que as fases rodaram (uma fase repetida
+    # soma no mesmo registro)
+    ativa = True
+
+    def __init__(self, memoria=True):
+        self.memoria = memoria
+        self.fases = []
+        self.indice = {}
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def registro(self, nome):
+        if nome not in self.indice:
+            registro = {'fase': nome, 'parede_s': 0.0, 'cpu_s': 0.0, 'pico_memoria_kb': None}
+            self.indice[nome] = registro
+            self.fases.append(registro)
+        return self.indice[nome]
+
+    def fase(self, nome):
+        return _Medicao(self, nome)
+
+    def contar(self, fase, **contadores):
+        registro = self.registro(fase)
+        for nome, valor in contadores.items():
+            registro[nome] = registro.get(nome, 0) + valor
+
+    def parar(self):
+        # Desliga o tracemalloc (se foi a instrumentação que ligou)
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def relatorio(self):
+        # {'fases': [...], 'total': {...}} (o que vai pro JSON)
+        total = {'parede_s': sum(f['parede_s'] for f in self.fases),
+                 'cpu_s': sum(f['cpu_s'] for f in self.fases)}
+        picos = [f['pico_memoria_kb'] for f in self.fases if f['pico_memoria_kb'] is not None]
+        total['pico_memoria_kb'] = max(picos) if picos else None
+        return {'fases': self.fases, 'total': total}
+
+    def salvar(self, caminho):
+        # Formato pela extensão: .csv ou JSON (qualquer outra)
+        if os.path.splitext(caminho)[1].lower() == '.csv':
+            self.salvar_csv(caminho)
+        else:
+            self.salvar_json(caminho)
+
+    def salvar_json(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.relatorio(), f, indent=2, ensure_ascii=False)
+
+    def salvar_csv(self, caminho):
+        # Uma linha por fase; uma coluna por contador (vazia se a fase não tem)
+        colunas = list(CAMPOS)
+        for registro in self.fases:
+            for nome in registro:
+                if nome not in colunas:
+                    colunas.append(nome)
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=colunas)
+            escritor.writeheader()
+            for registro in self.fases:
+                escritor.writerow(registro)
+
+
+class InstrumentacaoDesligada:
+    ativa = False
+    fases = []
+
+    def fase(self, nome):
+        return _VAZIO
+
+    def contar(self, fase, **contadores):
+        pass
+
+    def parar(self):
+        pass
+
+
+SEM_INSTRUMENTACAO = InstrumentacaoDesligada()
@@ -0,0 +1,900 @@
+# INTERPRETADOR MIPS
+# Roda o assembly que o GeradorMIPS gera sem precisar do MARS:
+#   python interpretador_mips.py saida.asm
+#   python interpretador_mips.py saida.asm --entrada 7 --entrada 3 --perfil 10
+# Cobre o subconjunto que o compilador emite (ALU de inteiros, mul/div,
+# lw/sw, desvios, j/jal/jr, FPU de precisão simples com l.s/s.s, c.xx.s,
+# bc1t/bc1f, movf/movt, mtc1/cvt.s.w) e os syscalls 1, 2, 4, 5, 6 e 10
+# Além da saída do programa devolve quantas instruções rodaram, por
+# instrução e por rótulo (trecho do rótulo até o próximo), pra comparar
+# otimizações pela contagem dinâmica e não só pelo tamanho do .asm
+#
+# Como roda rápido:
+#   - o assembly é decodificado uma vez: cada instrução vira uma função
+#     Python com os operandos já resolvidos (índice do registrador,
+#     imediato, endereço do rótulo)
+#   - as instruções são agrupadas em blocos básicos (sem desvio no meio);
+#     o laço principal roda o bloco inteiro e só conta a entrada dele, e as
+#     contagens por instrução e por rótulo saem disso no fim
+#   - a memória é um bytearray de tamanho fixo com duas visões (palavras
+#     inteiras e flutuantes), então lw/l.s é um acesso de lista
+# Memória: o .data começa em 0x10010000 (igual ao MARS) e a pilha desce do
+# fim do bloco de TAMANHO_MEMORIA bytes; acesso fora dele ou desalinhado é
+# erro de execução
+
+import argparse
+import math
+import re
+import sys
+
+BASE_DADOS = 0x10010000
+BASE_TEXTO = 0x00400000
+TAMANHO_MEMORIA = 4 * 1024 * 1024
+
+NOMES_REGISTRADORES = ['$zero', '$at', '$v0', '$v1', '$a0', '$a1', '$a2', '$a3',
+                       '$t0', '$t1', '$t2', '$t3', '$t4', '$t5', '$t6', '$t7',
+                       '$s0', '$s1', '$s2', '$s3', '$s4', '$s5', '$s6', '$s7',
+                       '$t8', '$t9', '$k0', '$k1', '$gp', '$sp', '$fp', '$ra']
+
+REGISTRADOR = {nome: i for i, nome in enumerate(NOMES_REGISTRADORES)}
+REGISTRADOR.update({'$' + str(i): i for i in range(32)})
+REGISTRADOR['$s8'] = 30
+
+# Posições extras da lista de registradores: HI, LO e um descarte pra onde
+# vão as escritas em $zero (assim a instrução não testa o destino)
+HI = 32
+LO = 33
+DESCARTE = 34
+
+SP = 29
+RA = 31
+
+# Instruções que terminam um bloco básico
+DESVIOS_2 = frozenset(['beq', 'bne', 'blt', 'bgt', 'bge', 'ble'])
+DESVIOS_1 = frozenset(['beqz', 'bnez', 'bgez', 'bgtz', 'blez', 'bltz'])
+DESVIOS_FPU = frozenset(['bc1t', 'bc1f'])
+DESVIOS = DESVIOS_2 | DESVIOS_1 | DESVIOS_FPU
+FIM_BLOCO = DESVIOS | frozenset(['j', 'jal', 'jr', 'syscall'])
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '\\': '\\', '"': '"', "'": "'"}
+
+
+def _w32(v):
+    # Inteiro Python -> inteiro de 32 bits com sinal (o que o registrador guarda)
+    return ((v + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+def _dividir(x, y):
+    # Divisão inteira do MIPS: trunca pra zero (o // do Python arredonda pra baixo)
+    if y == 0:
+        raise Exception("Divisao inteira por zero")
+    q = abs(x) // abs(y)
+    if (x < 0) != (y < 0):
+        q = -q
+    return _w32(q), _w32(x - q * y)
+
+
+def formatar_flutuante(v):
+    # Como o MARS imprime um float (Float.toString do Java): o menor número
+    # de dígitos que volta pro mesmo float, notação decimal entre 10^-3 e
+    # 10^7 e científica (1.0E10) fora disso
+    if v != v:
+        return 'NaN'
+    if math.isinf(v):
+        return 'Infinity' if v > 0 else '-Infinity'
+    if v == 0:
+        return '-0.0' if math.copysign(1.0, v) < 0 else '0.0'
+    conversao = memoryview(bytearray(4)).cast('f')
+    for precisao in range(1, 10):
+        texto = '%.*e' % (precisao - 1, v)
+        conversao[0] = float(texto)
+        if conversao[0] == v:
+            break
+    mantissa, expoente = texto.split('e')
+    expoente = int(expoente)
+    sinal = '-' if mantissa.startswith('-') else ''
+    digitos = mantissa.lstrip('-').replace('.', '').rstrip('0') or '0'
+    if 1e-3 <= abs(v) < 1e7:
+        if expoente >= 0:
+            inteira = digitos[:expoente + 1].ljust(expoente + 1, '0')
+            fracao = digitos[expoente + 1:] or '0'
+            return sinal + inteira + '.' + fracao
+        return sinal + '0.' + '0' * (-expoente - 1) + digitos
+    return sinal + digitos[0] + '.' + (digitos[1:] or '0') + 'E' + str(expoente)
+
+
+def _tirar_comentario(linha):
+    # Tira o comentário (#) sem cortar um '#' dentro de string
+    dentro = False
+    i = 0
+    while i < len(linha):
+        c = linha[i]
+        if c == '\\' and dentro:
+            i += 2
+            continue
+        if c == '"':
+            dentro = not dentro
+        elif c == '#' and not dentro:
+            return linha[:i]
+        i += 1
+    return linha
+
+
+def _ler_cadeia(texto, linha):
+    texto = texto.strip()
+    if len(texto) < 2 or texto[0] != '"' or texto[-1] != '"':
+        raise Exception("String invalida na linha " + str(linha) + ": " + texto)
+    saida = []
+    i = 1
+    while i < len(texto) - 1:
+        c = texto[i]
+        if c == '\\' and i + 1 < len(texto) - 1:
+            saida.append(ESCAPES.get(texto[i + 1], texto[i + 1]))
+            i += 2
+        else:
+            saida.append(c)
+            i += 1
+    return ''.join(saida)
+
+
+def _dividir_operandos(texto):
+    return [a.strip() for a in texto.split(',')] if texto.strip() else []
+
+
+class Instrucao:
+    # Instrução do .text antes de decodificar (linha pra mensagem de erro)
+    __slots__ = ('op', 'args', 'linha')
+
+    def __init__(self, op, args, linha):
+        self.op = op
+        self.args = args
+        self.linha = linha
+
+
+class Execucao:
+    # Resultado de uma execução
+    # saida: tudo que o programa imprimiu
+    # instrucoes: total de instruções executadas
+    # por_instrucao: {mnemônico: quantas vezes rodou}
+    # por_rotulo: {rótulo: instruções executadas no trecho dele}
+    # terminou: False se parou pelo limite de instruções
+    # visitas: {rótulo: quantas vezes a execução passou pelo rótulo}
+    # desvios: {linha do desvio condicional: (rótulo do trecho, rótulo de
+    # destino, vezes que rodou, vezes que desviou)}; só com contar_desvios
+    def __init__(self, saida, instrucoes, por_instrucao, por_rotulo, terminou, visitas=None,
+                 desvios=None):
+        self.saida = saida
+        self.instrucoes = instrucoes
+        self.por_instrucao = por_instrucao
+        self.por_rotulo = por_rotulo
+        self.terminou = terminou
+        self.visitas = visitas if visitas is not None else {}
+        self.desvios = desvios if desvios is not None else {}
+
+    def pontos_quentes(self, n=10):
+        # Os n rótulos onde mais instruções rodaram: [(rótulo, instruções, %)]
+        total = self.instrucoes or 1
+        ordenados = sorted(self.por_rotulo.items(), key=lambda item: -item[1])
+        return [(rotulo, qtd, 100.0 * qtd / total) for rotulo, qtd in ordenados[:n] if qtd]
+
+
+class InterpretadorMIPS:
+    # Monta e decodifica o assembly no construtor; executar() pode ser
+    # chamado várias vezes (cada execução começa com memória e registradores
+    # limpos)
+    # contar_desvios: conta quantas vezes cada desvio condicional desviou
+    # (Execucao.desvios, pro perfil do PGO); sem ele o laço principal não
+    # paga nada a mais
+
+    def __init__(self, asm, tamanho_memoria=TAMANHO_MEMORIA, contar_desvios=False):
+        self.tamanho_memoria = tamanho_memoria
+        self.contar_desvios = contar_desvios
+        self.tomados = {}   # posição do desvio -> [vezes que desviou]
+        self.dados = bytearray()
+        self.rotulos_dados = {}
+        self.instrucoes = []
+        self.rotulos_texto = {}
+        self.montar(asm)
+        if len(self.dados) > tamanho_memoria // 2:
+            raise Exception("O .data (" + str(len(self.dados)) + " bytes) nao cabe na memoria")
+
+        # Estado da máquina: criado uma vez e zerado a cada execução (as
+        # funções decodificadas guardam referência pra essas listas)
+        self.memoria = bytearray(tamanho_memoria)
+        self.palavras = memoryview(self.memoria).cast('i')
+        self.reais = memoryview(self.memoria).cast('f')
+        conversao = bytearray(4)
+        conv_i = memoryview(conversao).cast('i')
+        conv_f = memoryview(conversao).cast('f')
+        self.R = [0] * 35
+        self.F = [0.0] * 32
+        self.cc = [False]
+        self.saida = []
+        self.entrada = [None]
+        self.bloco_do_endereco = {}
+        self.blocos = self.decodificar(self.R, self.F, self.cc, self.palavras, self.reais, conv_i, conv_f,
+                                       self.saida, self.entrada)
+        for k, inicio in enumerate(self.inicios):
+            self.bloco_do_endereco[BASE_TEXTO + 4 * inicio] = k
+        self.entrada_programa = -1
+        inicio = self.rotulos_texto.get('main', 0)
+        if inicio < len(self.instrucoes):
+            self.entrada_programa = self.bloco_do_endereco[BASE_TEXTO + 4 * inicio]
+
+    # ------------------------------------------------------------------
+    # Montagem (texto -> .data em bytes e lista de instruções)
+    # ------------------------------------------------------------------
+
+    def montar(self, asm):
+        segmento = 'text'
+        for num, linha in enumerate(asm.split('\n'), 1):
+            linha = _tirar_comentario(linha).strip()
+            # Rótulos no começo da linha (pode ter mais de um)
+            while True:
+                m = re.match(r'^([A-Za-z_.$][\w.$]*)\s*:', linha)
+                if not m:
+                    break
+                self.definir_rotulo(m.group(1), segmento, num)
+                linha = linha[m.end():].strip()
+            if not linha:
+                continue
+            if linha.startswith('.'):
+                partes = linha.split(None, 1)
+                diretiva = partes[0]
+                resto = partes[1] if len(partes) > 1 else ''
+                if diretiva == '.data':
+                    segmento = 'data'
+                elif diretiva == '.text':
+                    segmento = 'text'
+                elif diretiva in ('.globl', '.global', '.extern'):
+                    pass
+                elif segmento == 'data':
+                    self.diretiva_dados(diretiva, resto, num)
+                else:
+                    raise Exception("Diretiva " + diretiva + " fora do .data na linha " + str(num))
+                continue
+            if segmento != 'text':
+                raise Exception("Instrucao no .data na linha " + str(num) + ": " + linha)
+            partes = linha.split(None, 1)
+            args = _dividir_operandos(partes[1]) if len(partes) > 1 else []
+            self.instrucoes.append(Instrucao(partes[0], args, num))
+
+    def definir_rotulo(self, nome, segmento, num):
+        if nome in self.rotulos_dados or nome in self.rotulos_texto:
+            raise Exception("Rotulo '" + nome + "' repetido na linha " + str(num))
+        if segmento == 'data':
+            self.rotulos_dados[nome] = len(self.dados)
+        else:
+            self.rotulos_texto[nome] = len(self.instrucoes)
+
+    def alinhar(self, n):
+        while len(self.dados) % n:
+            self.dados.append(0)
+
+    def diretiva_dados(self, diretiva, resto, num):
+        # O rótulo já foi definido antes do alinhamento; .word/.float
+        # alinham (como no MARS), então ele é corrigido pro endereço alinhado
+        if diretiva in ('.word', '.float'):
+            antes = len(self.dados)
+            self.alinhar(4)
+            for nome, pos in self.rotulos_dados.items():
+                if pos == antes:
+                    self.rotulos_dados[nome] = len(self.dados)
+            for valor in _dividir_operandos(resto):
+                if diretiva == '.word':
+                    self.dados.extend((int(valor, 0) & 0xFFFFFFFF).to_bytes(4, 'little'))
+                else:
+                    palavra = memoryview(bytearray(4))
+                    palavra.cast('f')[0] = float(valor)
+                    self.dados.extend(palavra)
+        elif diretiva in ('.asciiz', '.ascii'):
+            self.dados.extend(_ler_cadeia(resto, num).encode('utf-8'))
+            if diretiva == '.asciiz':
+                self.dados.append(0)
+        elif diretiva == '.space':
+            self.dados.extend(bytes(int(resto, 0)))
+        elif diretiva == '.align':
+            self.alinhar(1 << int(resto, 0))
+        else:
+            raise Exception("Diretiva " + diretiva + " nao suportada (linha " + str(num) + ")")
+
+    # ------------------------------------------------------------------
+    # Decodificação (instrução -> função Python)
+    # ------------------------------------------------------------------
+
+    def decodificar(self, R, F, cc, palavras, reais, conv_i, conv_f, saida, entrada):
+        # Monta os blocos básicos: (corpo, saída, tamanho); corpo é a lista
+        # de funções sem desvio e saída devolve o índice do próximo bloco
+        # (-1 = fim do programa)
+        instrs = self.instrucoes
+        lideres = set([0])
+        for pos in self.rotulos_texto.values():
+            lideres.add(pos)
+        for i, instr in enumerate(instrs):
+            if instr.op in FIM_BLOCO:
+                lideres.add(i + 1)
+        lideres = sorted(p for p in lideres if p < len(instrs))
+        bloco_da_instrucao = {pos: k for k, pos in enumerate(lideres)}
+        self.inicios = lideres
+
+        limite = self.tamanho_memoria
+
+        def reg(nome, instr, destino=False):
+            if nome not in REGISTRADOR:
+                raise Exception("Registrador invalido '" + nome + "' na linha " + str(instr.linha))
+            r = REGISTRADOR[nome]
+            return DESCARTE if destino and r == 0 else r
+
+        def freg(nome, instr):
+            if not re.match(r'^\$f([0-9]|[12][0-9]|3[01])$', nome):
+                raise Exception("Registrador de flutuante invalido '" + nome + "' na linha " + str(instr.linha))
+            return int(nome[2:])
+
+        def imediato(texto, instr):
+            try:
+                return int(texto, 0)
+            except ValueError:
+                raise Exception("Imediato invalido '" + texto + "' na linha " + str(instr.linha))
+
+        def alvo(nome, instr):
+            if nome not in self.rotulos_texto:
+                raise Exception("Rotulo '" + nome + "' nao definido (linha " + str(instr.linha) + ")")
+            return bloco_da_instrucao[self.rotulos_texto[nome]] if self.rotulos_texto[nome] < len(instrs) else -1
+
+        def endereco(texto, instr):
+            # (registrador base ou None, deslocamento relativo ao início da memória)
+            m = re.match(r'^(-?\w*)\((\$\w+)\)$', texto)
+            if m:
+                return reg(m.group(2), instr), (imediato(m.group(1), instr) if m.group(1) else 0) - BASE_DADOS
+            if texto in self.rotulos_dados:
+                return None, self.rotulos_dados[texto]
+            raise Exception("Endereco invalido '" + texto + "' na linha " + str(instr.linha))
+
+        def fora(a, instr):
+            raise Exception("Acesso invalido a memoria (endereco " + hex(a + BASE_DADOS) + ") na linha " +
+                            str(instr.linha))
+
+        def operando(texto, instr):
+            # Terceiro operando de ALU/desvio: registrador ou imediato (pseudo)
+            if texto.startswith('$'):
+                return True, reg(texto, instr)
+            return False, imediato(texto, instr)
+
+        def alu(op, d, s, t_reg, t):
+            # Uma função por combinação (registrador/imediato) pra não testar
+            # nada na hora de executar
+            if op in ('add', 'addu', 'addi', 'addiu'):
+                if t_reg:
+                    def f():
+                        R[d] = ((R[s] + R[t] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+                else:
+                    def f():
+                        R[d] = ((R[s] + t + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op in ('sub', 'subu'):
+                if t_reg:
+                    def f():
+                        R[d] = ((R[s] - R[t] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+                else:
+                    def f():
+                        R[d] = ((R[s] - t + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == 'mul':
+                if t_reg:
+                    def f():
+                        R[d] = ((R[s] * R[t] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+                else:
+                    def f():
+                        R[d] = ((R[s] * t + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op in ('div', 'rem'):
+                k = 0 if op == 'div' else 1
+                if t_reg:
+                    def f():
+                        R[d] = _dividir(R[s], R[t])[k]
+                else:
+                    def f():
+                        R[d] = _dividir(R[s], t)[k]
+            else:
+                calculo = {
+                    'and': lambda x, y: x & y, 'andi': lambda x, y: x & (y & 0xFFFF),
+                    'or': lambda x, y: x | y, 'ori': lambda x, y: x | (y & 0xFFFF),
+                    'xor': lambda x, y: x ^ y, 'xori': lambda x, y: x ^ (y & 0xFFFF),
+                    'nor': lambda x, y: ~(x | y),
+                    'slt': lambda x, y: int(x < y), 'slti': lambda x, y: int(x < y),
+                    'sltu': lambda x, y: int((x & 0xFFFFFFFF) < (y & 0xFFFFFFFF)),
+                    'sltiu': lambda x, y: int((x & 0xFFFFFFFF) < (y & 0xFFFFFFFF)),
+                    'sgt': lambda x, y: int(x > y), 'sge': lambda x, y: int(x >= y),
+                    'sle': lambda x, y: int(x <= y), 'seq': lambda x, y: int(x == y),
+                    'sne': lambda x, y: int(x != y),
+                    'sll': lambda x, y: x << (y & 31), 'sllv': lambda x, y: x << (y & 31),
+                    'srl': lambda x, y: (x & 0xFFFFFFFF) >> (y & 31),
+                    'srlv': lambda x, y: (x & 0xFFFFFFFF) >> (y & 31),
+                    'sra': lambda x, y: x >> (y & 31), 'srav': lambda x, y: x >> (y & 31),
+                }[op]
+                if t_reg:
+                    def f():
+                        R[d] = ((calculo(R[s], R[t]) + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+                else:
+                    def f():
+                        R[d] = ((calculo(R[s], t) + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            return f
+
+        def memoria(op, r, base, desloc, instr):
+            # lw/sw/l.s/s.s; endereço fixo (rótulo) é conferido aqui mesmo
+            vista = palavras if op in ('lw', 'sw') else reais
+            banco = R if op in ('lw', 'sw') else F
+            if base is None:
+                if desloc & 3 or not 0 <= desloc < limite:
+                    fora(desloc, instr)
+                i = desloc >> 2
+                if op in ('lw', 'l.s'):
+                    def f():
+                        banco[r] = vista[i]
+                elif op == 'sw':
+                    def f():
+                        palavras[i] = R[r]
+                else:
+                    def f():
+                        v = F[r]
+                        if v.__class__ is int:
+                            palavras[i] = v
+                        else:
+                            reais[i] = v
+                return f
+            if op in ('lw', 'l.s'):
+                def f():
+                    a = R[base] + desloc
+                    if a & 3 or not 0 <= a < limite:
+                        fora(a, instr)
+                    banco[r] = vista[a >> 2]
+            elif op == 'sw':
+                def f():
+                    a = R[base] + desloc
+                    if a & 3 or not 0 <= a < limite:
+                        fora(a, instr)
+                    palavras[a >> 2] = R[r]
+            else:
+                # Registrador da FPU pode ter os bits de um mtc1 (int)
+                def f():
+                    a = R[base] + desloc
+                    if a & 3 or not 0 <= a < limite:
+                        fora(a, instr)
+                    v = F[r]
+                    if v.__class__ is int:
+                        palavras[a >> 2] = v
+                    else:
+                        reais[a >> 2] = v
+            return f
+
+        def fpu(op, d, a, b):
+            if op == 'add.s':
+                def f():
+                    conv_f[0] = F[a] + F[b]
+                    F[d] = conv_f[0]
+            elif op == 'sub.s':
+                def f():
+                    conv_f[0] = F[a] - F[b]
+                    F[d] = conv_f[0]
+            elif op == 'mul.s':
+                def f():
+                    conv_f[0] = F[a] * F[b]
+                    F[d] = conv_f[0]
+            else:
+                def f():
+                    x, y = F[a], F[b]
+                    if y == 0:
+                        # IEEE: x/0 é infinito com o sinal dos dois, 0/0 é NaN
+                        F[d] = math.nan if x == 0 or x != x else math.copysign(math.inf, x) * math.copysign(1.0, y)
+                    else:
+                        conv_f[0] = x / y
+                        F[d] = conv_f[0]
+            return f
+
+        def chamada_sistema(instr):
+            def f():
+                servico = R[2]
+                if servico == 1:
+                    saida.append(str(R[4]))
+                elif servico == 2:
+                    saida.append(formatar_flutuante(F[12]))
+                elif servico == 4:
+                    a = R[4] - BASE_DADOS
+                    if not 0 <= a < limite:
+                        fora(a, instr)
+                    fim = memoria_bytes.index(0, a)
+                    saida.append(bytes(memoria_bytes[a:fim]).decode('utf-8', 'replace'))
+                elif servico == 5:
+                    try:
+                        R[2] = _w32(int(entrada[0]().strip()))
+                    except ValueError as e:
+                        raise Exception("Entrada invalida pra read de inteiro: " + str(e))
+                elif servico == 6:
+                    try:
+                        conv_f[0] = float(entrada[0]().strip())
+                    except ValueError as e:
+                        raise Exception("Entrada invalida pra read de flutuante: " + str(e))
+                    F[0] = conv_f[0]
+                elif servico == 10:
+                    return True
+                else:
+                    raise Exception("Syscall " + str(servico) + " nao suportado (linha " + str(instr.linha) + ")")
+                return False
+            return f
+
+        memoria_bytes = palavras.obj
+        blocos = []
+        for k, inicio in enumerate(lideres):
+            fim = lideres[k + 1] if k + 1 < len(lideres) else len(instrs)
+            corpo = []
+            saida_bloco = None
+            proximo = k + 1 if fim < len(instrs) else -1
+            for pos in range(inicio, fim):
+                instr = instrs[pos]
+                op, a = instr.op, instr.args
+                try:
+                    if op in FIM_BLOCO:
+                        saida_bloco = self.decodificar_saida(op, a, instr, pos, proximo, R, cc, reg, alvo,
+                                                             operando, chamada_sistema)
+                        if self.contar_desvios and op in DESVIOS:
+                            saida_bloco = self.contar_desvio(saida_bloco, pos, alvo(a[-1], instr))
+                    else:
+                        corpo.append(self.decodificar_instrucao(op, a, instr, R, F, cc, conv_i, conv_f,
+                                                                reg, freg, imediato, endereco, operando,
+                                                                alu, memoria, fpu))
+                except IndexError:
+                    raise Exception("Faltam operandos em '" + op + "' na linha " + str(instr.linha))
+            if saida_bloco is None:
+                saida_bloco = (lambda proximo=proximo: proximo)
+            blocos.append((corpo, saida_bloco, fim - inicio))
+        return blocos
+
+    def decodificar_instrucao(self, op, a, instr, R, F, cc, conv_i, conv_f,
+                              reg, freg, imediato, endereco, operando, alu, memoria, fpu):
+        if op == 'li':
+            d, v = reg(a[0], instr, True), _w32(imediato(a[1], instr))
+
+            def f():
+                R[d] = v
+            return f
+        if op == 'la':
+            d = reg(a[0], instr, True)
+            base, desloc = endereco(a[1], instr)
+            if base is None:
+                v = desloc + BASE_DADOS
+
+                def f():
+                    R[d] = v
+            else:
+                def f():
+                    R[d] = _w32(R[base] + desloc + BASE_DADOS)
+            return f
+        if op == 'lui':
+            d, v = reg(a[0], instr, True), _w32(imediato(a[1], instr) << 16)
+
+            def f():
+                R[d] = v
+            return f
+        if op == 'move':
+            d, s = reg(a[0], instr, True), reg(a[1], instr)
+
+            def f():
+                R[d] = R[s]
+            return f
+        if op in ('mflo', 'mfhi'):
+            d, s = reg(a[0], instr, True), (LO if op == 'mflo' else HI)
+
+            def f():
+                R[d] = R[s]
+            return f
+        if op in ('div', 'divu') and len(a) == 2:
+            s, t = reg(a[0], instr), reg(a[1], instr)
+
+            def f():
+                R[LO], R[HI] = _dividir(R[s], R[t])
+            return f
+        if op in ('mult',):
+            s, t = reg(a[0], instr), reg(a[1], instr)
+
+            def f():
+                p = R[s] * R[t]
+                R[LO] = _w32(p)
+                R[HI] = _w32(p >> 32)
+            return f
+        if op in ('lw', 'sw'):
+            base, desloc = endereco(a[1], instr)
+            return memoria(op, reg(a[0], instr, op == 'lw'), base, desloc, instr)
+        if op in ('l.s', 's.s'):
+            base, desloc = endereco(a[1], instr)
+            return memoria(op, freg(a[0], instr), base, desloc, instr)
+        if op in ('add.s', 'sub.s', 'mul.s', 'div.s'):
+            return fpu(op, freg(a[0], instr), freg(a[1], instr), freg(a[2], instr))
+        if op in ('mov.s', 'neg.s', 'abs.s'):
+            d, s = freg(a[0], instr), freg(a[1], instr)
+            if op == 'mov.s':
+                def f():
+                    F[d] = F[s]
+            elif op == 'neg.s':
+                def f():
+                    F[d] = -F[s]
+            else:
+                def f():
+                    F[d] = abs(F[s])
+            return f
+        if op == 'mtc1':
+            # Copia os bits do inteiro pro registrador da FPU; o registrador
+            # guarda o próprio int (os bits), porque passar por float perde
+            # os padrões de NaN sinalizador (inteiros negativos grandes)
+            s, d = reg(a[0], instr), freg(a[1], instr)
+
+            def f():
+                F[d] = R[s]
+            return f
+        if op == 'mfc1':
+            d, s = reg(a[0], instr, True), freg(a[1], instr)
+
+            def f():
+                v = F[s]
+                if v.__class__ is int:
+                    R[d] = v
+                else:
+                    conv_f[0] = v
+                    R[d] = conv_i[0]
+            return f
+        if op == 'cvt.s.w':
+            # O registrador tem os bits de um inteiro (normalmente do mtc1)
+            d, s = freg(a[0], instr), freg(a[1], instr)
+
+            def f():
+                v = F[s]
+                if v.__class__ is not int:
+                    conv_f[0] = v
+                    v = conv_i[0]
+                conv_f[0] = float(v)
+                F[d] = conv_f[0]
+            return f
+        if op == 'cvt.w.s':
+            d, s = freg(a[0], instr), freg(a[1], instr)
+
+            def f():
+                x = F[s]
+                conv_i[0] = _w32(int(x)) if x == x and abs(x) < 2 ** 31 else 0x7FFFFFFF
+                F[d] = conv_f[0]
+            return f
+        if op in ('c.lt.s', 'c.le.s', 'c.eq.s'):
+            x, y = freg(a[0], instr), freg(a[1], instr)
+            if op == 'c.lt.s':
+                def f():
+                    cc[0] = F[x] < F[y]
+            elif op == 'c.le.s':
+                def f():
+                    cc[0] = F[x] <= F[y]
+            else:
+                def f():
+                    cc[0] = F[x] == F[y]
+            return f
+        if op in ('movf', 'movt'):
+            d, s = reg(a[0], instr, True), reg(a[1], instr)
+            quando = op == 'movt'
+
+            def f():
+                if cc[0] == quando:
+                    R[d] = R[s]
+            return f
+        if op == 'nop':
+            return lambda: None
+        if op in ('add', 'addu', 'sub', 'subu', 'mul', 'div', 'rem', 'and', 'or', 'xor', 'nor',
+                  'slt', 'sltu', 'sgt', 'sge', 'sle', 'seq', 'sne', 'sllv', 'srlv', 'srav',
+                  'addi', 'addiu', 'slti', 'sltiu', 'andi', 'ori', 'xori', 'sll', 'srl', 'sra'):
+            t_reg, t = operando(a[2], instr)
+            return alu(op, reg(a[0], instr, True), reg(a[1], instr), t_reg, t)
+        raise Exception("Instrucao '" + op + "' nao suportada (linha " + str(instr.linha) + ")")
+
+    def contar_desvio(self, saida_bloco, pos, destino):
+        # Embrulha a saída do bloco contando as vezes que foi pro destino
+        tomados = self.tomados[pos] = [0]
+
+        def f():
+            seguinte = saida_bloco()
+            if seguinte == destino:
+                tomados[0] += 1
+            return seguinte
+        return f
+
+    def decodificar_saida(self, op, a, instr, pos, proximo, R, cc, reg, alvo, operando, chamada_sistema):
+        # Última instrução do bloco: devolve o índice do próximo bloco
+        if op == 'j':
+            destino = alvo(a[0], instr)
+            return lambda: destino
+        if op == 'jal':
+            destino = alvo(a[0], instr)
+            retorno = BASE_TEXTO + 4 * (pos + 1)
+
+            def f():
+                R[RA] = retorno
+                return destino
+            return f
+        if op == 'jr':
+            r = reg(a[0], instr)
+            blocos = self.bloco_do_endereco
+
+            def f():
+                destino = blocos.get(R[r])
+                if destino is None:
+                    raise Exception("jr pra endereco invalido " + hex(R[r] & 0xFFFFFFFF) +
+                                    " na linha " + str(instr.linha))
+                return destino
+            return f
+        if op == 'syscall':
+            servico = chamada_sistema(instr)
+
+            def f():
+                return -1 if servico() else proximo
+            return f
+        if op in DESVIOS_FPU:
+            destino = alvo(a[0], instr)
+            quando = op == 'bc1t'
+
+            def f():
+                return destino if cc[0] == quando else proximo
+            return f
+        if op in DESVIOS_1:
+            x, destino = reg(a[0], instr), alvo(a[1], instr)
+            teste = {'beqz': lambda v: v == 0, 'bnez': lambda v: v != 0, 'bgez': lambda v: v >= 0,
+                     'bgtz': lambda v: v > 0, 'blez': lambda v: v <= 0, 'bltz': lambda v: v < 0}[op]
+
+            def f():
+                return destino if teste(R[x]) else proximo
+            return f
+        x = reg(a[0], instr)
+        y_reg, y = operando(a[1], instr)
+        destino = alvo(a[2], instr)
+        if op == 'beq':
+            if y_reg:
+                return lambda: destino if R[x] == R[y] else proximo
+            return lambda: destino if R[x] == y else proximo
+        if op == 'bne':
+            if y_reg:
+                return lambda: destino if R[x] != R[y] else proximo
+            return lambda: destino if R[x] != y else proximo
+        if op == 'blt':
+            if y_reg:
+                return lambda: destino if R[x] < R[y] else proximo
+            return lambda: destino if R[x] < y else proximo
+        if op == 'bgt':
+            if y_reg:
+                return lambda: destino if R[x] > R[y] else proximo
+            return lambda: destino if R[x] > y else proximo
+        if op == 'bge':
+            if y_reg:
+                return lambda: destino if R[x] >= R[y] else proximo
+            return lambda: destino if R[x] >= y else proximo
+        if y_reg:
+            return lambda: destino if R[x] <= R[y] else proximo
+        return lambda: destino if R[x] <= y else proximo
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def executar(self, entradas=None, limite=None):
+        # entradas: valores lidos pelos read (lista de strings/números); sem
+        # ela lê da entrada padrão
+        # limite: máximo de instruções (None = sem limite); passando dele a
+        # execução para com terminou=False
+        memoria = self.memoria
+        memoria[:] = bytes(len(memoria))
+        memoria[:len(self.dados)] = self.dados
+        R = self.R
+        R[:] = [0] * len(R)
+        # Pilha começa 4KB abaixo do fim (como o MARS, que deixa espaço acima do $sp)
+        R[SP] = BASE_DADOS + self.tamanho_memoria - 4096 - 4
+        self.F[:] = [0.0] * len(self.F)
+        self.cc[0] = False
+        saida = self.saida
+        saida.clear()
+        if entradas is None:
+            def entrada():
+                linha = sys.stdin.readline()
+                if not linha:
+                    raise Exception("Entrada acabou (read sem valor)")
+                return linha
+        else:
+            fila = iter(list(entradas))
+
+            def entrada():
+                try:
+                    return str(next(fila))
+                except StopIteration:
+                    raise Exception("Entrada acabou (read sem valor)")
+        self.entrada[0] = entrada
+
+        for tomados in self.tomados.values():
+            tomados[0] = 0
+
+        blocos = self.blocos
+        execucoes = [0] * len(blocos)
+        atual = self.entrada_programa
+        contador = 0
+        terminou = True
+        while atual >= 0:
+            corpo, saida_bloco, tamanho = blocos[atual]
+            execucoes[atual] += 1
+            contador += tamanho
+            if limite is not None and contador > limite:
+                execucoes[atual] -= 1
+                terminou = False
+                break
+            for f in corpo:
+                f()
+            atual = saida_bloco()
+        return self.resumir(execucoes, ''.join(saida), terminou)
+
+    def resumir(self, execucoes, saida, terminou):
+        # Contagens por instrução e por rótulo a partir das execuções de
+        # cada bloco (todo bloco roda inteiro, então basta multiplicar)
+        rotulo_da_posicao = {}
+        for nome, pos in self.rotulos_texto.items():
+            rotulo_da_posicao.setdefault(pos, nome)
+        por_instrucao = {}
+        por_rotulo = {}
+        desvios = {}
+        rotulo = '(inicio)'
+        total = 0
+        for k, inicio in enumerate(self.inicios):
+            fim = self.inicios[k + 1] if k + 1 < len(self.inicios) else len(self.instrucoes)
+            vezes = execucoes[k]
+            for pos in range(inicio, fim):
+                rotulo = rotulo_da_posicao.get(pos, rotulo)
+                if vezes:
+                    op = self.instrucoes[pos].op
+                    por_instrucao[op] = por_instrucao.get(op, 0) + vezes
+                    por_rotulo[rotulo] = por_rotulo.get(rotulo, 0) + vezes
+                    total += vezes
+                if pos in self.tomados:
+                    instr = self.instrucoes[pos]
+                    desvios[instr.linha] = (rotulo, instr.args[-1], vezes, self.tomados[pos][0])
+        # Todo rótulo do .text começa um bloco
+        visitas = {}
+        for nome, pos in self.rotulos_texto.items():
+            k = self.bloco_do_endereco.get(BASE_TEXTO + 4 * pos)
+            if k is not None:
+                visitas[nome] = execucoes[k]
+        return Execucao(saida, total, por_instrucao, por_rotulo, terminou, visitas, desvios)
+
+
+def executar(asm, entradas=None, limite=None):
+    # Atalho: decodifica e roda uma vez
+    return InterpretadorMIPS(asm).executar(entradas, limite)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Executa assembly MIPS gerado pelo compilador")
+    p.add_argument("arquivo", help="arquivo .asm")
+    p.add_argument("--entrada", action="append", default=None, metavar="VALOR",
+                   help="valor pra um read (pode repetir; sem ela le da entrada padrao)")
+    p.add_argument("--limite", type=int, default=None, help="maximo de instrucoes executadas")
+    p.add_argument("--perfil", type=int, default=10, metavar="N",
+                   help="mostra os N rotulos mais executados (0 = nao mostra)")
+    args = p.parse_args(argv)
+
+    with open(args.arquivo, encoding="utf-8") as f:
+        asm = f.read()
+    try:
+        resultado = executar(asm, args.entrada, args.limite)
+    except Exception as e:
+        print("Erro de execucao: " + str(e), file=sys.stderr)
+        return 1
+
+    sys.stdout.write(resultado.saida)
+    if not resultado.saida.endswith('\n'):
+        sys.stdout.write('\n')
+    if not resultado.terminou:
+        print("-- parou no limite de " + str(args.limite) + " instrucoes", file=sys.stderr)
+    print("-- " + str(resultado.instrucoes) + " instrucoes executadas", file=sys.stderr)
+    if args.perfil:
+        for rotulo, qtd, pct in resultado.pontos_quentes(args.perfil):
+            print("   " + rotulo.ljust(20) + str(qtd).rjust(12) + "  " + format(pct, "5.1f") + "%",
+                  file=sys.stderr)
+    return 0 if resultado.terminou else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
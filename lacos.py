@@ -0,0 +1,124 @@
+# ANÁLISE DE LAÇOS NO CÓDIGO INTERMEDIÁRIO
+# Acha os laços pelo CFG, sem depender de como o while/for foi montado:
+#   - dominadores: A domina B se todo caminho da entrada até B passa por A
+#   - aresta de volta: B -> H onde H domina B (o H é o cabeçalho do laço)
+#   - laço natural: H mais todo bloco que chega em B sem passar por H
+#     (arestas de volta pro mesmo H formam um laço só)
+#   - pré-cabeçalho: bloco novo logo antes de H por onde toda entrada de
+#     fora do laço passa; é pra onde vai o código tirado do laço
+# Os passos de laço calculam laços e dominadores uma vez por passo: criar
+# um pré-cabeçalho só mexe nas arestas em volta de H e põe o bloco novo nos
+# laços de fora, e ele domina exatamente o que H dominava (mais ele mesmo)
+
+from codigo_intermediario import Bloco, Instr, calcular_cfg, pos_ordem_reversa
+
+
+class Laco:
+    # cabecalho: Bloco de entrada do laço
+    # blocos: conjunto de blocos do laço (inclui o cabeçalho)
+    # fundos: blocos com aresta de volta pro cabeçalho
+    def __init__(self, cabecalho):
+        self.cabecalho = cabecalho
+        self.blocos = {cabecalho}
+        self.fundos = []
+
+    def saidas(self):
+        # Arestas (de, para) que saem do laço
+        return [(b, s) for b in self.blocos for s in b.sucessores if s not in self.blocos]
+
+    def __repr__(self):
+        return "Laco(" + self.cabecalho.nome + ", " + str(len(self.blocos)) + " blocos)"
+
+
+def calcular_dominadores(funcao):
+    # {bloco: conjunto dos blocos que o dominam}, só dos alcançáveis
+    # (iterativo: dom(b) = {b} + interseção dos dom dos predecessores; em
+    # pós-ordem reversa quase sempre estabiliza na primeira volta)
+    calcular_cfg(funcao)
+    blocos = pos_ordem_reversa(funcao)
+    entrada = funcao.blocos[0]
+    dom = {b: set(blocos) for b in blocos}
+    dom[entrada] = {entrada}
+    mudou = True
+    while mudou:
+        mudou = False
+        for b in blocos:
+            if b is entrada:
+                continue
+            preds = [dom[p] for p in b.predecessores if p in dom]
+            novo = set.intersection(*preds) if preds else set()
+            novo.add(b)
+            if novo != dom[b]:
+                dom[b] = novo
+                mudou = True
+    return dom
+
+
+def encontrar_lacos(funcao, dom=None):
+    # Laços naturais da função, dos menores (mais internos) pros maiores
+    if dom is None:
+        dom = calcular_dominadores(funcao)
+    lacos = {}
+    for b in funcao.blocos:
+        if b not in dom:
+            continue
+        for h in b.sucessores:
+            if h not in dom[b]:
+                continue
+            laco = lacos.get(h)
+            if laco is None:
+                laco = lacos[h] = Laco(h)
+            laco.fundos.append(b)
+            pendentes = [b]
+            while pendentes:
+                x = pendentes.pop()
+                if x in laco.blocos:
+                    continue
+                laco.blocos.add(x)
+                pendentes.extend(p for p in x.predecessores if p in dom)
+    return sorted(lacos.values(), key=lambda l: len(l.blocos))
+
+
+def criar_preheader(funcao, laco, lacos=()):
+    # Devolve o pré-cabeçalho do laço, criando se precisar: se o único
+    # predecessor de fora já só salta pro cabeçalho, ele mesmo serve
+    # O CFG é atualizado só em volta do cabeçalho, e o bloco novo entra em
+    # todo laço de `lacos` que tem o cabeçalho (os de fora desse)
+    h = laco.cabecalho
+    de_fora = [p for p in h.predecessores if p not in laco.blocos]
+    if len(de_fora) == 1 and de_fora[0].terminador().op == 'salto':
+        return de_fora[0]
+
+    nome = "PRE_" + h.nome
+    n = 1
+    while funcao.bloco(nome) is not None:
+        n += 1
+        nome = "PRE_" + h.nome + "_" + str(n)
+    pre = Bloco(nome)
+    pre.instrs.append(Instr('salto', alvos=[h.nome]))
+
+    for p in de_fora:
+        term = p.terminador()
+        term.alvos = [nome if a == h.nome else a for a in term.alvos]
+        p.sucessores = [pre if s is h else s for s in p.sucessores]
+    pre.predecessores = de_fora
+    pre.sucessores = [h]
+    h.predecessores = [p for p in h.predecessores if p in laco.blocos] + [pre]
+    if h is funcao.blocos[0]:
+        # Laço começando na entrada: o pré-cabeçalho vira a entrada nova
+        funcao.blocos.insert(0, pre)
+    else:
+        funcao.blocos.insert(funcao.blocos.index(h), pre)
+    for outro in lacos:
+        if outro is not laco and h in outro.blocos:
+            outro.blocos.add(pre)
+    return pre
+
+
+def profundidade_blocos(funcao):
+    # {bloco: quantos laços contêm o bloco}
+    profundidade = {b: 0 for b in funcao.blocos}
+    for laco in encontrar_lacos(funcao):
+        for b in laco.blocos:
+            profundidade[b] += 1
+    return profundidade
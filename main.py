@@ -1,251 +1,463 @@
-from analisador_lexico import Lexico
-from analisador_sintatico_slr import SLR
-from analisador_sintatico import analisar as analisar_descendente
-from analisador_semantico import analisar_semantica
-from gerador_codigo_mips import GeradorMIPS
-
-def ler_codigo():
-    print("=" * 70)
-    print("COMPILADOR - Entrada de Codigo")
-    print("=" * 70)
-    
-    # Código de teste com várias estruturas da linguagem
-    codigo = """
-inteiro x;
-flutuante y;
-cadeia mensagem;
-logico condicao;
-
-fun soma(a, b) {
-    inteiro resultado;
-    resultado = a + b;
-}
-
-x = 10;
-y = 3.14;
-mensagem = "Ola mundo!";
-condicao = verdadeiro;
-
-// REMOVIDO: x++;
-// REMOVIDO: y--;
-
-if (x > 3) {
-    write("x é maior que 3");
-} else {
-    write("x não é maior que 3");
-}
-
-if (x >= 10) {
-    write("x maior ou igual a 10");
-}
-
-if (y <= 5.0) {
-    write("y menor ou igual a 5");
-}
-
-if (x != 5) {
-    write("x diferente de 5");
-}
-
-for (inteiro i = 0; i < 5; i = i + 1) {
-    write("Valor de i: ");
-    write(i);
-}
-
-while (condicao) {
-    write("Dentro do while");
-    condicao = falso;
-}
-
-read(x);
-soma(x, 10);
-
-resultado = x + y;
-resultado = x - y;
-resultado = x * 2;
-resultado = x / 2;
-"""
-    
-    print("Codigo:")
-    print(codigo.strip())
-    print("=" * 70)
-    return codigo
-
-def contar_manual(lista):
-    # Conta elementos da lista
-    cont = 0
-    for item in lista:
-        cont += 1
-    return cont
-
-def fazer_lexica(codigo):
-    print("\n[1] Analise Lexica")
-    print("-" * 70)
-
-    lex = Lexico()
-    tokens, erros = lex.analisar(codigo)
-
-    if erros:
-        print("ERROS encontrados:")
-        for e in erros:
-            print("  - " + e)
-        return None, erros
-
-    # Mostra os primeiros 25 tokens gerados
-    print("Tokens gerados (primeiros 25):")
-    cont = 0
-    for tk in tokens:
-        if cont >= 25:
-            break
-        print("  " + tk.tipo.ljust(10) + " | " + tk.lexema.ljust(12) + " | L:" + str(tk.linha).rjust(2))
-        cont += 1
-    
-    total = contar_manual(tokens)
-    if total > 25:
-        print("  ... (+" + str(total - 25) + " tokens)")
-
-    print("Total: " + str(total) + " tokens")
-    print("-" * 70)
-    return tokens, []
-
-
-def fazer_sintatica(tokens):
-    print("\n[2] Analise Sintatica (SLR)")
-    print("-" * 70)
-
-    slr = SLR()
-    # Faz uma cópia dos tokens pra não afetar as outras fases
-    erros = slr.analisar(tokens[:])
-
-    if erros:
-        print("ERROS encontrados:")
-        cont = 0
-        for e in erros:
-            if cont >= 5:
-                break
-            print("  - " + e)
-            cont += 1
-        
-        total = contar_manual(erros)
-        if total > 5:
-            print("  ... (+" + str(total - 5) + " erros)")
-        return False, erros
-
-    print("OK - Analise sintatica passou!")
-    print("  Variaveis, funcoes, if/else, for, while: OK")
-    print("-" * 70)
-    return True, []
-
-
-def fazer_semantica(tokens):
-    print("\n[3] Analise Semantica")
-    print("-" * 70)
-
-    erros, tabela = analisar_semantica(tokens)
-
-    if erros:
-        print("ERROS encontrados:")
-        cont = 0
-        for e in erros:
-            if cont >= 5:
-                break
-            print("  - " + e)
-            cont += 1
-        
-        total = contar_manual(erros)
-        if total > 5:
-            print("  ... (+" + str(total - 5) + " erros)")
-        return False, erros
-
-    print("OK - Analise semantica passou!")
-    print("  Variaveis declaradas: " + str(tabela.escopos.contar_variaveis_global()))
-    print("  Todas as variaveis foram declaradas antes do uso")
-    print("-" * 70)
-    return True, []
-
-
-def fazer_geracao_codigo(tokens):
-    print("\n[4] Geracao de Codigo MIPS")
-    print("-" * 70)
-
-    gerador = GeradorMIPS()
-    codigo_mips = gerador.gerar_codigo(tokens)
-
-    # Mostra as primeiras 15 linhas do código gerado
-    print("Codigo MIPS gerado (primeiras 15 linhas):")
-    linhas = codigo_mips.split('\n')
-    
-    cont = 0
-    for linha in linhas:
-        if cont >= 15:
-            break
-        print(linha)
-        cont += 1
-    
-    total = contar_manual(linhas)
-    if total > 15:
-        print("... (+" + str(total - 15) + " linhas)")
-    
-    print("-" * 70)
-
-    # Salva o código MIPS num arquivo
-    with open("saida.asm", "w", encoding="utf-8") as f:
-        f.write(codigo_mips)
-
-    print("Arquivo gerado: saida.asm")
-    return codigo_mips
-
-def main():
-    print("\n" + "=" * 70)
-    print("COMPILADOR - Trabalho de Compiladores")
-    print("Lexico + Sintatico (SLR) + Semantico + Geracao MIPS")
-    print("=" * 70)
-
-    # Lê o código de entrada
-    codigo = ler_codigo()
-
-    # Fase 1: Análise Léxica
-    tokens, erros = fazer_lexica(codigo)
-    if erros:
-        print("\nERRO: Falha na analise lexica")
-        return
-
-    # Fase 2: Análise Sintática (SLR)
-    ok, erros = fazer_sintatica(tokens)
-    if not ok:
-        print("\nERRO: Falha na analise sintatica")
-        return
-
-    # Fase 2a: Análise Sintática Descendente Recursiva 
-    print("\n[2a] Analise Sintatica Descendente Recursivo")
-    print("-" * 70)
-    erros_desc = analisar_descendente(tokens[:])
-    
-    total = contar_manual(erros_desc)
-    if erros_desc:
-        print("Erros encontrados: " + str(total))
-        print("(Normal - descendente nao suporta todas as estruturas)")
-    else:
-        print("Sem erros no descendente!")
-    print("-" * 70)
-
-    # Fase 3: Análise Semântica
-    ok, erros = fazer_semantica(tokens)
-    if not ok:
-        print("\nERRO: Falha na analise semantica")
-        return
-
-    # Fase 4: Geração de Código MIPS
-    codigo_mips = fazer_geracao_codigo(tokens)
-
-    
-    print("\n" + "=" * 70)
-    print("SUCESSO! Compilacao concluida")
-    print("=" * 70)
-    print("Arquivo gerado: saida.asm")
-    print("Execute no MARS MIPS Simulator")
-    print("=" * 70)
-
-
-if __name__ == "__main__":
-    main()
+from analisador_lexico import Lexico
+from analisador_sintatico import AnalisadorSintatico
+from analisador_semantico import analisar_semantica_arvore
+from analisador_tipos import verificar_tipos
+from gerador_codigo_mips import GeradorMIPS
+from codigo_intermediario import construir_ir
+from otimizador import GerenciadorPassos
+from expansao_inline import ExpansorInline, percorrer_comandos
+from compilador import CompiladorIncremental, coletar_perfil
+from arvore_sintatica import DeclVar, DeclFuncao
+from instrumentacao import Instrumentacao, SEM_INSTRUMENTACAO
+from interpretador_mips import InterpretadorMIPS
+from otimizacao_perfil import carregar_perfil, numerar_origens, desenrolar_lacos, ordenar_blocos
+
+# Nível de otimização da geração de código (0 = tudo na pilha,
+# 1 = alocação de registradores e expansão inline das funções pequenas,
+# 2 = código intermediário otimizado)
+NIVEL_OTIMIZACAO = 2
+
+# Passos do otimizador pra desligar no nível 2 (ex.: ['eliminar_subexpressoes'])
+PASSOS_DESATIVADOS = []
+
+# Compilação incremental: cada função e o programa principal são compilados
+# separado e guardados em PASTA_CACHE; na próxima execução só o que mudou
+# é recompilado (sem as fases detalhadas e sem expansão inline)
+INCREMENTAL = False
+PASTA_CACHE = ".cache_compilador"
+
+# Instrumentação: mede tempo (parede e CPU), pico de memória e contadores de
+# cada fase e grava em RELATORIO_FASES (.json ou .csv, pela extensão)
+INSTRUMENTAR = False
+RELATORIO_FASES = "relatorio_fases.json"
+
+# Execução do assembly gerado no interpretador MIPS (sem abrir o MARS):
+# ENTRADAS são os valores dos read, na ordem
+EXECUTAR = True
+ENTRADAS = ["7"]
+
+# Análise sintática: 'auto' usa o LL(1) descendente e só chama o SLR se ele
+# achar erro (pra validar e dar as mensagens); 'descendente' ou 'slr' usa
+# só um deles. MAX_ERROS_SINTATICOS é o limite de erros do SLR
+PARSER = 'auto'
+MAX_ERROS_SINTATICOS = 20
+
+# Otimização guiada por perfil (otimizacao_perfil.py): GERAR_PERFIL compila
+# uma versão instrumentada, roda com ENTRADAS e grava as contagens em
+# ARQUIVO_PERFIL; USAR_PERFIL lê ARQUIVO_PERFIL e usa na geração (expansão
+# inline e, no nível 2, desenrolamento de laços e ordem dos blocos)
+GERAR_PERFIL = False
+USAR_PERFIL = False
+ARQUIVO_PERFIL = "perfil.json"
+
+def ler_codigo():
+    print("=" * 70)
+    print("COMPILADOR - Entrada de Codigo")
+    print("=" * 70)
+    
+    # Código de teste com várias estruturas da linguagem
+    codigo = """
+inteiro x;
+flutuante y;
+cadeia mensagem;
+logico condicao;
+flutuante resultado;
+
+fun soma(a, b) {
+    inteiro resultado;
+    resultado = a + b;
+}
+
+x = 10;
+y = 3.14;
+mensagem = "Ola mundo!";
+condicao = verdadeiro;
+
+// REMOVIDO: x++;
+// REMOVIDO: y--;
+
+if (x > 3) {
+    write("x é maior que 3");
+} else {
+    write("x não é maior que 3");
+}
+
+if (x >= 10) {
+    write("x maior ou igual a 10");
+}
+
+if (y <= 5.0) {
+    write("y menor ou igual a 5");
+}
+
+if (x != 5) {
+    write("x diferente de 5");
+}
+
+for (inteiro i = 0; i < 5; i = i + 1) {
+    write("Valor de i: ");
+    write(i);
+}
+
+while (condicao) {
+    write("Dentro do while");
+    condicao = falso;
+}
+
+read(x);
+soma(x, 10);
+
+resultado = x + y;
+resultado = x - y;
+resultado = x * 2;
+resultado = x / 2;
+"""
+    
+    print("Codigo:")
+    print(codigo.strip())
+    print("=" * 70)
+    return codigo
+
+def contar_manual(lista):
+    # Conta elementos da lista
+    cont = 0
+    for item in lista:
+        cont += 1
+    return cont
+
+def contar_simbolos(comandos):
+    # Declarações (variáveis, parâmetros e funções), entrando nas funções
+    total = 0
+    for cmd in percorrer_comandos(comandos):
+        if isinstance(cmd, DeclVar):
+            total += 1
+        elif isinstance(cmd, DeclFuncao):
+            total += 1 + len(cmd.params) + contar_simbolos(cmd.corpo)
+    return total
+
+def contar_instrucoes_asm(codigo_mips):
+    # Linhas de instrução (sem rótulos, diretivas, comentários e linhas vazias)
+    total = 0
+    for linha in codigo_mips.split('\n'):
+        linha = linha.split('#')[0].strip()
+        if linha and not linha.endswith(':') and not linha.startswith('.'):
+            total += 1
+    return total
+
+def fazer_lexica(codigo, inst=SEM_INSTRUMENTACAO):
+    print("\n[1] Analise Lexica")
+    print("-" * 70)
+
+    lex = Lexico()
+    # Os tokens ficam num TokenBuffer (arrays, sem um objeto por token);
+    # as fases seguintes leem pelas TokenVisao do mesmo jeito que de um Token
+    with inst.fase("lexica"):
+        tokens, erros = lex.analisar_compacto(codigo)
+    inst.contar("lexica", tokens=len(tokens))
+
+    if erros:
+        print("ERROS encontrados:")
+        for e in erros:
+            print("  - " + e)
+        return None, erros
+
+    # Mostra os primeiros 25 tokens gerados
+    print("Tokens gerados (primeiros 25):")
+    cont = 0
+    for tk in tokens:
+        if cont >= 25:
+            break
+        print("  " + tk.tipo.ljust(10) + " | " + tk.lexema.ljust(12) + " | L:" + str(tk.linha).rjust(2))
+        cont += 1
+    
+    total = contar_manual(tokens)
+    if total > 25:
+        print("  ... (+" + str(total - 25) + " tokens)")
+
+    print("Total: " + str(total) + " tokens")
+    print("-" * 70)
+    return tokens, []
+
+
+def fazer_sintatica(tokens, inst=SEM_INSTRUMENTACAO):
+    print("\n[2] Analise Sintatica")
+    print("-" * 70)
+
+    analisador = AnalisadorSintatico(PARSER, MAX_ERROS_SINTATICOS)
+    # O parser não altera a lista de tokens e já devolve a AST, que é o que
+    # a semântica e a geração de código usam daqui pra frente
+    with inst.fase("sintatica"):
+        arvore, erros = analisador.analisar_arvore(tokens)
+    inst.contar("sintatica", **analisador.contadores())
+    print("Parser: " + analisador.usado)
+
+    if erros:
+        print("ERROS encontrados:")
+        cont = 0
+        for e in erros:
+            if cont >= 5:
+                break
+            print("  - " + e)
+            cont += 1
+        
+        total = contar_manual(erros)
+        if total > 5:
+            print("  ... (+" + str(total - 5) + " erros)")
+        if analisador.erros_suprimidos:
+            print("  (" + str(analisador.erros_suprimidos) + " erros em cascata suprimidos)")
+        if analisador.interrompida:
+            print("  Muitos erros sintaticos, analise interrompida depois de " + str(total))
+        return None, erros
+
+    print("OK - Analise sintatica passou!")
+    print("  Variaveis, funcoes, if/else, for, while: OK")
+    print("  Comandos no nivel principal: " + str(contar_manual(arvore.comandos)))
+    print("-" * 70)
+    return arvore, []
+
+
+def fazer_semantica(arvore, inst=SEM_INSTRUMENTACAO):
+    print("\n[3] Analise Semantica")
+    print("-" * 70)
+
+    with inst.fase("semantica"):
+        erros, tabela = analisar_semantica_arvore(arvore)
+        # Tipos só fazem sentido com todas as declarações resolvidas
+        if not erros:
+            erros = verificar_tipos(arvore)
+    if inst.ativa:
+        inst.contar("semantica", simbolos=contar_simbolos(arvore.comandos))
+
+    if erros:
+        print("ERROS encontrados:")
+        cont = 0
+        for e in erros:
+            if cont >= 5:
+                break
+            print("  - " + e)
+            cont += 1
+        
+        total = contar_manual(erros)
+        if total > 5:
+            print("  ... (+" + str(total - 5) + " erros)")
+        return False, erros
+
+    print("OK - Analise semantica passou!")
+    print("  Variaveis declaradas: " + str(tabela.escopos.contar_variaveis_global()))
+    print("  Todas as variaveis foram declaradas antes do uso")
+    print("  Tipos das expressoes verificados")
+    print("-" * 70)
+    return True, []
+
+
+def fazer_geracao_codigo(arvore, nivel_otimizacao=NIVEL_OTIMIZACAO, inst=SEM_INSTRUMENTACAO):
+    print("\n[4] Geracao de Codigo MIPS (-O" + str(nivel_otimizacao) + ")")
+    print("-" * 70)
+
+    gerador = GeradorMIPS(nivel_otimizacao)
+    perfil = None
+    if USAR_PERFIL:
+        perfil = carregar_perfil(ARQUIVO_PERFIL)
+        if numerar_origens(arvore) != perfil.assinatura:
+            print("Perfil " + ARQUIVO_PERFIL + " e de outro programa, compilando sem ele")
+            perfil = None
+        else:
+            print("Usando o perfil " + ARQUIVO_PERFIL + " (" + str(perfil.instrucoes) +
+                  " instrucoes medidas)")
+    if nivel_otimizacao >= 1:
+        expansor = ExpansorInline(chamadas=perfil.chamadas if perfil is not None else None)
+        with inst.fase("expansao_inline"):
+            expansor.expandir(arvore)
+        inst.contar("expansao_inline", chamadas_expandidas=expansor.expandidas)
+        print("Expansao inline: " + str(expansor.expandidas) + " chamada(s), " +
+              str(expansor.removidas) + " funcao(oes) removida(s)")
+    if nivel_otimizacao >= 2:
+        if perfil is not None:
+            print("Lacos desenrolados pelo perfil: " + str(desenrolar_lacos(arvore, perfil)))
+        with inst.fase("codigo_intermediario"):
+            ir = construir_ir(arvore)
+        antes = ir.num_instrucoes()
+        inst.contar("codigo_intermediario", instrucoes_ir=antes)
+        gerenciador = GerenciadorPassos(desativados=PASSOS_DESATIVADOS)
+        with inst.fase("otimizacao"):
+            gerenciador.executar(ir)
+        inst.contar("otimizacao", instrucoes_ir=ir.num_instrucoes())
+        print("Codigo intermediario: " + str(antes) + " -> " + str(ir.num_instrucoes()) + " instrucoes")
+        for nome in gerenciador.passos:
+            print("  " + nome + ": " + str(gerenciador.estatisticas[nome]))
+        if perfil is not None:
+            print("Funcoes com blocos reordenados pelo perfil: " + str(ordenar_blocos(ir, perfil)))
+        with inst.fase("geracao_mips"):
+            codigo_mips = gerador.gerar_codigo_ir(ir)
+    else:
+        with inst.fase("geracao_mips"):
+            codigo_mips = gerador.gerar_codigo_arvore(arvore)
+    if inst.ativa:
+        inst.contar("geracao_mips", instrucoes=contar_instrucoes_asm(codigo_mips))
+    if gerador.peephole is not None:
+        print("Peephole (" + str(gerador.peephole.iteracoes) + " varreduras):")
+        for nome, n in gerador.peephole.contagem.items():
+            if n:
+                print("  " + nome + ": " + str(n))
+
+    # Mostra as primeiras 15 linhas do código gerado
+    print("Codigo MIPS gerado (primeiras 15 linhas):")
+    linhas = codigo_mips.split('\n')
+    
+    cont = 0
+    for linha in linhas:
+        if cont >= 15:
+            break
+        print(linha)
+        cont += 1
+    
+    total = contar_manual(linhas)
+    if total > 15:
+        print("... (+" + str(total - 15) + " linhas)")
+    
+    print("-" * 70)
+
+    # Salva o código MIPS num arquivo
+    with open("saida.asm", "w", encoding="utf-8") as f:
+        f.write(codigo_mips)
+
+    print("Arquivo gerado: saida.asm")
+    return codigo_mips
+
+
+def fazer_execucao(codigo_mips, inst=SEM_INSTRUMENTACAO):
+    print("\n[5] Execucao (interpretador MIPS)")
+    print("-" * 70)
+
+    try:
+        with inst.fase("execucao"):
+            resultado = InterpretadorMIPS(codigo_mips).executar(ENTRADAS, limite=10000000)
+    except Exception as e:
+        print("ERRO: " + str(e))
+        return False
+    inst.contar("execucao", instrucoes_executadas=resultado.instrucoes)
+
+    print("Saida do programa (entradas: " + ", ".join(ENTRADAS) + "):")
+    print(resultado.saida)
+    if not resultado.terminou:
+        print("(parou no limite de instrucoes)")
+    print("Instrucoes executadas: " + str(resultado.instrucoes))
+    print("Trechos mais executados:")
+    for rotulo, qtd, pct in resultado.pontos_quentes(5):
+        print("  " + rotulo.ljust(20) + str(qtd).rjust(8) + "  " + format(pct, ".1f") + "%")
+    print("-" * 70)
+    return True
+
+
+def fazer_perfil(codigo, inst=SEM_INSTRUMENTACAO):
+    print("\n[3b] Perfil (build instrumentado no interpretador MIPS)")
+    print("-" * 70)
+
+    try:
+        with inst.fase("perfil"):
+            perfil, erros = coletar_perfil(codigo, ENTRADAS, limite=10000000)
+    except Exception as e:
+        print("ERRO: " + str(e))
+        return False
+    if erros:
+        print("ERRO: " + erros[0])
+        return False
+    perfil.salvar(ARQUIVO_PERFIL)
+
+    print("Instrucoes executadas (instrumentado): " + str(perfil.instrucoes))
+    print("Desvios medidos: " + str(len(perfil.desvios)) + ", chamadas medidas: " +
+          str(len(perfil.chamadas)))
+    print("Perfil gravado em " + ARQUIVO_PERFIL)
+    print("-" * 70)
+    return True
+
+
+def fazer_compilacao_incremental(codigo):
+    print("\n[*] Compilacao incremental (-O" + str(NIVEL_OTIMIZACAO) + ", cache em " + PASTA_CACHE + ")")
+    print("-" * 70)
+
+    compilador = CompiladorIncremental(PASTA_CACHE, NIVEL_OTIMIZACAO, PASSOS_DESATIVADOS)
+    codigo_mips, erros = compilador.compilar(codigo)
+    if erros:
+        print("ERROS encontrados:")
+        for e in erros[:5]:
+            print("  - " + e)
+        return None
+
+    print("Unidades reaproveitadas do cache: " + str(compilador.reusadas))
+    print("Unidades recompiladas: " + str(compilador.compiladas))
+    print("-" * 70)
+
+    with open("saida.asm", "w", encoding="utf-8") as f:
+        f.write(codigo_mips)
+    print("Arquivo gerado: saida.asm")
+    return codigo_mips
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("COMPILADOR - Trabalho de Compiladores")
+    print("Lexico + Sintatico (LL(1)/SLR) + Semantico + Geracao MIPS")
+    print("=" * 70)
+
+    # Lê o código de entrada
+    codigo = ler_codigo()
+
+    if INCREMENTAL:
+        if fazer_compilacao_incremental(codigo) is None:
+            print("\nERRO: Falha na compilacao")
+        return
+
+    inst = Instrumentacao() if INSTRUMENTAR else SEM_INSTRUMENTACAO
+    try:
+        compilar_fases(codigo, inst)
+    finally:
+        if inst.ativa:
+            inst.parar()
+            inst.salvar(RELATORIO_FASES)
+            print("Relatorio das fases: " + RELATORIO_FASES)
+
+
+def compilar_fases(codigo, inst):
+    # Fase 1: Análise Léxica
+    tokens, erros = fazer_lexica(codigo, inst)
+    if erros:
+        print("\nERRO: Falha na analise lexica")
+        return
+
+    # Fase 2: Análise Sintática (LL(1) ou SLR, ver PARSER), já montando a AST
+    arvore, erros = fazer_sintatica(tokens, inst)
+    if erros:
+        print("\nERRO: Falha na analise sintatica")
+        return
+
+    # Fase 3: Análise Semântica (sobre a AST)
+    ok, erros = fazer_semantica(arvore, inst)
+    if not ok:
+        print("\nERRO: Falha na analise semantica")
+        return
+
+    # Fase 3b: build instrumentado pro perfil (PGO)
+    if GERAR_PERFIL and not fazer_perfil(codigo, inst):
+        print("\nERRO: Falha ao gerar o perfil")
+        return
+
+    # Fase 4: Geração de Código MIPS (sobre a AST)
+    codigo_mips = fazer_geracao_codigo(arvore, inst=inst)
+
+    # Fase 5: Execução no interpretador MIPS
+    if EXECUTAR and not fazer_execucao(codigo_mips, inst):
+        print("\nERRO: Falha na execucao")
+        return
+
+    
+    print("\n" + "=" * 70)
+    print("SUCESSO! Compilacao concluida")
+    print("=" * 70)
+    print("Arquivo gerado: saida.asm")
+    print("Execute no MARS MIPS Simulator ou com: python interpretador_mips.py saida.asm")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+# OTIMIZAÇÃO GUIADA POR PERFIL (PGO)
+# Duas compilações do mesmo fonte:
+#   1. build instrumentado (compilador.coletar_perfil): nível 2 sem expansão
+#      inline, com rótulo em todo bloco do IR e sem peephole; roda no
+#      interpretador MIPS contando os desvios, e as contagens de cada bloco,
+#      desvio e chamada voltam pro nó do fonte que gerou ele -> Perfil (.json)
+#   2. build com perfil (compilador.gerar(..., perfil=...)), onde o perfil
+#      escolhe:
+#      - que chamadas expandir inline (ExpansorInline(chamadas=...)): as
+#        quentes ganham orçamento maior, as que nunca rodaram não crescem
+#      - que laços for desenrolar (desenrolar_lacos): os que dão muitas
+#        voltas por vez e têm o número de voltas fixo
+#      - a ordem dos blocos de cada função (ordenar_blocos): o sucessor mais
+#        executado vem logo depois, então o caminho quente cai direto, o
+#        desvio sai com a condição invertida quando o lado quente é o
+#        "então" (baixar_desvio já escolhe pelo bloco seguinte) e o código
+#        frio vai pro fim da função
+# As contagens ficam por origem: o número de cada if/while/for/chamada no
+# programa, dado em pré-ordem por numerar_origens na AST que sai da análise
+# (as duas compilações numeram igual o mesmo fonte). Cópias (expansão
+# inline, desenrolamento) herdam a origem e usam as contagens do original
+
+import hashlib
+import json
+
+from arvore_sintatica import (DeclVar, DeclFuncao, Atribuicao, Leitura, Se, Enquanto, Para, Num,
+                              Unaria, Var, Binaria, Chamada, IncDec)
+from expansao_inline import (percorrer_comandos, expressoes_do_comando, percorrer_expr, tamanho,
+                             coletar_funcoes)
+from codigo_intermediario import Const, calcular_cfg, tipo_var
+from otimizador import avaliar
+
+VERSAO_PERFIL = 1
+
+# Desenrolamento: média mínima de voltas por execução do laço, tamanho
+# máximo (nós) do corpo depois de desenrolar e fatores tentados (o número
+# de voltas tem que ser múltiplo do fator, assim não sobra volta pra tratar)
+VOLTAS_MINIMAS = 8
+LIMITE_DESENROLADO = 120
+FATORES = (4, 3, 2)
+LIMITE_VOLTAS = 1000000
+
+# Rodadas máximas da estimativa de frequência dos blocos
+RODADAS_FREQUENCIA = 100
+
+
+# ---------------- Origens ----------------
+
+def nos_com_origem(comandos):
+    # if/while/for e chamadas, em pré-ordem, entrando nas funções
+    for cmd in percorrer_comandos(comandos):
+        if isinstance(cmd, Se) or isinstance(cmd, Enquanto) or isinstance(cmd, Para):
+            yield cmd
+        for expr in expressoes_do_comando(cmd):
+            for e in percorrer_expr(expr):
+                if isinstance(e, Chamada):
+                    yield e
+        if isinstance(cmd, DeclFuncao):
+            yield from nos_com_origem(cmd.corpo)
+
+
+def numerar_origens(arvore):
+    # Numera os nós (no.origem = 0, 1, ...) e devolve a assinatura do
+    # programa: hash da sequência de nós numerados, que o perfil guarda pra
+    # não ser usado com outro fonte (mudar só linha ou comentário não muda)
+    h = hashlib.sha256()
+    for n, no in enumerate(nos_com_origem(arvore.comandos)):
+        no.origem = n
+        h.update((type(no).__name__ + ":" + getattr(no, 'nome', '') + ";").encode())
+    return h.hexdigest()[:16]
+
+
+# ---------------- Perfil ----------------
+
+class Perfil:
+    # assinatura: a de numerar_origens do programa medido
+    # desvios: {origem do if/while/for: [vezes que a condição deu verdadeiro,
+    #           vezes que deu falso]}
+    # chamadas: {origem da chamada: vezes que rodou}
+    # blocos: {rótulo do bloco no build instrumentado: vezes que rodou}
+    # instrucoes: instruções executadas no build instrumentado
+    # execucoes: quantas execuções foram somadas no perfil
+    def __init__(self, assinatura):
+        self.assinatura = assinatura
+        self.desvios = {}
+        self.chamadas = {}
+        self.blocos = {}
+        self.instrucoes = 0
+        self.execucoes = 0
+
+    def contar_desvio(self, origem, verdadeiro, falso):
+        contagem = self.desvios.setdefault(origem, [0, 0])
+        contagem[0] += verdadeiro
+        contagem[1] += falso
+
+    def voltas(self, origem):
+        # Média de voltas de um laço por vez que ele roda (None sem contagem)
+        contagem = self.desvios.get(origem)
+        if contagem is None or contagem[1] == 0:
+            return None
+        return contagem[0] / contagem[1]
+
+    def juntar(self, outro):
+        # Soma as contagens de outra execução do mesmo programa
+        if outro.assinatura != self.assinatura:
+            raise Exception("Perfis de programas diferentes nao podem ser juntados")
+        for origem, (v, f) in outro.desvios.items():
+            self.contar_desvio(origem, v, f)
+        for origem, n in outro.chamadas.items():
+            self.chamadas[origem] = self.chamadas.get(origem, 0) + n
+        for rotulo, n in outro.blocos.items():
+            self.blocos[rotulo] = self.blocos.get(rotulo, 0) + n
+        self.instrucoes += outro.instrucoes
+        self.execucoes += outro.execucoes
+        return self
+
+    def salvar(self, caminho):
+        dados = {
+            "versao": VERSAO_PERFIL,
+            "assinatura": self.assinatura,
+            "execucoes": self.execucoes,
+            "instrucoes": self.instrucoes,
+            "desvios": {str(o): c for o, c in sorted(self.desvios.items())},
+            "chamadas": {str(o): n for o, n in sorted(self.chamadas.items())},
+            "blocos": self.blocos,
+        }
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f, indent=1)
+
+
+def carregar_perfil(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    if dados.get("versao") != VERSAO_PERFIL:
+        raise Exception("Perfil '" + caminho + "' tem versao " + str(dados.get("versao")) +
+                        " (esperado " + str(VERSAO_PERFIL) + ")")
+    perfil = Perfil(dados["assinatura"])
+    perfil.execucoes = dados.get("execucoes", 0)
+    perfil.instrucoes = dados.get("instrucoes", 0)
+    perfil.desvios = {int(o): list(c) for o, c in dados["desvios"].items()}
+    perfil.chamadas = {int(o): n for o, n in dados["chamadas"].items()}
+    perfil.blocos = dict(dados.get("blocos", {}))
+    return perfil
+
+
+def montar_perfil(programa, execucao, assinatura):
+    # Perfil a partir do IR do build instrumentado e da execução dele
+    # (InterpretadorMIPS com contar_desvios): cada bloco começa no rótulo
+    # dele, então as visitas do rótulo são as vezes que o bloco rodou e o
+    # desvio condicional do trecho é o desvio do bloco
+    perfil = Perfil(assinatura)
+    perfil.execucoes = 1
+    perfil.instrucoes = execucao.instrucoes
+    desvios = {}
+    for funcao in programa.funcoes:
+        for bloco in funcao.blocos:
+            vezes = execucao.visitas.get(bloco.nome, 0)
+            perfil.blocos[bloco.nome] = vezes
+            for instr in bloco.instrs:
+                if instr.op == 'chamar' and instr.origem is not None:
+                    perfil.chamadas[instr.origem] = perfil.chamadas.get(instr.origem, 0) + vezes
+            term = bloco.terminador()
+            if term.op == 'desvio' and term.origem is not None:
+                desvios[bloco.nome] = term
+
+    for trecho, destino, vezes, tomados in execucao.desvios.values():
+        term = desvios.get(trecho)
+        if term is None or destino not in term.alvos:
+            continue
+        if destino == term.alvos[0]:
+            contagem = [tomados, vezes - tomados]
+        else:
+            contagem = [vezes - tomados, tomados]
+        origem, direto = term.origem
+        if not direto:
+            contagem.reverse()
+        perfil.contar_desvio(origem, contagem[0], contagem[1])
+    return perfil
+
+
+def contagem_ir(perfil, instr):
+    # [vezes pra alvos[0], vezes pra alvos[1]] de um desvio do IR, ou None
+    if instr.origem is None:
+        return None
+    origem, direto = instr.origem
+    contagem = perfil.desvios.get(origem)
+    if contagem is None:
+        return None
+    return contagem if direto else contagem[::-1]
+
+
+# ---------------- Desenrolamento de laços ----------------
+
+def constante_inteira(expr):
+    if isinstance(expr, Num) and '.' not in expr.lexema:
+        return int(expr.lexema)
+    if isinstance(expr, Unaria) and expr.op == 'menos':
+        valor = constante_inteira(expr.expr)
+        return -valor if valor is not None else None
+    return None
+
+
+def voltas_fixas(laco):
+    # Número de voltas do for quando ele não depende da execução: i começa
+    # numa constante, a condição compara i com uma constante, o passo soma
+    # (ou subtrai) uma constante de i e o corpo não mexe em i; senão None
+    inicio, cond, passo = laco.inicio, laco.cond, laco.passo
+    if isinstance(inicio, DeclVar):
+        decl, valor = inicio, inicio.valor
+    elif isinstance(inicio, Atribuicao):
+        decl, valor = inicio.decl, inicio.expr
+    else:
+        return None
+    a = constante_inteira(valor) if valor is not None else None
+    if decl is None or a is None or tipo_var(decl) != 'inteiro':
+        return None
+    if (not isinstance(cond, Binaria) or cond.op not in ('menor', 'le', 'maior', 'ge', 'ne') or
+            not isinstance(cond.esq, Var) or cond.esq.decl is not decl):
+        return None
+    b = constante_inteira(cond.dir)
+    if (b is None or not isinstance(passo, Atribuicao) or passo.decl is not decl or
+            not isinstance(passo.expr, Binaria) or passo.expr.op not in ('mais', 'menos') or
+            not isinstance(passo.expr.esq, Var) or passo.expr.esq.decl is not decl):
+        return None
+    c = constante_inteira(passo.expr.dir)
+    if not c:
+        return None
+    c = c if passo.expr.op == 'mais' else -c
+
+    # O corpo não pode escrever em i (nem uma função chamada, se i não for
+    # a variável do próprio for)
+    for cmd in percorrer_comandos(laco.corpo):
+        if isinstance(cmd, DeclFuncao):
+            return None
+        if (isinstance(cmd, Atribuicao) or isinstance(cmd, Leitura)) and cmd.decl is decl:
+            return None
+        for expr in expressoes_do_comando(cmd):
+            for e in percorrer_expr(expr):
+                if isinstance(e, IncDec) and e.decl is decl:
+                    return None
+                if isinstance(e, Chamada) and decl is not inicio:
+                    return None
+
+    n = 0
+    v = a
+    limite = Const(b, 'inteiro')
+    while avaliar(cond.op, 'inteiro', Const(v, 'inteiro'), limite).valor:
+        n += 1
+        v += c
+        if n > LIMITE_VOLTAS or abs(v) >= 2 ** 31:
+            return None
+    return n
+
+
+def desenrolar(laco, perfil):
+    # Corpo do for repetido k vezes com o passo no meio:
+    #   for (...; i < n; i = i + 1) { c }  ->  { c  i = i + 1  c  ...  c }
+    # (sem teste entre as cópias: o número de voltas é múltiplo de k). As
+    # cópias são os mesmos nós, então as declarações do corpo continuam
+    # sendo as mesmas variáveis, como nas voltas do laço original
+    voltas = perfil.voltas(laco.origem)
+    if voltas is None or voltas < VOLTAS_MINIMAS:
+        return False
+    n = voltas_fixas(laco)
+    if n is None:
+        return False
+    t = tamanho(laco.corpo) + tamanho([laco.passo])
+    for k in FATORES:
+        if n >= k and n % k == 0 and k * t <= LIMITE_DESENROLADO:
+            corpo = list(laco.corpo)
+            for _ in range(k - 1):
+                corpo = corpo + [laco.passo] + laco.corpo
+            laco.corpo = corpo
+            return True
+    return False
+
+
+def desenrolar_lacos(arvore, perfil):
+    # Desenrola os for quentes do programa (mexe na AST; só pra geração pelo
+    # IR) e devolve quantos foram desenrolados. Os de dentro vão primeiro,
+    # então o de fora já mede o corpo desenrolado
+    lacos = []
+    for comandos in [arvore.comandos] + [d.corpo for d in coletar_funcoes(arvore.comandos)]:
+        lacos.extend(c for c in percorrer_comandos(comandos) if isinstance(c, Para))
+    feitos = 0
+    for laco in reversed(lacos):
+        if laco.origem is not None and desenrolar(laco, perfil):
+            feitos += 1
+    return feitos
+
+
+# ---------------- Ordem dos blocos ----------------
+
+def peso_aresta(perfil, freq, origem, destino):
+    # Vezes que a execução vai de origem pra destino: desvio medido passa
+    # as contagens dele, salto passa tudo, desvio sem contagem divide meio
+    # a meio (cópias de um mesmo nó usam a contagem do original inteira)
+    term = origem.terminador()
+    if term.op == 'salto':
+        return freq[origem]
+    contagem = contagem_ir(perfil, term)
+    if contagem is None:
+        return freq[origem] / 2
+    return contagem[0] if destino.nome == term.alvos[0] else contagem[1]
+
+
+def frequencias(funcao, perfil, entrada):
+    # Vezes que cada bloco roda, estimadas pelo perfil (entrada: vezes que
+    # a função roda); repete até as estimativas pararem de mudar
+    calcular_cfg(funcao)
+    freq = {b: 0.0 for b in funcao.blocos}
+    primeiro = funcao.blocos[0]
+    for _ in range(RODADAS_FREQUENCIA):
+        mudou = False
+        for b in funcao.blocos:
+            novo = entrada if b is primeiro else 0.0
+            novo += sum(peso_aresta(perfil, freq, p, b) for p in b.predecessores)
+            if abs(novo - freq[b]) > 1e-3 * max(1.0, novo):
+                mudou = True
+            freq[b] = novo
+        if not mudou:
+            break
+    return freq
+
+
+def ordenar_funcao(funcao, perfil, entrada):
+    # Junta os blocos em cadeias pelas arestas mais pesadas (o bloco de cima
+    # cai direto no de baixo) e emite a cadeia da entrada primeiro, depois
+    # as outras na ordem original, com as que nunca rodaram no fim
+    # No empate a aresta de volta ganha: o teste do laço vai pra baixo do
+    # corpo e cada volta fica com um desvio só
+    if not any(contagem_ir(perfil, b.terminador()) is not None for b in funcao.blocos):
+        return False
+    freq = frequencias(funcao, perfil, entrada)
+    posicao = {b.nome: i for i, b in enumerate(funcao.blocos)}
+    arestas = []
+    for b in funcao.blocos:
+        for s in b.sucessores:
+            p = peso_aresta(perfil, freq, b, s)
+            if p > 0:
+                volta = posicao[s.nome] <= posicao[b.nome]
+                arestas.append((-p, not volta, posicao[b.nome], posicao[s.nome]))
+    arestas.sort()
+
+    cadeia = {b.nome: [b] for b in funcao.blocos}
+    entrada_bloco = funcao.blocos[0]
+    for _, _, i, j in arestas:
+        a, b = funcao.blocos[i], funcao.blocos[j]
+        ca, cb = cadeia[a.nome], cadeia[b.nome]
+        if ca is cb or ca[-1] is not a or cb[0] is not b or b is entrada_bloco:
+            continue
+        ca.extend(cb)
+        for x in cb:
+            cadeia[x.nome] = ca
+
+    cadeias = []
+    vistas = set()
+    for b in funcao.blocos:
+        c = cadeia[b.nome]
+        if id(c) not in vistas:
+            vistas.add(id(c))
+            cadeias.append(c)
+    principal = cadeia[entrada_bloco.nome]
+    outras = [c for c in cadeias if c is not principal]
+    outras.sort(key=lambda c: (freq[c[0]] == 0, posicao[c[0].nome]))
+    ordem = [b for c in [principal] + outras for b in c]
+    if ordem == funcao.blocos:
+        return False
+    funcao.ordem_alocacao = funcao.blocos
+    funcao.blocos = ordem
+    return True
+
+
+def entradas_funcoes(programa, perfil):
+    # {nome da função: vezes que foi chamada}, pelas chamadas medidas
+    entradas = {}
+    for funcao in programa.funcoes:
+        for bloco in funcao.blocos:
+            for instr in bloco.instrs:
+                if instr.op == 'chamar' and instr.origem in perfil.chamadas:
+                    nome = instr.alvos[0]
+                    entradas[nome] = entradas.get(nome, 0) + perfil.chamadas[instr.origem]
+    return entradas
+
+
+def ordenar_blocos(programa, perfil):
+    # Reordena os blocos de cada função do IR (já otimizado) pelo perfil e
+    # devolve quantas funções mudaram de ordem
+    entradas = entradas_funcoes(programa, perfil)
+    mudadas = 0
+    for funcao in programa.funcoes:
+        entrada = 1 if funcao is programa.principal() else entradas.get(funcao.nome, 0)
+        if ordenar_funcao(funcao, perfil, entrada):
+            mudadas += 1
+    return mudadas
@@ -0,0 +1,745 @@
+# OTIMIZADOR DO CÓDIGO INTERMEDIÁRIO
+# Passos sobre o IR de três endereços (codigo_intermediario.py), rodados por
+# um gerenciador que repete a sequência até nenhum passo mudar mais nada
+# Cada passo recebe a função e o contexto do programa e devolve quantas
+# mudanças fez (vai pras estatísticas)
+#
+# Passos:
+#   propagar_constantes     propagação de constantes no CFG inteiro, só pelos
+#                           caminhos executáveis; desvio com condição conhecida
+#                           vira salto (o if/while morto some depois)
+#   dobrar_constantes       operação só com constantes vira a constante
+#                           (e identidades tipo x + 0, x * 1)
+#   propagar_copias         depois de x = y, usa y no lugar de x (por bloco)
+#   eliminar_subexpressoes  a mesma conta de novo no bloco reaproveita o
+#                           resultado da primeira (CSE local)
+#   mover_invariantes       conta que dá o mesmo valor em toda volta do laço
+#                           sai pro pré-cabeçalho (LICM)
+#   reduzir_forca           i * k, com i variável de indução (i = i + c no
+#                           laço), vira uma soma de c * k a cada volta
+#   eliminar_codigo_morto   tira instruções cujo resultado ninguém lê
+#                           (vivacidade no CFG) e blocos inalcançáveis
+#   simplificar_fluxo       desvio com os dois alvos iguais vira salto, salto
+#                           pra bloco vazio vai direto pro destino e bloco com
+#                           um só predecessor é juntado com ele
+
+import heapq
+
+from codigo_intermediario import (Const, Instr, OPERADORES_BINARIOS, calcular_vivas, calcular_cfg,
+                                  blocos_alcancaveis, nomes_compartilhados, COM_EFEITO,
+                                  flutuante_32, pos_ordem_reversa)
+from lacos import encontrar_lacos, calcular_dominadores, criar_preheader
+
+# Operações sem efeito colateral (podem ser reaproveitadas ou removidas)
+PURAS = OPERADORES_BINARIOS | frozenset(['mov', 'neg', 'nao', 'cvt'])
+COMUTATIVAS = frozenset(['mais', 'mult', 'eqeq', 'ne'])
+
+
+class ContextoPrograma:
+    # O que os passos precisam saber do programa fora da função:
+    # globais - variáveis que mais de uma função usa (as do programa
+    #           principal que alguma função lê/escreve)
+    def __init__(self, programa):
+        self.globais = frozenset(nomes_compartilhados(programa))
+        self.principal = programa.principal()
+
+    def vivas_na_saida(self, funcao):
+        # Depois do fim do programa nada é lido; depois do retorno de uma
+        # função, as globais continuam valendo pra quem chamou
+        if funcao is self.principal:
+            return frozenset()
+        return self.globais
+
+
+# ---------------- Avaliação de constantes ----------------
+
+def inteiro_32(v):
+    # Mesmo resultado da aritmética de 32 bits do MIPS (dá a volta)
+    v &= 0xFFFFFFFF
+    return v - 0x100000000 if v & 0x80000000 else v
+
+
+def avaliar(op, tipo, a, b=None):
+    # Valor de op aplicado às constantes, ou None se não der pra dobrar
+    # (divisão por zero fica pra execução)
+    x = a.valor
+    y = b.valor if b is not None else None
+    if 'flutuante' in (a.tipo, b.tipo if b is not None else None):
+        # A FPU faz a conta (e a comparação) em precisão simples: os dois
+        # lados vão pra float32 antes, não só o resultado
+        x = flutuante_32(float(x))
+        y = flutuante_32(float(y)) if b is not None else None
+
+    if op == 'cvt':
+        return Const(flutuante_32(float(x)), 'flutuante')
+    if op == 'neg':
+        return Const(flutuante_32(-x), tipo) if tipo == 'flutuante' else Const(inteiro_32(-x), tipo)
+    if op == 'nao':
+        return Const(1 if x == 0 else 0, 'lógico')
+
+    if op in ('maior', 'menor', 'ge', 'le', 'eqeq', 'ne'):
+        r = {'maior': x > y, 'menor': x < y, 'ge': x >= y, 'le': x <= y,
+             'eqeq': x == y, 'ne': x != y}[op]
+        return Const(1 if r else 0, 'lógico')
+
+    if op == 'div' and y == 0:
+        return None
+
+    if tipo == 'flutuante':
+        r = {'mais': lambda: x + y, 'menos': lambda: x - y, 'mult': lambda: x * y,
+             'div': lambda: x / y}[op]()
+        return Const(flutuante_32(r), 'flutuante')
+
+    if op == 'div':
+        # Divisão inteira do MIPS trunca pra zero (o // do Python arredonda pra baixo)
+        q = abs(x) // abs(y)
+        r = q if (x < 0) == (y < 0) else -q
+    else:
+        r = {'mais': lambda: x + y, 'menos': lambda: x - y, 'mult': lambda: x * y}[op]()
+    return Const(inteiro_32(r), tipo)
+
+
+def avaliar_instr(funcao, instr, args):
+    # Valor de uma instrução pura com os argumentos constantes dados
+    # (cvt usa o tipo do destino; o resto, o tipo do primeiro operando)
+    if instr.op == 'mov':
+        return args[0]
+    if instr.op == 'cvt':
+        return avaliar('cvt', funcao.tipos.get(instr.dest, 'flutuante'), *args)
+    return avaliar(instr.op, funcao.tipo_de(args[0]), *args)
+
+
+def _eh_const(op, valor):
+    return isinstance(op, Const) and op.tipo != 'cadeia' and op.valor == valor
+
+
+def simplificar(instr, tipo):
+    # Identidades algébricas: devolve o operando que substitui a conta, ou None
+    a = instr.args[0] if instr.args else None
+    b = instr.args[1] if len(instr.args) > 1 else None
+    op = instr.op
+    if op == 'mais':
+        if _eh_const(b, 0):
+            return a
+        if _eh_const(a, 0):
+            return b
+    elif op == 'menos':
+        if _eh_const(b, 0):
+            return a
+    elif op == 'mult':
+        if _eh_const(b, 1):
+            return a
+        if _eh_const(a, 1):
+            return b
+        # x * 0 só pra inteiro (em flutuante, inf * 0 não é 0)
+        if tipo != 'flutuante' and (_eh_const(a, 0) or _eh_const(b, 0)):
+            return Const(0, tipo)
+    elif op == 'div':
+        if _eh_const(b, 1):
+            return a
+    return None
+
+
+# ---------------- Passos ----------------
+
+def dobrar_constantes(funcao, contexto):
+    mudancas = 0
+    for bloco in funcao.blocos:
+        for i, instr in enumerate(bloco.instrs):
+            if instr.op not in PURAS or instr.op == 'mov':
+                continue
+            tipo = funcao.tipos.get(instr.dest, 'inteiro')
+            novo = None
+            if all(isinstance(a, Const) for a in instr.args):
+                novo = avaliar_instr(funcao, instr, instr.args)
+            if novo is None:
+                novo = simplificar(instr, tipo)
+            if novo is not None:
+                bloco.instrs[i] = Instr('mov', instr.dest, [novo])
+                mudancas += 1
+    return mudancas
+
+
+# Valor de um nome na propagação de constantes: Const, NAO_CONSTANTE, ou
+# ausente do estado. O estado é esparso: variável ausente é NAO_CONSTANTE
+# (na entrada nada se sabe delas, e é o que a maioria vira depois de um
+# read ou de um laço) e temporário ausente ainda não foi definido por
+# nenhum caminho executável
+NAO_CONSTANTE = 'nao_constante'
+
+
+def propagar_constantes(funcao, contexto):
+    # Propagação condicional de constantes (Wegman & Zadeck, sem SSA):
+    # percorre o CFG a partir da entrada, só seguindo as arestas que podem
+    # ser tomadas com o que se sabe até ali, e junta os estados que chegam
+    # em cada bloco. Depois troca os usos pelos valores conhecidos e os
+    # desvios de condição conhecida por saltos
+    # A fila anda em pós-ordem reversa (um bloco só roda depois dos
+    # predecessores, então fora de laço cada bloco roda uma vez) e o estado
+    # que sai de um bloco só leva as constantes e os temporários usados em
+    # outro bloco: a junção percorre só esses nomes, não o programa inteiro
+    calcular_cfg(funcao)
+    mapa = funcao.mapa_blocos()
+    ordem = pos_ordem_reversa(funcao)
+    posicao = {b: i for i, b in enumerate(ordem)}
+    de_fora = _temporarios_entre_blocos(funcao)
+
+    entradas = {ordem[0]: {}}
+    pendentes = [0]
+    na_fila = {0}
+    while pendentes:
+        i = heapq.heappop(pendentes)
+        na_fila.discard(i)
+        bloco = ordem[i]
+        estado = dict(entradas[bloco])
+        for instr in bloco.instrs[:-1]:
+            _transferir(funcao, contexto, instr, estado)
+        alvos = _alvos_executaveis(funcao, bloco.terminador(), estado)
+        if not alvos:
+            continue
+        saida = {n: v for n, v in estado.items() if n[0] != '%' or n in de_fora}
+        for alvo in alvos:
+            destino = mapa[alvo]
+            anterior = entradas.get(destino)
+            novo = saida if anterior is None else _juntar(anterior, saida)
+            if novo != anterior:
+                entradas[destino] = novo
+                j = posicao[destino]
+                if j not in na_fila:
+                    na_fila.add(j)
+                    heapq.heappush(pendentes, j)
+
+    mudancas = 0
+    for bloco in funcao.blocos:
+        if bloco not in entradas:
+            continue
+        estado = dict(entradas[bloco])
+        for i, instr in enumerate(bloco.instrs):
+            for j, arg in enumerate(instr.args):
+                valor = estado.get(arg) if isinstance(arg, str) else None
+                if isinstance(valor, Const):
+                    instr.args[j] = valor
+                    mudancas += 1
+            if instr.op == 'desvio':
+                alvos = _alvos_executaveis(funcao, instr, estado)
+                if len(alvos) == 1:
+                    bloco.instrs[i] = Instr('salto', alvos=alvos)
+                    mudancas += 1
+            else:
+                _transferir(funcao, contexto, instr, estado)
+    return mudancas
+
+
+def _temporarios_entre_blocos(funcao):
+    # Temporários lidos num bloco antes de serem definidos nele (os outros
+    # morrem no próprio bloco e não precisam ir no estado de saída)
+    nomes = set()
+    for bloco in funcao.blocos:
+        definidos = set()
+        for instr in bloco.instrs:
+            for arg in instr.args:
+                if isinstance(arg, str) and arg[0] == '%' and arg not in definidos:
+                    nomes.add(arg)
+            if instr.dest is not None:
+                definidos.add(instr.dest)
+    return nomes
+
+
+def _valor(operando, estado):
+    if isinstance(operando, Const):
+        return operando
+    if operando[0] == '%':
+        return estado.get(operando)
+    return estado.get(operando, NAO_CONSTANTE)
+
+
+def _definir(estado, nome, valor):
+    # Variável NAO_CONSTANTE fica fora do estado (é o valor de quem tá fora)
+    if valor is None or (valor == NAO_CONSTANTE and nome[0] != '%'):
+        estado.pop(nome, None)
+    else:
+        estado[nome] = valor
+
+
+def _transferir(funcao, contexto, instr, estado):
+    if instr.op == 'chamar':
+        # A função pode mudar as globais
+        for nome in [n for n in estado if n in contexto.globais]:
+            del estado[nome]
+    if instr.dest is None:
+        return
+    if instr.op not in PURAS:
+        _definir(estado, instr.dest, NAO_CONSTANTE)
+        return
+    args = [_valor(a, estado) for a in instr.args]
+    if NAO_CONSTANTE in args:
+        _definir(estado, instr.dest, NAO_CONSTANTE)
+    elif None in args:
+        # Só uma variável sem valor ainda seria otimista demais: não
+        # constante é o seguro
+        _definir(estado, instr.dest, None if instr.dest[0] == '%' else NAO_CONSTANTE)
+    else:
+        resultado = avaliar_instr(funcao, instr, args)
+        _definir(estado, instr.dest, NAO_CONSTANTE if resultado is None else resultado)
+
+
+def _alvos_executaveis(funcao, term, estado):
+    # Sucessores que podem ser tomados (nenhum se a condição ainda não tem valor)
+    if term.op == 'salto':
+        return list(term.alvos)
+    if term.op != 'desvio':
+        return []
+    a, b = [_valor(x, estado) for x in term.args]
+    if a is None or b is None:
+        return []
+    if a == NAO_CONSTANTE or b == NAO_CONSTANTE:
+        return list(term.alvos)
+    tipo = 'flutuante' if 'flutuante' in (a.tipo, b.tipo) else a.tipo
+    resultado = avaliar(term.cond, tipo, a, b)
+    return [term.alvos[0] if resultado.valor else term.alvos[1]]
+
+
+def _juntar(a, b):
+    # Encontro de dois estados: mesmo valor fica, valores diferentes não
+    # são constante. Variável que falta num lado já é NAO_CONSTANTE (e sai);
+    # temporário que falta num lado fica com o valor do outro
+    junto = {}
+    for nome, valor in a.items():
+        outro = b.get(nome)
+        if outro is None:
+            if nome[0] == '%':
+                junto[nome] = valor
+        elif outro == valor:
+            junto[nome] = valor
+        elif nome[0] == '%':
+            junto[nome] = NAO_CONSTANTE
+    for nome, valor in b.items():
+        if nome[0] == '%' and nome not in a:
+            junto[nome] = valor
+    return junto
+
+
+def propagar_copias(funcao, contexto):
+    mudancas = 0
+    usos = contar_usos(funcao)
+    for bloco in funcao.blocos:
+        copias = {}   # nome -> operando que tem o mesmo valor
+        novas = []
+        for instr in bloco.instrs:
+            # Troca os usos pelas cópias conhecidas
+            for i, arg in enumerate(instr.args):
+                if isinstance(arg, str) and arg in copias:
+                    instr.args[i] = copias[arg]
+                    mudancas += 1
+
+            # %t = a op b; x = %t  ->  x = a op b  (se %t só é usado ali)
+            if (instr.op == 'mov' and isinstance(instr.args[0], str) and instr.args[0].startswith('%')
+                    and novas and novas[-1].dest == instr.args[0] and novas[-1].op in PURAS
+                    and usos.get(instr.args[0], 0) == 1
+                    and funcao.tipos.get(instr.args[0]) == funcao.tipos.get(instr.dest)):
+                anterior = novas[-1]
+                copias.pop(anterior.dest, None)
+                anterior.dest = instr.dest
+                instr = anterior
+                novas.pop()
+                mudancas += 1
+
+            if instr.op == 'chamar':
+                # A função pode mudar as globais: esquece tudo
+                copias = {}
+
+            if instr.dest is not None:
+                d = instr.dest
+                copias.pop(d, None)
+                for nome in [n for n, v in copias.items() if v == d]:
+                    del copias[nome]
+                if instr.op == 'mov' and instr.args[0] != d:
+                    copias[d] = instr.args[0]
+
+            if instr.op == 'mov' and instr.args[0] == instr.dest:
+                mudancas += 1
+                continue
+            novas.append(instr)
+        bloco.instrs = novas
+    return mudancas
+
+
+def eliminar_subexpressoes(funcao, contexto):
+    mudancas = 0
+    for bloco in funcao.blocos:
+        disponiveis = {}   # (op, args) -> nome que já tem o resultado
+        for i, instr in enumerate(bloco.instrs):
+            if instr.op == 'chamar':
+                disponiveis = {}
+            if instr.op in PURAS and instr.op != 'mov':
+                chave = chave_expressao(instr)
+                anterior = disponiveis.get(chave)
+                if anterior is not None and \
+                        funcao.tipos.get(anterior) == funcao.tipos.get(instr.dest):
+                    bloco.instrs[i] = instr = Instr('mov', instr.dest, [anterior])
+                    mudancas += 1
+
+            if instr.dest is not None:
+                d = instr.dest
+                for chave in [c for c, n in disponiveis.items() if n == d or d in c[1]]:
+                    del disponiveis[chave]
+                if instr.op in PURAS and instr.op != 'mov' and d not in instr.args:
+                    disponiveis[chave_expressao(instr)] = d
+    return mudancas
+
+
+def chave_expressao(instr):
+    args = tuple(instr.args)
+    if instr.op in COMUTATIVAS:
+        args = tuple(sorted(args, key=repr))
+    return (instr.op, args)
+
+
+def eliminar_codigo_morto(funcao, contexto):
+    mudancas = 0
+
+    # Blocos que nenhum caminho a partir da entrada alcança
+    alcancaveis = blocos_alcancaveis(funcao)
+    if len(alcancaveis) != len(funcao.blocos):
+        mudancas += len(funcao.blocos) - len(alcancaveis)
+        funcao.blocos = [b for b in funcao.blocos if b in alcancaveis]
+
+    # Instruções puras cujo resultado não é lido depois
+    _, saida = calcular_vivas(funcao, contexto.vivas_na_saida(funcao), contexto.globais)
+    for bloco in funcao.blocos:
+        vivas = set(saida[bloco])
+        novas = []
+        for instr in reversed(bloco.instrs):
+            if instr.dest is not None and instr.op in PURAS and instr.dest not in vivas:
+                mudancas += 1
+                continue
+            if instr.dest is not None:
+                vivas.discard(instr.dest)
+            vivas.update(instr.usos())
+            if instr.op == 'chamar':
+                vivas.update(contexto.globais)
+            novas.append(instr)
+        novas.reverse()
+        bloco.instrs = novas
+    return mudancas
+
+
+def mover_invariantes(funcao, contexto):
+    # Um laço por vez, dos internos pros externos, com laços, dominadores e
+    # vivacidade calculados uma vez só no começo do passo. Tirar d = a op b
+    # de um laço pro pré-cabeçalho não muda o que tá vivo fora do laço (a e
+    # b já chegavam vivos no cabeçalho, d não), então as vivas do cabeçalho
+    # e das saídas dos laços de fora continuam valendo; o que sobrar pra
+    # mover a próxima rodada do gerenciador pega
+    dom = calcular_dominadores(funcao)
+    lacos = encontrar_lacos(funcao, dom)
+    if not lacos:
+        return 0
+    analise = _AnaliseLacos(funcao, contexto, dom, lacos)
+    mudancas = 0
+    for laco in lacos:
+        mudancas += _mover_do_laco(funcao, contexto, laco, analise)
+    return mudancas
+
+
+class _AnaliseLacos:
+    # O que os passos de laço consultam, calculado uma vez por passo e
+    # acertado a cada pré-cabeçalho novo (ele fica com as vivas de entrada
+    # do cabeçalho, domina o que o cabeçalho dominava e vem logo antes dele
+    # na ordem dos blocos)
+    def __init__(self, funcao, contexto, dom, lacos, vivas=True):
+        self.funcao = funcao
+        self.dom = dom
+        self.lacos = lacos
+        self.posicao = {b: i for i, b in enumerate(funcao.blocos)}
+        self.cabecalho_de = {}
+        self.entrada = None
+        if vivas:
+            self.entrada, _ = calcular_vivas(funcao, contexto.vivas_na_saida(funcao), contexto.globais)
+
+    def preheader(self, laco):
+        h = laco.cabecalho
+        pre = criar_preheader(self.funcao, laco, self.lacos)
+        if pre not in self.posicao:
+            self.posicao[pre] = self.posicao[h] - 0.5
+            self.cabecalho_de[pre] = h
+            if self.entrada is not None:
+                self.entrada[pre] = set(self.entrada[h])
+        return pre
+
+    def domina(self, a, b):
+        while a in self.cabecalho_de:
+            if a is b:
+                return True
+            a = self.cabecalho_de[a]
+        return a in self.dom[b]
+
+    def blocos(self, laco):
+        # Blocos do laço na ordem da função
+        return sorted(laco.blocos, key=self.posicao.__getitem__)
+
+
+def _definicoes(contexto, laco):
+    # {nome: quantas vezes é definido no laço}; chamada de função conta
+    # como definição (dupla) de toda global
+    definidos = {}
+    for b in laco.blocos:
+        for instr in b.instrs:
+            if instr.dest is not None:
+                definidos[instr.dest] = definidos.get(instr.dest, 0) + 1
+            if instr.op == 'chamar':
+                for nome in contexto.globais:
+                    definidos[nome] = definidos.get(nome, 0) + 2
+    return definidos
+
+
+def _mover_do_laco(funcao, contexto, laco, analise):
+    # d = a op b é invariante se a e b não mudam no laço; pode sair se:
+    #   - é a única definição de d no laço
+    #   - d não chega vivo no cabeçalho (ninguém no laço lê o d de antes)
+    #   - d não é lido depois do laço, ou o bloco dela domina as saídas
+    #     (senão um laço que roda zero vezes mudaria o d)
+    #   - não é divisão (dividir por zero fora do caminho que executava)
+    definidos = _definicoes(contexto, laco)
+    entrada = analise.entrada
+    saidas = laco.saidas()
+    vivas_fora = set()
+    for _, s in saidas:
+        vivas_fora |= entrada[s]
+    blocos = analise.blocos(laco)
+
+    movidas = []
+    mudou = True
+    while mudou:
+        mudou = False
+        for b in blocos:
+            for instr in list(b.instrs):
+                d = instr.dest
+                if instr.op not in PURAS or definidos.get(d) != 1:
+                    continue
+                if instr.op == 'div' and not (isinstance(instr.args[1], Const) and instr.args[1].valor != 0):
+                    continue
+                if d in entrada[laco.cabecalho]:
+                    continue
+                if any(isinstance(a, str) and definidos.get(a, 0) > 0 for a in instr.args):
+                    continue
+                if d in vivas_fora and not all(analise.domina(b, x) for x, _ in saidas):
+                    continue
+                b.instrs.remove(instr)
+                movidas.append(instr)
+                definidos[d] = 0
+                mudou = True
+
+    if movidas:
+        pre = analise.preheader(laco)
+        pre.instrs[-1:-1] = movidas
+    return len(movidas)
+
+
+def reduzir_forca(funcao, contexto):
+    # Também um laço por vez, dos internos pros externos, com os laços
+    # achados uma vez só (não precisa de vivacidade)
+    dom = calcular_dominadores(funcao)
+    lacos = encontrar_lacos(funcao, dom)
+    if not lacos:
+        return 0
+    analise = _AnaliseLacos(funcao, contexto, dom, lacos, vivas=False)
+    mudancas = 0
+    for laco in lacos:
+        mudancas += _reduzir_no_laco(funcao, contexto, laco, analise)
+    return mudancas
+
+
+def variaveis_inducao(funcao, contexto, laco):
+    # Variáveis de indução básicas do laço: inteiros cujas definições no
+    # laço são todas i = i + c / i = i - c (c constante)
+    # Retorna {nome: [instruções que mudam o nome]}
+    definicoes = {}
+    chamada = False
+    for b in laco.blocos:
+        for instr in b.instrs:
+            if instr.dest is not None:
+                definicoes.setdefault(instr.dest, []).append(instr)
+            if instr.op == 'chamar':
+                chamada = True
+    inducao = {}
+    for nome, instrs in definicoes.items():
+        if funcao.tipos.get(nome) != 'inteiro' or (chamada and nome in contexto.globais):
+            continue
+        if all(_passo_inducao(nome, i) is not None for i in instrs):
+            inducao[nome] = instrs
+    return inducao
+
+
+def _passo_inducao(nome, instr):
+    # Quanto a instrução soma em nome (i = i + c, i = c + i, i = i - c), ou None
+    a = instr.args[0] if instr.args else None
+    b = instr.args[1] if len(instr.args) > 1 else None
+    if instr.op == 'mais' and a == nome and isinstance(b, Const):
+        return b.valor
+    if instr.op == 'mais' and b == nome and isinstance(a, Const):
+        return a.valor
+    if instr.op == 'menos' and a == nome and isinstance(b, Const):
+        return -b.valor
+    return None
+
+
+def _reduzir_no_laco(funcao, contexto, laco, analise):
+    # d = i * k  ->  s = i * k no pré-cabeçalho, s = s + c*k logo depois
+    # de cada i = i + c, e d = s no lugar da multiplicação
+    inducao = variaveis_inducao(funcao, contexto, laco)
+    alvos = []
+    for b in analise.blocos(laco):
+        for instr in b.instrs:
+            if instr.op != 'mult' or funcao.tipos.get(instr.dest) != 'inteiro':
+                continue
+            i, k = instr.args
+            if isinstance(i, Const):
+                i, k = k, i
+            if i in inducao and isinstance(k, Const):
+                alvos.append((instr, i, k.valor))
+    if not alvos:
+        return 0
+
+    pre = analise.preheader(laco)
+    bloco_de = {}
+    for b in laco.blocos:
+        for instr in b.instrs:
+            bloco_de[id(instr)] = b
+    reduzidas = {}   # (i, k) -> nome que acompanha i * k
+    for instr, i, k in alvos:
+        s = reduzidas.get((i, k))
+        if s is None:
+            s = reduzidas[(i, k)] = novo_temp(funcao, 'inteiro')
+            pre.instrs.insert(len(pre.instrs) - 1, Instr('mult', s, [i, Const(k, 'inteiro')]))
+            for passo in inducao[i]:
+                delta = Const(inteiro_32(_passo_inducao(i, passo) * k), 'inteiro')
+                b = bloco_de[id(passo)]
+                b.instrs.insert(b.instrs.index(passo) + 1, Instr('mais', s, [s, delta]))
+        instr.op = 'mov'
+        instr.args = [s]
+    return len(alvos)
+
+
+def novo_temp(funcao, tipo):
+    # Temporário novo (%N com N maior que todos os da função)
+    n = max([int(x[1:]) for x in funcao.tipos if x[1:].isdigit() and x.startswith('%')] + [0]) + 1
+    nome = "%" + str(n)
+    funcao.tipos[nome] = tipo
+    return nome
+
+
+def simplificar_fluxo(funcao, contexto):
+    mudancas = 0
+    for bloco in funcao.blocos:
+        term = bloco.terminador()
+        if term.op == 'desvio' and term.alvos[0] == term.alvos[1]:
+            bloco.instrs[-1] = Instr('salto', alvos=[term.alvos[0]])
+            mudancas += 1
+
+    # Salto pra bloco que só tem um salto vai direto pro destino final
+    mapa = funcao.mapa_blocos()
+    entrada = funcao.blocos[0]
+
+    def destino_final(nome):
+        vistos = set()
+        while nome not in vistos:
+            vistos.add(nome)
+            b = mapa[nome]
+            if b is entrada or len(b.instrs) != 1 or b.instrs[0].op != 'salto':
+                break
+            nome = b.instrs[0].alvos[0]
+        return nome
+
+    for bloco in funcao.blocos:
+        term = bloco.terminador()
+        if term.op in ('salto', 'desvio'):
+            novos = [destino_final(a) for a in term.alvos]
+            if novos != term.alvos:
+                term.alvos = novos
+                mudancas += 1
+
+    # Bloco que termina em salto pro único sucessor, sendo o único
+    # predecessor dele: os dois viram um bloco só
+    calcular_cfg(funcao)
+    removidos = set()
+    for bloco in funcao.blocos:
+        if bloco in removidos:
+            continue
+        while bloco.terminador().op == 'salto':
+            seguinte = mapa[bloco.terminador().alvos[0]]
+            if seguinte is bloco or seguinte is entrada or len(seguinte.predecessores) != 1:
+                break
+            bloco.instrs = bloco.instrs[:-1] + seguinte.instrs
+            bloco.sucessores = seguinte.sucessores
+            for s in seguinte.sucessores:
+                s.predecessores = [bloco if p is seguinte else p for p in s.predecessores]
+            removidos.add(seguinte)
+            mudancas += 1
+    if removidos:
+        funcao.blocos = [b for b in funcao.blocos if b not in removidos]
+    return mudancas
+
+
+def contar_usos(funcao):
+    usos = {}
+    for bloco in funcao.blocos:
+        for instr in bloco.instrs:
+            for nome in instr.usos():
+                usos[nome] = usos.get(nome, 0) + 1
+    return usos
+
+
+# ---------------- Gerenciador ----------------
+
+PASSOS = {
+    'propagar_constantes': propagar_constantes,
+    'dobrar_constantes': dobrar_constantes,
+    'propagar_copias': propagar_copias,
+    'eliminar_subexpressoes': eliminar_subexpressoes,
+    'mover_invariantes': mover_invariantes,
+    'reduzir_forca': reduzir_forca,
+    'eliminar_codigo_morto': eliminar_codigo_morto,
+    'simplificar_fluxo': simplificar_fluxo,
+}
+
+# Ordem padrão da sequência
+PASSOS_PADRAO = ['propagar_constantes', 'dobrar_constantes', 'propagar_copias',
+                 'eliminar_subexpressoes', 'mover_invariantes', 'reduzir_forca',
+                 'eliminar_codigo_morto', 'simplificar_fluxo']
+
+
+class GerenciadorPassos:
+    # passos: nomes dos passos na ordem (padrão: PASSOS_PADRAO)
+    # desativados: nomes pra pular (liga/desliga cada passo)
+    # Repete a sequência até ninguém mudar nada (ou max_iteracoes)
+    def __init__(self, passos=None, desativados=(), max_iteracoes=10):
+        if passos is None:
+            passos = PASSOS_PADRAO
+        for nome in list(passos) + list(desativados):
+            if nome not in PASSOS:
+                raise Exception("Passo de otimizacao desconhecido: '" + nome + "'")
+        self.passos = [p for p in passos if p not in desativados]
+        self.max_iteracoes = max_iteracoes
+        self.estatisticas = {p: 0 for p in self.passos}
+        self.iteracoes = 0
+
+    def executar(self, programa):
+        contexto = ContextoPrograma(programa)
+        for funcao in programa.funcoes:
+            for _ in range(self.max_iteracoes):
+                self.iteracoes += 1
+                total = 0
+                for nome in self.passos:
+                    n = PASSOS[nome](funcao, contexto)
+                    self.estatisticas[nome] += n
+                    total += n
+                if total == 0:
+                    break
+        return programa
+
+
+def otimizar(programa, desativados=()):
+    # Atalho: roda a sequência padrão (menos os desativados)
+    GerenciadorPassos(desativados=desativados).executar(programa)
+    return programa
@@ -0,0 +1,393 @@
+# OTIMIZADOR PEEPHOLE
+# Passa uma janela pequena por cima das instruções MIPS geradas e troca
+# padrões redundantes por versões menores, tipo:
+#   sw $t0, 4($sp) / lw $t0, 4($sp)     -> o lw sai
+#   j L / L:                            -> o j sai
+#   li $t1, 1 / add $t0, $t0, $t1       -> addi $t0, $t0, 1
+#   add $t0, $s0, $t1 / move $s0, $t0   -> add $s0, $s0, $t1
+#   li $t0, 5 sem ninguém ler $t0       -> some
+# Trabalha numa lista de Instrucao (op + argumentos), não no texto
+# As regras são plugáveis (lista de Regra) e a otimização repete até
+# nenhuma regra achar mais nada; cada regra conta quantas vezes agiu
+
+import re
+
+
+class Instrucao:
+    # Uma linha do .text: instrução (op + args) ou rótulo (rotulo)
+    __slots__ = ('op', 'args', 'rotulo')
+
+    def __init__(self, op=None, args=(), rotulo=None):
+        self.op = op
+        self.args = list(args)
+        self.rotulo = rotulo
+
+    @staticmethod
+    def de_linha(linha):
+        linha = linha.strip()
+        if linha.endswith(':'):
+            return Instrucao(rotulo=linha[:-1])
+        partes = linha.split(None, 1)
+        args = [a.strip() for a in partes[1].split(',')] if len(partes) > 1 else []
+        return Instrucao(partes[0], args)
+
+    def eh_rotulo(self):
+        return self.rotulo is not None
+
+    def __str__(self):
+        if self.rotulo is not None:
+            return self.rotulo + ":"
+        if self.args:
+            return "    " + self.op + " " + ", ".join(self.args)
+        return "    " + self.op
+
+    __repr__ = __str__
+
+
+def de_linhas(linhas):
+    return [Instrucao.de_linha(l) for l in linhas if l.strip()]
+
+
+def para_linhas(instrs):
+    return [str(i) for i in instrs]
+
+
+# ---------------- Efeito das instruções nos registradores ----------------
+
+ALU_3 = frozenset(['add', 'addu', 'sub', 'subu', 'mul', 'and', 'or', 'xor', 'nor', 'slt', 'sltu',
+                   'sgt', 'sge', 'sle', 'seq', 'sne', 'sllv', 'srlv', 'srav',
+                   'add.s', 'sub.s', 'mul.s', 'div.s'])
+ALU_2 = frozenset(['addi', 'addiu', 'slti', 'sltiu', 'andi', 'ori', 'xori', 'sll', 'srl', 'sra',
+                   'move', 'mov.s', 'neg.s', 'abs.s', 'cvt.s.w', 'cvt.w.s', 'mfc1'])
+CARGAS = frozenset(['lw', 'l.s'])
+CONSTANTES = frozenset(['li', 'la', 'lui'])
+DESVIOS = frozenset(['beq', 'bne', 'blt', 'bgt', 'bge', 'ble', 'beqz', 'bnez', 'bgez', 'bgtz',
+                     'blez', 'bltz', 'bc1t', 'bc1f'])
+COMPARA_FPU = frozenset(['c.lt.s', 'c.le.s', 'c.eq.s'])
+
+# Instruções sem efeito além de escrever o primeiro argumento
+# (podem sumir se ninguém ler o resultado)
+PURAS = ALU_3 | ALU_2 | CARGAS | CONSTANTES
+
+# Registradores que nunca são considerados mortos
+SEMPRE_VIVOS = frozenset(['$sp', '$fp', '$ra', '$gp', '$zero'])
+
+# Vivos depois de um jr $ra (retorno): o valor de retorno e os salvos pelo chamado
+VIVOS_NO_RETORNO = frozenset(['$v0'] + ['$s' + str(i) for i in range(8)] +
+                             ['$f' + str(i) for i in range(20, 32)])
+
+_BASE = re.compile(r'\((\$\w+)\)')
+
+
+def _regs(args):
+    regs = []
+    for a in args:
+        if a.startswith('$'):
+            regs.append(a)
+        else:
+            m = _BASE.search(a)
+            if m:
+                regs.append(m.group(1))
+    return regs
+
+
+def efeito(instr):
+    # (lidos, escritos) da instrução; None nos lidos = "lê tudo" (desconhecida)
+    op, a = instr.op, instr.args
+    if op in ALU_3 or op in ALU_2 or op in CARGAS:
+        return _regs(a[1:]), a[:1]
+    if op in CONSTANTES:
+        return [], a[:1]
+    if op in ('sw', 's.s'):
+        return _regs(a), []
+    if op == 'div' and len(a) == 2:
+        return _regs(a), ['$lo', '$hi']
+    if op in ('mflo', 'mfhi'):
+        return ['$' + op[2:]], a[:1]
+    if op == 'mtc1':
+        return a[:1], a[1:2]
+    if op in COMPARA_FPU:
+        return _regs(a), ['$fcc']
+    if op in ('movf', 'movt'):
+        return _regs(a) + ['$fcc'], a[:1]
+    if op in DESVIOS:
+        lidos = _regs(a[:-1])
+        if op in ('bc1t', 'bc1f'):
+            lidos.append('$fcc')
+        return lidos, []
+    if op == 'j':
+        return [], []
+    if op == 'jal':
+        return ['$a0', '$a1', '$a2', '$a3', '$sp'], ['$ra', '$v0']
+    if op == 'jr':
+        return a[:1], []
+    if op == 'syscall':
+        return ['$v0', '$a0', '$a1', '$f12'], []
+    return None, []
+
+
+class Contexto:
+    # Informação global da lista que as regras podem consultar:
+    # posição de cada rótulo e quantas vezes cada rótulo é referenciado
+    # (recalculado sob demanda depois de cada mudança)
+    def __init__(self, instrs, fixos=()):
+        self.instrs = instrs
+        self.fixos = frozenset(fixos)   # rótulos que não podem sumir (main, funções)
+        self.sujo = True
+        self.posicoes = {}
+        self.referencias = {}
+
+    def atualizar(self):
+        if not self.sujo:
+            return
+        self.posicoes = {}
+        self.referencias = {}
+        for i, instr in enumerate(self.instrs):
+            if instr.rotulo is not None:
+                self.posicoes[instr.rotulo] = i
+            elif instr.op in DESVIOS or instr.op in ('j', 'jal'):
+                alvo = instr.args[-1]
+                self.referencias[alvo] = self.referencias.get(alvo, 0) + 1
+        self.sujo = False
+
+    def posicao(self, rotulo):
+        self.atualizar()
+        return self.posicoes.get(rotulo)
+
+    def usado(self, rotulo):
+        self.atualizar()
+        return rotulo in self.fixos or self.referencias.get(rotulo, 0) > 0
+
+    def morto_depois(self, i, reg, limite=64):
+        # O valor de reg depois da instrução i nunca é lido? Segue os
+        # caminhos possíveis (caindo direto e pelos desvios) até cada um
+        # escrever reg, ler reg, ou passar do limite de passos (aí, na
+        # dúvida, diz que tá vivo)
+        if reg in SEMPRE_VIVOS:
+            return False
+        self.atualizar()
+        pendentes = [i + 1]
+        vistos = set()
+        passos = 0
+        while pendentes:
+            k = pendentes.pop()
+            while True:
+                if k in vistos:
+                    break
+                vistos.add(k)
+                passos += 1
+                if passos > limite:
+                    return False
+                if k >= len(self.instrs):
+                    break
+                instr = self.instrs[k]
+                if instr.rotulo is not None:
+                    k += 1
+                    continue
+                lidos, escritos = efeito(instr)
+                if lidos is None or reg in lidos:
+                    return False
+                if instr.op == 'jr':
+                    if reg in VIVOS_NO_RETORNO:
+                        return False
+                    break
+                if reg in escritos and instr.op not in ('movf', 'movt'):
+                    break
+                if instr.op == 'syscall' and self._eh_saida(k):
+                    break
+                if instr.op in DESVIOS or instr.op == 'j':
+                    alvo = self.posicoes.get(instr.args[-1])
+                    if alvo is None:
+                        return False
+                    pendentes.append(alvo)
+                    if instr.op == 'j':
+                        break
+                k += 1
+        return True
+
+    def _eh_saida(self, k):
+        # syscall logo depois de li $v0, 10 (fim do programa)
+        anterior = self.instrs[k - 1] if k > 0 else None
+        return anterior is not None and anterior.op == 'li' and anterior.args == ['$v0', '10']
+
+
+# ---------------- Regras ----------------
+
+class Regra:
+    # janela: quantas instruções seguidas a regra olha
+    # aplicar(janela, contexto, i) devolve a lista que substitui a janela,
+    # ou None se o padrão não casou
+    def __init__(self, nome, janela, aplicar):
+        self.nome = nome
+        self.janela = janela
+        self.aplicar = aplicar
+
+
+def _sw_lw(j, ctx, i):
+    # sw R, X / lw R2, X -> sw R, X / move R2, R  (ou some, se R2 == R)
+    a, b = j
+    pares = {('sw', 'lw'): 'move', ('s.s', 'l.s'): 'mov.s'}
+    mover = pares.get((a.op, b.op))
+    if mover and a.args[1] == b.args[1]:
+        if b.args[0] == a.args[0]:
+            return [a]
+        return [a, Instrucao(mover, [b.args[0], a.args[0]])]
+    return None
+
+
+def _carga_repetida(j, ctx, i):
+    # lw R, X / lw R, X -> lw R, X  (X não usa R como base)
+    a, b = j
+    if a.op in CARGAS and a.op == b.op and a.args == b.args and a.args[0] not in _regs(a.args[1:]):
+        return [a]
+    return None
+
+
+def _salto_proximo(j, ctx, i):
+    # j L / L: -> L:
+    a, b = j
+    if a.op == 'j' and b.rotulo == a.args[0]:
+        return [b]
+    return None
+
+
+def _salto_pra_salto(j, ctx, i):
+    # desvio pra L, onde L: j M -> desvio direto pra M
+    a = j[0]
+    if a.op not in DESVIOS and a.op != 'j':
+        return None
+    pos = ctx.posicao(a.args[-1])
+    if pos is None:
+        return None
+    k = pos + 1
+    while k < len(ctx.instrs) and ctx.instrs[k].rotulo is not None:
+        k += 1
+    if k < len(ctx.instrs) and ctx.instrs[k].op == 'j' and ctx.instrs[k].args[0] != a.args[-1]:
+        return [Instrucao(a.op, a.args[:-1] + [ctx.instrs[k].args[0]])]
+    return None
+
+
+def _inalcancavel(j, ctx, i):
+    # j L / instrução (sem rótulo no meio) -> a instrução nunca executa
+    a, b = j
+    if a.op in ('j', 'jr') and b.rotulo is None:
+        return [a]
+    return None
+
+
+def _rotulo_sem_uso(j, ctx, i):
+    a = j[0]
+    if a.rotulo is not None and not ctx.usado(a.rotulo):
+        return []
+    return None
+
+
+def _move_proprio(j, ctx, i):
+    a = j[0]
+    if a.op in ('move', 'mov.s') and a.args[0] == a.args[1]:
+        return []
+    return None
+
+
+def _escrita_morta(j, ctx, i):
+    # Instrução pura cujo resultado ninguém lê (li/lw/add... sem uso)
+    a = j[0]
+    if a.op in PURAS and ctx.morto_depois(i, a.args[0]):
+        return []
+    return None
+
+
+def _imediato(j, ctx, i):
+    # li R, v / add D, A, R -> addi D, A, v  (R morto depois)
+    a, b = j
+    if a.op != 'li' or b.op not in ('add', 'addu', 'sub', 'subu', 'slt') or len(b.args) != 3:
+        return None
+    r = a.args[0]
+    try:
+        v = int(a.args[1])
+    except ValueError:
+        return None
+    d, x, y = b.args
+    if b.op in ('add', 'addu') and x == r and y != r:
+        x, y = y, x
+    if y != r or x == r:
+        return None
+    if b.op in ('sub', 'subu'):
+        v = -v
+    if not -32768 <= v <= 32767 or not ctx.morto_depois(i + 1, r):
+        return None
+    op = 'slti' if b.op == 'slt' else 'addi'
+    return [Instrucao(op, [d, x, str(v)])]
+
+
+def _dobrar_move(j, ctx, i):
+    # op D, ... / move X, D -> op X, ...  (D morto depois do move)
+    a, b = j
+    if b.op not in ('move', 'mov.s') or a.op not in PURAS or a.op in ('move', 'mov.s'):
+        return None
+    if b.args[1] != a.args[0] or b.args[0] == b.args[1]:
+        return None
+    float_a = a.op.endswith('.s') or a.op in ('cvt.s.w', 'l.s') or (a.op == 'mtc1')
+    if (b.op == 'mov.s') != float_a:
+        return None
+    if not ctx.morto_depois(i + 1, a.args[0]):
+        return None
+    return [Instrucao(a.op, [b.args[0]] + a.args[1:])]
+
+
+REGRAS_PADRAO = [
+    Regra('move_proprio', 1, _move_proprio),
+    Regra('sw_lw', 2, _sw_lw),
+    Regra('carga_repetida', 2, _carga_repetida),
+    Regra('salto_proximo', 2, _salto_proximo),
+    Regra('salto_pra_salto', 1, _salto_pra_salto),
+    Regra('inalcancavel', 2, _inalcancavel),
+    Regra('rotulo_sem_uso', 1, _rotulo_sem_uso),
+    Regra('imediato', 2, _imediato),
+    Regra('dobrar_move', 2, _dobrar_move),
+    Regra('escrita_morta', 1, _escrita_morta),
+]
+
+
+class Peephole:
+    # regras: lista de Regra (padrão: REGRAS_PADRAO)
+    # fixos: rótulos que não podem ser removidos
+    def __init__(self, regras=None, fixos=('main',), max_iteracoes=20):
+        self.regras = list(REGRAS_PADRAO if regras is None else regras)
+        self.fixos = fixos
+        self.max_iteracoes = max_iteracoes
+        self.contagem = {r.nome: 0 for r in self.regras}
+        self.iteracoes = 0
+
+    def otimizar(self, instrs):
+        # Desliza a janela pela lista aplicando as regras; repete as
+        # varreduras até uma inteira passar sem mudança
+        instrs = list(instrs)
+        ctx = Contexto(instrs, self.fixos)
+        maior_janela = max([r.janela for r in self.regras] + [1])
+        for _ in range(self.max_iteracoes):
+            self.iteracoes += 1
+            mudou = False
+            i = 0
+            while i < len(instrs):
+                for regra in self.regras:
+                    janela = instrs[i:i + regra.janela]
+                    if len(janela) < regra.janela:
+                        continue
+                    novo = regra.aplicar(janela, ctx, i)
+                    if novo is not None:
+                        instrs[i:i + regra.janela] = novo
+                        ctx.sujo = True
+                        self.contagem[regra.nome] += 1
+                        mudou = True
+                        # Volta um pouco: a troca pode ter criado padrão com o anterior
+                        i = max(i - maior_janela + 1, 0)
+                        break
+                else:
+                    i += 1
+            if not mudou:
+                break
+        return instrs
+
+    def otimizar_linhas(self, linhas):
+        return para_linhas(self.otimizar(de_linhas(linhas)))
@@ -0,0 +1,30 @@
+# ALOCADOR DE RÓTULOS
+# Todo rótulo do assembly sai daqui, então nunca repete (antes o gerador
+# usava nomes fixos tipo ELSE_MAIOR_3 e dois ifs davam rótulo duplicado)
+# Os rótulos de uma mesma construção saem com o mesmo número
+# (ELSE_4 / FIM_IF_4), o que deixa o assembly fácil de acompanhar
+
+
+class Rotulos:
+    def __init__(self):
+        self.contador = 0
+        self.usados = set()
+
+    def reservar(self, nome):
+        # Registra um rótulo de nome fixo (main, nome de função...)
+        if nome in self.usados:
+            raise Exception("Rotulo '" + nome + "' duplicado")
+        self.usados.add(nome)
+        return nome
+
+    def novos(self, *prefixos):
+        # Um rótulo pra cada prefixo, todos com o mesmo número
+        while True:
+            self.contador += 1
+            nomes = [p + "_" + str(self.contador) for p in prefixos]
+            if not any(n in self.usados for n in nomes):
+                self.usados.update(nomes)
+                return nomes
+
+    def novo(self, prefixo):
+        return self.novos(prefixo)[0]
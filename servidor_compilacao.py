@@ -0,0 +1,162 @@
+# SERVIDOR DE COMPILAÇÃO
+# Processo que fica no ar com o compilador já importado (léxico, tabela do
+# SLR, gerador...) e compila o que chegar por um socket Unix, então quem
+# compila arquivo por arquivo não paga a subida do Python a cada vez:
+#   python servidor_compilacao.py --socket /tmp/compilador.sock -j 4
+#   python cliente_compilacao.py prog.txt -o prog.asm
+# Protocolo: cada mensagem é um JSON numa linha (pedido e resposta); uma
+# conexão pode mandar vários pedidos seguidos
+#   pedido:   {"codigo": "..."} ou {"caminho": "/abs/prog.txt"},
+#             mais "nivel", "desativados", "cache" (opcionais)
+#             {"comando": "ping"} / {"comando": "parar"}
+#   resposta: {"ok": true, "asm": "...", "erros": [], "tempo": 0.01}
+# Cada conexão tem sua thread; a compilação em si vai pra um pool de
+# processos (já aquecidos, com os módulos importados), então pedidos ao
+# mesmo tempo compilam em paralelo de verdade. Com -j 1 compila na própria
+# thread
+
+import argparse
+import errno
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from compilador import compilar, CompiladorIncremental
+
+SOCKET_PADRAO = "/tmp/compilador_mips.sock"
+
+
+def compilar_pedido(pedido):
+    # Pedido (dict) -> resposta (dict); roda no processo do pool
+    inicio = time.perf_counter()
+    try:
+        if "codigo" in pedido:
+            codigo = pedido["codigo"]
+        else:
+            with open(pedido["caminho"], encoding="utf-8") as f:
+                codigo = f.read()
+        nivel = pedido.get("nivel", 2)
+        desativados = tuple(pedido.get("desativados", ()))
+        if pedido.get("cache"):
+            asm, erros = CompiladorIncremental(pedido["cache"], nivel, desativados).compilar(codigo)
+        else:
+            asm, erros = compilar(codigo, nivel, desativados)
+    except Exception as e:
+        asm, erros = None, [type(e).__name__ + ": " + str(e)]
+    return {"ok": not erros, "asm": asm, "erros": erros,
+            "tempo": time.perf_counter() - inicio}
+
+
+def _aquecer():
+    # Roda uma vez em cada processo do pool, antes do primeiro pedido
+    compilar("inteiro x; x = 1; write(x);")
+
+
+class TratadorConexao(socketserver.StreamRequestHandler):
+    def handle(self):
+        for linha in self.rfile:
+            if not linha.strip():
+                continue
+            try:
+                pedido = json.loads(linha)
+                if not isinstance(pedido, dict):
+                    raise ValueError("esperava um objeto JSON")
+            except ValueError as e:
+                pedido = {}
+                resposta = {"ok": False, "asm": None, "erros": ["Pedido invalido: " + str(e)]}
+            else:
+                resposta = self.server.atender(pedido)
+            self.wfile.write((json.dumps(resposta) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if pedido.get("comando") == "parar":
+                return
+
+
+def apagar_socket_velho(caminho):
+    # Socket velho (servidor que morreu sem limpar) é apagado, mas só se
+    # ninguém atende nele: apagar o de um servidor no ar deixaria ele
+    # rodando sem ninguém conseguir chegar
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(caminho)
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                return
+            if e.errno != errno.ECONNREFUSED:
+                raise
+        else:
+            raise FileExistsError(errno.EEXIST, "Ja tem um servidor de compilacao no ar", caminho)
+    os.unlink(caminho)
+
+
+class ServidorCompilacao(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, caminho, processos=1):
+        apagar_socket_velho(caminho)
+        super().__init__(caminho, TratadorConexao)
+        self.caminho = caminho
+        self.pool = None
+        if processos > 1:
+            self.pool = ProcessPoolExecutor(max_workers=processos, initializer=_aquecer)
+        else:
+            _aquecer()
+        self.atendidos = 0
+        self.trava = threading.Lock()
+
+    def atender(self, pedido):
+        comando = pedido.get("comando", "compilar")
+        if comando == "ping":
+            return {"ok": True, "atendidos": self.atendidos}
+        if comando == "parar":
+            # shutdown espera o serve_forever acabar: chama de outra thread
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        if comando != "compilar":
+            return {"ok": False, "asm": None, "erros": ["Comando desconhecido: " + str(comando)]}
+        if self.pool is not None:
+            resposta = self.pool.submit(compilar_pedido, pedido).result()
+        else:
+            resposta = compilar_pedido(pedido)
+        with self.trava:
+            self.atendidos += 1
+        return resposta
+
+    def server_close(self):
+        super().server_close()
+        if self.pool is not None:
+            self.pool.shutdown()
+        if os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Servidor de compilacao (socket Unix)")
+    p.add_argument("--socket", default=SOCKET_PADRAO, help="caminho do socket (padrao: " + SOCKET_PADRAO + ")")
+    p.add_argument("-j", dest="processos", type=int, default=os.cpu_count() or 1,
+                   help="processos compilando em paralelo (padrao: numero de nucleos)")
+    args = p.parse_args(argv)
+
+    try:
+        servidor = ServidorCompilacao(args.socket, args.processos)
+    except OSError as e:
+        print("Nao deu pra abrir o servidor em " + args.socket + ": " + str(e), file=sys.stderr)
+        return 1
+    print("Servidor de compilacao em " + args.socket + " (" + str(args.processos) + " processo(s))")
+    sys.stdout.flush()
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
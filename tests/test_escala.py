@@ -0,0 +1,40 @@
+# Tempo de compilação em -O2 tem que crescer perto de linear com o tamanho
+# do programa: cada passo do otimizador roda num programa gerado de N e de
+# 4N bytes e a razão dos tempos fica bem abaixo dos 16x de um passo
+# quadrático (linear dá uns 4x)
+
+import sys
+import time
+
+import pytest
+
+from analisador_lexico import Lexico
+from benchmark import gerar_programa
+from codigo_intermediario import construir_ir
+from compilador import analisar
+from otimizador import GerenciadorPassos
+
+RAZAO_MAXIMA = 10
+
+
+def tempo_passo(passo, tamanho, repeticoes=3):
+    # Menor tempo de uma rodada do passo sozinho sobre o IR do programa
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+    tokens, _ = Lexico().analisar_compacto(gerar_programa(tamanho))
+    arvore, erros = analisar(tokens)
+    assert erros == []
+    melhor = None
+    for _ in range(repeticoes):
+        ir = construir_ir(arvore)
+        inicio = time.perf_counter()
+        GerenciadorPassos(passos=[passo], max_iteracoes=1).executar(ir)
+        tempo = time.perf_counter() - inicio
+        melhor = tempo if melhor is None else min(melhor, tempo)
+    return melhor
+
+
+@pytest.mark.parametrize("passo", ["propagar_constantes", "mover_invariantes", "reduzir_forca"])
+def test_passo_escala_linear(passo):
+    pequeno = tempo_passo(passo, 16 * 1024)
+    grande = tempo_passo(passo, 64 * 1024)
+    assert grande < RAZAO_MAXIMA * pequeno + 0.05
@@ -0,0 +1,82 @@
+# Dobra de constantes com flutuante: -O2 tem que imprimir o mesmo que -O0
+# (a FPU faz tudo em precisão simples, o otimizador tem que fazer igual)
+
+import pytest
+
+from compilador import compilar
+from interpretador_mips import executar
+
+
+def saida(codigo, nivel, entradas=None):
+    asm, erros = compilar(codigo, nivel)
+    assert erros == []
+    return executar(asm, entradas).saida
+
+
+PROGRAMAS = [
+    # 0.1 + 0.2 == 0.3 em float32 (em double não é)
+    """
+flutuante a;
+a = 0.1 + 0.2;
+if (a == 0.3) {
+    write("igual");
+} else {
+    write("diferente");
+}
+write(a);
+""",
+    # 1.1 * 1.1 > 1.21 em double, mas não em float32
+    """
+flutuante a;
+a = 1.1 * 1.1;
+if (a > 1.21) {
+    write("maior");
+} else {
+    write("nao maior");
+}
+write(a);
+""",
+    # Literal e conta misturando inteiro e flutuante
+    """
+flutuante a;
+a = 39.7125 * 1.0 + 16777217;
+write(a);
+write(0.7 - 0.1 / 3.0);
+""",
+]
+
+
+@pytest.mark.parametrize("codigo", PROGRAMAS, ids=["soma", "produto", "misto"])
+def test_dobra_flutuante_igual_ao_O0(codigo):
+    assert saida(codigo, 2) == saida(codigo, 0)
+
+
+def test_desvio_dobrado_com_comparacao_flutuante():
+    # a e b chegam no if por outro bloco: quem dobra o desvio é o
+    # propagar_constantes, e tem que escolher o mesmo lado que o -O0
+    codigo = """
+flutuante a;
+flutuante b;
+inteiro x;
+read(x);
+a = 0.1;
+b = 0.2;
+if (x > 0) {
+    write(x);
+}
+if (a + b == 0.3) {
+    write("igual");
+} else {
+    write("diferente");
+}
+if (a * 3.0 <= 0.3) {
+    write("menor ou igual");
+} else {
+    write("maior");
+}
+"""
+    asm, erros = compilar(codigo, 2)
+    assert erros == []
+    # O lado que não roda sumiu (o desvio foi mesmo dobrado)
+    assert '"diferente"' not in asm and '"maior"' not in asm
+    assert executar(asm, ['3']).saida == saida(codigo, 0, ['3']) == "3igualmenor ou igual"
@@ -0,0 +1,74 @@
+# Compilação incremental: cache por unidade (programa principal + cada função)
+
+import os
+
+import pytest
+
+from compilador import CompiladorIncremental, compilar
+from interpretador_mips import executar
+
+PROGRAMA = """inteiro total;
+fun dobra(x) {
+    write(x * 2);
+}
+fun acumula(x) {
+    total = total + x;
+}
+total = 0;
+dobra(4);
+acumula(5);
+acumula(6);
+write(total);
+"""
+SAIDA = "811"
+
+
+@pytest.mark.parametrize("nivel", [0, 2])
+def test_acerto_e_falta(tmp_path, nivel):
+    inc = CompiladorIncremental(str(tmp_path), nivel)
+    asm, erros = inc.compilar(PROGRAMA)
+    assert erros == []
+    assert (inc.compiladas, inc.reusadas) == (3, 0)
+    assert executar(asm).saida == SAIDA == executar(compilar(PROGRAMA, nivel)[0]).saida
+
+    # Nada mudou: tudo vem do cache e o assembly é o mesmo
+    de_novo, _ = inc.compilar(PROGRAMA)
+    assert (inc.compiladas, inc.reusadas) == (0, 3)
+    assert de_novo == asm
+
+
+def test_mudar_uma_funcao_so_recompila_ela(tmp_path):
+    inc = CompiladorIncremental(str(tmp_path))
+    inc.compilar(PROGRAMA)
+    asm, erros = inc.compilar(PROGRAMA.replace("x * 2", "x * 3"))
+    assert erros == []
+    assert (inc.compiladas, inc.reusadas) == (1, 2)
+    assert executar(asm).saida == "1211"
+
+
+def test_nivel_faz_parte_da_chave(tmp_path):
+    CompiladorIncremental(str(tmp_path), 2).compilar(PROGRAMA)
+    inc = CompiladorIncremental(str(tmp_path), 0)
+    inc.compilar(PROGRAMA)
+    assert (inc.compiladas, inc.reusadas) == (3, 0)
+
+
+def test_entrada_estragada_recompila(tmp_path):
+    inc = CompiladorIncremental(str(tmp_path))
+    inc.compilar(PROGRAMA)
+    for nome in os.listdir(tmp_path):
+        with open(os.path.join(tmp_path, nome), "w", encoding="utf-8") as f:
+            f.write("{pela metade")
+    asm, erros = inc.compilar(PROGRAMA)
+    assert erros == []
+    assert (inc.compiladas, inc.reusadas) == (3, 0)
+    assert executar(asm).saida == SAIDA
+
+
+def test_erro_nao_vai_pro_cache(tmp_path):
+    inc = CompiladorIncremental(str(tmp_path))
+    asm, erros = inc.compilar(PROGRAMA.replace("write(x * 2);", "write(x * );"))
+    assert asm is None and erros
+    # As unidades certas ficaram no cache; a com erro não
+    inc.compilar(PROGRAMA)
+    assert (inc.compiladas, inc.reusadas) == (1, 2)
@@ -0,0 +1,77 @@
+# Expansão inline: o programa tem que imprimir o mesmo com e sem ela
+
+import pytest
+
+from analisador_lexico import Lexico
+from arvore_sintatica import DeclFuncao
+from compilador import analisar, compilar
+from expansao_inline import ExpansorInline
+from interpretador_mips import executar
+
+# soma mexe numa global, mostra tem uma local com o mesmo nome da global i
+# (cada cópia ganha declarações novas) e conta é recursiva (não expande)
+PROGRAMA = """inteiro total;
+inteiro i;
+fun soma(a, b) {
+    inteiro resultado;
+    resultado = a + b;
+    total = total + resultado;
+}
+fun mostra(x) {
+    inteiro i;
+    i = x * 2;
+    write(i);
+}
+fun conta(n) {
+    if (n > 0) {
+        write(n);
+        conta(n - 1);
+    }
+}
+total = 0;
+for (i = 0; i < 3; i = i + 1) {
+    soma(i, 10);
+    mostra(i);
+}
+conta(3);
+write(total);
+"""
+SAIDA = "024" + "321" + "33"
+
+
+def arvore(codigo):
+    tokens, _ = Lexico().analisar_compacto(codigo)
+    arv, erros = analisar(tokens)
+    assert erros == []
+    return arv
+
+
+@pytest.mark.parametrize("nivel", [0, 1, 2])
+def test_mesma_saida(nivel):
+    asm, erros = compilar(PROGRAMA, nivel)
+    assert erros == []
+    assert executar(asm).saida == SAIDA
+
+
+@pytest.mark.parametrize("nivel", [1, 2])
+def test_so_a_recursiva_continua_chamada(nivel):
+    asm, _ = compilar(PROGRAMA, nivel)
+    assert "jal fun_soma" not in asm and "jal fun_mostra" not in asm
+    assert "jal fun_conta" in asm
+
+
+def test_expansor():
+    arv = arvore(PROGRAMA)
+    expansor = ExpansorInline()
+    assert expansor.expandir(arv) == 2
+    # soma e mostra não têm mais chamada e saem da AST
+    assert expansor.removidas == 2
+    assert [c.nome for c in arv.comandos if isinstance(c, DeclFuncao)] == ['conta']
+
+
+def test_sem_espaco_nao_expande():
+    # Limite de crescimento zero: nenhuma cópia cabe, nada muda
+    arv = arvore(PROGRAMA)
+    expansor = ExpansorInline(limite_tamanho=0, limite_unica=0, limite_crescimento=0)
+    assert expansor.expandir(arv) == 0
+    assert expansor.removidas == 0
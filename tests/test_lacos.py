@@ -0,0 +1,94 @@
+# Movimento de invariantes e redução de força nos laços (-O2)
+
+import pytest
+
+from analisador_lexico import Lexico
+from codigo_intermediario import Const, construir_ir
+from compilador import analisar, compilar
+from interpretador_mips import executar
+from otimizador import GerenciadorPassos
+
+PROGRAMA = """inteiro i;
+inteiro a;
+inteiro b;
+inteiro s;
+read(a);
+read(b);
+s = 0;
+for (i = 0; i < 10; i = i + 1) {
+    s = s + a * b + i * 4;
+}
+write(s);
+"""
+
+ANINHADO = """inteiro i;
+inteiro j;
+inteiro a;
+inteiro s;
+read(a);
+s = 0;
+for (i = 0; i < 4; i = i + 1) {
+    j = 0;
+    while (j < 3) {
+        s = s + a * 7 + j * 4;
+        j = j + 1;
+    }
+}
+write(s);
+"""
+
+# Blocos que o construtor do IR cria pra cada laço
+PREFIXOS_LACO = ('INICIO_FOR', 'CORPO_FOR', 'PASSO_FOR', 'INICIO_WHILE', 'CORPO_WHILE')
+
+
+def otimizado(codigo, *passos):
+    tokens, _ = Lexico().analisar_compacto(codigo)
+    arvore, erros = analisar(tokens)
+    assert erros == []
+    ir = construir_ir(arvore)
+    GerenciadorPassos(passos=passos).executar(ir)
+    return ir.principal()
+
+
+def instrucoes(funcao, no_laco):
+    return [instr for bloco in funcao.blocos
+            if bloco.nome.startswith(PREFIXOS_LACO) == no_laco
+            for instr in bloco.instrs]
+
+
+def test_invariante_sai_do_laco():
+    funcao = otimizado(PROGRAMA, 'mover_invariantes')
+    dentro = instrucoes(funcao, True)
+    fora = instrucoes(funcao, False)
+    assert not any(i.op == 'mult' and i.args == ['a', 'b'] for i in dentro)
+    assert any(i.op == 'mult' and i.args == ['a', 'b'] for i in fora)
+
+
+def test_multiplicacao_vira_soma():
+    # i * 4 vira um temporário que começa em 0 e soma 4 a cada volta
+    # (o passo do for sai como %5 = i + 1 / i = %5; a cópia propagada
+    # deixa i = i + 1, que é o que a redução reconhece)
+    funcao = otimizado(PROGRAMA, 'propagar_copias', 'reduzir_forca')
+    dentro = instrucoes(funcao, True)
+    assert not any(i.op == 'mult' and 'i' in i.args for i in dentro)
+    assert any(i.op == 'mais' and i.dest == i.args[0] and i.args[1] == Const(4, 'inteiro')
+               for i in dentro)
+
+
+@pytest.mark.parametrize("codigo, entradas, esperado", [
+    (PROGRAMA, ["3", "5"], "330"),
+    (ANINHADO, ["2"], "216"),
+])
+@pytest.mark.parametrize("desativados", [(), ('mover_invariantes',), ('reduzir_forca',)])
+def test_mesma_saida_do_O0(codigo, entradas, esperado, desativados):
+    asm, erros = compilar(codigo, 2, desativados)
+    assert erros == []
+    assert executar(asm, list(entradas)).saida == esperado
+    assert executar(compilar(codigo, 0)[0], list(entradas)).saida == esperado
+
+
+def test_aninhado_sai_dos_dois_lacos():
+    # a * 7 não muda em nenhum dos dois laços: sobe pra antes do for
+    funcao = otimizado(ANINHADO, 'mover_invariantes')
+    assert not any(i.op == 'mult' and i.args[0] == 'a' for i in instrucoes(funcao, True))
+    assert funcao.blocos[0].instrs[-2].op == 'mult'
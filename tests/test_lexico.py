@@ -0,0 +1,52 @@
+# Motor rápido do léxico: gerador tokens() e lotes em blocos
+
+import io
+
+import pytest
+
+from analisador_lexico import Lexico
+
+
+def chaves(tokens):
+    return [(tk.tipo, tk.lexema, tk.linha, tk.coluna) for tk in tokens]
+
+
+PROGRAMA = """inteiro contador;
+contador = 10; // comentário com "aspas"
+cadeia msg;
+msg = "linha um
+linha dois \\" escapada";
+while (contador >= 0) {
+    write(contador & msg);
+    contador--;
+}
+"""
+
+COM_ERROS = 'inteiro x;\nx = 1 @ 2;\n#\nmsg = "sem fechar\n'
+
+
+@pytest.mark.parametrize("codigo", [PROGRAMA, COM_ERROS])
+@pytest.mark.parametrize("tamanho_bloco", [1, 2, 3, 7, 16, 64 * 1024])
+def test_tokens_igual_ao_analisar(codigo, tamanho_bloco):
+    # Blocos pequenos cortam o meio de ids, operadores de 2 chars, '//',
+    # strings com quebra de linha e escapes
+    esperado, erros = Lexico().analisar(codigo)
+    lexico = Lexico()
+    assert chaves(lexico.tokens(codigo, tamanho_bloco)) == chaves(esperado)
+    assert lexico.erros == erros
+
+
+@pytest.mark.parametrize("tamanho_bloco", [1, 5, 64 * 1024])
+def test_tokens_de_arquivo(tamanho_bloco):
+    # Arquivo lido aos poucos dá o mesmo que a string inteira
+    esperado, _ = Lexico().analisar(PROGRAMA * 20)
+    lidos = Lexico().tokens(io.StringIO(PROGRAMA * 20), tamanho_bloco)
+    assert chaves(lidos) == chaves(esperado)
+
+
+def test_igual_ao_motor_classico():
+    for codigo in (PROGRAMA, COM_ERROS):
+        rapido = Lexico().analisar(codigo)
+        classico = Lexico('classico').analisar(codigo)
+        assert chaves(rapido[0]) == chaves(classico[0])
+        assert rapido[1] == classico[1]
@@ -0,0 +1,54 @@
+# Compilação em lote: código de saída, onde cada .asm vai parar e saídas
+# repetidas
+
+from compilar_lote import main
+from interpretador_mips import executar
+
+CERTO = "inteiro x;\nx = 6 * 7;\nwrite(x);\n"
+ERRADO = "inteiro x;\nx = 1 + ;\n"
+
+
+def escrever(caminho, codigo):
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_text(codigo, encoding="utf-8")
+    return str(caminho)
+
+
+def rodar(caminho):
+    return executar(caminho.read_text(encoding="utf-8")).saida
+
+
+def test_asm_do_lado_do_fonte(tmp_path):
+    a = escrever(tmp_path / "a.txt", CERTO)
+    b = escrever(tmp_path / "b.txt", CERTO)
+    assert main([a, b, "-j", "2", "-q"]) == 0
+    assert rodar(tmp_path / "a.asm") == rodar(tmp_path / "b.asm") == "42"
+
+
+def test_pasta_mantem_subpastas(tmp_path):
+    escrever(tmp_path / "fontes" / "p.txt", CERTO)
+    escrever(tmp_path / "fontes" / "sub" / "p.txt", CERTO)
+    saida = tmp_path / "saida"
+    assert main([str(tmp_path / "fontes"), "-o", str(saida), "-j", "1", "-q"]) == 0
+    assert rodar(saida / "p.asm") == rodar(saida / "sub" / "p.asm") == "42"
+
+
+def test_um_arquivo_com_erro_falha_o_lote(tmp_path):
+    certo = escrever(tmp_path / "certo.txt", CERTO)
+    errado = escrever(tmp_path / "errado.txt", ERRADO)
+    assert main([certo, errado, "-j", "1", "-q"]) == 1
+    # O que compilou é gravado mesmo assim; o que deu erro não
+    assert (tmp_path / "certo.asm").exists()
+    assert not (tmp_path / "errado.asm").exists()
+
+
+def test_saida_repetida_nao_compila_nada(tmp_path, capsys):
+    a = escrever(tmp_path / "a" / "p.txt", CERTO)
+    b = escrever(tmp_path / "b" / "p.txt", CERTO)
+    saida = tmp_path / "saida"
+    assert main([a, b, "-o", str(saida), "-j", "1"]) == 1
+    assert "Saida repetida" in capsys.readouterr().err
+    assert not saida.exists()
+    # A mesma entrada duas vezes não é colisão
+    assert main([a, a, "-o", str(saida), "-j", "1", "-q"]) == 0
+    assert rodar(saida / "p.asm") == "42"
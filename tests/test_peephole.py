@@ -0,0 +1,98 @@
+# Cada regra do peephole sozinha num par mínimo antes/depois
+
+import pytest
+
+from compilador import compilar
+from interpretador_mips import executar
+from peephole import Peephole, REGRAS_PADRAO
+
+REGRAS = {r.nome: r for r in REGRAS_PADRAO}
+
+
+def otimizar(nome, linhas):
+    peephole = Peephole(regras=[REGRAS[nome]])
+    saida = [l.strip() for l in peephole.otimizar_linhas(linhas)]
+    return saida, peephole.contagem[nome]
+
+
+CASOS = [
+    ('move_proprio',
+     ["move $t0, $t0", "jr $ra"],
+     ["jr $ra"]),
+    ('sw_lw',
+     ["sw $t0, 4($sp)", "lw $t1, 4($sp)"],
+     ["sw $t0, 4($sp)", "move $t1, $t0"]),
+    ('sw_lw',
+     ["s.s $f0, 8($sp)", "l.s $f0, 8($sp)"],
+     ["s.s $f0, 8($sp)"]),
+    ('carga_repetida',
+     ["lw $t0, 4($sp)", "lw $t0, 4($sp)"],
+     ["lw $t0, 4($sp)"]),
+    ('salto_proximo',
+     ["j L1", "L1:"],
+     ["L1:"]),
+    ('salto_pra_salto',
+     ["beq $t0, $zero, L1", "L1:", "j L2", "L2:", "jr $ra"],
+     ["beq $t0, $zero, L2", "L1:", "j L2", "L2:", "jr $ra"]),
+    ('inalcancavel',
+     ["j L1", "li $t0, 1", "L1:"],
+     ["j L1", "L1:"]),
+    ('rotulo_sem_uso',
+     ["main:", "L1:", "li $t0, 1"],
+     ["main:", "li $t0, 1"]),
+    ('imediato',
+     ["li $t1, 1", "add $t0, $t0, $t1", "sw $t0, 0($sp)", "jr $ra"],
+     ["addi $t0, $t0, 1", "sw $t0, 0($sp)", "jr $ra"]),
+    ('imediato',
+     ["li $t1, 3", "sub $t0, $t2, $t1", "sw $t0, 0($sp)", "jr $ra"],
+     ["addi $t0, $t2, -3", "sw $t0, 0($sp)", "jr $ra"]),
+    ('dobrar_move',
+     ["add $t0, $s0, $t1", "move $s0, $t0", "jr $ra"],
+     ["add $s0, $s0, $t1", "jr $ra"]),
+    ('escrita_morta',
+     ["li $t0, 5", "li $v0, 10", "syscall"],
+     ["li $v0, 10", "syscall"]),
+]
+
+
+@pytest.mark.parametrize("nome, antes, depois", CASOS, ids=[c[0] for c in CASOS])
+def test_regra(nome, antes, depois):
+    saida, vezes = otimizar(nome, antes)
+    assert saida == depois
+    assert vezes == 1
+
+
+@pytest.mark.parametrize("nome, linhas", [
+    # Valor lido depois: nada a fazer
+    ('escrita_morta', ["li $t0, 5", "move $a0, $t0", "li $v0, 1", "syscall", "jr $ra"]),
+    # $t1 ainda é lido depois do add
+    ('imediato', ["li $t1, 1", "add $t0, $t0, $t1", "move $a0, $t1", "jr $ra"]),
+    # A base do endereço é o próprio registrador carregado
+    ('carga_repetida', ["lw $t0, 0($t0)", "lw $t0, 0($t0)"]),
+    # Rótulo com desvio apontando pra ele fica
+    ('rotulo_sem_uso', ["L1:", "li $t0, 1", "j L1"]),
+])
+def test_regra_nao_casa(nome, linhas):
+    saida, vezes = otimizar(nome, linhas)
+    assert saida == linhas
+    assert vezes == 0
+
+
+PROGRAMA = """inteiro i;
+inteiro soma;
+soma = 0;
+for (i = 1; i <= 10; i = i + 1) {
+    if (i != 5) {
+        soma = soma + i;
+    }
+}
+write(soma);
+"""
+
+
+@pytest.mark.parametrize("nivel", [1, 2])
+def test_programa_com_peephole(nivel):
+    # Com o peephole (-O1/-O2) a saída é a mesma do -O0
+    asm, erros = compilar(PROGRAMA, nivel)
+    assert erros == []
+    assert executar(asm).saida == executar(compilar(PROGRAMA, 0)[0]).saida == "50"
@@ -0,0 +1,50 @@
+# Rótulos únicos e desvios fundidos nas condições
+
+import re
+
+import pytest
+
+from compilador import compilar
+from interpretador_mips import executar
+from rotulos import Rotulos
+
+# Um if/else e um while por operador relacional, com nomes que repetem
+# entre as construções (antes o gerador repetia ELSE_MAIOR_3 etc.)
+OPERADORES = ['>', '<', '>=', '<=', '==', '!=']
+PROGRAMA = "inteiro x;\ninteiro n;\nx = 3;\n" + "".join(
+    "if (x " + op + " 3) { write(1); } else { write(0); }\n"
+    "n = 0;\nwhile (n " + op + " 2) { n = n + 1; if (n > 5) { n = 9; } }\n"
+    "write(n);\n"
+    for op in OPERADORES)
+SAIDA = "00" + "02" + "10" + "13" + "10" + "02"
+
+ROTULO = re.compile(r"^(\w+):", re.M)
+RELACIONAL = re.compile(r"^\s*(slt|sle|sgt|sge|seq|sne)\b", re.M)
+
+
+@pytest.mark.parametrize("nivel", [0, 1, 2])
+def test_rotulos_unicos_e_saida(nivel):
+    asm, erros = compilar(PROGRAMA, nivel)
+    assert erros == []
+    rotulos = ROTULO.findall(asm)
+    assert len(rotulos) == len(set(rotulos))
+    assert executar(asm).saida == SAIDA
+
+
+def test_condicao_vira_desvio_fundido():
+    # Sem otimização, a comparação da condição já sai num desvio só
+    # (ble/blt/...) em vez de calcular 0/1 e testar com beq
+    asm, _ = compilar(PROGRAMA, 0)
+    assert RELACIONAL.search(asm) is None
+    assert re.search(r"^\s*ble \$t\d, 3, ELSE_\d+$", asm, re.M)
+
+
+def test_alocador():
+    rotulos = Rotulos()
+    assert rotulos.novos("ELSE", "FIM_IF") == ["ELSE_1", "FIM_IF_1"]
+    rotulos.reservar("main")
+    with pytest.raises(Exception):
+        rotulos.reservar("main")
+    # Número já usado por um rótulo reservado é pulado
+    rotulos.reservar("LOOP_2")
+    assert rotulos.novo("LOOP") == "LOOP_3"
@@ -0,0 +1,75 @@
+# Servidor de compilação: compila pelo socket, desliga e limpa o socket
+
+import os
+import socket
+import threading
+
+import pytest
+
+import cliente_compilacao
+from interpretador_mips import executar
+from servidor_compilacao import ServidorCompilacao
+
+PROGRAMA = "inteiro x;\nx = 6 * 7;\nwrite(x);\n"
+
+
+@pytest.fixture
+def servidor(tmp_path, request):
+    caminho = str(tmp_path / "c.sock")
+    srv = ServidorCompilacao(caminho, getattr(request, "param", 1))
+    srv.thread = threading.Thread(target=srv.serve_forever)
+    srv.thread.start()
+    yield srv
+    if srv.thread.is_alive():
+        srv.shutdown()
+        srv.thread.join()
+    srv.server_close()
+
+
+@pytest.mark.parametrize("servidor", [1, 2], indirect=True)
+def test_compila_pelo_cliente(servidor, tmp_path):
+    fonte = tmp_path / "p.txt"
+    fonte.write_text(PROGRAMA, encoding="utf-8")
+    assert cliente_compilacao.main([str(fonte), "--socket", servidor.caminho]) == 0
+    assert executar((tmp_path / "p.asm").read_text(encoding="utf-8")).saida == "42"
+    assert cliente_compilacao.pedir(servidor.caminho, {"comando": "ping"})["atendidos"] == 1
+
+
+def test_erros_voltam_na_resposta(servidor, tmp_path):
+    fonte = tmp_path / "erro.txt"
+    fonte.write_text("inteiro x;\nx = 1 + ;\n", encoding="utf-8")
+    assert cliente_compilacao.main([str(fonte), "--socket", servidor.caminho]) == 1
+    assert not (tmp_path / "erro.asm").exists()
+    resposta = cliente_compilacao.pedir(servidor.caminho, {"codigo": PROGRAMA, "nivel": 0})
+    assert resposta["ok"] and executar(resposta["asm"]).saida == "42"
+
+
+def test_varios_pedidos_na_mesma_conexao(servidor):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(servidor.caminho)
+        s.sendall(b'[1, 2]\n{"codigo": "inteiro x; x = 1; write(x);"}\n')
+        with s.makefile("rb") as f:
+            invalido = f.readline()
+            certo = f.readline()
+    assert b"Pedido invalido" in invalido
+    assert b'"ok": true' in certo
+
+
+def test_segundo_servidor_nao_apaga_o_socket(servidor):
+    with pytest.raises(FileExistsError):
+        ServidorCompilacao(servidor.caminho)
+    assert cliente_compilacao.pedir(servidor.caminho, {"comando": "ping"})["ok"]
+
+
+def test_parar_desliga_e_limpa(servidor, tmp_path):
+    caminho = servidor.caminho
+    assert cliente_compilacao.main(["--parar", "--socket", caminho]) == 0
+    # O serve_forever termina sozinho; quem subiu o servidor fecha
+    servidor.thread.join(10)
+    assert not servidor.thread.is_alive()
+    servidor.server_close()
+    assert not os.path.exists(caminho)
+    # Sem servidor o cliente sai com 2
+    fonte = tmp_path / "p.txt"
+    fonte.write_text(PROGRAMA, encoding="utf-8")
+    assert cliente_compilacao.main([str(fonte), "--socket", caminho]) == 2
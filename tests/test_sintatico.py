@@ -0,0 +1,64 @@
+# Recuperação de erros do analisador sintático
+
+import pytest
+
+from analisador_lexico import Lexico
+from analisador_sintatico import AnalisadorSintatico, ParserDescendente, MAX_ANINHAMENTO
+
+
+def analisar(codigo, **opcoes):
+    tokens, erros = Lexico().analisar_compacto(codigo)
+    assert erros == []
+    analisador = AnalisadorSintatico(**opcoes)
+    arvore, erros = analisador.analisar_arvore(tokens)
+    return analisador, erros
+
+
+@pytest.mark.parametrize("max_erros", [1, 5, 20])
+def test_erros_nao_passam_do_limite(max_erros):
+    # Um erro por linha, bem mais que o limite
+    analisador, erros = analisar("inteiro x;\n" + "x = 1 + ;\n" * 40, max_erros=max_erros)
+    assert len(erros) <= max_erros
+    assert analisador.interrompida
+
+
+def test_sem_limite_reporta_todos():
+    analisador, erros = analisar("inteiro x;\n" + "x = 1 + ;\n" * 40, max_erros=None)
+    assert len(erros) == 40
+    assert not analisador.interrompida
+
+
+def test_parenteses_aninhados_no_descendente():
+    # Expressão não usa a pilha do Python: mil níveis passam sem erro
+    analisador, erros = analisar("x = " + "(" * 1000 + "- 1" + ")" * 1000 + ";", parser="descendente")
+    assert erros == []
+
+
+def test_blocos_aninhados_demais():
+    blocos = MAX_ANINHAMENTO + 1
+    codigo = "if (x) { " * blocos + "x = 1;" + " }" * blocos
+    analisador, erros = analisar(codigo, parser="descendente")
+    assert len(erros) == 1 and "blocos aninhados demais" in erros[0]
+    # No automático o SLR (que não tem limite) refaz a análise
+    analisador, erros = analisar(codigo)
+    assert erros == [] and analisador.usado == "slr"
+
+
+def test_erro_interno_nao_vira_erro_sintatico(monkeypatch):
+    def quebrada(self):
+        raise ZeroDivisionError("bug")
+    monkeypatch.setattr(ParserDescendente, "primaria", quebrada)
+    with pytest.raises(ZeroDivisionError):
+        analisar("x = 1;")
+
+
+def test_contadores_do_parser_usado():
+    # LL(1) reporta só os tokens consumidos (não tem shift/reduce)
+    analisador, erros = analisar("inteiro x;\nx = 1 + 2;")
+    assert erros == [] and analisador.usado == "descendente"
+    assert analisador.contadores() == {'tokens_consumidos': 9}
+    # Com erro o SLR refaz e os contadores são os dele
+    analisador, erros = analisar("inteiro x;\nx = 1 + ;")
+    assert analisador.usado == "slr"
+    contadores = analisador.contadores()
+    assert 'tokens_consumidos' not in contadores and contadores['deslocamentos'] > 0
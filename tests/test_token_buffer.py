@@ -0,0 +1,63 @@
+# TokenBuffer (tokens em arrays) tem que se comportar igual à lista de Token
+
+import pytest
+
+from analisador_lexico import Lexico, Token, TokenVisao
+from compilador import analisar, gerar
+from interpretador_mips import executar
+
+PROGRAMA = """fun dobro(n) {
+    write(n * 2);
+}
+inteiro i;
+cadeia nome;
+nome = "fim
+de linha";
+for (i = 0; i < 3; i = i + 1) {
+    dobro(i); // comentário
+}
+write(nome);
+"""
+
+
+def chaves(tokens):
+    return [(tk.tipo, tk.lexema, tk.linha, tk.coluna) for tk in tokens]
+
+
+@pytest.fixture
+def tokens():
+    lista, erros = Lexico().analisar(PROGRAMA)
+    buf, erros_buf = Lexico().analisar_compacto(PROGRAMA)
+    assert erros == erros_buf == []
+    return lista, buf
+
+
+def test_mesmos_tokens(tokens):
+    lista, buf = tokens
+    assert len(buf) == len(lista)
+    assert chaves(buf) == chaves(lista)
+    assert buf.lista_lexemas() == [tk.lexema for tk in lista]
+    assert buf.lista_linhas() == [tk.linha for tk in lista]
+
+
+def test_indice_e_fatia(tokens):
+    lista, buf = tokens
+    assert isinstance(buf[0], TokenVisao)
+    assert chaves([buf[-1]]) == chaves([lista[-1]])
+    assert chaves(buf[3:9]) == chaves(lista[3:9])
+    with pytest.raises(IndexError):
+        buf[len(buf)]
+    tk = buf.token(5)
+    assert isinstance(tk, Token) and chaves([tk]) == chaves([lista[5]])
+
+
+def test_compila_igual(tokens):
+    # O pipeline inteiro a partir do buffer e da lista gera o mesmo assembly
+    lista, buf = tokens
+    arvore_lista, erros = analisar(lista)
+    assert erros == []
+    arvore_buf, erros = analisar(buf)
+    assert erros == []
+    asm = gerar(arvore_buf)
+    assert asm == gerar(arvore_lista)
+    assert executar(asm).saida == "024fim\nde linha"